@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Build cache for the docs/business generators.
+
+Each output (pitch deck PDF, Word document, ...) is keyed by a hash of:
+- the source markdown and any other input files (reference.docx, ...)
+- the generator script itself, which holds the styling and options
+- the engine that builds it and that engine's version
+
+If the output on disk already matches the key, nothing is rebuilt. If an
+earlier build with the same key is in the cache, it is copied into place.
+Only otherwise does the engine run, and its output is then stored.
+
+The cache also remembers which engine worked on this machine and which
+failed, per engine version and inputs, so later builds go straight to the
+working engine instead of probing the ones that are known to fail. A
+failure is only remembered for the inputs it happened on: once they
+change (or the engine is upgraded) the engine is tried again, so a
+document that broke an engine does not rule it out for every later build. An engine
+whose Python packages or command line tools are missing is skipped
+without being tried at all.
+
+Cache: ~/.cache/nivostack/docs-build ($XDG_CACHE_HOME, or DOCS_BUILD_CACHE
+to override). Pass --force to a generator to ignore the cache and probe
+every engine again.
+
+    engines = [Engine("pandoc-wkhtmltopdf", build_pdf, packages=["pypandoc"], binaries=["wkhtmltopdf"])]
+    build("pitch-deck-pdf", pdf_file, [md_file, Path(__file__)], engines)
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+KEEP_PER_OUTPUT = 5  # cached builds kept per output file
+
+def cache_dir():
+    if os.environ.get("DOCS_BUILD_CACHE"):
+        return Path(os.environ["DOCS_BUILD_CACHE"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "nivostack" / "docs-build"
+
+@dataclass
+class Engine:
+    """One way to build an output: build() writes it and returns True on success."""
+    name: str
+    build: object
+    packages: list = field(default_factory=list)  # Python distributions it imports
+    binaries: list = field(default_factory=list)  # command line tools it runs
+    heavy: bool = False  # CPU/memory hungry (wkhtmltopdf, LaTeX, weasyprint); render_docs.py bounds these
+
+    def version(self):
+        """Cheap fingerprint of what the engine runs, or None if something is missing.
+
+        Uses installed package versions and tool paths/mtimes, so nothing
+        is imported or executed to compute it.
+        """
+        from importlib import metadata
+
+        parts = [self.name]
+        for package in self.packages:
+            try:
+                parts.append(f"{package}={metadata.version(package)}")
+            except metadata.PackageNotFoundError:
+                return None
+        for binary in self.binaries:
+            path = shutil.which(binary)
+            if not path:
+                return None
+            parts.append(f"{binary}={path}@{os.stat(path).st_mtime_ns}")
+        return ";".join(parts)
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _stat(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def _write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def _read_json(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+class BuildCache:
+    """Content-addressed outputs plus the engine memo, stored under cache_dir()."""
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else cache_dir()
+        self.engines_file = self.root / "engines.json"
+        self.manifest_file = self.root / "manifest.json"
+
+    def key(self, target, inputs, engine_version, options=None):
+        parts = {"target": target, "engine": engine_version, "inputs": self.inputs_digest(inputs, options)}
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def inputs_digest(self, inputs, options=None):
+        parts = {"options": options or {}, "inputs": [[Path(p).name, _sha256(p)] for p in inputs if Path(p).exists()]}
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    @contextmanager
+    def _locked(self):
+        """Serialize updates of the JSON files between processes (render_docs.py runs builds in parallel)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _object(self, key):
+        return self.root / "objects" / key[:2] / key
+
+    def restore(self, key, output):
+        """'current' if `output` already is the build for `key`, 'restored' if copied from the cache, else None."""
+        output = Path(output)
+        obj = self._object(key)
+        if not obj.exists():
+            return None
+        record = _read_json(self.manifest_file).get(str(output.resolve()), {})
+        if output.exists() and record.get("key") == key and record.get("stat") == _stat(output):
+            return "current"
+        if output.exists() and _sha256(output) == _sha256(obj):
+            self._record(output, key)
+            return "current"
+        shutil.copyfile(obj, output)
+        self._record(output, key)
+        return "restored"
+
+    def store(self, key, output):
+        obj = self._object(key)
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=obj.parent, prefix=".tmp-")
+        os.close(fd)
+        shutil.copyfile(output, tmp)
+        os.replace(tmp, obj)
+        self._record(Path(output), key)
+
+    def _record(self, output, key):
+        with self._locked():
+            manifest = _read_json(self.manifest_file)
+            name = str(output.resolve())
+            record = manifest.get(name, {})
+            history = [k for k in record.get("history", []) if k != key] + [key]
+            for old in history[:-KEEP_PER_OUTPUT]:
+                if not any(old in r.get("history", []) for n, r in manifest.items() if n != name):
+                    self._object(old).unlink(missing_ok=True)
+            manifest[name] = {"key": key, "stat": _stat(output), "history": history[-KEEP_PER_OUTPUT:]}
+            _write_json(self.manifest_file, manifest)
+
+    # -- engine memo ----------------------------------------------------------
+
+    def engine_order(self, target, engines, force=False, inputs_digest=None):
+        """Yield (engine, version) to try: the engine that worked last time first, then the
+        rest in order, leaving out engines that are not installed and engines that failed
+        before at the same version on the same inputs."""
+        memo = {} if force else _read_json(self.engines_file).get(target, {})
+        for engine in sorted(engines, key=lambda engine: engine.name != memo.get("working")):
+            version = engine.version()
+            if version is None:
+                print(f"  - {engine.name}: not installed, skipped")
+            elif memo.get("failed", {}).get(engine.name) == {"version": version, "inputs": inputs_digest}:
+                print(f"  - {engine.name}: failed on these inputs before, skipped (--force to retry)")
+            else:
+                yield engine, version
+
+    def remember(self, target, engine, version, worked, inputs_digest=None):
+        with self._locked():
+            memo = _read_json(self.engines_file)
+            entry = memo.setdefault(target, {})
+            failed = entry.setdefault("failed", {})
+            if worked:
+                entry["working"] = engine.name
+                failed.pop(engine.name, None)
+            else:
+                failed[engine.name] = {"version": version, "inputs": inputs_digest}
+                if entry.get("working") == engine.name:
+                    del entry["working"]
+            _write_json(self.engines_file, memo)
+
+def build_result(target, output, inputs, engines, options=None, force=False, cache=None):
+    """Bring `output` up to date with the first engine that works.
+
+    Returns (engine name or None, state) with state one of "unchanged",
+    "restored" (copied from the cache), "built" or "failed". `target` names
+    the output kind for the engine memo (e.g. "pitch-deck-pdf").
+    """
+    cache = cache or BuildCache()
+    output = Path(output)
+    inputs_digest = cache.inputs_digest(inputs, options)
+    for engine, version in cache.engine_order(target, engines, force, inputs_digest):
+        key = cache.key(target, inputs, version, options)
+        state = None if force else cache.restore(key, output)
+        if state:
+            print(f"✓ {output.name} is up to date ({engine.name}, {'unchanged' if state == 'current' else 'from cache'})")
+            return engine.name, "unchanged" if state == "current" else "restored"
+        print(f"\nBuilding {output.name} with {engine.name}...")
+        try:
+            built = engine.build()
+        except Exception as e:
+            print(f"Error building with {engine.name}: {e}")
+            built = False
+        if built and output.exists():
+            cache.store(key, output)
+            cache.remember(target, engine, version, True)
+            return engine.name, "built"
+        cache.remember(target, engine, version, False, inputs_digest)
+    return None, "failed"
+
+def build(target, output, inputs, engines, options=None, force=False, cache=None):
+    """build_result() for scripts that only need to know which engine, if any, produced `output`."""
+    return build_result(target, output, inputs, engines, options, force, cache)[0]
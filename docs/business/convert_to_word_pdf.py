@@ -9,38 +9,41 @@ For PDF generation, you also need wkhtmltopdf:
     macOS: brew install wkhtmltopdf
     Linux: sudo apt-get install wkhtmltopdf
     Windows: Download from https://wkhtmltopdf.org/downloads.html
+
+Outputs are only rebuilt when their inputs or conversion method change
+(see build_cache.py); use --force to rebuild anyway.
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
 
-def convert_with_pypandoc():
-    """Convert using pypandoc (recommended method)."""
+from build_cache import Engine, build
+
+MD_FILE = Path(__file__).parent / "AWS_CREDITS_PITCH_DECK.md"
+
+def convert_with_pypandoc(to='docx', md_file=MD_FILE, out_file=None):
+    """Convert using pypandoc (recommended method) to 'docx' or 'pdf'."""
     try:
         import pypandoc
         
-        md_file = Path(__file__).parent / "AWS_CREDITS_PITCH_DECK.md"
-        docx_file = md_file.with_suffix('.docx')
-        pdf_file = md_file.with_suffix('.pdf')
-        
-        print(f"Converting {md_file} to Word format...")
-        pypandoc.convert_file(
-            str(md_file),
-            'docx',
-            outputfile=str(docx_file),
-            extra_args=['--reference-doc=reference.docx'] if Path('reference.docx').exists() else []
-        )
-        print(f"✓ Created: {docx_file}")
+        md_file = Path(md_file)
+        out_file = Path(out_file) if out_file else md_file.with_suffix('.' + to)
         
-        print(f"Converting {md_file} to PDF format...")
+        if to == 'docx':
+            print(f"Converting {md_file} to Word format...")
+            extra_args = ['--reference-doc=reference.docx'] if Path('reference.docx').exists() else []
+        else:
+            print(f"Converting {md_file} to PDF format...")
+            extra_args = ['--pdf-engine=wkhtmltopdf', '--toc']
         pypandoc.convert_file(
             str(md_file),
-            'pdf',
-            outputfile=str(pdf_file),
-            extra_args=['--pdf-engine=wkhtmltopdf', '--toc']
+            to,
+            outputfile=str(out_file),
+            extra_args=extra_args
         )
-        print(f"✓ Created: {pdf_file}")
+        print(f"✓ Created: {out_file}")
         
         return True
     except ImportError:
@@ -50,23 +53,20 @@ def convert_with_pypandoc():
         print(f"Error converting with pypandoc: {e}")
         return False
 
-def convert_with_markdown_docx():
-    """Convert using markdown and python-docx (alternative method)."""
+def convert_with_markdown_docx(md_file=MD_FILE, docx_file=None):
+    """Convert using python-docx and the shared markdown parser (alternative method)."""
     try:
-        import markdown
         from docx import Document
-        from docx.shared import Inches, Pt
         from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from generate_word import add_blocks
+        from md_ast import Block, Document as MarkdownDocument
         
-        md_file = Path(__file__).parent / "AWS_CREDITS_PITCH_DECK.md"
-        docx_file = md_file.with_suffix('.docx')
+        md_file = Path(md_file)
+        docx_file = Path(docx_file) if docx_file else md_file.with_suffix('.docx')
         
         print(f"Reading {md_file}...")
-        with open(md_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-        
-        # Convert markdown to HTML
-        html = markdown.markdown(md_content, extensions=['extra', 'toc'])
+        # The same parse generate_word.py uses (md_ast.py)
+        blocks = MarkdownDocument.load(md_file).blocks
         
         # Create Word document
         doc = Document()
@@ -79,17 +79,8 @@ def convert_with_markdown_docx():
         subtitle = doc.add_paragraph('DevBridge: Mobile App Monitoring & Configuration Platform')
         subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
-        # Parse and add content (simplified - for better results use pypandoc)
-        lines = md_content.split('\n')
-        for line in lines:
-            if line.startswith('# '):
-                doc.add_heading(line[2:], level=1)
-            elif line.startswith('## '):
-                doc.add_heading(line[3:], level=2)
-            elif line.startswith('### '):
-                doc.add_heading(line[4:], level=3)
-            elif line.strip():
-                doc.add_paragraph(line)
+        # Add content; the document's own title becomes its first heading
+        add_blocks(doc, [Block('heading', block.text, 1) if block.kind == 'title' else block for block in blocks])
         
         doc.save(str(docx_file))
         print(f"✓ Created: {docx_file}")
@@ -98,7 +89,7 @@ def convert_with_markdown_docx():
         return True
     except ImportError as e:
         print(f"Error: Required library not installed: {e}")
-        print("Install with: pip install markdown python-docx")
+        print("Install with: pip install python-docx")
         return False
     except Exception as e:
         print(f"Error converting: {e}")
@@ -106,21 +97,39 @@ def convert_with_markdown_docx():
 
 def main():
     """Main conversion function."""
+    parser = argparse.ArgumentParser(description="Convert the AWS Credits pitch deck to Word and PDF")
+    parser.add_argument("--force", action="store_true", help="rebuild even if unchanged and retry every method")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("AWS Credits Pitch Deck Converter")
     print("=" * 60)
     print()
     
-    # Try pypandoc first (best quality)
-    if convert_with_pypandoc():
+    # Try pypandoc first (best quality), falling back to python-docx for
+    # Word. The build cache skips outputs whose inputs have not changed and
+    # starts with the method that worked last time.
+    md_file = MD_FILE
+    inputs = [md_file, Path(__file__), Path(__file__).with_name('generate_word.py'),
+              Path(__file__).with_name('md_ast.py'), Path('reference.docx')]
+    docx_method = build("aws-credits-docx", md_file.with_suffix('.docx'), inputs, [
+        Engine("pypandoc", lambda: convert_with_pypandoc('docx'), packages=["pypandoc"]),
+        Engine("python-docx", convert_with_markdown_docx, packages=["python-docx"]),
+    ], force=args.force)
+    pdf_method = build("aws-credits-pdf", md_file.with_suffix('.pdf'), inputs, [
+        Engine("pypandoc + wkhtmltopdf", lambda: convert_with_pypandoc('pdf'),
+               packages=["pypandoc"], binaries=["wkhtmltopdf"]),
+    ], force=args.force)
+    
+    if docx_method == "pypandoc" and pdf_method:
         print("\n✓ Conversion completed successfully!")
         return
-    
-    # Fallback to markdown+docx
-    print("\nTrying alternative conversion method...")
-    if convert_with_markdown_docx():
+    if docx_method:
         print("\n✓ Basic conversion completed!")
-        print("For better formatting, install pypandoc: pip install pypandoc")
+        if docx_method != "pypandoc":
+            print("For better formatting, install pypandoc: pip install pypandoc")
+        if not pdf_method:
+            print("PDF not created: install pypandoc and wkhtmltopdf for PDF output")
         return
     
     print("\n✗ Conversion failed. Please install required dependencies:")
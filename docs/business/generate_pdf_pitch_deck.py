@@ -3,237 +3,226 @@
 Script to convert NivoStack AWS Credits Pitch Deck Markdown to PDF format.
 
 This script tries multiple methods to ensure PDF generation:
-1. pypandoc with wkhtmltopdf (best quality)
-2. markdown2pdf with weasyprint
-3. markdown with reportlab
-4. HTML to PDF with weasyprint
+1. pypandoc with wkhtmltopdf (best quality), or with pdflatex
+2. HTML to PDF with weasyprint
+3. reportlab (basic)
+
+Every method renders from the sectioned parse in md_ast.py, the one the
+Word backend uses: the HTML methods get a page built per section from it,
+reportlab its blocks. The page keeps the blocks python-markdown (the
+previous renderer) produced for these documents: headings to h6, fenced
+code as <pre>, rules, nested lists and links.
 
 Requirements:
-    pip install pypandoc markdown2pdf weasyprint reportlab markdown
+    pip install pypandoc weasyprint reportlab
 
 For PDF generation, you also need wkhtmltopdf (optional):
     macOS: brew install wkhtmltopdf
     Linux: sudo apt-get install wkhtmltopdf
+
+The PDF is only rebuilt when the markdown, this script or the method
+that built it changes, and the method that worked last time is tried
+first (see build_cache.py). Use --force to rebuild and retry every method.
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
 
-def convert_with_pypandoc():
-    """Convert using pypandoc (recommended method)."""
+from build_cache import Engine, build
+from md_ast import inline_html, list_items, load_cached, render_html
+
+MD_FILE = Path(__file__).parent / "NIVOSTACK_AWS_CREDITS_PITCH_DECK.md"
+
+PANDOC_ARGS = {
+    'wkhtmltopdf': [
+        '--pdf-engine=wkhtmltopdf',
+        '--toc',
+        '--variable=geometry:margin=1in',
+        '--variable=fontsize:11pt',
+        '--variable=mainfont:Helvetica',
+    ],
+    'pdflatex': [
+        '--pdf-engine=pdflatex',
+        '--toc',
+        '-V', 'geometry:margin=1in',
+        '-V', 'fontsize=11pt',
+    ],
+}
+
+PDF_STYLE = """
+@page {
+    size: letter;
+    margin: 1in;
+}
+body {
+    font-family: 'Helvetica', 'Arial', sans-serif;
+    font-size: 11pt;
+    line-height: 1.6;
+    color: #333;
+}
+h1 {
+    color: #1a1a1a;
+    font-size: 24pt;
+    margin-top: 24pt;
+    margin-bottom: 12pt;
+    page-break-after: avoid;
+}
+h2 {
+    color: #2a2a2a;
+    font-size: 18pt;
+    margin-top: 18pt;
+    margin-bottom: 9pt;
+    page-break-after: avoid;
+}
+h3 {
+    color: #3a3a3a;
+    font-size: 14pt;
+    margin-top: 14pt;
+    margin-bottom: 7pt;
+    page-break-after: avoid;
+}
+p {
+    margin-bottom: 8pt;
+}
+ul, ol {
+    margin-bottom: 12pt;
+    padding-left: 24pt;
+}
+li {
+    margin-bottom: 4pt;
+}
+table {
+    border-collapse: collapse;
+    width: 100%;
+    margin-bottom: 12pt;
+}
+th, td {
+    border: 1px solid #ddd;
+    padding: 8pt;
+    text-align: left;
+}
+th {
+    background-color: #f5f5f5;
+    font-weight: bold;
+}
+code {
+    background-color: #f4f4f4;
+    padding: 2pt 4pt;
+    border-radius: 3pt;
+    font-family: 'Courier New', monospace;
+    font-size: 10pt;
+}
+pre {
+    background-color: #f4f4f4;
+    padding: 12pt;
+    border-radius: 4pt;
+    overflow-x: auto;
+    page-break-inside: avoid;
+}
+blockquote {
+    border-left: 4pt solid #ddd;
+    padding-left: 12pt;
+    margin-left: 0;
+    color: #666;
+}
+"""
+
+_html_cache = {}  # resolved markdown path -> {section key: HTML fragment}
+
+def document_html(md_file):
+    """md_file as an HTML page, from the parse shared with the Word backend (md_ast.py).
+
+    Sections whose source is unchanged since the last call in this process
+    keep both their parse and their HTML.
+    """
+    md_file = Path(md_file).resolve()
+    return render_html(load_cached(md_file), _html_cache.setdefault(md_file, {}), PDF_STYLE)
+
+def convert_with_pypandoc(pdf_engine='wkhtmltopdf', md_file=MD_FILE, pdf_file=None):
+    """Convert using pypandoc (recommended method) with the given PDF engine."""
     try:
         import pypandoc
         
-        md_file = Path(__file__).parent / "NIVOSTACK_AWS_CREDITS_PITCH_DECK.md"
-        pdf_file = md_file.with_suffix('.pdf')
+        md_file = Path(md_file)
+        pdf_file = Path(pdf_file) if pdf_file else md_file.with_suffix('.pdf')
         
         if not md_file.exists():
             print(f"Error: {md_file} not found")
             return False
         
-        print(f"Converting {md_file} to PDF using pypandoc...")
-        
-        # Try with wkhtmltopdf first
-        try:
-            pypandoc.convert_file(
-                str(md_file),
-                'pdf',
-                outputfile=str(pdf_file),
-                extra_args=[
-                    '--pdf-engine=wkhtmltopdf',
-                    '--toc',
-                    '--variable=geometry:margin=1in',
-                    '--variable=fontsize:11pt',
-                    '--variable=mainfont:Helvetica',
-                ]
-            )
-            print(f"✓ Created: {pdf_file}")
-            return True
-        except Exception as e:
-            print(f"wkhtmltopdf failed: {e}")
-            # Try with pdflatex
-            try:
-                pypandoc.convert_file(
-                    str(md_file),
-                    'pdf',
-                    outputfile=str(pdf_file),
-                    extra_args=[
-                        '--pdf-engine=pdflatex',
-                        '--toc',
-                        '-V', 'geometry:margin=1in',
-                        '-V', 'fontsize=11pt',
-                    ]
-                )
-                print(f"✓ Created: {pdf_file}")
-                return True
-            except Exception as e2:
-                print(f"pdflatex also failed: {e2}")
-                return False
+        print(f"Converting {md_file} to PDF using pypandoc with {pdf_engine}...")
+        pypandoc.convert_text(
+            document_html(md_file),
+            'pdf',
+            format='html',
+            outputfile=str(pdf_file),
+            extra_args=PANDOC_ARGS[pdf_engine]
+        )
+        print(f"✓ Created: {pdf_file}")
+        return True
         
     except ImportError:
         print("Error: pypandoc not installed. Install with: pip install pypandoc")
         return False
     except Exception as e:
-        print(f"Error converting with pypandoc: {e}")
+        print(f"{pdf_engine} failed: {e}")
         return False
 
-def convert_with_weasyprint():
-    """Convert using markdown + weasyprint."""
+def convert_with_weasyprint(md_file=MD_FILE, pdf_file=None):
+    """Convert using the shared markdown parse + weasyprint."""
     try:
-        import markdown
-        from weasyprint import HTML, CSS
+        from weasyprint import HTML
         from weasyprint.text.fonts import FontConfiguration
         
-        md_file = Path(__file__).parent / "NIVOSTACK_AWS_CREDITS_PITCH_DECK.md"
-        pdf_file = md_file.with_suffix('.pdf')
+        md_file = Path(md_file)
+        pdf_file = Path(pdf_file) if pdf_file else md_file.with_suffix('.pdf')
         
         if not md_file.exists():
             print(f"Error: {md_file} not found")
             return False
         
         print(f"Reading {md_file}...")
-        with open(md_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-        
-        # Convert markdown to HTML
-        html_content = markdown.markdown(md_content, extensions=['extra', 'toc', 'tables', 'codehilite'])
-        
-        # Add CSS styling
-        html_with_style = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                @page {{
-                    size: letter;
-                    margin: 1in;
-                }}
-                body {{
-                    font-family: 'Helvetica', 'Arial', sans-serif;
-                    font-size: 11pt;
-                    line-height: 1.6;
-                    color: #333;
-                }}
-                h1 {{
-                    color: #1a1a1a;
-                    font-size: 24pt;
-                    margin-top: 24pt;
-                    margin-bottom: 12pt;
-                    page-break-after: avoid;
-                }}
-                h2 {{
-                    color: #2a2a2a;
-                    font-size: 18pt;
-                    margin-top: 18pt;
-                    margin-bottom: 9pt;
-                    page-break-after: avoid;
-                }}
-                h3 {{
-                    color: #3a3a3a;
-                    font-size: 14pt;
-                    margin-top: 14pt;
-                    margin-bottom: 7pt;
-                    page-break-after: avoid;
-                }}
-                p {{
-                    margin-bottom: 8pt;
-                }}
-                ul, ol {{
-                    margin-bottom: 12pt;
-                    padding-left: 24pt;
-                }}
-                li {{
-                    margin-bottom: 4pt;
-                }}
-                table {{
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin-bottom: 12pt;
-                }}
-                th, td {{
-                    border: 1px solid #ddd;
-                    padding: 8pt;
-                    text-align: left;
-                }}
-                th {{
-                    background-color: #f5f5f5;
-                    font-weight: bold;
-                }}
-                code {{
-                    background-color: #f4f4f4;
-                    padding: 2pt 4pt;
-                    border-radius: 3pt;
-                    font-family: 'Courier New', monospace;
-                    font-size: 10pt;
-                }}
-                pre {{
-                    background-color: #f4f4f4;
-                    padding: 12pt;
-                    border-radius: 4pt;
-                    overflow-x: auto;
-                    page-break-inside: avoid;
-                }}
-                blockquote {{
-                    border-left: 4pt solid #ddd;
-                    padding-left: 12pt;
-                    margin-left: 0;
-                    color: #666;
-                }}
-            </style>
-        </head>
-        <body>
-            {html_content}
-        </body>
-        </html>
-        """
+        html_with_style = document_html(md_file)
         
         print("Converting HTML to PDF with weasyprint...")
         font_config = FontConfiguration()
-        HTML(string=html_with_style).write_pdf(
-            pdf_file,
-            stylesheets=[CSS(string="""
-                @page {
-                    size: letter;
-                    margin: 1in;
-                }
-            """)],
-            font_config=font_config
-        )
+        HTML(string=html_with_style).write_pdf(str(pdf_file), font_config=font_config)
         print(f"✓ Created: {pdf_file}")
         return True
         
     except ImportError as e:
         print(f"Error: Required library not installed: {e}")
-        print("Install with: pip install markdown weasyprint")
+        print("Install with: pip install weasyprint")
         return False
     except Exception as e:
         print(f"Error converting with weasyprint: {e}")
         return False
 
-def convert_with_reportlab():
-    """Convert using markdown + reportlab (basic)."""
+def _reportlab_markup(text):
+    """Inline markdown as reportlab paragraph markup."""
+    text = inline_html(text)
+    text = text.replace('<strong>', '<b>').replace('</strong>', '</b>').replace('<em>', '<i>').replace('</em>', '</i>')
+    return text.replace('<code>', '<font face="Courier">').replace('</code>', '</font>')
+
+def convert_with_reportlab(md_file=MD_FILE, pdf_file=None):
+    """Convert using the shared markdown parse + reportlab (basic)."""
     try:
-        import markdown
         from reportlab.lib.pagesizes import letter
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Preformatted, HRFlowable
+        from reportlab.lib.styles import getSampleStyleSheet
         from reportlab.lib.units import inch
         
-        md_file = Path(__file__).parent / "NIVOSTACK_AWS_CREDITS_PITCH_DECK.md"
-        pdf_file = md_file.with_suffix('.pdf')
+        md_file = Path(md_file)
+        pdf_file = Path(pdf_file) if pdf_file else md_file.with_suffix('.pdf')
         
         if not md_file.exists():
             print(f"Error: {md_file} not found")
             return False
         
         print(f"Reading {md_file}...")
-        with open(md_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-        
-        # Convert markdown to HTML first, then parse
-        html_content = markdown.markdown(md_content, extensions=['extra', 'toc'])
+        blocks = load_cached(md_file).blocks
         
         # Create PDF
         doc = SimpleDocTemplate(str(pdf_file), pagesize=letter,
@@ -243,21 +232,30 @@ def convert_with_reportlab():
         styles = getSampleStyleSheet()
         story = []
         
-        # Parse HTML and add to story (simplified)
-        lines = md_content.split('\n')
-        for line in lines:
-            if line.startswith('# '):
-                story.append(Paragraph(line[2:], styles['Title']))
-                story.append(Spacer(1, 0.2*inch))
-            elif line.startswith('## '):
-                story.append(Paragraph(line[3:], styles['Heading1']))
-                story.append(Spacer(1, 0.1*inch))
-            elif line.startswith('### '):
-                story.append(Paragraph(line[4:], styles['Heading2']))
-                story.append(Spacer(1, 0.05*inch))
-            elif line.strip():
-                story.append(Paragraph(line, styles['Normal']))
-                story.append(Spacer(1, 0.05*inch))
+        # "#" headings become titles, "##" and "###" the two heading levels, deeper ones a third
+        heading_styles = {1: ('Title', 0.2), 2: ('Heading1', 0.1), 3: ('Heading2', 0.05)}
+        for block in blocks:
+            if block.kind == 'code':
+                story.append(Preformatted(block.text, styles['Code']))
+                continue
+            if block.kind == 'rule':
+                story.append(HRFlowable(width='100%', spaceBefore=4, spaceAfter=8))
+                continue
+            if block.kind in ('title', 'heading'):
+                style, space = heading_styles.get(1 if block.kind == 'title' else block.level, ('Heading3', 0.05))
+                lines = [(_reportlab_markup(block.text), style, space)]
+            elif block.kind == 'bold':
+                lines = [(f"<b>{_reportlab_markup(block.text)}</b>", 'Normal', 0.05)]
+            elif block.kind in ('bullets', 'numbers'):
+                lines = [("&nbsp;" * 6 * depth + f"{f'{number}.' if ordered else '•'} {_reportlab_markup(item)}",
+                          'Normal', 0.05) for depth, ordered, number, item in list_items(block)]
+            elif block.kind == 'table':
+                lines = [(' | '.join(_reportlab_markup(cell) for cell in row), 'Normal', 0.05) for row in block.items]
+            else:
+                lines = [(_reportlab_markup(block.text), 'Normal', 0.05)]
+            for markup, style, space in lines:
+                story.append(Paragraph(markup, styles[style]))
+                story.append(Spacer(1, space*inch))
         
         doc.build(story)
         print(f"✓ Created: {pdf_file}")
@@ -266,43 +264,57 @@ def convert_with_reportlab():
         
     except ImportError as e:
         print(f"Error: Required library not installed: {e}")
-        print("Install with: pip install markdown reportlab")
+        print("Install with: pip install reportlab")
         return False
     except Exception as e:
         print(f"Error converting with reportlab: {e}")
         return False
 
+def pdf_engines(md_file, pdf_file):
+    """The PDF methods for `md_file`, best quality first (also used by render_docs.py)."""
+    return [
+        Engine("pypandoc + wkhtmltopdf (best quality)", lambda: convert_with_pypandoc('wkhtmltopdf', md_file, pdf_file),
+               packages=["pypandoc"], binaries=["wkhtmltopdf"], heavy=True),
+        Engine("pypandoc + pdflatex", lambda: convert_with_pypandoc('pdflatex', md_file, pdf_file),
+               packages=["pypandoc"], binaries=["pdflatex"], heavy=True),
+        Engine("weasyprint (good quality)", lambda: convert_with_weasyprint(md_file, pdf_file),
+               packages=["weasyprint"], heavy=True),
+        Engine("reportlab (basic)", lambda: convert_with_reportlab(md_file, pdf_file),
+               packages=["reportlab"]),
+    ]
+
 def main():
     """Main conversion function."""
+    parser = argparse.ArgumentParser(description="Generate the NivoStack AWS Credits pitch deck PDF")
+    parser.add_argument("--force", action="store_true", help="rebuild even if unchanged and retry every method")
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("NivoStack AWS Credits Pitch Deck - PDF Generator")
     print("=" * 70)
     print()
     
-    md_file = Path(__file__).parent / "NIVOSTACK_AWS_CREDITS_PITCH_DECK.md"
+    md_file = MD_FILE
     if not md_file.exists():
         print(f"Error: {md_file} not found!")
         print("Please ensure the markdown file exists.")
         return
     
-    # Try methods in order of quality
-    methods = [
-        ("pypandoc (best quality)", convert_with_pypandoc),
-        ("weasyprint (good quality)", convert_with_weasyprint),
-        ("reportlab (basic)", convert_with_reportlab),
-    ]
+    # Try methods in order of quality; the build cache skips unchanged
+    # outputs and starts with the method that worked last time
+    methods = pdf_engines(md_file, md_file.with_suffix('.pdf'))
     
-    for method_name, method_func in methods:
-        print(f"\nTrying {method_name}...")
-        if method_func():
-            print(f"\n✓ Successfully created PDF using {method_name}!")
-            pdf_file = md_file.with_suffix('.pdf')
-            print(f"  Location: {pdf_file.absolute()}")
-            return
+    pdf_file = md_file.with_suffix('.pdf')
+    inputs = [md_file, Path(__file__), Path(__file__).with_name("md_ast.py")]
+    method_name = build("pitch-deck-pdf", pdf_file, inputs, methods, force=args.force)
+    if method_name:
+        print(f"\n✓ PDF ready ({method_name})!")
+        print(f"  Location: {pdf_file.absolute()}")
+        return
     
     print("\n✗ All conversion methods failed.")
     print("\nPlease install required dependencies:")
-    print("  pip install pypandoc markdown weasyprint reportlab")
+    print("  pip install pypandoc weasyprint reportlab")
     print("\nFor best results, also install:")
     print("  macOS: brew install wkhtmltopdf")
     print("  Linux: sudo apt-get install wkhtmltopdf")
@@ -1,180 +1,267 @@
 #!/usr/bin/env python3
 """
 Generate Word document from Markdown pitch deck.
+
+The document is only rebuilt when the markdown, this script or the
+python-docx version changes (see build_cache.py); use --force to rebuild.
+
+With --watch it keeps running and rebuilds on every save: only the
+sections that changed are re-parsed (md_ast.py) and re-emitted, the rest
+of the document is copied from the previous build, so a preview of a
+large document takes well under a second. --html (and --pdf, with
+weasyprint) write a preview from the same parse.
+
+    python3 generate_word.py --watch --html /tmp/pitch-deck.html
 """
 
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.style import WD_STYLE_TYPE
-import re
+import argparse
+import os
+import tempfile
+import time
 from pathlib import Path
 
-def create_word_document():
-    """Create Word document from markdown file."""
-    
-    # Read markdown file
-    md_file = Path(__file__).parent / "AWS_CREDITS_PITCH_DECK.md"
-    docx_file = md_file.with_suffix('.docx')
-    
-    print(f"Reading {md_file}...")
-    with open(md_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Create Word document
-    doc = Document()
-    
+from build_cache import Engine, build
+from md_ast import Document, list_items, render_html, strip_inline
+
+MD_FILE = Path(__file__).parent / "AWS_CREDITS_PITCH_DECK.md"
+
+def new_word_document():
+    """An empty python-docx document with the pitch deck's default font."""
+    from docx import Document as WordDocument
+    from docx.shared import Pt
+
+    doc = WordDocument()
+
     # Set default font
     style = doc.styles['Normal']
     font = style.font
     font.name = 'Calibri'
     font.size = Pt(11)
-    
-    # Parse markdown and add to document
-    lines = content.split('\n')
-    i = 0
-    
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Skip empty lines (but add spacing)
-        if not line:
-            i += 1
-            continue
-        
+    return doc
+
+def add_blocks(doc, blocks):
+    """Add parsed markdown blocks (md_ast.Block) to the python-docx document `doc`."""
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    from docx.shared import Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    for block in blocks:
         # Title (first line)
-        if i == 0 and line.startswith('# '):
-            title = doc.add_heading(line[2:], 0)
+        if block.kind == 'title':
+            title = doc.add_heading(block.text, 0)
             title.alignment = WD_ALIGN_PARAGRAPH.CENTER
             title_format = title.runs[0].font
             title_format.size = Pt(24)
             title_format.bold = True
             title_format.color.rgb = RGBColor(26, 115, 232)  # Blue
-            i += 1
-            continue
-        
-        # Main headings (# Heading)
-        if line.startswith('# '):
-            heading = doc.add_heading(line[2:], 1)
-            heading_format = heading.runs[0].font
-            heading_format.color.rgb = RGBColor(26, 115, 232)  # Blue
-            i += 1
-            continue
-        
-        # Subheadings (## Subheading)
-        if line.startswith('## '):
-            heading = doc.add_heading(line[3:], 2)
-            heading_format = heading.runs[0].font
-            heading_format.color.rgb = RGBColor(66, 133, 244)  # Light blue
-            i += 1
-            continue
-        
-        # Sub-subheadings (### Sub-subheading)
-        if line.startswith('### '):
-            heading = doc.add_heading(line[4:], 3)
+
+        # Main headings (# Heading), subheadings (## Subheading), deeper ones (### ...)
+        elif block.kind == 'heading':
+            heading = doc.add_heading(block.text, block.level)
             heading_format = heading.runs[0].font
-            heading_format.color.rgb = RGBColor(95, 99, 104)  # Gray
-            i += 1
-            continue
-        
+            heading_format.color.rgb = {
+                1: RGBColor(26, 115, 232),  # Blue
+                2: RGBColor(66, 133, 244),  # Light blue
+            }.get(block.level, RGBColor(95, 99, 104))  # Gray
+
         # Bold text (**text**)
-        if line.startswith('**') and line.endswith('**'):
+        elif block.kind == 'bold':
             p = doc.add_paragraph()
-            run = p.add_run(line[2:-2])
+            run = p.add_run(block.text)
             run.bold = True
-            i += 1
-            continue
-        
-        # Lists (- item or * item)
-        if line.startswith('- ') or line.startswith('* '):
-            items = []
-            while i < len(lines) and (lines[i].strip().startswith('- ') or lines[i].strip().startswith('* ')):
-                item_text = lines[i].strip()[2:].strip()
+
+        # Lists (- item or * item) and numbered lists (1. item), nested up to three levels
+        elif block.kind in ('bullets', 'numbers'):
+            for depth, ordered, _, item in list_items(block):
+                style = ('List Number' if ordered else 'List Bullet') + (f' {min(depth, 2) + 1}' if depth else '')
                 # Remove markdown formatting
-                item_text = re.sub(r'\*\*(.*?)\*\*', r'\1', item_text)
-                items.append(item_text)
-                i += 1
-            
-            for item in items:
-                p = doc.add_paragraph(item, style='List Bullet')
-            continue
-        
-        # Numbered lists (1. item)
-        if re.match(r'^\d+\.\s', line):
-            items = []
-            while i < len(lines) and re.match(r'^\d+\.\s', lines[i].strip()):
-                item_text = re.sub(r'^\d+\.\s', '', lines[i].strip())
-                item_text = re.sub(r'\*\*(.*?)\*\*', r'\1', item_text)
-                items.append(item_text)
-                i += 1
-            
-            for item in items:
-                p = doc.add_paragraph(item, style='List Number')
-            continue
-        
+                doc.add_paragraph(strip_inline(item), style=style)
+
+        # Fenced code (```), line breaks and spacing kept
+        elif block.kind == 'code':
+            run = doc.add_paragraph().add_run(block.text)
+            run.font.name = 'Courier New'
+            run.font.size = Pt(9)
+
+        # Horizontal rule (---): an empty paragraph with a bottom border
+        elif block.kind == 'rule':
+            border = OxmlElement('w:bottom')
+            for name, value in (('val', 'single'), ('sz', '6'), ('space', '1'), ('color', 'auto')):
+                border.set(qn(f'w:{name}'), value)
+            borders = OxmlElement('w:pBdr')
+            borders.append(border)
+            doc.add_paragraph()._p.get_or_add_pPr().append(borders)
+
         # Tables (basic support)
-        if '|' in line and line.count('|') >= 2:
-            # Skip separator lines
-            if re.match(r'^\|[\s\-:]+\|', line):
-                i += 1
-                continue
-            
-            # Parse table
-            rows = []
-            while i < len(lines) and '|' in lines[i]:
-                if not re.match(r'^\|[\s\-:]+\|', lines[i].strip()):
-                    cells = [cell.strip() for cell in lines[i].split('|')[1:-1]]
-                    rows.append(cells)
-                i += 1
-            
-            if rows:
-                table = doc.add_table(rows=len(rows), cols=len(rows[0]))
-                table.style = 'Light Grid Accent 1'
-                
-                for row_idx, row_data in enumerate(rows):
-                    for col_idx, cell_data in enumerate(row_data):
-                        # Remove markdown formatting
-                        cell_data = re.sub(r'\*\*(.*?)\*\*', r'\1', cell_data)
-                        table.rows[row_idx].cells[col_idx].text = cell_data
-                        # Make header row bold
-                        if row_idx == 0:
-                            for paragraph in table.rows[row_idx].cells[col_idx].paragraphs:
-                                for run in paragraph.runs:
-                                    run.bold = True
-            continue
-        
+        elif block.kind == 'table':
+            rows = block.items
+            table = doc.add_table(rows=len(rows), cols=len(rows[0]))
+            table.style = 'Light Grid Accent 1'
+
+            for row_idx, row_data in enumerate(rows):
+                for col_idx, cell_data in enumerate(row_data):
+                    # Remove markdown formatting
+                    table.rows[row_idx].cells[col_idx].text = strip_inline(cell_data)
+                    # Make header row bold
+                    if row_idx == 0:
+                        for paragraph in table.rows[row_idx].cells[col_idx].paragraphs:
+                            for run in paragraph.runs:
+                                run.bold = True
+
         # Regular paragraph
-        # Remove markdown formatting
-        para_text = line
-        para_text = re.sub(r'\*\*(.*?)\*\*', r'\1', para_text)  # Bold
-        para_text = re.sub(r'`(.*?)`', r'\1', para_text)  # Code
-        
-        # Check if it's a special line (like "Date:", "Company:", etc.)
-        if ':' in para_text and len(para_text.split(':')) == 2:
-            p = doc.add_paragraph()
-            parts = para_text.split(':', 1)
-            run1 = p.add_run(parts[0] + ':')
-            run1.bold = True
-            p.add_run(parts[1])
         else:
-            p = doc.add_paragraph(para_text)
-        
-        i += 1
-    
+            # Remove markdown formatting
+            para_text = strip_inline(block.text, code=True)
+
+            # Check if it's a special line (like "Date:", "Company:", etc.)
+            if ':' in para_text and len(para_text.split(':')) == 2:
+                p = doc.add_paragraph()
+                parts = para_text.split(':', 1)
+                run1 = p.add_run(parts[0] + ':')
+                run1.bold = True
+                p.add_run(parts[1])
+            else:
+                doc.add_paragraph(para_text)
+
+def _write_atomic(path, write):
+    """Call write(temporary path), then move the result over `path`, keeping its permissions."""
+    path = Path(path)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=path.suffix)
+    os.close(fd)
+    try:
+        write(tmp)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def _body_elements(body):
+    """The body's content elements, without the trailing section properties."""
+    children = list(body)
+    return children[:-1] if children and children[-1].tag.endswith('}sectPr') else children
+
+class WordBuilder:
+    """Builds .docx files from parsed documents, keeping the XML emitted for each section.
+
+    A section whose key was built before is copied instead of emitted
+    again, so a rebuild after an edit only emits the changed sections.
+    """
+
+    def __init__(self):
+        self.parts = {}  # section key -> the body elements it produced
+        self.emitted = 0
+
+    def build(self, document, docx_file):
+        from copy import deepcopy
+
+        doc = new_word_document()
+        body = doc.element.body
+        self.emitted = 0
+        for section in document.sections:
+            if section.key in self.parts:
+                for element in self.parts[section.key]:
+                    if body.sectPr is not None:
+                        body.sectPr.addprevious(deepcopy(element))
+                    else:
+                        body.append(deepcopy(element))
+                continue
+            before = len(_body_elements(body))
+            add_blocks(doc, section.blocks)
+            self.parts[section.key] = [deepcopy(element) for element in _body_elements(body)[before:]]
+            self.emitted += 1
+        for key in set(self.parts) - {section.key for section in document.sections}:
+            del self.parts[key]
+
+        # Save atomically, so a viewer never opens a half-written file
+        _write_atomic(docx_file, doc.save)
+        return docx_file
+
+def create_word_document(md_file=MD_FILE, docx_file=None):
+    """Create Word document from markdown file."""
+    md_file = Path(md_file)
+    docx_file = Path(docx_file) if docx_file else md_file.with_suffix('.docx')
+
+    print(f"Reading {md_file}...")
+    document = Document.load(md_file)
+
     # Save document
     print(f"Saving Word document to {docx_file}...")
-    doc.save(str(docx_file))
+    WordBuilder().build(document, docx_file)
     print(f"✓ Successfully created: {docx_file}")
     return docx_file
 
+def watch(md_file, docx_file, html_file=None, pdf_file=None, interval=0.25):
+    """Rebuild on every change to `md_file` until interrupted."""
+    builder, html_cache = WordBuilder(), {}
+    previous, stamp = None, None
+    print(f"Watching {md_file} (Ctrl+C to stop)...")
+    try:
+        while True:
+            try:
+                stat = os.stat(md_file)
+            except FileNotFoundError:
+                time.sleep(interval)  # being replaced by an editor
+                continue
+            if (stat.st_mtime_ns, stat.st_size) != stamp:
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                started = time.perf_counter()
+                document = Document.load(md_file, previous)
+                if previous and [s.key for s in document.sections] == [s.key for s in previous.sections]:
+                    time.sleep(interval)  # saved without changes
+                    continue
+                builder.build(document, docx_file)
+                outputs = [Path(docx_file).name]
+                if html_file or pdf_file:
+                    page = render_html(document, html_cache)
+                    if html_file:
+                        _write_atomic(html_file, lambda tmp: Path(tmp).write_text(page, encoding='utf-8'))
+                        outputs.append(Path(html_file).name)
+                    if pdf_file:
+                        from weasyprint import HTML
+                        HTML(string=page).write_pdf(str(pdf_file))
+                        outputs.append(Path(pdf_file).name)
+                print(f"✓ {time.strftime('%H:%M:%S')} {', '.join(outputs)}: re-parsed {len(document.reparsed)} "
+                      f"and re-emitted {builder.emitted} of {len(document.sections)} sections "
+                      f"in {(time.perf_counter() - started) * 1000:.0f}ms", flush=True)
+                previous = document
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the AWS Credits pitch deck Word document")
+    parser.add_argument("source", nargs="?", type=Path, default=MD_FILE, help="markdown file (default: the pitch deck)")
+    parser.add_argument("--output", type=Path, help="Word file (default: next to the source)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if unchanged")
+    parser.add_argument("--watch", action="store_true", help="rebuild the changed sections on every save")
+    parser.add_argument("--html", type=Path, help="with --watch, also write an HTML preview here")
+    parser.add_argument("--pdf", type=Path, help="with --watch, also render a PDF preview here (needs weasyprint)")
+    args = parser.parse_args()
+
+    md_file = args.source
+    docx_file = args.output or md_file.with_suffix('.docx')
+    if args.watch:
+        watch(md_file, docx_file, args.html, args.pdf)
+        return
+    if args.html or args.pdf:
+        parser.error("--html and --pdf are watch-mode previews; use them with --watch")
+    engine = Engine("python-docx", lambda: bool(create_word_document(md_file, docx_file)), packages=["python-docx"])
+    if not build("pitch-deck-docx", docx_file, [md_file, Path(__file__), Path(__file__).with_name("md_ast.py")],
+                 [engine], force=args.force):
+        print("Error: Word document not created (is python-docx installed? pip install python-docx)")
+
 if __name__ == '__main__':
     try:
-        create_word_document()
+        main()
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
-
-
-
-
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Markdown document model shared by the DOCX and HTML/PDF backends.
+
+A document is parsed once into sections, which split at each `#` and `##`
+heading. Each section is a list of blocks:
+
+    title     first line of the file, when it is a "# " heading
+    heading   text, level 1-6
+    bold      a line that is entirely **bold**
+    bullets   items of a "- " / "* " list
+    numbers   items of a "1. " list; level is the first item's number
+    table     rows of cells (separator rows dropped)
+    code      the lines of a ``` or ~~~ fenced block, as written
+    rule      a "---", "***" or "___" line
+    para      any other line
+
+A list runs on across blank lines and indented continuation lines;
+`nesting` holds each item's (depth, ordered), so items indented under
+another one, of either kind, stay in its list. Block text keeps its
+inline markdown (**bold**, *emphasis*, `code`, [links](url)); each
+backend decides how to render it.
+
+Sections are keyed by a hash of their source lines. Parsing with the
+previous Document re-uses the blocks of every unchanged section, and
+backends can cache what they emitted per section key the same way, so an
+edit only re-parses and re-emits the sections it touched:
+
+    doc = Document.load(md_file)
+    doc = Document.load(md_file, previous=doc)   # after an edit
+    print(doc.reparsed)                          # indices of the sections that changed
+
+load_cached() keeps the last parse of each file in the process, so the
+Word and PDF backends building the same file share one parse.
+"""
+
+import hashlib
+import html
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+TABLE_SEPARATOR = re.compile(r'^\|[\s\-:]+\|')
+HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*$')
+RULE = re.compile(r'^([-*_])(\s*\1){2,}$')
+FENCE = re.compile(r'^(`{3,}|~{3,})')
+LIST_ITEM = re.compile(r'^(\s*)(?:([-*])|(\d+)\.)\s+(.*)$')
+LINK = re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)')
+EMPHASIS = re.compile(r'(?<![*\w])\*(?![\s*])(.+?)(?<![\s*])\*(?![*\w])')
+
+@dataclass
+class Block:
+    kind: str
+    text: str = ""
+    level: int = 0
+    items: list = field(default_factory=list)  # list items, or table rows of cells
+    nesting: list = field(default_factory=list)  # per list item: (depth, ordered)
+
+@dataclass
+class Section:
+    key: str
+    blocks: list
+
+def _indent(line):
+    return len(line) - len(line.lstrip())
+
+def _list_item(line):
+    """(indent, ordered, number, text) when `line` is a list item, else None."""
+    match = LIST_ITEM.match(line)
+    if not match or RULE.match(line.strip()):
+        return None
+    indent, bullet, number, text = match.groups()
+    return len(indent), bullet is None, int(number or 1), text.strip()
+
+def _fence(lines, i):
+    """(code block, next line index) for the fence opening at lines[i]."""
+    opening = lines[i]
+    marker, indent = FENCE.match(opening.strip()).group(1), _indent(opening)
+    body = []
+    i += 1
+    while i < len(lines) and not lines[i].strip().startswith(marker):
+        line = lines[i]
+        body.append(line[min(indent, _indent(line)):])
+        i += 1
+    return Block('code', '\n'.join(body)), i + 1
+
+def _list(lines, i):
+    """(list block, next line index) for the list starting at lines[i]."""
+    base, ordered, number, _ = _list_item(lines[i])
+    items, nesting, indents = [], [], []
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            # a blank line ends the list unless an item (or nested content) follows
+            j = i + 1
+            while j < len(lines) and not lines[j].strip():
+                j += 1
+            following = _list_item(lines[j]) if j < len(lines) else None
+            if following is None or (following[0] <= base and following[1] != ordered):
+                break
+            i = j
+            continue
+        item = _list_item(line)
+        if item is None:
+            if _indent(line) <= base or FENCE.match(line.strip()):
+                break
+            items[-1] += ' ' + line.strip()  # continuation of the item
+            i += 1
+            continue
+        indent, item_ordered = item[0], item[1]
+        if indent <= base and item_ordered != ordered:
+            break
+        while indents and indents[-1] >= max(indent, base):
+            indents.pop()
+        indents.append(max(indent, base))
+        items.append(item[3])
+        nesting.append((len(indents) - 1, item_ordered))
+        i += 1
+    return Block('numbers' if ordered else 'bullets', level=number if ordered else 0,
+                 items=items, nesting=nesting), i
+
+def parse_blocks(lines, first=False):
+    """Blocks for `lines`; `first` when they start the file (line 0 may be the title)."""
+    blocks = []
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+
+        if not line:
+            i += 1
+            continue
+
+        heading = HEADING.match(line)
+        if i == 0 and first and line.startswith('# '):
+            blocks.append(Block('title', line[2:]))
+        elif heading:
+            blocks.append(Block('heading', heading.group(2), len(heading.group(1))))
+        elif FENCE.match(line):
+            block, i = _fence(lines, i)
+            blocks.append(block)
+            continue
+        elif RULE.match(line):
+            blocks.append(Block('rule'))
+        elif _list_item(lines[i]):
+            block, i = _list(lines, i)
+            blocks.append(block)
+            continue
+        elif line.startswith('**') and line.endswith('**'):
+            blocks.append(Block('bold', line[2:-2]))
+        elif '|' in line and line.count('|') >= 2:
+            if TABLE_SEPARATOR.match(line):
+                i += 1
+                continue
+            rows = []
+            while i < len(lines) and '|' in lines[i]:
+                if not TABLE_SEPARATOR.match(lines[i].strip()):
+                    rows.append([cell.strip() for cell in lines[i].split('|')[1:-1]])
+                i += 1
+            if rows:
+                blocks.append(Block('table', items=rows))
+            continue
+        else:
+            blocks.append(Block('para', line))
+        i += 1
+    return blocks
+
+def split_sections(lines):
+    """Line ranges for the sections: a new one starts at each "# " or "## " heading outside a fence."""
+    starts, fence = [0], None
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if fence:
+            fence = None if line.startswith(fence) else fence
+        elif FENCE.match(line):
+            fence = FENCE.match(line).group(1)
+        elif i and line.startswith(('# ', '## ')):
+            starts.append(i)
+    return list(zip(starts, starts[1:] + [len(lines)]))
+
+class Document:
+    """A parsed markdown file: its sections, and which of them were (re)parsed."""
+
+    def __init__(self, sections, reparsed):
+        self.sections = sections
+        self.reparsed = reparsed
+
+    @property
+    def blocks(self):
+        return [block for section in self.sections for block in section.blocks]
+
+    @classmethod
+    def parse(cls, text, previous=None):
+        lines = text.split('\n')
+        known = {section.key: section for section in previous.sections} if previous else {}
+        sections, reparsed = [], []
+        for index, (start, end) in enumerate(split_sections(lines)):
+            chunk = lines[start:end]
+            key = hashlib.sha1(('first\n' if start == 0 else '\n').encode() + '\n'.join(chunk).encode()).hexdigest()
+            if key in known:
+                sections.append(known[key])
+            else:
+                sections.append(Section(key, parse_blocks(chunk, first=start == 0)))
+                reparsed.append(index)
+        return cls(sections, reparsed)
+
+    @classmethod
+    def load(cls, path, previous=None):
+        return cls.parse(Path(path).read_text(encoding='utf-8'), previous)
+
+_parsed = {}  # resolved path -> ((mtime, size), Document)
+
+def load_cached(path):
+    """Document.load() shared within the process: the same Document while the file is
+    unchanged, and after an edit a parse that re-uses the unchanged sections."""
+    path = Path(path).resolve()
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _parsed.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    document = Document.load(path, cached[1] if cached else None)
+    _parsed[path] = (stamp, document)
+    return document
+
+def strip_inline(text, code=False):
+    """Plain text: **bold** and *emphasis* markers removed, [links](url) as "links (url)",
+    and with `code`, backticks removed."""
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = EMPHASIS.sub(r'\1', text)
+    text = LINK.sub(lambda m: m[1] if m[1] == m[2] else f'{m[1]} ({m[2]})', text)
+    return re.sub(r'`(.*?)`', r'\1', text) if code else text
+
+def inline_html(text):
+    # code spans are set aside first so their contents stay literal
+    spans = []
+    def keep(match):
+        spans.append(f'<code>{html.escape(match[1], quote=False)}</code>')
+        return f'\0{len(spans) - 1}\0'
+    text = html.escape(re.sub(r'`([^`]*)`', keep, text), quote=False)
+    text = LINK.sub(lambda m: f'<a href="{m[2].replace(chr(34), "&quot;")}">{m[1]}</a>', text)
+    text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
+    text = EMPHASIS.sub(r'<em>\1</em>', text)
+    return re.sub('\0(\\d+)\0', lambda m: spans[int(m[1])], text)
+
+def list_items(block):
+    """(depth, ordered, number, text) for each item of a list block; number counts within its own list."""
+    counters = []
+    for text, (depth, ordered) in zip(block.items, block.nesting):
+        del counters[depth + 1:]
+        if len(counters) <= depth:
+            counters += [(block.level or 1) - 1 if depth == 0 else 0] * (depth + 1 - len(counters))
+        counters[depth] += 1
+        yield depth, ordered, counters[depth], text
+
+def list_html(block):
+    parts, open_lists = [], []
+    for depth, ordered, number, text in list_items(block):
+        if open_lists and depth < len(open_lists):
+            parts.append('</li>')
+            while len(open_lists) > depth + 1:
+                parts.append(f'</{open_lists.pop()}></li>')
+        while len(open_lists) < depth + 1:
+            tag = 'ol' if ordered else 'ul'
+            parts.append(f'<{tag} start="{number}">' if ordered and number != 1 else f'<{tag}>')
+            open_lists.append(tag)
+        parts.append(f'<li>{inline_html(text)}')
+    parts.append('</li>')
+    while open_lists:
+        parts.append(f'</{open_lists.pop()}>' + ('</li>' if open_lists else ''))
+    return ''.join(parts)
+
+def section_html(section):
+    parts = []
+    for block in section.blocks:
+        if block.kind == 'title':
+            parts.append(f'<h1 class="title">{inline_html(block.text)}</h1>')
+        elif block.kind == 'heading':
+            parts.append(f'<h{block.level}>{inline_html(block.text)}</h{block.level}>')
+        elif block.kind == 'bold':
+            parts.append(f'<p><strong>{inline_html(block.text)}</strong></p>')
+        elif block.kind in ('bullets', 'numbers'):
+            parts.append(list_html(block))
+        elif block.kind == 'table':
+            head, *body = block.items
+            parts.append('<table><tr>' + ''.join(f'<th>{inline_html(cell)}</th>' for cell in head) + '</tr>'
+                         + ''.join('<tr>' + ''.join(f'<td>{inline_html(cell)}</td>' for cell in row) + '</tr>'
+                                   for row in body) + '</table>')
+        elif block.kind == 'code':
+            parts.append(f'<pre><code>{html.escape(block.text, quote=False)}</code></pre>')
+        elif block.kind == 'rule':
+            parts.append('<hr>')
+        else:
+            parts.append(f'<p>{inline_html(block.text)}</p>')
+    return '\n'.join(parts)
+
+HTML_STYLE = """
+@page { size: letter; margin: 1in; }
+body { font-family: Calibri, 'Helvetica', 'Arial', sans-serif; font-size: 11pt; line-height: 1.5; color: #333; }
+h1.title { text-align: center; font-size: 24pt; color: #1a73e8; }
+h1 { color: #1a73e8; } h2 { color: #4285f4; } h3 { color: #5f6368; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 12pt; }
+th, td { border: 1px solid #ddd; padding: 6pt; text-align: left; }
+th { background-color: #f5f5f5; }
+code { background-color: #f4f4f4; padding: 1pt 3pt; font-family: 'Courier New', monospace; }
+pre { background-color: #f4f4f4; padding: 8pt; white-space: pre; font-size: 9pt; }
+pre code { padding: 0; }
+"""
+
+def render_html(document, cache=None, style=HTML_STYLE):
+    """A standalone HTML page for `document`; `cache` ({section key: fragment}) keeps unchanged sections' HTML."""
+    fragments = []
+    for section in document.sections:
+        if cache is None:
+            fragments.append(section_html(section))
+            continue
+        if section.key not in cache:
+            cache[section.key] = section_html(section)
+        fragments.append(cache[section.key])
+    if cache is not None:
+        for key in set(cache) - {section.key for section in document.sections}:
+            del cache[key]
+    return ('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<style>' + style + '</style>\n</head>\n'
+            '<body>\n' + '\n'.join(fragments) + '\n</body>\n</html>\n')
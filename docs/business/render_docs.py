@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Render every markdown document under docs/ to Word and PDF in parallel.
+
+Each (document, format) pair is one job in a process pool, so rebuilding
+the whole doc set scales with the number of cores. Heavy engines
+(wkhtmltopdf, LaTeX, weasyprint) are bounded separately (--heavy-jobs),
+so a pool sized to the cores does not run a dozen of them at once.
+Everything goes through build_cache.py, so unchanged documents are
+skipped and the engine that works on this machine is tried first.
+
+Usage:
+    python3 render_docs.py                        # all of docs/ -> build/docs/
+    python3 render_docs.py ../business ../technical --formats pdf
+    python3 render_docs.py --jobs 8 --heavy-jobs 2 --out /tmp/docs
+
+Outputs mirror the source tree under --out. A per-document timing report
+(slowest first; build time, not counting time queued for a heavy engine
+slot) is printed at the end; the exit code is 1 if any output could not
+be built.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import replace
+from pathlib import Path
+
+from build_cache import Engine, build_result
+
+HERE = Path(__file__).resolve().parent
+DOCS_DIR = HERE.parent
+DEFAULT_OUT = DOCS_DIR.parent / "build" / "docs"
+FORMATS = ("docx", "pdf")
+# The scripts holding each format's conversion code; editing them rebuilds that format
+GENERATORS = {
+    "docx": [HERE / "convert_to_word_pdf.py", HERE / "generate_word.py", HERE / "md_ast.py"],
+    "pdf": [HERE / "generate_pdf_pitch_deck.py", HERE / "md_ast.py"],
+}
+
+_heavy = None  # semaphore shared by the workers
+_waited = 0.0  # seconds this worker's current job spent waiting for it
+
+def docx_engines(md_file, docx_file):
+    import convert_to_word_pdf
+    import generate_word
+    return [
+        Engine("pypandoc", lambda: convert_to_word_pdf.convert_with_pypandoc('docx', md_file, docx_file),
+               packages=["pypandoc"]),
+        Engine("python-docx", lambda: bool(generate_word.create_word_document(md_file, docx_file)),
+               packages=["python-docx"]),
+    ]
+
+def pdf_engines(md_file, pdf_file):
+    import generate_pdf_pitch_deck
+    return generate_pdf_pitch_deck.pdf_engines(md_file, pdf_file)
+
+ENGINES = {"docx": docx_engines, "pdf": pdf_engines}
+
+def discover(paths, out_dir):
+    """Markdown files under `paths`, skipping hidden directories and the output directory."""
+    seen = set()
+    for path in paths:
+        path = Path(path).resolve()
+        found = [path] if path.is_file() else sorted(path.rglob("*.md"))
+        for md_file in found:
+            if any(part.startswith('.') for part in md_file.parts) or out_dir in md_file.parents:
+                continue
+            if md_file not in seen:
+                seen.add(md_file)
+                yield md_file
+
+def _init_worker(semaphore):
+    global _heavy
+    _heavy = semaphore
+
+def _bounded(engine):
+    """The engine, holding the heavy-engine semaphore while it builds if it is heavy."""
+    if not engine.heavy or _heavy is None:
+        return engine
+    def run():
+        global _waited
+        started = time.perf_counter()
+        with _heavy:
+            _waited += time.perf_counter() - started
+            return engine.build()
+    return replace(engine, build=run)
+
+def render(md_file, fmt, output, force=False):
+    """Build one (document, format) pair; runs in a worker process."""
+    global _waited
+    _waited = 0.0
+    started = time.perf_counter()
+    log = io.StringIO()
+    with redirect_stdout(log):
+        output.parent.mkdir(parents=True, exist_ok=True)
+        engines = [_bounded(engine) for engine in ENGINES[fmt](md_file, output)]
+        engine, state = build_result(f"docs-{fmt}:{md_file}", output, [md_file, *GENERATORS[fmt]], engines,
+                                     force=force)
+    return {"source": md_file, "format": fmt, "engine": engine, "state": state,
+            "seconds": time.perf_counter() - started - _waited, "waited": _waited, "log": log.getvalue()}
+
+def report(results, sources, root, wall, jobs):
+    by_source = {}
+    for result in results:
+        by_source.setdefault(result["source"], {})[result["format"]] = result
+    formats = sorted({result["format"] for result in results}, key=FORMATS.index)
+    width = max([len(_label(source, root)) for source in sources] + [8])
+
+    print("\n" + "=" * 70)
+    print("Timing report (slowest first)")
+    print("=" * 70)
+    print(f"  {'Document':<{width}}  " + "  ".join(f"{fmt:<18}" for fmt in formats) + "  total")
+    total = lambda source: sum(r["seconds"] for r in by_source.get(source, {}).values())
+    for source in sorted(by_source, key=total, reverse=True):
+        cells = []
+        for fmt in formats:
+            result = by_source[source].get(fmt)
+            cells.append(f"{result['seconds']:6.2f}s {result['state']:<10}" if result else " " * 18)
+        print(f"  {_label(source, root):<{width}}  " + "  ".join(cells) + f"  {total(source):6.2f}s")
+
+    counts = {state: sum(1 for r in results if r["state"] == state)
+              for state in ("built", "restored", "unchanged", "failed")}
+    work = sum(r["seconds"] for r in results)
+    waited = sum(r["waited"] for r in results)
+    print(f"\n{len(results)} outputs from {len(sources)} documents: {counts['built']} built, "
+          f"{counts['restored']} from cache, {counts['unchanged']} unchanged, {counts['failed']} failed")
+    print(f"{wall:.1f}s wall, {work:.1f}s of work on {jobs} workers ({work / wall if wall else 0:.1f}x)"
+          + (f", {waited:.1f}s queued for a heavy engine slot" if waited >= 0.05 else ""))
+
+def _label(source, root):
+    try:
+        return str(source.relative_to(root))
+    except ValueError:
+        return str(source)
+
+def main():
+    parser = argparse.ArgumentParser(description="Render docs/ markdown to Word and PDF in parallel")
+    parser.add_argument("paths", nargs="*", default=[DOCS_DIR], help="files or directories (default: docs/)")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="comma-separated: docx,pdf (default: both)")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help=f"output directory (default: {DEFAULT_OUT})")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: cores)")
+    parser.add_argument("--heavy-jobs", type=int, default=2,
+                        help="wkhtmltopdf/LaTeX/weasyprint builds at once (default: 2)")
+    parser.add_argument("--force", action="store_true", help="rebuild everything and retry every engine")
+    parser.add_argument("--verbose", "-v", action="store_true", help="show each build's output")
+    args = parser.parse_args()
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    if args.jobs < 1 or args.heavy_jobs < 1:
+        parser.error("--jobs and --heavy-jobs must be at least 1")
+
+    out_dir = args.out.resolve()
+    sources = list(discover(args.paths, out_dir))
+    if not sources:
+        print("No markdown files found")
+        return 0
+    root = Path(os.path.commonpath([DOCS_DIR, *sources])) if len(sources) > 1 else sources[0].parent
+    tasks = [(source, fmt, out_dir / Path(_label(source, root)).with_suffix('.' + fmt))
+             for source in sources for fmt in formats]
+    jobs = min(args.jobs, len(tasks))
+    print(f"Rendering {len(sources)} documents x {len(formats)} formats into {out_dir} "
+          f"({jobs} workers, {args.heavy_jobs} heavy)")
+
+    import multiprocessing
+    context = multiprocessing.get_context()
+    semaphore = context.BoundedSemaphore(args.heavy_jobs)
+    results = []
+    failed_formats = set()
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=_init_worker,
+                             initargs=(semaphore,)) as pool:
+        futures = [pool.submit(render, *task, args.force) for task in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            mark = "✗" if result["state"] == "failed" else "✓"
+            print(f"{mark} [{len(results)}/{len(tasks)}] {_label(result['source'], root)} -> {result['format']} "
+                  f"{result['seconds']:.2f}s {result['state']}" + (f" ({result['engine']})" if result["engine"] else ""))
+            # Show why the first failure of each format failed; they usually share a cause
+            if args.verbose or (result["state"] == "failed" and result["format"] not in failed_formats):
+                print("    " + result["log"].strip().replace("\n", "\n    "))
+            if result["state"] == "failed":
+                failed_formats.add(result["format"])
+    report(results, sources, root, time.perf_counter() - started, jobs)
+    return 1 if failed_formats else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
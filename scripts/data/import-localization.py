@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Stream a large translation file into a project through /api/localization/import.
+
+The import route parses the whole upload and writes it in one interactive
+Prisma transaction (5 s default timeout) inside one serverless invocation,
+so a file with tens of thousands of keys has to go up in pieces. This
+client:
+
+- streams the source file (JSON flat or nested, CSV key,value,description,
+  category, XLIFF 1.2/2.0) entry by entry instead of loading it;
+- cuts it into chunks whose size adapts to the observed latency, aiming each
+  request at --target-seconds (halving a chunk that times out or fails with
+  a 5xx/429, and retrying it);
+- uploads up to --concurrency chunks at a time, one connection per worker;
+- records finished entries in a checkpoint file after every chunk, so an
+  interrupted import resumes where it stopped (re-sending a chunk is
+  harmless: the route upserts by key);
+- reports keys per second while it runs and a summary at the end.
+
+Chunks go up as JSON, or as CSV when entries carry descriptions (the JSON
+format has no description field). CSV rows carry their own category; a
+JSON chunk cannot, so it is cut where the category changes. --category
+applies to entries without one. Categories and descriptions are only set
+on keys the import creates.
+
+Usage:
+    python3 import-localization.py fr.json --language fr
+    python3 import-localization.py strings.csv --language de --category onboarding --concurrency 8
+    python3 import-localization.py app.fr.xliff                  # language from the file's trgLang
+    python3 import-localization.py big.json --language fr --dry-run
+    python3 import-localization.py big.json --language fr --restart --json import.json
+
+Credentials come from --admin-token/--project-id (or NIVOSTACK_ADMIN_TOKEN /
+NIVOSTACK_PROJECT_ID) and the server from --base-url (or
+NIVOSTACK_BASE_URL, default http://localhost:3000). The language must exist
+and be enabled in the project.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from localization_files import chunk_file, chunk_format, detect_format, iter_entries, xliff_target_language
+
+# The dashboard client and percentile() are the API probes' (scripts/testing/harness)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "testing"))
+from harness.admin import AdminClient
+from harness.stats import percentile
+
+RETRY_STATUSES = {None, 408, 429, 500, 502, 503, 504}
+PROGRESS_INTERVAL_S = 2.0
+
+class ChunkSizer:
+    """Chunk size steered towards a target request latency.
+
+    Each finished chunk scales the size by target/elapsed (at most halving
+    or doubling it at a time); a failed chunk halves it.
+    """
+
+    def __init__(self, initial, minimum, maximum, target_s):
+        self.size, self.minimum, self.maximum, self.target_s = initial, minimum, maximum, target_s
+        self.lock = threading.Lock()
+
+    def observe(self, count, elapsed_s):
+        if count < self.size // 2:
+            return  # a short tail chunk says little about the size
+        with self.lock:
+            factor = min(max(self.target_s / max(elapsed_s, 1e-3), 0.5), 2.0)
+            self.size = int(min(max(self.size * factor, self.minimum), self.maximum))
+
+    def failed(self):
+        with self.lock:
+            self.size = max(self.size // 2, self.minimum)
+
+class Checkpoint:
+    """Finished entry numbers as merged [start, end) ranges, saved after every chunk."""
+
+    def __init__(self, path, fingerprint):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.ranges = []
+        self.totals = {}
+        self.lock = threading.Lock()
+
+    def load(self, restart):
+        if restart or not self.path.exists():
+            return False
+        with open(self.path) as f:
+            data = json.load(f)
+        if data.get("fingerprint") != self.fingerprint:
+            raise ValueError(f"{self.path} was written for a different file, language or project; "
+                             "pass --restart to start over")
+        self.ranges = [tuple(r) for r in data["ranges"]]
+        self.totals = data.get("totals", {})
+        return True
+
+    def done_count(self):
+        return sum(end - start for start, end in self.ranges)
+
+    def skipper(self):
+        """A function telling, for increasing entry numbers, whether one was already imported."""
+        ranges = iter(sorted(self.ranges))
+        current = next(ranges, None)
+
+        def done(number):
+            nonlocal current
+            while current and number >= current[1]:
+                current = next(ranges, None)
+            return bool(current) and current[0] <= number
+
+        return done
+
+    def record(self, numbers, stats):
+        with self.lock:
+            for number in numbers:
+                self.ranges.append((number, number + 1))
+            self.ranges.sort()
+            merged = [self.ranges[0]]
+            for start, end in self.ranges[1:]:
+                if start <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+                else:
+                    merged.append((start, end))
+            self.ranges = merged
+            for name, value in stats.items():
+                if isinstance(value, int):
+                    self.totals[name] = self.totals.get(name, 0) + value
+            temporary = self.path.with_name(self.path.name + ".tmp")
+            with open(temporary, "w") as f:
+                json.dump({"fingerprint": self.fingerprint, "ranges": self.ranges, "totals": self.totals}, f)
+            os.replace(temporary, self.path)
+
+    def remove(self):
+        self.path.unlink(missing_ok=True)
+
+class Chunk:
+    __slots__ = ("numbers", "entries", "category", "attempt")
+
+    def __init__(self, numbers, entries, category, attempt=0):
+        self.numbers, self.entries, self.category, self.attempt = numbers, entries, category, attempt
+
+    def split(self):
+        """The two halves, re-cut by category if a half of a CSV chunk would go up as JSON."""
+        half = len(self.entries) // 2
+        return [*upload_chunks(self.numbers[:half], self.entries[:half], self.category),
+                *upload_chunks(self.numbers[half:], self.entries[half:], self.category)]
+
+def upload_chunks(numbers, entries, default_category):
+    """`entries` as one chunk if it goes up as CSV, else one chunk per run of equal category.
+
+    A CSV chunk's category is the import's fallback for rows that have none.
+    """
+    if chunk_format(entries) == "csv":
+        yield Chunk(numbers, entries, default_category)
+        return
+    start = 0
+    for end in range(1, len(entries) + 1):
+        category = entries[start].category or default_category
+        if end == len(entries) or (entries[end].category or default_category) != category:
+            yield Chunk(numbers[start:end], entries[start:end], category)
+            start = end
+
+def chunks(entries, sizer, default_category, skip):
+    """Chunks of not-yet-imported entries, at the sizer's current size (see upload_chunks())."""
+    numbers, batch = [], []
+    for number, entry in enumerate(entries):
+        if skip(number):
+            continue
+        numbers.append(number)
+        batch.append(entry)
+        if len(batch) >= sizer.size:
+            yield from upload_chunks(numbers, batch, default_category)
+            numbers, batch = [], []
+    if batch:
+        yield from upload_chunks(numbers, batch, default_category)
+
+class Importer:
+    """Uploads chunks from worker threads through one AdminClient (its HTTP/1.1 pool is thread-safe)."""
+
+    def __init__(self, args, language):
+        self.args, self.language = args, language
+        self.admin = AdminClient(args.base_url, args.admin_token, args.project_id)
+
+    def upload(self, chunk):
+        """(status, response JSON, elapsed seconds, descriptions left out) for one chunk."""
+        fmt, filename, payload = chunk_file(chunk.entries)
+        options = {"createMissingKeys": not self.args.no_create_keys, "updateExisting": not self.args.no_update,
+                   "dryRun": False}
+        if chunk.category:
+            options["category"] = chunk.category
+        started = time.perf_counter()
+        status, data = self.admin.upload(
+            "/api/localization/import",
+            {"projectId": self.args.project_id, "format": fmt, "languageCode": self.language,
+             "options": json.dumps(options)},
+            {"file": (filename, payload)}, expect=None)
+        dropped = sum(1 for e in chunk.entries if e.description) if fmt == "json" else 0
+        return status, data, time.perf_counter() - started, dropped
+
+    def close(self):
+        self.admin.close()
+
+def check_language(args, language):
+    """None if `language` exists and is enabled in the project, else what is wrong."""
+    with AdminClient(args.base_url, args.admin_token, args.project_id) as admin:
+        status, data = admin.request("GET", "/api/localization/languages", query={"projectId": args.project_id},
+                                     expect=None)
+    if status != 200:
+        detail = data.get("error") if isinstance(data, dict) else None
+        return f"GET /api/localization/languages -> {status or 'no response'}" + (f": {detail}" if detail else "")
+    match = next((lang for lang in (data or {}).get("languages", []) if lang["code"] == language), None)
+    if match is None:
+        return f"language '{language}' does not exist in project {args.project_id}; add it first"
+    if not match.get("isEnabled", True):
+        return f"language '{language}' is disabled in project {args.project_id}"
+    return None
+
+def dry_run(args, fmt):
+    sizer = ChunkSizer(args.chunk, args.chunk, args.chunk, args.target_seconds)
+    count = requests = size = with_descriptions = 0
+    formats = {}
+    started = time.perf_counter()
+    for chunk in chunks(iter_entries(args.source, fmt), sizer, args.category, lambda number: False):
+        chunk_fmt, _, payload = chunk_file(chunk.entries)
+        formats[chunk_fmt] = formats.get(chunk_fmt, 0) + 1
+        count += len(chunk.entries)
+        requests += 1
+        size += len(payload)
+        with_descriptions += sum(1 for e in chunk.entries if e.description)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {count} entries read in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} entries/s)")
+    print(f"   {requests} chunks of up to {args.chunk} keys ("
+          + ", ".join(f"{n} {f.upper()}" for f, n in formats.items()) + f"), {size / 1e6:.1f} MB to upload")
+    if with_descriptions:
+        print(f"   {with_descriptions} entries carry a description")
+    return {"entries": count, "chunks": requests, "upload_bytes": size}
+
+def print_progress(done, resumed, started, recent, sizer, in_flight):
+    now = time.perf_counter()
+    while recent and now - recent[0][0] > 10:
+        recent.popleft()
+    rate = (done - resumed) / max(now - started, 1e-9)
+    recent_rate = (sum(n for _, n in recent) / max(now - recent[0][0], 1e-9)) if len(recent) > 1 else rate
+    print(f"   {done:>9,} keys  {rate:8,.0f} keys/s  (last 10s {recent_rate:8,.0f})  "
+          f"chunk {sizer.size:>5}  in flight {in_flight}", flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming, resumable localization import")
+    parser.add_argument("source", help="JSON, CSV or XLIFF file to import")
+    parser.add_argument("--format", choices=("json", "csv", "xliff"), default=None,
+                        help="source format (default: from the file extension)")
+    parser.add_argument("--language", default=None,
+                        help="language code to import into (default: the XLIFF file's target language)")
+    parser.add_argument("--category", default=None, help="category for new keys that have none in the file")
+    parser.add_argument("--no-create-keys", action="store_true", help="skip keys that do not exist yet")
+    parser.add_argument("--no-update", action="store_true", help="leave existing translations unchanged")
+    parser.add_argument("--concurrency", type=int, default=4, help="chunks uploaded at a time (default: 4)")
+    parser.add_argument("--chunk", type=int, default=200, help="first chunk size, in keys (default: 200)")
+    parser.add_argument("--min-chunk", type=int, default=25, help="smallest chunk size (default: 25)")
+    parser.add_argument("--max-chunk", type=int, default=5000, help="largest chunk size (default: 5000)")
+    parser.add_argument("--target-seconds", type=float, default=2.0,
+                        help="request latency the chunk size aims for (default: 2.0)")
+    parser.add_argument("--retries", type=int, default=5, help="attempts per chunk at the smallest size (default: 5)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="progress file for resuming (default: <source>.import-checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="parse and chunk the file without uploading")
+    parser.add_argument("--base-url", default=os.environ.get("NIVOSTACK_BASE_URL", "http://localhost:3000"),
+                        help="server URL (default: $NIVOSTACK_BASE_URL or http://localhost:3000)")
+    parser.add_argument("--admin-token", default=os.environ.get("NIVOSTACK_ADMIN_TOKEN"),
+                        help="dashboard JWT (default: $NIVOSTACK_ADMIN_TOKEN)")
+    parser.add_argument("--project-id", default=os.environ.get("NIVOSTACK_PROJECT_ID"),
+                        help="project to import into (default: $NIVOSTACK_PROJECT_ID)")
+    parser.add_argument("--json", default=None, metavar="FILE", help="also write the summary as JSON")
+    args = parser.parse_args()
+    if not os.path.isfile(args.source):
+        parser.error(f"{args.source} not found")
+    try:
+        fmt = args.format or detect_format(args.source)
+    except ValueError as e:
+        parser.error(str(e))
+    if not 1 <= args.min_chunk <= args.chunk <= args.max_chunk:
+        parser.error("chunk sizes must satisfy 1 <= --min-chunk <= --chunk <= --max-chunk")
+
+    print("=" * 78)
+    print(f"Localization import: {args.source} ({fmt.upper()})")
+    if args.dry_run:
+        print("=" * 78)
+        summary = dry_run(args, fmt)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(summary, f, indent=2)
+        return
+
+    language = args.language or (xliff_target_language(args.source) if fmt == "xliff" else None)
+    if not language:
+        parser.error("--language is required (XLIFF files may name it with trgLang/target-language)")
+    if not args.admin_token or not args.project_id:
+        parser.error("importing needs --admin-token and --project-id (or NIVOSTACK_ADMIN_TOKEN / NIVOSTACK_PROJECT_ID)")
+    stat = os.stat(args.source)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.source}.import-checkpoint.json", {
+        "source": os.path.abspath(args.source), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+        "format": fmt, "language": language, "category": args.category, "base_url": args.base_url,
+        "project_id": args.project_id})
+    try:
+        resumed = checkpoint.load(args.restart)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Target: {args.base_url}   Project: {args.project_id}   Language: {language}")
+    print(f"Chunks: {args.chunk} keys to start ({args.min_chunk}-{args.max_chunk}), aiming at "
+          f"{args.target_seconds:g}s per request, {args.concurrency} at a time")
+    if resumed:
+        print(f"Resuming: {checkpoint.done_count():,} entries already imported ({checkpoint.path})")
+    print("=" * 78)
+
+    problem = check_language(args, language)
+    if problem:
+        print(f"❌ {problem}")
+        sys.exit(2)
+
+    sizer = ChunkSizer(args.chunk, args.min_chunk, args.max_chunk, args.target_seconds)
+    importer = Importer(args, language)
+    source = chunks(iter_entries(args.source, fmt), sizer, args.category, checkpoint.skipper())
+    retry = deque()
+    in_flight = {}
+    latencies, sizes, key_errors = [], [], []
+    counts = {"requests": 0, "splits": 0, "retries": 0, "skipped": 0, "descriptions_dropped": 0}
+    done = resumed_count = checkpoint.done_count()
+    recent = deque()
+    started = last_report = time.perf_counter()
+    failure = None
+
+    def accepted(chunk, data, elapsed, dropped):
+        """Account for a chunk the server accepted and checkpoint it."""
+        nonlocal done
+        stats = (data or {}).get("stats", {})
+        checkpoint.record(chunk.numbers, stats)
+        sizer.observe(len(chunk.entries), elapsed)
+        latencies.append(elapsed)
+        sizes.append(len(chunk.entries))
+        for error in stats.get("errors") or []:
+            # --no-create-keys/--no-update skips come back as errors ending in "is false"
+            if str(error.get("message", "")).endswith("is false"):
+                counts["skipped"] += 1
+            else:
+                key_errors.append(error)
+        counts["descriptions_dropped"] += dropped
+        done += len(chunk.entries)
+        recent.append((time.perf_counter(), len(chunk.entries)))
+
+    pool = ThreadPoolExecutor(max_workers=args.concurrency)
+    try:
+        while True:
+            while failure is None and len(in_flight) < args.concurrency:
+                chunk = retry.popleft() if retry else next(source, None)
+                if chunk is None:
+                    break
+                in_flight[pool.submit(importer.upload, chunk)] = chunk
+            if not in_flight:
+                break
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk = in_flight.pop(future)
+                status, data, elapsed, dropped = future.result()
+                counts["requests"] += 1
+                if status == 200:
+                    accepted(chunk, data, elapsed, dropped)
+                elif status in RETRY_STATUSES:
+                    sizer.failed()
+                    if len(chunk.entries) > args.min_chunk:
+                        counts["splits"] += 1
+                        retry.extend(chunk.split())
+                    elif chunk.attempt + 1 < args.retries:
+                        counts["retries"] += 1
+                        time.sleep(min(2 ** chunk.attempt, 30))
+                        chunk.attempt += 1
+                        retry.append(chunk)
+                    else:
+                        failure = f"a {len(chunk.entries)}-key chunk failed {args.retries} times (last: {status or 'no response'})"
+                else:
+                    detail = (data or {}).get("error") if isinstance(data, dict) else None
+                    failure = f"import -> {status}" + (f": {detail}" if detail else "")
+            if time.perf_counter() - last_report >= PROGRESS_INTERVAL_S:
+                last_report = time.perf_counter()
+                print_progress(done, resumed_count, started, recent, sizer, len(in_flight))
+    except KeyboardInterrupt:
+        failure = "interrupted"
+        for future in in_flight:
+            future.cancel()
+    except (ValueError, OSError) as e:
+        failure = f"cannot read {args.source}: {e}"
+    finally:
+        pool.shutdown(wait=True)
+        # Chunks already uploading when the run stopped finish during the shutdown; checkpoint
+        # the ones the server accepted, so a resumed run does not send them again
+        for future, chunk in in_flight.items():
+            if future.cancelled() or future.exception() is not None:
+                continue
+            status, data, elapsed, dropped = future.result()
+            counts["requests"] += 1
+            if status == 200:
+                accepted(chunk, data, elapsed, dropped)
+        importer.close()
+
+    elapsed = time.perf_counter() - started
+    imported = done - resumed_count
+    totals = checkpoint.totals
+    print("\n" + "=" * 78)
+    print("IMPORT SUMMARY")
+    print("=" * 78)
+    print(f"  Keys sent:        {imported:,} in {elapsed:.1f}s ({imported / max(elapsed, 1e-9):,.0f} keys/s)"
+          + (f", {resumed_count:,} before resuming" if resumed_count else ""))
+    print(f"  Keys created:     {totals.get('keysCreated', 0):,}")
+    print(f"  Translations:     {totals.get('translationsCreated', 0):,} created, "
+          f"{totals.get('translationsUpdated', 0):,} updated, {counts['skipped']:,} skipped")
+    if latencies:
+        print(f"  Requests:         {counts['requests']} ({counts['splits']} splits, {counts['retries']} retries)"
+              f"  latency p50 {percentile(latencies, 0.5):.2f}s  p95 {percentile(latencies, 0.95):.2f}s")
+        print(f"  Chunk size:       median {statistics.median(sizes):.0f}, last {sizer.size}, "
+              f"largest {max(sizes)}")
+    if counts["descriptions_dropped"]:
+        print(f"  ⚠️  {counts['descriptions_dropped']} descriptions left out (their chunks had multi-line text, "
+              "which only the JSON upload can carry)")
+    if key_errors:
+        print(f"  ⚠️  {len(key_errors)} keys reported errors, e.g.:")
+        for error in key_errors[:5]:
+            print(f"     {error.get('key', '?')}: {error.get('message')}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"source": args.source, "language": language, "keys": imported, "resumed_from": resumed_count,
+                       "elapsed_s": elapsed, "keys_per_s": imported / max(elapsed, 1e-9), "totals": totals,
+                       "requests": counts, "latency_s": {"p50": percentile(latencies, 0.5),
+                                                         "p95": percentile(latencies, 0.95)},
+                       "errors": key_errors, "failure": failure}, f, indent=2)
+        print(f"\nSummary written to {args.json}")
+    if failure:
+        print(f"\n❌ Import stopped: {failure}")
+        print(f"   Run the same command again to resume from {checkpoint.path}")
+        sys.exit(1)
+    checkpoint.remove()
+    print("\n✅ Import complete" + (" (with key errors)" if key_errors else ""))
+    sys.exit(1 if key_errors else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Translation source files for import-localization.py.
+
+iter_entries() streams the entries of a JSON, CSV or XLIFF file the way
+src/lib/localization/parsers.ts reads them, one Entry at a time (XLIFF with
+iterparse, JSON with ijson when it is installed), and chunk_file() turns a
+list of entries back into an upload for /api/localization/import.
+
+    for entry in iter_entries("fr.xliff"):       # Entry(key, value, description, category)
+        ...
+"""
+
+import csv
+import io
+import json
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Entry:
+    key: str
+    value: str
+    description: str = None
+    category: str = None
+
+
+FORMATS = {".json": "json", ".csv": "csv", ".xlf": "xliff", ".xliff": "xliff"}
+
+
+def detect_format(path):
+    for suffix, fmt in FORMATS.items():
+        if str(path).lower().endswith(suffix):
+            return fmt
+    raise ValueError(f"cannot tell the format of {path}; expected one of {', '.join(FORMATS)}")
+
+
+def iter_entries(path, fmt=None):
+    """Entries of a source file, in file order; `fmt` is "json", "csv" or "xliff" (default: by extension)."""
+    fmt = fmt or detect_format(path)
+    return {"json": iter_json, "csv": iter_csv, "xliff": iter_xliff}[fmt](path)
+
+
+def iter_json(path):
+    """Flat ({"a.b": "text"}) or nested ({"a": {"b": "text"}}) JSON; only string leaves are entries.
+
+    Streams with ijson when it is installed; otherwise the file is loaded
+    whole, which is what the import route itself does.
+    """
+    try:
+        import ijson
+    except ImportError:
+        with open(path, encoding="utf-8") as f:
+            yield from _flatten(json.load(f))
+        return
+    # one [key or index] frame per open container; arrays flatten to their indexes, as in the route
+    frames = []
+    with open(path, "rb") as f:
+        for _, event, value in ijson.parse(f):
+            if event == "map_key":
+                frames[-1][0] = value
+                continue
+            if event in ("end_map", "end_array"):
+                frames.pop()
+                continue
+            if frames and isinstance(frames[-1][0], int):
+                frames[-1][0] += 1
+            if event == "string":
+                yield Entry(".".join(str(frame[0]) for frame in frames), value)
+            elif event == "start_map":
+                frames.append([None])
+            elif event == "start_array":
+                frames.append([-1])
+
+
+def _flatten(data, prefix=""):
+    items = enumerate(data) if isinstance(data, list) else data.items() if isinstance(data, dict) else ()
+    for key, value in items:
+        full_key = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, str):
+            yield Entry(full_key, value)
+        elif isinstance(value, (dict, list)):
+            yield from _flatten(value, full_key)
+
+
+def iter_csv(path):
+    """key,value[,description[,category]] lines, split as the route's parseCSV() does.
+
+    Like the route, a quoted field cannot span lines, and the first
+    non-blank line is a header when it contains "key".
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        first = True
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            if first and "key" in line:
+                first = False
+                continue
+            first = False
+            parts = [part.strip() for part in _csv_line(line.rstrip("\n"))]
+            if len(parts) < 2:
+                raise ValueError(f"{path}:{number}: expected at least key and value")
+            yield Entry(parts[0], parts[1], parts[2] if len(parts) > 2 and parts[2] else None,
+                        parts[3] if len(parts) > 3 and parts[3] else None)
+
+
+def _csv_line(line):
+    """parseCSVLine(): commas outside quotes split, "" inside quotes is a quote."""
+    fields, current, quoted, i = [], [], False, 0
+    while i < len(line):
+        char = line[i]
+        if char == '"':
+            if quoted and line[i + 1:i + 2] == '"':
+                current.append('"')
+                i += 1
+            else:
+                quoted = not quoted
+        elif char == "," and not quoted:
+            fields.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    fields.append("".join(current))
+    return fields
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_xliff(path):
+    """XLIFF 2.0 <unit id> and 1.2 <trans-unit id> elements; the target text, else the source text.
+
+    Each unit is dropped from its parent (<file>, <group>) once read, so
+    memory stays flat however many units the file has.
+    """
+    parents = []
+    for event, element in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            continue
+        parents.pop()
+        if _local(element.tag) not in ("unit", "trans-unit"):
+            continue
+        texts = {_local(child.tag): _inner_markup(child) for child in element.iter()
+                 if _local(child.tag) in ("source", "target")}
+        value = (texts.get("target") or texts.get("source") or "").strip()
+        notes = [child.text.strip() for child in element.iter() if _local(child.tag) == "note" and child.text]
+        if element.get("id") and value:
+            yield Entry(element.get("id"), value, notes[0] if notes else None)
+        element.clear()
+        if parents:
+            parents[-1].remove(element)
+
+
+def _inner_markup(element):
+    """The content of `element` with inline tags (<ph/>, <g>...) kept as text, as the route stores it."""
+    parts = [element.text or ""]
+    for child in element:
+        tag = _local(child.tag)
+        attributes = "".join(f' {_local(name)}="{value}"' for name, value in child.attrib.items())
+        inner = _inner_markup(child)
+        parts.append(f"<{tag}{attributes}>{inner}</{tag}>" if inner else f"<{tag}{attributes}/>")
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def xliff_target_language(path):
+    """The target language of an XLIFF file (2.0 trgLang, 1.2 target-language), or None."""
+    for _, element in ET.iterparse(path, events=("start",)):
+        language = element.get("trgLang") or element.get("target-language")
+        if language or _local(element.tag) in ("unit", "trans-unit"):
+            return language
+    return None
+
+
+def chunk_format(entries):
+    """"csv" or "json": the format chunk_file() sends `entries` in.
+
+    The import route's JSON format has no description field, so entries with
+    a description go up as CSV (key,value,description,category) unless a
+    field spans lines, which the route's line-based CSV parser cannot read.
+    """
+    if any(e.description for e in entries) and not any(
+            "\n" in field or "\r" in field for e in entries for field in (e.key, e.value, e.description or "")):
+        return "csv"
+    return "json"
+
+def chunk_file(entries):
+    """An import upload for `entries`: (format, filename, bytes), in chunk_format(entries)."""
+    if chunk_format(entries) == "csv":
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(("key", "value", "description", "category"))
+        writer.writerows((e.key, e.value, e.description or "", e.category or "") for e in entries)
+        return "csv", "chunk.csv", out.getvalue().encode("utf-8")
+    payload = {e.key: e.value for e in entries}
+    return "json", "chunk.json", json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -1,10 +1,54 @@
 #!/usr/bin/env python3
+"""
+Publish the monorepo to iplixera/nivostack-monorepo as a single clean commit.
+
+The default snapshot mode streams the working tree's file list into
+`git fast-import` instead of re-staging everything on an orphan branch:
+- files matching snapshot-excludes.txt (gitignore syntax: .next/,
+  *.tsbuildinfo, node_modules/, ...) and --exclude patterns are left out,
+  including ones that are committed
+- unchanged tracked files reuse the blob already in the index, so only
+  modified and untracked files are read and hashed
+- the working tree, the index and the current branch are not touched
+
+The commit is written to the clean-main branch and pushed to the remote's
+main. Its parent is the snapshot published there before (fetched first;
+if the remote cannot be read the script stops rather than publish without
+it), so the push only sends the files that changed; --squash makes a single
+parentless commit instead, which replaces the published history and is
+uploaded in full. A size report of what is published, what was excluded
+and what the push has to send is printed before pushing.
+
+    python3 push_to_iplixera.py --dry-run                       # build clean-main and report only
+    python3 push_to_iplixera.py --squash                        # one commit, no published history
+    python3 push_to_iplixera.py --repo /tmp/work --remote /tmp/published.git
+    python3 push_to_iplixera.py --mode orphan                   # old flow: git rm -rf . && git add -A
+"""
+
+import argparse
+import os
+import stat
 import subprocess
 import sys
-import os
+from collections import defaultdict
 from datetime import datetime
+from pathlib import Path
 
-os.chdir('/Users/karim-f/Code/devbridge')
+REPO_DIR = os.environ.get("NIVOSTACK_REPO_DIR", "/Users/karim-f/Code/devbridge")
+REMOTE = "iplixera"
+REMOTE_BRANCH = "main"
+SNAPSHOT_BRANCH = "clean-main"
+EXCLUDES_FILE = Path(__file__).resolve().with_name("snapshot-excludes.txt")
+AUTHOR = "iplixera <iplixera@iplixera.com>"
+REPORT_TOP = 10
+
+COMMIT_MSG = """Initial commit - NivoStack monorepo
+
+- Dashboard with Next.js (NivoStack Studio)
+- Flutter SDK (nivostack_sdk)
+- Android SDK (com.plixera.nivostack)
+- Documentation
+- Deployment configurations for 4 Vercel projects"""
 
 def run_cmd(cmd, description):
     print(f"\n{'='*60}")
@@ -23,49 +67,303 @@ def run_cmd(cmd, description):
         print(f"Error: {e}")
         return False
 
-print("Starting push process...")
-print(f"Working directory: {os.getcwd()}")
+def git_output(*args):
+    result = subprocess.run(["git", *args], capture_output=True, check=False)
+    if result.returncode != 0:
+        print(f"❌ git {' '.join(args)} failed: {result.stderr.decode(errors='replace').strip()}")
+        sys.exit(1)
+    return result.stdout
 
-# Step 1: Backup
-timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-backup_branch = f"backup-before-clean-{timestamp}"
-backup_tag = f"backup-{timestamp}"
+def git_records(*args):
+    """Stream the NUL-terminated records a git command prints (paths stay bytes)."""
+    proc = subprocess.Popen(["git", *args], stdout=subprocess.PIPE)
+    pending = b""
+    for chunk in iter(lambda: proc.stdout.read(1 << 16), b""):
+        *records, pending = (pending + chunk).split(b"\0")
+        yield from records
+    if proc.wait() != 0:
+        print(f"❌ git {' '.join(args)} failed")
+        sys.exit(1)
 
-run_cmd(f"git branch {backup_branch}", "Creating backup branch")
-run_cmd(f"git tag {backup_tag}", "Creating backup tag")
+def human(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
 
-# Step 2: Clean branch
-run_cmd("git checkout main", "Switching to main")
-run_cmd("git checkout --orphan clean-main", "Creating orphan branch")
-run_cmd("git rm -rf .", "Clearing files")
-run_cmd("git add -A", "Staging files")
+def fast_import_path(path):
+    """A path for an M line; C-quoted if it could be misread."""
+    if not path.startswith(b'"') and b"\n" not in path:
+        return path
+    return b'"' + path.replace(b"\\", b"\\\\").replace(b'"', b'\\"').replace(b"\n", b"\\n") + b'"'
 
-# Step 3: Commit
-commit_msg = """Initial commit - NivoStack monorepo
+def file_mode(st):
+    if stat.S_ISLNK(st.st_mode):
+        return b"120000"
+    return b"100755" if st.st_mode & stat.S_IXUSR else b"100644"
 
-- Dashboard with Next.js (NivoStack Studio)
-- Flutter SDK (nivostack_sdk)
-- Android SDK (com.plixera.nivostack)
-- Documentation
-- Deployment configurations for 4 Vercel projects"""
+class SnapshotReport:
+    """What went into the snapshot, for the size report."""
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.reused = 0
+        self.streamed = 0
+        self.streamed_bytes = 0
+        self.excluded = 0
+        self.excluded_bytes = 0
+        self.by_dir = defaultdict(lambda: [0, 0])
+        self.excluded_by_dir = defaultdict(lambda: [0, 0])
+        self.largest = []
+
+    @staticmethod
+    def _group(path, depth):
+        parts = path.decode(errors="replace").split("/")
+        return "/".join(parts[:depth]) + ("/" if len(parts) > depth else "")
+
+    def add(self, path, size, reused):
+        self.files += 1
+        self.bytes += size
+        if reused:
+            self.reused += 1
+        else:
+            self.streamed += 1
+            self.streamed_bytes += size
+        entry = self.by_dir[self._group(path, 1)]
+        entry[0] += 1
+        entry[1] += size
+        self.largest = sorted(self.largest + [(size, path.decode(errors="replace"))], reverse=True)[:REPORT_TOP]
+
+    def exclude(self, path, size):
+        self.excluded += 1
+        self.excluded_bytes += size
+        entry = self.excluded_by_dir[self._group(path, 2)]
+        entry[0] += 1
+        entry[1] += size
 
-run_cmd(
-    f'git commit -m "{commit_msg}" --author="iplixera <iplixera@iplixera.com>"',
-    "Creating commit"
-)
+    def print(self):
+        print(f"\n📊 Snapshot: {self.files} files, {human(self.bytes)}")
+        print(f"   {self.reused} unchanged files reuse their blobs, "
+              f"{self.streamed} read from the working tree ({human(self.streamed_bytes)})")
+        print(f"   Excluded: {self.excluded} tracked files, {human(self.excluded_bytes)}")
+        for title, groups in (("Published by directory", self.by_dir), ("Excluded", self.excluded_by_dir)):
+            if groups:
+                print(f"\n   {title}:")
+                for name, (count, size) in sorted(groups.items(), key=lambda item: -item[1][1])[:REPORT_TOP]:
+                    print(f"     {human(size):>10}  {count:>6} files  {name}")
+        if self.largest:
+            print("\n   Largest files:")
+            for size, path in self.largest:
+                print(f"     {human(size):>10}  {path}")
 
-# Step 4: Push
-success = run_cmd("git push iplixera clean-main:main --force", "Pushing to repository")
+def exclude_args(excludes_file, patterns):
+    args = [f"--exclude-from={excludes_file}"] if excludes_file else []
+    return args + [f"--exclude={pattern}" for pattern in patterns]
 
-if success:
-    print("\n" + "="*60)
-    print("✅ SUCCESS! Repository pushed!")
-    print(f"📋 https://github.com/iplixera/nivostack-monorepo")
+def stream_snapshot(out, excludes, report):
+    """Write the fast-import file commands for the working tree to `out`."""
+    subprocess.run(["git", "update-index", "-q", "--refresh"], capture_output=True, check=False)
+    excluded = set(git_records("ls-files", "-z", "--cached", "--ignored", *excludes))
+    modified = set(git_records("diff-files", "-z", "--name-only"))
+
+    def inline(path, st):
+        if stat.S_ISLNK(st.st_mode):
+            data = os.readlink(path)
+            out.write(b"M 120000 inline " + fast_import_path(path) + b"\ndata %d\n" % len(data) + data + b"\n")
+            return
+        out.write(b"M " + file_mode(st) + b" inline " + fast_import_path(path) + b"\ndata %d\n" % st.st_size)
+        with open(path, "rb") as f:
+            copied = 0
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                out.write(chunk)
+                copied += len(chunk)
+        if copied != st.st_size:
+            print(f"❌ {path.decode(errors='replace')} changed while it was being published")
+            sys.exit(1)
+        out.write(b"\n")
+
+    seen = set()
+    # Tracked files: "<mode> <sha> <stage>\t<path>"
+    for record in git_records("ls-files", "-z", "--stage"):
+        info, path = record.split(b"\t", 1)
+        mode, sha, _ = info.split(b" ")
+        if path in seen:
+            continue  # unmerged: one entry per stage
+        seen.add(path)
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
+            if path in excluded:
+                report.exclude(path, 0)
+            continue  # deleted in the working tree
+        if path in excluded:
+            report.exclude(path, st.st_size)
+        elif mode == b"160000":
+            out.write(b"M 160000 " + sha + b" " + fast_import_path(path) + b"\n")  # submodule commit
+        elif path in modified or file_mode(st) != mode:
+            inline(path, st)
+            report.add(path, st.st_size, reused=False)
+        else:
+            out.write(b"M " + mode + b" " + sha + b" " + fast_import_path(path) + b"\n")
+            report.add(path, st.st_size, reused=True)
+
+    # Untracked files that are not ignored; excluded directories are not even walked
+    for path in git_records("ls-files", "-z", "--others", "--exclude-standard", *excludes):
+        st = os.lstat(path)
+        if stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode):
+            inline(path, st)
+            report.add(path, st.st_size, reused=False)
+
+def build_snapshot(branch, message, excludes, parent=None):
+    """Write the working tree as a commit on `branch` with git fast-import; returns its sha.
+
+    The commit's only parent is `parent` (the published snapshot), or none.
+    """
+    report = SnapshotReport()
+    ref = f"refs/heads/{branch}".encode()
+    proc = subprocess.Popen(["git", "fast-import", "--quiet", "--force", "--date-format=now"],
+                            stdin=subprocess.PIPE)
+    out = proc.stdin
+    message = message.encode() + b"\n"
+    author = AUTHOR.encode()
+    # reset: start the branch over instead of continuing from its current commit
+    out.write(b"reset " + ref + b"\n\ncommit " + ref + b"\n")
+    out.write(b"author " + author + b" now\ncommitter " + author + b" now\n")
+    out.write(b"data %d\n" % len(message) + message)
+    if parent:
+        out.write(b"from " + parent.encode() + b"\n")
+    out.write(b"deleteall\n")
+    try:
+        stream_snapshot(out, excludes, report)
+        out.write(b"\ndone\n")
+        out.close()
+    except BrokenPipeError:
+        pass
+    if proc.wait() != 0:
+        print("❌ git fast-import failed")
+        sys.exit(1)
+    report.print()
+    return git_output("rev-parse", ref.decode()).decode().strip()
+
+def published_commit(remote, branch):
+    """The commit `remote` has on `branch` (fetched if needed), or None for a new branch.
+
+    Only a branch the remote does not have (ls-remote --exit-code exits 2)
+    means None; any other failure stops the script, since publishing with no
+    parent would force-push over the remote's history.
+    """
+    ref = f"refs/heads/{branch}"
+    result = subprocess.run(["git", "ls-remote", "--exit-code", remote, ref], capture_output=True, text=True)
+    if result.returncode == 2:
+        return None
+    if result.returncode != 0:
+        print(f"❌ Cannot read {ref} from {remote}: {result.stderr.strip()}")
+        sys.exit(1)
+    git_output("fetch", "--quiet", "--no-tags", remote, ref)
+    return git_output("rev-parse", "FETCH_HEAD").decode().strip()
+
+def push_estimate(commit, published):
+    """Objects and on-disk bytes the push has to send."""
+    args = ["rev-list", "--objects", commit, *(["--not", published] if published else [])]
+    objects = sum(1 for _ in git_output(*args).splitlines())
+    size = int(git_output(*args[:2], "--disk-usage", *args[2:]).strip() or 0)
+    return objects, size
+
+def publish_snapshot(args):
+    excludes = exclude_args(None if args.no_default_excludes else args.excludes_file, args.exclude)
+    # Building on the published snapshot lets git send only the files that changed;
+    # a parentless commit (--squash) has to be uploaded in full
+    published = None if args.squash else published_commit(args.remote, args.branch)
+    if published:
+        print(f"📌 {args.remote} {args.branch} is at {published[:12]}; publishing what changed since")
+    message = COMMIT_MSG if not published else \
+        f"Update NivoStack monorepo snapshot\n\nPublished {datetime.now():%Y-%m-%d %H:%M}"
+
+    print("📸 Building snapshot with git fast-import...")
+    started = datetime.now()
+    commit = build_snapshot(SNAPSHOT_BRANCH, message, excludes, published)
+    print(f"\n✅ {SNAPSHOT_BRANCH} -> {commit[:12]} in {(datetime.now() - started).total_seconds():.1f}s")
+
+    if published and git_output("rev-parse", f"{commit}^{{tree}}") == git_output("rev-parse", f"{published}^{{tree}}"):
+        print(f"\n✅ Nothing changed since the published snapshot; not pushing")
+        git_output("update-ref", f"refs/heads/{SNAPSHOT_BRANCH}", published)
+        return True
+    objects, size = push_estimate(commit, published)
+    print(f"📦 To send: {objects} objects, about {human(size)} as stored locally")
+    if args.dry_run:
+        print("\n🔍 Dry run: not pushing")
+        return True
+
+    print(f"\n📤 Pushing {SNAPSHOT_BRANCH} to {args.remote} {args.branch}...")
+    result = subprocess.run(["git", "push", "--force", args.remote, f"{commit}:refs/heads/{args.branch}"],
+                            capture_output=True, text=True)
+    print((result.stdout + result.stderr).strip())
+    return result.returncode == 0
+
+def publish_orphan(args):
+    """The original flow: re-stage the whole working tree on an orphan branch."""
+    # Step 1: Backup
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    backup_branch = f"backup-before-clean-{timestamp}"
+    backup_tag = f"backup-{timestamp}"
+
+    run_cmd(f"git branch {backup_branch}", "Creating backup branch")
+    run_cmd(f"git tag {backup_tag}", "Creating backup tag")
+
+    # Step 2: Clean branch
+    run_cmd("git checkout main", "Switching to main")
+    run_cmd(f"git checkout --orphan {SNAPSHOT_BRANCH}", "Creating orphan branch")
+    run_cmd("git rm -rf .", "Clearing files")
+    run_cmd("git add -A", "Staging files")
+
+    # Step 3: Commit
+    run_cmd(
+        f'git commit -m "{COMMIT_MSG}" --author="{AUTHOR}"',
+        "Creating commit"
+    )
+
+    # Step 4: Push
     print(f"📋 Backup: {backup_branch}")
-    print("="*60)
-else:
-    print("\n" + "="*60)
-    print("❌ Push may have failed. Check output above.")
-    print("="*60)
-    sys.exit(1)
+    return run_cmd(f"git push {args.remote} {SNAPSHOT_BRANCH}:{args.branch} --force", "Pushing to repository")
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish the monorepo as a single clean commit")
+    parser.add_argument("--repo", default=REPO_DIR, help=f"repository to publish (default: {REPO_DIR})")
+    parser.add_argument("--remote", default=REMOTE, help=f"remote name or URL (default: {REMOTE})")
+    parser.add_argument("--branch", default=REMOTE_BRANCH, help=f"branch to publish to (default: {REMOTE_BRANCH})")
+    parser.add_argument("--mode", choices=["snapshot", "orphan"], default="snapshot",
+                        help="snapshot: git fast-import (default); orphan: the old git rm/git add flow")
+    parser.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                        help="also leave out paths matching this gitignore pattern (repeatable)")
+    parser.add_argument("--excludes-file", type=Path, default=EXCLUDES_FILE,
+                        help=f"exclude rules (default: {EXCLUDES_FILE.name} next to this script)")
+    parser.add_argument("--no-default-excludes", action="store_true", help="ignore the exclude rules file")
+    parser.add_argument("--squash", action="store_true",
+                        help="publish a single parentless commit, replacing the published history (full upload)")
+    parser.add_argument("--dry-run", action="store_true", help="build the snapshot and report, but do not push")
+    args = parser.parse_args()
+
+    args.excludes_file = args.excludes_file.resolve()
+    os.chdir(args.repo)
+    os.chdir(git_output("rev-parse", "--show-toplevel").decode().strip())
+    print("Starting push process...")
+    print(f"Working directory: {os.getcwd()}")
+
+    success = publish_snapshot(args) if args.mode == "snapshot" else publish_orphan(args)
+
+    if args.dry_run:
+        return
+    if success:
+        print("\n" + "="*60)
+        print("✅ SUCCESS! Repository pushed!")
+        print(f"📋 https://github.com/iplixera/nivostack-monorepo")
+        print("="*60)
+    else:
+        print("\n" + "="*60)
+        print("❌ Push may have failed. Check output above.")
+        print("="*60)
+        sys.exit(1)
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Find what makes the repository expensive to clone and check out.
+
+Every object in history is listed by `git rev-list --objects`, which is
+piped straight into one long-lived `git cat-file --batch-check` process.
+Each blob's size (raw, and on disk after compression and deltas) is
+charged to the path it was committed at, so committed build output
+(.next/dev chunks and source maps), lockfile and tsbuildinfo churn show
+up with what they really cost across history.
+
+The report ranks:
+- paths, directories and file extensions by their size across history
+- ignore rules (snapshot-excludes.txt by default, or --rules FILE) by what
+  they would save: the HEAD column is what untracking + ignoring the files
+  takes off every checkout; the history column is what a history rewrite
+  (git filter-repo --invert-paths ...) takes off every clone
+
+Usage:
+    python3 scan-repo-bloat.py                    # all refs of the current repository
+    python3 scan-repo-bloat.py --repo ../other --top 30
+    python3 scan-repo-bloat.py --rev main --rules .gitignore
+    python3 scan-repo-bloat.py --json > bloat.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+DEFAULT_RULES = Path(__file__).resolve().with_name("snapshot-excludes.txt")
+BATCH_FORMAT = "%(objecttype) %(objectname) %(objectsize) %(objectsize:disk) %(rest)"
+
+def human(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def git_output(*args):
+    result = subprocess.run(["git", *args], capture_output=True)
+    if result.returncode != 0:
+        print(f"❌ git {' '.join(args)} failed: {result.stderr.decode(errors='replace').strip()}")
+        sys.exit(1)
+    return result.stdout
+
+class Usage:
+    """Blob versions, raw bytes and on-disk bytes charged to a path, directory, extension or rule."""
+    __slots__ = ("versions", "size", "disk", "head_files", "head_size")
+
+    def __init__(self):
+        self.versions = self.size = self.disk = self.head_files = self.head_size = 0
+
+    def add(self, size, disk):
+        self.versions += 1
+        self.size += size
+        self.disk += disk
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+def scan_objects(rev_args):
+    """{path: Usage} for every blob reachable from `rev_args`, plus totals per object type."""
+    paths = defaultdict(Usage)
+    totals = defaultdict(Usage)
+    revlist = subprocess.Popen(["git", "rev-list", "--objects", *rev_args], stdout=subprocess.PIPE)
+    catfile = subprocess.Popen(["git", "cat-file", f"--batch-check={BATCH_FORMAT}"],
+                               stdin=revlist.stdout, stdout=subprocess.PIPE)
+    revlist.stdout.close()  # cat-file owns the pipe now
+    for line in catfile.stdout:
+        kind, _, size, disk, path = line.rstrip(b"\n").split(b" ", 4)
+        size, disk = int(size), int(disk)
+        totals[kind.decode()].add(size, disk)
+        if kind == b"blob":
+            paths[path.decode(errors="replace")].add(size, disk)
+    if catfile.wait() != 0 or revlist.wait() != 0:
+        print("❌ Listing objects failed (is this a git repository? is --rev valid?)")
+        sys.exit(1)
+    return paths, totals
+
+def head_sizes(rev):
+    """{path: size} of the files in `rev`."""
+    sizes = {}
+    for record in git_output("ls-tree", "-r", "-l", "-z", rev).split(b"\0"):
+        if not record:
+            continue
+        info, path = record.split(b"\t", 1)
+        _, kind, _, size = info.split(None, 3)
+        if kind == b"blob":
+            sizes[path.decode(errors="replace")] = int(size)
+    return sizes
+
+def _groups(path, depth, dirs, extensions):
+    parts = path.split("/")
+    ext = os.path.splitext(parts[-1])[1] or parts[-1]
+    yield extensions["*" + ext if ext.startswith(".") else ext]
+    for level in range(1, min(depth, len(parts) - 1) + 1):
+        yield dirs["/".join(parts[:level]) + "/"]
+
+def rollup(paths, head, depth):
+    """Per-directory (up to `depth` levels) and per-extension Usage."""
+    dirs, extensions = defaultdict(Usage), defaultdict(Usage)
+    for path, usage in paths.items():
+        for group in _groups(path, depth, dirs, extensions):
+            group.versions += usage.versions
+            group.size += usage.size
+            group.disk += usage.disk
+    # HEAD is counted from its own listing: a blob shared by several paths is charged to only one of them
+    for path, size in head.items():
+        for group in _groups(path, depth, dirs, extensions):
+            group.head_files += 1
+            group.head_size += size
+    # Leave out directories that only wrap one subdirectory (.next/ when everything is in .next/dev/)
+    for name in sorted(dirs, key=len, reverse=True):
+        parent = name[:name.rstrip("/").rfind("/") + 1]
+        same = lambda usage: (usage.disk, usage.head_size)
+        if parent and parent in dirs and same(dirs[parent]) == same(dirs[name]):
+            del dirs[parent]
+    return dirs, extensions
+
+def match_rules(paths, head, rules_file):
+    """Usage per ignore rule in `rules_file`; each path counts for the rule that decides it (the last match)."""
+    rules = defaultdict(Usage)
+    # An empty repository, so the scanned repository's own .gitignore files do not take part
+    with tempfile.TemporaryDirectory() as scratch:
+        subprocess.run(["git", "init", "-q", scratch], check=True)
+        result = subprocess.run(["git", "-C", scratch, "-c", f"core.excludesFile={rules_file}", "check-ignore",
+                                 "--no-index", "--verbose", "--non-matching", "--stdin", "-z"],
+                                input="\0".join(set(paths) | set(head)).encode() + b"\0", capture_output=True)
+    if result.returncode not in (0, 1):
+        print(f"❌ Matching rules failed: {result.stderr.decode(errors='replace').strip()}")
+        sys.exit(1)
+    # -z -v: source, line number, pattern, path per match
+    fields = result.stdout.split(b"\0")
+    for i in range(0, len(fields) - 3, 4):
+        pattern, path = fields[i + 2].decode(errors="replace"), fields[i + 3].decode(errors="replace")
+        if not pattern or pattern.startswith("!"):
+            continue
+        rule = rules[pattern]
+        if path in paths:
+            rule.versions += paths[path].versions
+            rule.size += paths[path].size
+            rule.disk += paths[path].disk
+        if path in head:
+            rule.head_files += 1
+            rule.head_size += head[path]
+    return rules
+
+def print_table(title, rows, top, head_label="in HEAD"):
+    if not rows:
+        return
+    print(f"\n{title}")
+    print(f"  {'history (disk)':>14} {'history (raw)':>14} {'blobs':>9} {head_label:>16}  path")
+    for name, usage in rows[:top]:
+        in_head = f"{usage.head_files} / {human(usage.head_size)}" if usage.head_files else "-"
+        print(f"  {human(usage.disk):>14} {human(usage.size):>14} {usage.versions:>9} {in_head:>16}  {name}")
+    if len(rows) > top:
+        print(f"  ... {len(rows) - top} more")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank the paths that make the repository expensive to clone")
+    parser.add_argument("--repo", default=".", help="repository to scan (default: current directory)")
+    parser.add_argument("--rev", action="append", default=[],
+                        help="revision(s) to scan, e.g. main or HEAD~100..HEAD (default: all refs)")
+    parser.add_argument("--rules", type=Path, default=DEFAULT_RULES,
+                        help=f"gitignore-style rules to evaluate (default: {DEFAULT_RULES.name})")
+    parser.add_argument("--top", type=int, default=20, help="rows per table (default: 20)")
+    parser.add_argument("--depth", type=int, default=3, help="directory levels to roll up (default: 3)")
+    parser.add_argument("--json", action="store_true", help="print the full results as JSON")
+    args = parser.parse_args()
+
+    rules_file = args.rules.resolve() if args.rules else None
+    os.chdir(args.repo)
+    started = time.perf_counter()
+    paths, totals = scan_objects(args.rev or ["--all"])
+    head = head_sizes("HEAD") if git_output("rev-parse", "--verify", "--quiet", "HEAD") else {}
+    for path, usage in paths.items():
+        if path in head:
+            usage.head_files, usage.head_size = 1, head[path]
+    dirs, extensions = rollup(paths, head, args.depth)
+    rules = match_rules(paths, head, rules_file) if rules_file and rules_file.exists() else {}
+    elapsed = time.perf_counter() - started
+
+    by_disk = lambda items: sorted(items, key=lambda item: (item[1].disk, item[1].size), reverse=True)
+    if args.json:
+        json.dump({"totals": {kind: usage.as_dict() for kind, usage in totals.items()},
+                   "paths": {path: usage.as_dict() for path, usage in by_disk(paths.items())},
+                   "directories": {name: usage.as_dict() for name, usage in by_disk(dirs.items())},
+                   "extensions": {name: usage.as_dict() for name, usage in by_disk(extensions.items())},
+                   "rules": {name: usage.as_dict() for name, usage in by_disk(rules.items())},
+                   "seconds": round(elapsed, 3)}, sys.stdout, indent=2)
+        print()
+        return
+
+    print("=" * 70)
+    print(f"Repository bloat: {os.getcwd()}")
+    print("=" * 70)
+    all_disk = sum(usage.disk for usage in totals.values())
+    for kind in ("commit", "tree", "blob", "tag"):
+        if kind in totals:
+            print(f"  {kind + 's':<8} {totals[kind].versions:>8}  {human(totals[kind].disk):>10} on disk"
+                  f"  {human(totals[kind].size):>10} raw")
+    print(f"  {'total':<8} {sum(u.versions for u in totals.values()):>8}  {human(all_disk):>10} on disk")
+    print(f"  {len(paths)} paths charged with blobs, {len(head)} files in HEAD; scanned in {elapsed:.2f}s")
+
+    print_table("📄 Paths by size across history", by_disk(paths.items()), args.top)
+    print_table(f"📁 Directories (up to {args.depth} levels)", by_disk(dirs.items()), args.top)
+    print_table("🏷️  Extensions", by_disk(extensions.items()), args.top)
+    if rules:
+        print_table(f"🧹 What each rule in {rules_file.name} would save", by_disk(rules.items()), args.top,
+                    head_label="off checkouts")
+        saved_disk = sum(rule.disk for rule in rules.values())
+        saved_head = sum(rule.head_size for rule in rules.values())
+        print(f"\n  Together: untracking + ignoring saves {human(saved_head)} per checkout; a history rewrite "
+              f"saves {human(saved_disk)} of {human(all_disk)} ({saved_disk / all_disk * 100 if all_disk else 0:.0f}%) "
+              f"per clone")
+    elif rules_file:
+        print(f"\n⚠️  No rules evaluated ({rules_file} not found or nothing matched)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Tracker CLI
+
+One fast-starting entry point for the tracker tools (add, status, sync) and
+the optional daemon that keeps the parsed tracker and GitHub session warm
+between commands. See tracker/cli.py and tracker/daemon.py.
+
+Usage:
+    ./scripts/github/tracker-cli.py add ui "Fix header" --component Dashboard --priority P1
+    ./scripts/github/tracker-cli.py status UI-012 done
+    ./scripts/github/tracker-cli.py sync [--graphql]
+    ./scripts/github/tracker-cli.py daemon start|stop|status
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from tracker.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
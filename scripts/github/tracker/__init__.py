@@ -0,0 +1,9 @@
+"""
+Shared helpers for the tracker <-> GitHub scripts in scripts/github.
+
+The scripts are kebab-case and run directly, so they put this directory on
+sys.path and import from here:
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    from tracker.model import Tracker
+"""
@@ -0,0 +1,248 @@
+"""
+Async GitHub REST client for bulk tracker syncs (stdlib only).
+
+AsyncGitHub keeps a small pool of keep-alive HTTP/1.1 connections and never
+runs more than `concurrency` requests at once. Every response is fed to a
+shared RateLimiter, which paces all workers together:
+
+- primary limit: X-RateLimit-Remaining / X-RateLimit-Reset. Once remaining
+  drops below `low_water` the remaining budget is spread evenly until the
+  reset; at zero every worker waits for the reset.
+- secondary limit: a 403/429 with Retry-After pauses every worker for that
+  long and doubles the spacing between requests; without Retry-After the
+  pause backs off exponentially from `secondary_backoff_s`. Each success
+  shrinks the spacing again (towards `min_interval`).
+
+Rate-limited and 5xx responses are retried up to `max_retries` times (5xx
+only for idempotent requests: a 502 may arrive after the server acted).
+
+    async with AsyncGitHub(token, concurrency=4) as github:
+        number = await github.create_issue("owner", "repo", title, body, ["ui"])
+"""
+
+import asyncio
+import json
+import ssl
+import time
+from urllib.parse import urlsplit
+
+GITHUB_API_BASE = "https://api.github.com"
+
+
+class GitHubError(Exception):
+    """A request failed for good (after retries, or with a non-retryable status)."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class RateLimiter:
+    """Shared pacing state for all workers of one AsyncGitHub client."""
+
+    def __init__(self, min_interval=0.0, max_interval=30.0, low_water=50, secondary_backoff_s=60.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.low_water = low_water
+        self.secondary_backoff_s = secondary_backoff_s
+        self.interval = min_interval
+        self.remaining = None
+        self.reset_at = None
+        self.paused_until = 0.0
+        self.secondary_hits = 0
+        self.waited_s = 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait for this request's turn."""
+        async with self._lock:
+            now = time.time()
+            interval = self.interval
+            if self.remaining is not None and self.reset_at and self.remaining < self.low_water:
+                interval = max(interval, (self.reset_at - now) / max(self.remaining, 1))
+            slot = max(now, self._next_slot, self.paused_until)
+            self._next_slot = slot + interval
+        delay = slot - now
+        if delay > 0:
+            self.waited_s += delay
+            await asyncio.sleep(delay)
+
+    def observe(self, status, headers, body=b""):
+        """Update pacing from a response; returns seconds to wait before a retry, or None."""
+        now = time.time()
+        if "x-ratelimit-remaining" in headers:
+            self.remaining = int(headers["x-ratelimit-remaining"])
+            self.reset_at = float(headers.get("x-ratelimit-reset", now))
+        if status in (403, 429):
+            retry_after = headers.get("retry-after")
+            if retry_after is not None:
+                wait = float(retry_after)
+            elif self.remaining == 0 and self.reset_at:
+                wait = max(self.reset_at - now, 0) + 1
+            elif status == 403 and b"rate limit" not in body.lower():
+                return None  # a plain permission error, not a rate limit
+            else:
+                wait = self.secondary_backoff_s * 2 ** self.secondary_hits
+            # Workers rejected in the same burst count as one event
+            if self.remaining != 0 and now >= self.paused_until:
+                self.secondary_hits += 1
+                self.interval = min(max(self.interval * 2, 0.25), self.max_interval)
+            self.paused_until = max(self.paused_until, now + wait)
+            return wait
+        if self.remaining == 0 and self.reset_at:
+            self.paused_until = max(self.paused_until, self.reset_at + 1)
+        if status < 400:
+            self.interval = max(self.interval * 0.9, self.min_interval)
+        return None
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.requests = 0
+
+    def close(self):
+        self.writer.close()
+
+
+async def _read_body(reader, headers):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                await reader.readline()
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read()
+
+
+class AsyncGitHub:
+    """Bounded-concurrency, rate-limit-aware GitHub REST client."""
+
+    def __init__(self, token, api_base=GITHUB_API_BASE, concurrency=4, limiter=None, timeout=30, max_retries=5):
+        parts = urlsplit(api_base)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = limiter or RateLimiter()
+        self.connections_opened = 0
+        self.requests_sent = 0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._idle = []
+        self._ssl = ssl.create_default_context() if self.scheme == "https" else None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+    async def _connect(self):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self._ssl), self.timeout)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def _send(self, method, path, payload, extra_headers=None):
+        conn = self._idle.pop() if self._idle else await self._connect()
+        head = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host}",
+                f"Authorization: token {self.token}", "Accept: application/vnd.github+json",
+                "User-Agent: nivostack-tracker-sync", f"Content-Length: {len(payload)}"]
+        if payload:
+            head.append("Content-Type: application/json")
+        head += [f"{name}: {value}" for name, value in (extra_headers or {}).items()]
+        reused = conn.requests > 0
+        status = None
+        try:
+            conn.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+            await conn.writer.drain()
+            status_line = await asyncio.wait_for(conn.reader.readline(), self.timeout)
+            if not status_line:
+                raise ConnectionResetError("connection closed by server")
+            status = int(status_line.split()[1])
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(conn.reader.readline(), self.timeout)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await asyncio.wait_for(_read_body(conn.reader, headers), self.timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError, IndexError) as e:
+            conn.close()
+            # A reused keep-alive connection the server had already closed, before any
+            # response arrived: the request was never processed, so resend it
+            if reused and status is None and isinstance(e, (ConnectionError, asyncio.IncompleteReadError)):
+                return await self._send(method, path, payload, extra_headers)
+            raise GitHubError(f"{method} {path}: {e or type(e).__name__}") from e
+        conn.requests += 1
+        self.requests_sent += 1
+        if headers.get("connection", "").lower() == "close":
+            conn.close()
+        else:
+            self._idle.append(conn)
+        return status, headers, body
+
+    async def request(self, method, path, data=None, headers=None, idempotent=True):
+        """Send one API request, retrying rate limits and 5xx; returns (status, headers, json).
+
+        A 304 (from an If-None-Match in `headers`) is returned with json None.
+        With idempotent=False a 5xx is raised instead of retried.
+        """
+        payload = json.dumps(data).encode("utf-8") if data is not None else b""
+        for attempt in range(self.max_retries + 1):
+            async with self._slots:
+                await self.limiter.acquire()
+                status, response_headers, body = await self._send(method, path, payload, headers)
+            wait = self.limiter.observe(status, response_headers, body)
+            retryable = wait is not None or (status >= 500 and idempotent)
+            if not retryable or attempt == self.max_retries:
+                break
+            if wait is None:
+                await asyncio.sleep(min(2 ** attempt, 30))
+        try:
+            parsed = json.loads(body) if body else None
+        except ValueError:
+            parsed = None
+        if status >= 400:
+            message = parsed.get("message") if isinstance(parsed, dict) else body[:200].decode("utf-8", "replace")
+            raise GitHubError(f"{method} {path}: HTTP {status}: {message}", status)
+        return status, response_headers, parsed
+
+    async def create_issue(self, owner, repo, title, body, labels):
+        _, _, issue = await self.request(
+            "POST", f"/repos/{owner}/{repo}/issues", {"title": title, "body": body, "labels": labels})
+        return str(issue["number"])
+
+    async def update_issue(self, owner, repo, number, fields):
+        _, _, issue = await self.request("PATCH", f"/repos/{owner}/{repo}/issues/{number}", fields)
+        return issue
+
+    async def list_issues(self, owner, repo, labels=None, state="all", per_page=100):
+        """All issues (not pull requests) matching `labels`, following pagination."""
+        issues = []
+        page = 1
+        while True:
+            query = f"state={state}&per_page={per_page}&page={page}"
+            if labels:
+                query += f"&labels={','.join(labels)}"
+            _, _, batch = await self.request("GET", f"/repos/{owner}/{repo}/issues?{query}")
+            issues.extend(issue for issue in batch if "pull_request" not in issue)
+            if len(batch) < per_page:
+                return issues
+            page += 1
@@ -0,0 +1,81 @@
+"""
+On-disk cache of the GitHub auth check done by check_github_access().
+
+Discovering auth costs two `gh` subprocesses and a GET /user round trip;
+the result is cached in ~/.cache/nivostack/github-auth.json for
+AUTH_CACHE_TTL_S, keyed by a fingerprint of what it was made with (API
+base and token, plus gh's hosts.yml so `gh auth login/logout` count as a
+change). Tokens themselves are never written to the cache. A 401 from any
+later call should invalidate() the entry so the next run re-checks.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+AUTH_CACHE_TTL_S = int(os.environ.get("TRACKER_AUTH_TTL", 12 * 3600))
+
+
+def cache_path():
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "nivostack" / "github-auth.json"
+
+
+def _gh_hosts_file():
+    base = os.environ.get("GH_CONFIG_DIR") or Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config") / "gh"
+    return Path(base) / "hosts.yml"
+
+
+def credential_fingerprint(token, api_base=""):
+    """Stable hash of everything the auth check depends on."""
+    digest = hashlib.sha256()
+    digest.update(f"{api_base}\n{token or ''}".encode("utf-8"))
+    hosts = _gh_hosts_file()
+    if hosts.exists():
+        digest.update(hosts.read_bytes())
+    return digest.hexdigest()[:32]
+
+
+def _read():
+    try:
+        return json.loads(cache_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(entries):
+    path = cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".github-auth.", dir=path.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # the cache is an optimisation; never fail a sync over it
+
+
+def lookup(token, api_base="", ttl_s=AUTH_CACHE_TTL_S):
+    """The cached {"method", "login", "verified_at"} for these credentials, if still fresh."""
+    entry = _read().get(credential_fingerprint(token, api_base))
+    if entry and time.time() - entry.get("verified_at", 0) < ttl_s:
+        return entry
+    return None
+
+
+def store(token, method, login=None, api_base=""):
+    now = time.time()
+    entries = {key: entry for key, entry in _read().items()
+               if now - entry.get("verified_at", 0) < AUTH_CACHE_TTL_S}
+    entries[credential_fingerprint(token, api_base)] = {"method": method, "login": login, "verified_at": now}
+    _write(entries)
+
+
+def invalidate(token, api_base=""):
+    entries = _read()
+    if entries.pop(credential_fingerprint(token, api_base), None) is not None:
+        _write(entries)
@@ -0,0 +1,118 @@
+"""
+Command line for the tracker tools: one entry point, cheap to start.
+
+    tracker-cli.py add testing|ui <title> [--category C] [--component C] [--priority P1] [--notes TEXT]
+    tracker-cli.py status <TEST-001|UI-001|#issue> <done|in progress|blocked|not started>
+    tracker-cli.py import <file.csv|file.jsonl> [--type testing|ui] [--dry-run] [--no-issues] [--graphql]
+    tracker-cli.py sync [--dry-run] [--concurrency 4] [--no-reconcile] [--create-only] [--graphql]
+    tracker-cli.py daemon start|stop|status|run
+
+If a tracker daemon is listening (daemon.py) the command is handed to it and
+its output streamed back; otherwise it runs in this process. Set
+TRACKER_NO_DAEMON=1 to always run in-process.
+
+Only argparse and the light config/model modules load at start-up; each
+command imports what it needs when it runs.
+"""
+
+import argparse
+import os
+import sys
+
+from .config import TRACKER_FILE, daemon_socket_path
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tracker-cli.py", description="Tracker and GitHub issue tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a row to the tracker and create its GitHub issue")
+    add.add_argument("type", choices=["testing", "ui"], type=str.lower)
+    add.add_argument("title")
+    add.add_argument("--category", default="Integration", help="category (testing tasks)")
+    add.add_argument("--component", default="Dashboard", help="component (UI changes)")
+    add.add_argument("--priority", default="P1", help="P0|P1|P2|P3")
+    add.add_argument("--notes", default="", help="description")
+    add.add_argument("--tracker", default=TRACKER_FILE, help=f"tracker file (default: {TRACKER_FILE})")
+
+    status = commands.add_parser("status", help="update a row's status")
+    status.add_argument("item_id", help="TEST-XXX or UI-XXX or #issue_number")
+    status.add_argument("status", help="done|in progress|blocked|not started")
+    status.add_argument("--tracker", default=TRACKER_FILE, help=f"tracker file (default: {TRACKER_FILE})")
+
+    bulk = commands.add_parser("import", help="add rows from a CSV or JSONL file, skipping duplicate titles")
+    bulk.add_argument("file", help="CSV with a header row, or one JSON object per line")
+    bulk.add_argument("--format", choices=["csv", "jsonl"], help="input format (default: from the file extension)")
+    bulk.add_argument("--type", choices=["testing", "ui"], type=str.lower, help="type for rows without one")
+    bulk.add_argument("--dry-run", action="store_true", help="report what would be added without writing")
+    bulk.add_argument("--no-issues", action="store_true", help="only add the rows; create issues on the next sync")
+    bulk.add_argument("--concurrency", type=int, default=4, help="issues created at once (default: 4)")
+    bulk.add_argument("--graphql", action="store_true", help="create the issues with batched GraphQL mutations")
+    bulk.add_argument("--tracker", default=TRACKER_FILE, help=f"tracker file (default: {TRACKER_FILE})")
+
+    sync = commands.add_parser("sync", help="sync the tracker with GitHub issues")
+    sync.add_argument("--dry-run", "--test", action="store_true", dest="dry_run", help="show what would be created")
+    sync.add_argument("--concurrency", type=int, default=4, help="issues created at once with token auth (default: 4)")
+    sync.add_argument("--no-reconcile", action="store_false", dest="reconcile",
+                      help="skip matching existing GitHub issues by their tracker marker")
+    sync.add_argument("--create-only", action="store_false", dest="incremental",
+                      help="only create missing issues; skip pushing changed rows and pulling GitHub state")
+    sync.add_argument("--graphql", action="store_true",
+                      help="create and update issues with batched GraphQL mutations instead of one REST call each")
+    sync.add_argument("--tracker", default=TRACKER_FILE, help=f"tracker file (default: {TRACKER_FILE})")
+
+    daemon = commands.add_parser("daemon", help="keep the tracker and GitHub session warm between commands")
+    daemon.add_argument("action", choices=["start", "stop", "status", "run"])
+    daemon.add_argument("--idle-timeout", type=float, default=None,
+                        help="exit after this many idle seconds (default: 1800, 0 = never)")
+    return parser
+
+
+def run(argv, session=None):
+    """Parse and run one command; returns its exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    from . import commands
+
+    if args.command == "add":
+        if not args.title:
+            print("❌ Title is required")
+            return 1
+        area = args.category if args.type == "testing" else args.component
+        result = commands.add_item(args.type, args.title, area, args.priority, args.notes, session, args.tracker)
+        if not result:
+            return 1
+        from .config import REPO_NAME, REPO_OWNER
+        print(f"\n✅ Issue added: {result['id']}")
+        if result['issue_number']:
+            print(f"   GitHub Issue: #{result['issue_number']}")
+            print(f"   URL: https://github.com/{REPO_OWNER}/{REPO_NAME}/issues/{result['issue_number']}")
+        return 0
+    if args.command == "status":
+        return 0 if commands.update_status(args.item_id, args.status, session, args.tracker) else 1
+    if args.command in ("import", "sync") and args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.command == "import":
+        return commands.import_items(args, session)
+    if args.command == "sync":
+        return commands.sync(args, session)
+
+    from . import daemon
+    if args.action == "run":
+        return daemon.serve(idle_timeout=args.idle_timeout)
+    if args.action == "start":
+        return daemon.start(idle_timeout=args.idle_timeout)
+    if args.action == "stop":
+        return daemon.stop()
+    return daemon.status()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if (argv and argv[0] not in ("daemon", "-h", "--help") and not os.environ.get("TRACKER_NO_DAEMON")
+            and daemon_socket_path().exists()):
+        from .daemon import forward
+        code = forward(argv)
+        if code is not None:
+            return code
+    return run(argv)
@@ -0,0 +1,556 @@
+"""
+The tracker commands (add, status, import, sync) behind tracker-cli.py and the
+add-issue-to-tracker.py / update-issue-status.py / sync-tracker-to-github.py
+wrappers.
+
+Every command takes a Session. A one-shot run uses a fresh one; the daemon
+(daemon.py) keeps one alive, so the tracker store, the parsed tracker, the
+auth check and the async GitHub client with its keep-alive connections and
+rate-limit state carry over from one command to the next. All tracker
+writes go through the store (store.py).
+
+Modules that are slow to import (asyncio, ssl, urllib, the sync and GraphQL
+code) are imported inside the commands that need them.
+"""
+
+import os
+import time
+
+from .config import (GITHUB_API_BASE, LABELS_TESTING, LABELS_UI, REPO_NAME, REPO_OWNER, TRACKER_FILE, build_issue,
+                     get_github_token)
+from .model import TABLE_KINDS, Tracker, TrackerError
+
+STATUS_MAP = {
+    "done": ":green_circle: Done",
+    "complete": ":green_circle: Done",
+    "finished": ":green_circle: Done",
+    "in progress": ":large_blue_circle: In Progress",
+    "working": ":large_blue_circle: In Progress",
+    "blocked": ":red_circle: Blocked",
+    "not started": ":white_circle: Not Started",
+}
+
+
+def _stat_key(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class Session:
+    """State a command can reuse; only kept between commands when `persistent`."""
+
+    def __init__(self, persistent=False):
+        self.persistent = persistent
+        self._trackers = {}
+        self._stores = {}
+        self._access = {}
+        self._clients = {}
+        self._loop = None
+
+    def tracker(self, path):
+        """The parsed tracker at `path`, reparsed only if the file changed since we last saw it."""
+        path = os.path.abspath(path)
+        cached = self._trackers.get(path)
+        if cached and cached[0] == _stat_key(path) and not cached[1].dirty:
+            return cached[1]
+        tracker = Tracker.load(path)
+        if self.persistent:
+            self._trackers[path] = (_stat_key(path), tracker)
+        return tracker
+
+    def store(self, path):
+        """The TrackerStore for the tracker at `path` (one open connection per persistent session)."""
+        from .store import TrackerStore
+
+        path = os.path.abspath(path)
+        if path in self._stores:
+            return self._stores[path]
+        store = TrackerStore.open(path)
+        if self.persistent:
+            self._stores[path] = store
+        return store
+
+    def save(self, tracker):
+        """Write the tracker's changed rows through the store; returns True if anything was written."""
+        changed = self.store(tracker.path).save_tracker(tracker)
+        if changed:
+            # Other writers' rows may have been merged in; reparse next time
+            self._trackers.pop(os.path.abspath(tracker.path), None)
+        return changed
+
+    def check_access(self, dry_run=False):
+        """check_github_access(), asked once per token for a persistent session."""
+        token = get_github_token()
+        if token in self._access and not dry_run:
+            return self._access[token]
+        from .rest import check_github_access
+        method = check_github_access(dry_run=dry_run)
+        if self.persistent and method and not dry_run:
+            self._access[token] = method
+        return method
+
+    def forget_access(self, token):
+        from . import auth as auth_cache
+        self._access.pop(token, None)
+        auth_cache.invalidate(token, GITHUB_API_BASE)
+
+    def run_github(self, token, concurrency, work):
+        """Run `await work(github)` with an AsyncGitHub client and return its result.
+
+        A persistent session keeps one client per (token, concurrency) on a
+        background event loop, so later commands reuse its connections.
+        """
+        import asyncio
+        from .api import AsyncGitHub
+
+        if not self.persistent:
+            async def once():
+                async with AsyncGitHub(token, GITHUB_API_BASE, concurrency=concurrency) as github:
+                    return await work(github)
+            return asyncio.run(once())
+
+        if self._loop is None:
+            import threading
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, name="tracker-github", daemon=True).start()
+
+        async def warm():
+            key = (token, concurrency)
+            if key not in self._clients:
+                self._clients[key] = AsyncGitHub(token, GITHUB_API_BASE, concurrency=concurrency)
+            return await work(self._clients[key])
+        return asyncio.run_coroutine_threadsafe(warm(), self._loop).result()
+
+    def describe(self):
+        return {"trackers": sorted(set(self._trackers) | set(self._stores)), "authenticated": len(self._access),
+                "clients": [{"concurrency": concurrency, "requests": client.requests_sent,
+                             "connections": client.connections_opened}
+                            for (_, concurrency), client in self._clients.items()]}
+
+
+def add_item(kind, title, area, priority, notes, session=None, tracker_file=TRACKER_FILE):
+    """Add a row to the tracker (its ID allocated by the store), then create its GitHub issue."""
+    session = session or Session()
+    try:
+        store = session.store(tracker_file)
+        item = store.add(kind, title, area, priority, notes)
+    except TrackerError as e:
+        print(f"❌ {e}")
+        return None
+
+    print(f"✅ Added {item.id} to tracker")
+
+    issue_number = None
+    # Create GitHub issue
+    auth_method = session.check_access(dry_run=False)
+    if auth_method:
+        issue_title, body, labels = build_issue(item)
+        token = get_github_token()
+        if token and auth_method == "token":
+            from .api import GitHubError
+            try:
+                issue_number = session.run_github(token, 1, lambda github: github.create_issue(
+                    REPO_OWNER, REPO_NAME, issue_title, body, [l.strip() for l in labels.split(",")]))
+            except GitHubError as e:
+                if e.status == 401:
+                    session.forget_access(token)
+                print(f"❌ Failed to create issue: {e}")
+        else:
+            from .rest import create_issue
+            issue_number = create_issue(issue_title, body, labels, auth_method=auth_method, dry_run=False)
+
+        if issue_number:
+            store.set_issue(item.id, issue_number)
+            print(f"✅ Created GitHub issue #{issue_number}")
+        else:
+            print("⚠️  Added to tracker but failed to create GitHub issue")
+    else:
+        print("⚠️  Added to tracker but no GitHub access (issue will be created on next sync)")
+
+    return {"id": item.id, "issue_number": issue_number, "type": kind}
+
+
+def update_status(item_id, new_status, session=None, tracker_file=TRACKER_FILE):
+    """Update status of an issue in the tracker."""
+    session = session or Session()
+    # Normalize status
+    status_lower = new_status.lower()
+    if status_lower in STATUS_MAP:
+        status_emoji = STATUS_MAP[status_lower]
+    else:
+        # Try to match partial
+        for key, value in STATUS_MAP.items():
+            if key in status_lower:
+                status_emoji = value
+                break
+        else:
+            print(f"❌ Unknown status: {new_status}")
+            return False
+
+    try:
+        item = session.store(tracker_file).set_status(item_id, status_emoji)
+    except TrackerError as e:
+        print(f"❌ {e}")
+        return False
+    print(f"✅ Updated {item.id} status to {status_emoji}")
+    return True
+
+
+def sync_with_token(session, tracker, items, token, concurrency, state, reconcile_existing=True, incremental=True,
+                    batched=False, progress=None):
+    """Create issues for `items` with the async client, then (incremental) push changed
+    rows and pull GitHub-side state changes. With `batched`, creates and pushes go
+    through batched GraphQL mutations. `progress(item, result)`, if given, replaces
+    the line printed per created issue. Returns the IDs that failed."""
+    from . import graphql
+    from .sync import (SyncJournal, apply_remote, content_hash, create_issues, issue_fields, pull_changes,
+                       push_changes, reconcile)
+
+    journal = SyncJournal(tracker.path)
+    failures = []
+
+    def report_failure(item, error):
+        if getattr(error, "status", None) == 401:
+            session.forget_access(token)
+        failures.append(item.id)
+        print(f"❌ {item.id}: {error}")
+
+    def on_created(item, result):
+        if isinstance(result, Exception):
+            report_failure(item, result)
+        else:
+            tracker.set_issue(item.id, result)
+            # What GitHub has now: the row's content, created open
+            created = {**issue_fields(item, build_issue), "state": "open"}
+            state.record(item.id, result, content_hash(created), "open", fields=created)
+            if not progress:
+                print(f"✅ Created issue #{result} for {item.id}")
+        if progress:
+            progress(item, result)
+
+    def on_pushed(item, result):
+        if isinstance(result, Exception):
+            return report_failure(item, result)
+        print(f"⬆️  Updated issue #{item.issue} from {item.id} ({result['state']})")
+
+    async def pull(github):
+        for item_id, message in apply_remote(tracker, state, await pull_changes(github, REPO_OWNER, REPO_NAME, state), build_issue):
+            print(f"⬇️  {item_id}: {message}")
+
+    async def run(github):
+        # A warm client's counters span earlier commands; report this sync's share
+        limiter = github.limiter
+        sent, opened = github.requests_sent, github.connections_opened
+        waited, secondary = limiter.waited_s, limiter.secondary_hits
+        if incremental:
+            await pull(github)
+        todo = items
+        if todo and reconcile_existing:
+            existing = await reconcile(github, REPO_OWNER, REPO_NAME,
+                                       [LABELS_TESTING.split(","), LABELS_UI.split(",")])
+            todo = []
+            for item in items:
+                if item.id in existing:
+                    tracker.set_issue(item.id, existing[item.id])
+                    print(f"🔗 {item.id} already has issue #{existing[item.id]}")
+                else:
+                    todo.append(item)
+        batcher = graphql.GraphQLBatcher(github, REPO_OWNER, REPO_NAME) if batched else None
+        if batcher and todo:
+            await batcher.prepare(LABELS_TESTING.split(",") + LABELS_UI.split(","))
+        if todo:
+            print(f"📝 Creating {len(todo)} issues "
+                  + ("(batched GraphQL)..." if batcher else f"({concurrency} at a time)..."))
+        if batcher:
+            await graphql.create_issues(batcher, todo, build_issue, journal, on_created)
+        else:
+            await create_issues(github, REPO_OWNER, REPO_NAME, todo, build_issue, journal, on_created)
+        if incremental:
+            if batcher:
+                pushed = await graphql.push_changes(batcher, tracker, state, build_issue, on_pushed)
+            else:
+                pushed = await push_changes(github, REPO_OWNER, REPO_NAME, tracker, state, build_issue, on_pushed)
+            if todo or pushed:
+                await pull(github)  # see our own writes, so the next no-op sync is a single 304
+        print(f"\n   {github.requests_sent - sent} requests over {github.connections_opened - opened} new connection(s), "
+              f"{limiter.waited_s - waited:.1f}s paced/waiting, {limiter.secondary_hits - secondary} secondary rate limit(s)"
+              + (f", {limiter.remaining} requests left until reset" if limiter.remaining is not None else ""))
+        if batcher and batcher.batches:
+            print(f"   {batcher.batches} GraphQL batch(es) of up to {batcher.largest_batch} operations, "
+                  f"{batcher.waited_s:.1f}s waiting on the point budget"
+                  + (f", {batcher.split_batches} split after a refusal or error" if batcher.split_batches else ""))
+
+    try:
+        session.run_github(token, concurrency, run)
+    finally:
+        journal.close()
+    return failures
+
+
+def sync(args, session=None):
+    """The sync-tracker-to-github command; returns the exit code."""
+    from .sync import SyncJournal, SyncState
+
+    session = session or Session()
+    dry_run = args.dry_run
+
+    if dry_run:
+        print("🔍 DRY RUN MODE - No issues will be created")
+        print("=" * 50)
+
+    print("🚀 Syncing Tracker to GitHub Issues")
+    print("=" * 35)
+    print(f"\nRepository: {REPO_OWNER}/{REPO_NAME}")
+    print(f"Tracker: {args.tracker}")
+    print()
+
+    # Check prerequisites (skip in dry-run mode)
+    auth_method = session.check_access(dry_run=dry_run)
+    if not auth_method and not dry_run:
+        return 1
+    elif not auth_method and dry_run:
+        print("⚠️  GitHub access not available, but continuing in dry-run mode...\n")
+
+    # Parse tracker file once; all issue numbers are written back in one atomic save
+    try:
+        tracker = session.tracker(args.tracker)
+    except TrackerError as e:
+        print(f"❌ {e}")
+        return 1
+
+    # Recover issue numbers from an interrupted run before deciding what is pending
+    journal = SyncJournal(tracker.path)
+    recovered = [(item_id, number) for item_id, number in journal.replay() if item_id in tracker.by_id]
+    for item_id, number in recovered:
+        tracker.set_issue(item_id, number)
+    if recovered:
+        print(f"♻️  Recovered {len(recovered)} issue number(s) from an interrupted sync")
+
+    testing_items = tracker.pending("testing") if "testing" in tracker.tables else []
+    ui_items = tracker.pending("ui") if "ui" in tracker.tables else []
+
+    print(f"📋 Scanning tracker file...")
+    print(f"Found {len(testing_items)} testing tasks without GitHub issues")
+    print(f"Found {len(ui_items)} UI changes without GitHub issues")
+    print()
+
+    token = get_github_token()
+    state = SyncState(tracker.path)
+    failures = []
+    interrupted = False
+    try:
+        if token and not dry_run:
+            failures = sync_with_token(session, tracker, testing_items + ui_items, token, args.concurrency, state,
+                                       args.reconcile, args.incremental, args.graphql)
+        elif not testing_items and not ui_items:
+            print("✅ All items already have GitHub issues")
+            return 0
+        else:
+            from .rest import create_issue
+            for heading, items in (("📝 Processing testing tasks...", testing_items),
+                                   ("🎨 Processing UI changes...", ui_items)):
+                if not items:
+                    continue
+                print(heading)
+                for item in items:
+                    issue_title, body, labels = build_issue(item)
+                    issue_number = create_issue(issue_title, body, labels, auth_method=auth_method, dry_run=dry_run)
+
+                    if issue_number:
+                        if not dry_run:
+                            tracker.set_issue(item.id, issue_number)
+                            print(f"   Recorded issue #{issue_number} for {item.id}\n")
+                        else:
+                            print(f"   [DRY RUN] Would update tracker with issue #{issue_number}\n")
+                    elif not dry_run:
+                        failures.append(item.id)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted - issues created so far are kept; re-run to continue")
+        interrupted = True
+    finally:
+        # Save even if interrupted, so issues created so far are not lost
+        if session.save(tracker):
+            print(f"\n📝 Updated {args.tracker}")
+        journal.clear()
+        if token and not dry_run:
+            state.save()
+
+    if interrupted:
+        return 130
+    if dry_run:
+        print("✅ Dry run complete! No issues were created.")
+        print("\nTo create issues for real, run without --dry-run flag:")
+        print("  ./scripts/sync-tracker-to-github.sh")
+    elif failures:
+        print(f"⚠️  Sync finished with {len(failures)} failure(s): {', '.join(failures)}")
+        print("   Re-run the sync to retry them.")
+        return 1
+    else:
+        print("✅ Sync complete!")
+        print(f"\nView issues at: https://github.com/{REPO_OWNER}/{REPO_NAME}/issues")
+    return 0
+
+
+IMPORT_FIELDS = {  # column -> accepted spellings in the input
+    "kind": ("type", "kind"),
+    "title": ("title",),
+    "area": ("area", "category", "component"),
+    "priority": ("priority",),
+    "notes": ("notes", "description"),
+    "status": ("status",),
+}
+KIND_ALIASES = {"testing": "testing", "test": "testing", "ui": "ui"}
+DEFAULT_AREAS = {"testing": "Integration", "ui": "Dashboard"}
+IMPORT_REPORT_LIMIT = 20
+
+
+def _field(record, name):
+    for key in IMPORT_FIELDS[name]:
+        value = record.get(key)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    return None
+
+
+def read_import(path, fmt=None, default_kind=None, errors=None):
+    """Yield tracker rows from a CSV (with a header row) or JSONL file, one at a time.
+
+    Columns: type/kind (testing|ui), title, area/category/component,
+    priority, notes/description, status. Rows that cannot be imported are
+    appended to `errors` as (line number, message) and skipped.
+    """
+    import csv
+    import json
+
+    fmt = fmt or ("csv" if str(path).lower().endswith(".csv") else "jsonl")
+    errors = [] if errors is None else errors
+    with open(path, newline="", encoding="utf-8-sig") as stream:
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            records = ((reader.line_num, {(k or "").strip().lower(): v for k, v in record.items()})
+                       for record in reader)
+        else:
+            records = ((number, line) for number, line in enumerate(stream, 1) if line.strip())
+        for number, record in records:
+            if fmt != "csv":
+                try:
+                    record = json.loads(record)
+                except ValueError as e:
+                    errors.append((number, f"invalid JSON: {e}"))
+                    continue
+                if not isinstance(record, dict):
+                    errors.append((number, "expected a JSON object"))
+                    continue
+                record = {str(k).lower(): v for k, v in record.items()}
+            kind = KIND_ALIASES.get((_field(record, "kind") or default_kind or "").lower())
+            title = _field(record, "title")
+            status = _field(record, "status")
+            if not kind:
+                errors.append((number, "type must be testing or ui (or pass --type)"))
+            elif not title:
+                errors.append((number, "title is required"))
+            elif status and status.lower() not in STATUS_MAP and status not in STATUS_MAP.values():
+                errors.append((number, f"unknown status: {status}"))
+            else:
+                yield {"kind": kind, "title": " ".join(title.split()),
+                       "area": _field(record, "area") or DEFAULT_AREAS[kind],
+                       "priority": (_field(record, "priority") or "P1").upper(),
+                       "notes": _field(record, "notes") or "",
+                       "status": STATUS_MAP.get(status.lower(), status) if status else None}
+
+
+class Progress:
+    """Counts finished issue creations and prints a running total about once a second."""
+
+    def __init__(self, total, interval=1.0):
+        self.total, self.interval = total, interval
+        self.created = self.failed = 0
+        self.started = self.shown = time.monotonic()
+
+    def __call__(self, item, result):
+        if isinstance(result, Exception):
+            self.failed += 1
+        else:
+            self.created += 1
+        now = time.monotonic()
+        if now - self.shown >= self.interval or self.created + self.failed == self.total:
+            self.shown = now
+            rate = self.created / max(now - self.started, 1e-6)
+            print(f"   📝 {self.created + self.failed}/{self.total}: {self.created} created"
+                  + (f", {self.failed} failed" if self.failed else "") + f" ({rate:.1f}/s)", flush=True)
+
+
+def import_items(args, session=None):
+    """The import command: bulk-add rows from a file, then create their issues; returns the exit code."""
+    session = session or Session()
+    errors = []
+    rows = read_import(args.file, args.format, args.type, errors)
+    print(f"📥 Importing {args.file} into {args.tracker}")
+    try:
+        store = session.store(args.tracker)
+        if args.dry_run:
+            from .store import title_hash
+            seen, added, duplicates = {}, [], []
+            for row in rows:
+                key = (row["kind"], title_hash(row["title"]))
+                if key not in seen:
+                    seen[key] = store.duplicate_of(row["kind"], row["title"])
+                    if not seen[key]:
+                        seen[key] = "an earlier row"
+                        added.append(row)
+                        continue
+                duplicates.append((row, seen[key]))
+        else:
+            added, duplicates = store.add_many(rows)
+    except (OSError, TrackerError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    for number, message in errors[:IMPORT_REPORT_LIMIT]:
+        print(f"❌ Line {number}: {message}")
+    for row, existing in duplicates[:IMPORT_REPORT_LIMIT]:
+        print(f"⏭️  Skipped \"{row['title']}\": duplicate of {existing}")
+    if max(len(errors), len(duplicates)) > IMPORT_REPORT_LIMIT:
+        print(f"   (only the first {IMPORT_REPORT_LIMIT} of each are listed)")
+    verb = "Would add" if args.dry_run else "Added"
+    print(f"✅ {verb} {len(added)} item(s); {len(duplicates)} duplicate(s) and {len(errors)} invalid row(s) skipped")
+    if args.dry_run or not added:
+        return 1 if errors else 0
+    for kind in TABLE_KINDS:
+        ids = [item.id for item in added if item.kind == kind]
+        if ids:
+            print(f"   {ids[0]} .. {ids[-1]}" if len(ids) > 1 else f"   {ids[0]}")
+    if args.no_issues:
+        return 1 if errors else 0
+
+    token = get_github_token()
+    if not token or not session.check_access():
+        print("⚠️  No GitHub token; the issues will be created on the next sync")
+        return 1 if errors else 0
+
+    from .sync import SyncJournal, SyncState
+
+    tracker = session.tracker(args.tracker)
+    items = [tracker.by_id[item.id] for item in added if item.id in tracker.by_id]
+    state = SyncState(tracker.path)
+    progress = Progress(len(items))
+    failures = []
+    try:
+        failures = sync_with_token(session, tracker, items, token, args.concurrency, state, reconcile_existing=False,
+                                   incremental=False, batched=args.graphql, progress=progress)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted - issues created so far are kept; run sync to create the rest")
+        return 130
+    finally:
+        if session.save(tracker):
+            print(f"\n📝 Updated {args.tracker} with {progress.created} issue number(s)")
+        SyncJournal(tracker.path).clear()
+        state.save()
+    if failures:
+        print(f"⚠️  {len(failures)} issue(s) not created: {', '.join(failures)}")
+        print("   Run sync to retry them.")
+        return 1
+    return 1 if errors else 0
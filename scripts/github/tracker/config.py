@@ -0,0 +1,68 @@
+"""
+Settings and issue layout shared by the tracker commands.
+
+Kept import-light (os and pathlib only): every command imports it, and the
+tracker CLI has to start fast.
+"""
+
+import os
+from pathlib import Path
+
+TRACKER_FILE = "docs/TRACKER_TESTING_UI.md"
+REPO_OWNER = "iplixera"
+REPO_NAME = "nivostack-monorepo"
+LABELS_TESTING = "testing,integration"
+LABELS_UI = "ui,frontend"
+GITHUB_API_BASE = os.environ.get("GITHUB_API_BASE", "https://api.github.com")
+
+
+def daemon_socket_path():
+    """Where the tracker daemon listens (daemon.py); TRACKER_SOCKET to override."""
+    if os.environ.get("TRACKER_SOCKET"):
+        return Path(os.environ["TRACKER_SOCKET"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "nivostack" / "tracker.sock"
+
+
+def get_github_token():
+    """Get GitHub token from environment variable or config file."""
+    # Check environment variable first
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+
+    # Check ~/.devbridge_tokens file
+    tokens_file = Path.home() / ".devbridge_tokens"
+    if tokens_file.exists():
+        try:
+            with open(tokens_file, 'r') as f:
+                for line in f:
+                    if line.startswith("GITHUB_TOKEN="):
+                        token = line.split("=", 1)[1].strip()
+                        # Remove quotes if present
+                        token = token.strip('"\'')
+                        if token and token != "ghp_your_token_here":
+                            return token
+        except Exception as e:
+            print(f"⚠️  Could not read token file: {e}")
+
+    return None
+
+
+def build_issue(item):
+    """Return (title, body, labels) for a tracker item."""
+    if item.kind == "testing":
+        kind_label, area_label, title_prefix, labels = "Testing Task", "Category", "[Testing]", LABELS_TESTING
+    else:
+        kind_label, area_label, title_prefix, labels = "UI Change", "Component", "[UI]", LABELS_UI
+    body = f"""**Type**: {kind_label}
+**{area_label}**: {item.area}
+**Priority**: {item.priority}
+**Status**: {item.status}
+
+**Description**:
+{item.notes}
+
+---
+*Created from tracker: {item.id}*"""
+    return f"{title_prefix} {item.title}", body, labels
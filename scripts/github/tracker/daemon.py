@@ -0,0 +1,262 @@
+"""
+Optional long-running tracker daemon on a Unix socket.
+
+    tracker-cli.py daemon start     # detached; logs to ~/.cache/nivostack/tracker-daemon.log
+    tracker-cli.py add ui "Fix header"   # handed to the daemon while it runs
+    tracker-cli.py daemon stop
+
+The daemon keeps one persistent commands.Session, so the parsed tracker
+(reparsed only when the file changes on disk), the auth check and the
+async GitHub client (keep-alive connections, rate-limit state) stay warm
+between commands. Commands run one at a time, which also keeps concurrent
+callers from interleaving tracker writes.
+
+Protocol: the client sends one JSON line {"argv", "cwd", "env", "stamp"};
+the daemon answers with {"out": text} lines as the command prints and a
+final {"exit": code}. It answers {"fallback": reason} instead, and the
+client runs the command itself, when the client's GitHub settings (env)
+differ from the daemon's, or when the tracker code changed since the
+daemon started ("stamp"; the daemon then exits).
+
+The socket is ~/.cache/nivostack/tracker.sock (TRACKER_SOCKET to
+override), created 0600. The daemon exits after `idle_timeout` seconds
+without a command (TRACKER_DAEMON_IDLE, default 1800; 0 = never).
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+from .config import daemon_socket_path as socket_path
+
+IDLE_TIMEOUT_S = float(os.environ.get("TRACKER_DAEMON_IDLE", 1800))
+# What a command's behaviour depends on besides its argv and cwd
+ENV_KEYS = ("GITHUB_TOKEN", "GITHUB_API_BASE", "HOME", "XDG_CACHE_HOME", "GH_CONFIG_DIR", "TRACKER_AUTH_TTL")
+_PACKAGE = Path(__file__).resolve().parent
+
+
+def code_stamp():
+    """Changes whenever a tracker module is edited."""
+    return max(path.stat().st_mtime_ns for path in _PACKAGE.glob("*.py"))
+
+
+def _env():
+    return {key: os.environ.get(key) for key in ENV_KEYS}
+
+
+def _connect(timeout=None):
+    path = socket_path()
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _request(message, timeout=None):
+    """Send one request; yields the daemon's reply messages."""
+    sock = _connect(timeout)
+    if sock is None:
+        return
+    with sock, sock.makefile("rb") as replies:
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        for line in replies:
+            yield json.loads(line)
+
+
+def forward(argv):
+    """Run `argv` in the daemon, streaming its output; None if there is no usable daemon."""
+    message = {"argv": argv, "cwd": os.getcwd(), "env": _env(), "stamp": code_stamp()}
+    try:
+        for reply in _request(message):
+            if "out" in reply:
+                sys.stdout.write(reply["out"])
+                sys.stdout.flush()
+            elif "exit" in reply:
+                return reply["exit"]
+            else:
+                return None
+    except (OSError, ValueError):
+        pass
+    return None  # no daemon, it fell back, or it went away mid-command
+
+
+class _Stream:
+    """File-like stdout/stderr that sends each write to the client."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.broken = False
+
+    def write(self, text):
+        if text and not self.broken:
+            try:
+                self.conn.sendall(json.dumps({"out": text}).encode("utf-8") + b"\n")
+            except OSError:
+                self.broken = True  # client went away; finish the command anyway
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def serve(idle_timeout=None):
+    """Run the daemon in the foreground until stopped or idle."""
+    from .commands import Session
+
+    idle_timeout = IDLE_TIMEOUT_S if idle_timeout is None else idle_timeout
+    path = socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if _connect(timeout=1):
+        print(f"❌ A tracker daemon is already listening on {path}")
+        return 1
+    if path.exists():
+        path.unlink()  # left behind by a daemon that did not shut down cleanly
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    server.settimeout(min(idle_timeout, 60) if idle_timeout else None)
+
+    session = Session(persistent=True)
+    env, stamp = _env(), code_stamp()
+    started = last_used = time.time()
+    served = 0
+    print(f"🔌 Tracker daemon {os.getpid()} listening on {path}", flush=True)
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                if idle_timeout and time.time() - last_used >= idle_timeout:
+                    print(f"💤 Idle for {idle_timeout:.0f}s, exiting", flush=True)
+                    return 0
+                continue
+            with conn, conn.makefile("rb") as requests:
+                conn.settimeout(None)
+                try:
+                    message = json.loads(requests.readline() or b"null")
+                except (OSError, ValueError):
+                    continue
+                if not message:
+                    continue  # a connection probe (daemon start/status)
+                try:
+                    done = _handle(conn, message, session, env, stamp, started, served)
+                except OSError:
+                    continue  # the client went away
+                if done:
+                    return 0
+                if "argv" in message:
+                    served += 1
+                last_used = time.time()
+    finally:
+        server.close()
+        if path.exists():
+            path.unlink()
+
+
+def _handle(conn, message, session, env, stamp, started, served):
+    """Answer one request; returns True when the daemon should exit."""
+    from .cli import run
+
+    reply = lambda data: conn.sendall(json.dumps(data).encode("utf-8") + b"\n")
+    if message.get("op") == "status":
+        reply({"pid": os.getpid(), "uptime_s": round(time.time() - started), "commands": served,
+               **session.describe()})
+        return False
+    if message.get("op") == "stop":
+        reply({"stopping": os.getpid()})
+        return True
+    if message.get("stamp") != stamp:
+        print("♻️  Tracker code changed, exiting", flush=True)
+        reply({"fallback": "tracker code changed; daemon exiting"})
+        return True
+    if message.get("env") != env:
+        reply({"fallback": "different GitHub settings"})
+        return False
+    reply({"exit": _run_command(run, session, message, _Stream(conn))})
+    return False
+
+
+def _run_command(run, session, message, stream):
+    stdout, stderr, cwd = sys.stdout, sys.stderr, os.getcwd()
+    sys.stdout = sys.stderr = stream
+    try:
+        os.chdir(message["cwd"])
+        return run(message["argv"], session)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        print(f"❌ {type(e).__name__}: {e}")
+        return 1
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+        os.chdir(cwd)
+
+
+def start(idle_timeout=None):
+    """Start the daemon detached and wait until it accepts connections."""
+    import subprocess
+
+    if _connect(timeout=1):
+        print(f"✅ Tracker daemon already running on {socket_path()}")
+        return 0
+    log_path = socket_path().parent / "tracker-daemon.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    command = [sys.executable, str(_PACKAGE.parent / "tracker-cli.py"), "daemon", "run"]
+    if idle_timeout is not None:
+        command += ["--idle-timeout", str(idle_timeout)]
+    with open(log_path, "a") as log:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=log, cwd="/",
+                                   start_new_session=True)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if process.poll() is not None:
+            print(f"❌ Tracker daemon exited with {process.returncode}; see {log_path}")
+            return 1
+        sock = _connect(timeout=1)
+        if sock:
+            sock.close()
+            print(f"✅ Tracker daemon {process.pid} listening on {socket_path()}")
+            return 0
+        time.sleep(0.05)
+    print(f"❌ Tracker daemon did not start within 10s; see {log_path}")
+    return 1
+
+
+def stop():
+    replies = list(_request({"op": "stop"}, timeout=10))
+    if not replies:
+        print("⚠️  No tracker daemon running")
+        return 1
+    print(f"✅ Stopped tracker daemon {replies[0]['stopping']}")
+    return 0
+
+
+def status():
+    replies = list(_request({"op": "status"}, timeout=10))
+    if not replies:
+        print("⚠️  No tracker daemon running")
+        return 1
+    info = replies[0]
+    print(f"✅ Tracker daemon {info['pid']} on {socket_path()}: up {info['uptime_s']}s, {info['commands']} command(s)")
+    for path in info["trackers"]:
+        print(f"   📋 {path}")
+    for client in info["clients"]:
+        print(f"   🔗 GitHub client (concurrency {client['concurrency']}): "
+              f"{client['requests']} requests over {client['connections']} connection(s)")
+    return 0
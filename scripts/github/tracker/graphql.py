@@ -0,0 +1,313 @@
+"""
+Batched issue creation and updates over GitHub's GraphQL API.
+
+Instead of one REST round trip per row, GraphQLBatcher packs many
+createIssue / updateIssue mutations into one request, each under its own
+alias (m0, m1, ...) with its input passed as a variable:
+
+    mutation($i0: CreateIssueInput!, $i1: UpdateIssueInput!) {
+      m0: createIssue(input: $i0) { issue { ...IssueFields } }
+      m1: updateIssue(input: $i1) { issue { ...IssueFields } }
+    }
+
+GitHub reports a failed mutation as an error whose path starts with its
+alias, so every result and error is mapped back to the operation's key
+(the tracker ID) while the rest of the batch succeeds.
+
+Batch size is picked automatically:
+
+- cost: GitHub's secondary limit allows `points_per_minute` (2000) points of
+  GraphQL per minute, and a mutation costs MUTATION_COST (5) points. A
+  batch never exceeds `max_cost` points, and batches draw on a token bucket
+  of `points_per_minute` so a long sync paces itself instead of tripping
+  the limit.
+- time: the size grows while batches finish well within `target_s` and
+  shrinks when they take longer (GitHub aborts requests after ~10s).
+- rejection: a request refused as a whole (node/complexity limits) is
+  split in half and retried, and later batches stay below the refused size;
+  a single operation that is still refused fails on its own.
+
+A 5xx or timeout may arrive after part of a batch was applied. Updates are
+idempotent and are retried; creates are reported as failed, and the next
+sync's reconcile() finds any that did land by their tracker marker.
+
+Batches are sent one at a time, as GitHub asks for mutations to be serial.
+
+    batcher = GraphQLBatcher(github, "owner", "repo")
+    await batcher.prepare(["ui", "frontend"])
+    results = await create_issues(batcher, items, build_issue, journal)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+from .api import GitHubError
+from .sync import changed_rows, record_push
+
+MUTATION_COST = 5
+DEFAULT_MAX_COST = 500
+POINTS_PER_MINUTE = 2000
+LOOKUPS_PER_QUERY = 100
+
+_ISSUE_FIELDS = "fragment IssueFields on Issue { id number state updatedAt }"
+
+
+@dataclass
+class Operation:
+    key: str          # tracker ID the result is reported under
+    mutation: str     # "createIssue" or "updateIssue"
+    input: dict
+
+
+class BatchSizer:
+    """Picks how many operations go into the next request."""
+
+    def __init__(self, initial=20, maximum=DEFAULT_MAX_COST // MUTATION_COST, target_s=5.0):
+        self.maximum = maximum
+        self.size = min(initial, maximum)
+        self.target_s = target_s
+
+    def success(self, elapsed):
+        if elapsed > self.target_s:
+            self.size = max(self.size * 3 // 4, 1)
+        elif elapsed < self.target_s / 2:
+            self.size = min(self.size + max(self.size // 2, 1), self.maximum)
+
+    def failure(self, refused=None):
+        """Halve the size; a batch `refused` for its size also lowers the ceiling."""
+        if refused:
+            self.maximum = max(min(self.maximum, refused * 3 // 4), 1)
+        self.size = max(min(self.size // 2, self.maximum), 1)
+
+
+def _issue(node):
+    """A GraphQL Issue as the REST-shaped dict the rest of the sync uses."""
+    return {"node_id": node["id"], "number": node["number"], "state": node["state"].lower(),
+            "updated_at": node.get("updatedAt")}
+
+
+def _split(batch):
+    middle = len(batch) // 2
+    return [batch[:middle], batch[middle:]]
+
+
+class GraphQLBatcher:
+    """Runs create/update operations for one repository in cost-bounded batches."""
+
+    def __init__(self, github, owner, repo, max_cost=DEFAULT_MAX_COST, points_per_minute=POINTS_PER_MINUTE,
+                 target_s=5.0):
+        self.github = github
+        self.owner = owner
+        self.repo = repo
+        self.points_per_minute = points_per_minute
+        self.sizer = BatchSizer(maximum=max(max_cost // MUTATION_COST, 1), target_s=target_s)
+        self.repository_id = None
+        self.label_ids = {}
+        self.batches = 0
+        self.largest_batch = 0
+        self.split_batches = 0
+        self.waited_s = 0.0
+        self._points = float(points_per_minute)
+        self._refilled = time.monotonic()
+
+    async def query(self, query, variables=None, idempotent=True):
+        """POST one GraphQL document; returns (data, errors)."""
+        for attempt in range(self.github.max_retries + 1):
+            _, headers, response = await self.github.request(
+                "POST", "/graphql", {"query": query, "variables": variables or {}}, idempotent=idempotent)
+            errors = response.get("errors") or []
+            # Primary GraphQL limit: a 200 with RATE_LIMITED and nothing executed
+            if not any(error.get("type") == "RATE_LIMITED" for error in errors) or attempt == self.github.max_retries:
+                return response.get("data"), errors
+            reset_at = float(headers.get("x-ratelimit-reset", time.time()))
+            await asyncio.sleep(max(reset_at - time.time(), 0) + 1)
+
+    async def prepare(self, label_names):
+        """Look up the repository and label IDs (creating missing labels) in one query."""
+        names = sorted(set(label_names))
+        declared = "".join(f", $l{n}: String!" for n in range(len(names)))
+        lookups = " ".join(f"l{n}: label(name: $l{n}) {{ id }}" for n in range(len(names)))
+        variables = {"owner": self.owner, "name": self.repo, **{f"l{n}": name for n, name in enumerate(names)}}
+        data, errors = await self.query(
+            f"query($owner: String!, $name: String!{declared}) "
+            f"{{ repository(owner: $owner, name: $name) {{ id {lookups} }} }}", variables)
+        repository = (data or {}).get("repository")
+        if not repository:
+            raise GitHubError(f"GraphQL: repository {self.owner}/{self.repo}: "
+                              + (errors[0]["message"] if errors else "not found"))
+        self.repository_id = repository["id"]
+        for n, name in enumerate(names):
+            label = repository.get(f"l{n}")
+            if label is None:
+                # createIssue only takes existing label IDs; REST creates them on demand
+                _, _, label = await self.github.request(
+                    "POST", f"/repos/{self.owner}/{self.repo}/labels", {"name": name, "color": "ededed"})
+                label = {"id": label["node_id"]}
+            self.label_ids[name] = label["id"]
+
+    async def node_ids(self, numbers):
+        """{issue number: GraphQL ID} for existing issues, up to LOOKUPS_PER_QUERY per request."""
+        numbers = sorted({str(number) for number in numbers}, key=int)
+        found = {}
+        for start in range(0, len(numbers), LOOKUPS_PER_QUERY):
+            chunk = numbers[start:start + LOOKUPS_PER_QUERY]
+            lookups = " ".join(f"n{number}: issue(number: {int(number)}) {{ id }}" for number in chunk)
+            data, _ = await self.query(
+                f"query($owner: String!, $name: String!) "
+                f"{{ repository(owner: $owner, name: $name) {{ {lookups} }} }}", {"owner": self.owner, "name": self.repo})
+            repository = (data or {}).get("repository") or {}
+            for number in chunk:
+                if repository.get(f"n{number}"):
+                    found[number] = repository[f"n{number}"]["id"]
+        return found
+
+    def create(self, key, title, body, labels):
+        return Operation(key, "createIssue", {
+            "repositoryId": self.repository_id, "title": title, "body": body,
+            "labelIds": [self.label_ids[name] for name in labels if name in self.label_ids]})
+
+    def update(self, key, node_id, fields):
+        data = {"id": node_id, **{name: fields[name] for name in ("title", "body") if name in fields}}
+        if "state" in fields:
+            data["state"] = fields["state"].upper()
+        return Operation(key, "updateIssue", data)
+
+    async def _spend(self, points):
+        """Draw from the per-minute point budget, waiting for it to refill if needed."""
+        now = time.monotonic()
+        rate = self.points_per_minute / 60
+        self._points = min(self._points + (now - self._refilled) * rate, self.points_per_minute)
+        self._refilled = now
+        if self._points < points:
+            wait = (points - self._points) / rate
+            self.waited_s += wait
+            await asyncio.sleep(wait)
+            self._points = points
+            self._refilled = time.monotonic()
+        self._points -= points
+
+    async def run(self, operations, on_result=None):
+        """Apply every operation; returns {key: issue dict or GitHubError}.
+
+        on_result(operation, issue_or_error) is called as each batch completes.
+        """
+        results = {}
+
+        def finish(op, result):
+            results[op.key] = result
+            if on_result:
+                on_result(op, result)
+
+        queue = list(operations)
+        while queue:
+            pending = [queue[:self.sizer.size]]
+            queue = queue[self.sizer.size:]
+            while pending:
+                pending = [retry for batch in pending for retry in await self._run_batch(batch, finish)]
+        return results
+
+    async def _run_batch(self, batch, finish):
+        """Send one batch; returns the sub-batches to retry."""
+        await self._spend(MUTATION_COST * len(batch))
+        declared = ", ".join(f"$i{n}: {op.mutation[0].upper()}{op.mutation[1:]}Input!" for n, op in enumerate(batch))
+        fields = " ".join(f"m{n}: {op.mutation}(input: $i{n}) {{ issue {{ ...IssueFields }} }}" for n, op in enumerate(batch))
+        creates = any(op.mutation == "createIssue" for op in batch)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        started = time.monotonic()
+        try:
+            data, errors = await self.query(f"mutation({declared}) {{ {fields} }} {_ISSUE_FIELDS}",
+                                            {f"i{n}": op.input for n, op in enumerate(batch)}, idempotent=not creates)
+        except GitHubError as e:
+            if e.status is not None and e.status < 500:
+                for op in batch:
+                    finish(op, e)
+                return []
+            # Server error or timeout: some of the batch may have been applied
+            self.sizer.failure()
+            retry = []
+            for op in batch:
+                if op.mutation == "createIssue":
+                    finish(op, GitHubError(f"{e} (may have been created; the next sync reconciles it)", e.status))
+                else:
+                    retry.append(op)
+            if len(retry) > 1:
+                self.split_batches += 1
+                return _split(retry)
+            for op in retry:
+                finish(op, e)
+            return []
+
+        request_errors = [error for error in errors if not error.get("path")]
+        if request_errors:
+            # Refused as a whole before anything ran (e.g. node or complexity limits)
+            self._points += MUTATION_COST * len(batch)
+            self.sizer.failure(refused=len(batch))
+            if len(batch) > 1:
+                self.split_batches += 1
+                return _split(batch)
+            finish(batch[0], GitHubError(f"GraphQL: {request_errors[0].get('message')}"))
+            return []
+
+        self.sizer.success(time.monotonic() - started)
+        failed = {}
+        for error in errors:
+            failed.setdefault(error["path"][0], error.get("message", "failed"))
+        for n, op in enumerate(batch):
+            node = ((data or {}).get(f"m{n}") or {}).get("issue")
+            if f"m{n}" in failed or not node:
+                finish(op, GitHubError(f"GraphQL {op.mutation}: {failed.get(f'm{n}', 'no result')}"))
+            else:
+                finish(op, _issue(node))
+        return []
+
+
+async def create_issues(batcher, items, build_issue, journal, on_result=None):
+    """Batched create_issues() (sync.py): same results, journaling and callbacks."""
+    by_key = {item.id: item for item in items}
+    operations = []
+    for item in items:
+        title, body, labels = build_issue(item)
+        operations.append(batcher.create(item.id, title, body, [l.strip() for l in labels.split(",")]))
+
+    def finished(op, result):
+        item = by_key[op.key]
+        if not isinstance(result, Exception):
+            result = str(result["number"])
+            journal.record(item.id, result)
+        if on_result:
+            on_result(item, result)
+
+    results = await batcher.run(operations, finished)
+    return {key: result if isinstance(result, Exception) else str(result["number"]) for key, result in results.items()}
+
+
+async def push_changes(batcher, tracker, state, build_issue, on_result=None):
+    """Batched push_changes() (sync.py); returns the IDs pushed."""
+    rows = {item.id: (item, changes, fields) for item, changes, fields in changed_rows(tracker, state, build_issue)}
+
+    def known_node_id(item):
+        entry = state.items.get(item.id) or {}
+        return entry.get("node_id") if entry.get("issue") == item.issue else None
+
+    missing = await batcher.node_ids(item.issue for item, _, _ in rows.values() if not known_node_id(item))
+    operations = []
+    for item, changes, _ in rows.values():
+        node_id = known_node_id(item) or missing.get(item.issue)
+        if node_id:
+            operations.append(batcher.update(item.id, node_id, changes))
+        elif on_result:
+            on_result(item, GitHubError(f"issue #{item.issue} not found", 404))
+    pushed = []
+
+    def finished(op, result):
+        item, _, fields = rows[op.key]
+        if not isinstance(result, Exception):
+            result = record_push(tracker, state, item, fields, result)
+            pushed.append(item.id)
+        if on_result:
+            on_result(item, result)
+
+    await batcher.run(operations, finished)
+    return pushed
@@ -0,0 +1,240 @@
+"""
+In-memory model of docs/TRACKER_TESTING_UI.md.
+
+The file is read and parsed once into Tracker, which indexes items by ID,
+by GitHub issue number and by table. Mutations only touch the model; save()
+renders the tables back into the original text (rows that were not changed
+keep their exact original line) and replaces the file atomically via a
+temp file and rename, so an interrupted run never leaves a half-written
+tracker.
+
+    with Tracker.load(TRACKER_FILE) as tracker:
+        item = tracker.add("testing", "Login flow", "Integration", "P1", "...")
+        tracker.set_issue(item.id, "123")
+    # written once, on exit, if anything changed
+
+The scripts write through store.TrackerStore, which serializes writers and
+keeps an indexed SQLite copy of the rows; this module stays the markdown
+parser and renderer.
+"""
+
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+NOT_STARTED = ":white_circle: Not Started"
+DONE = ":green_circle: Done"
+
+# Table kind -> (ID prefix, name of the third column)
+TABLE_KINDS = {
+    "testing": ("TEST", "Category"),
+    "ui": ("UI", "Component"),
+}
+
+_HEADER_RE = re.compile(r"^\|\s*ID\s*\|\s*Title\s*\|\s*(\w+)\s*\|")
+_SEPARATOR_RE = re.compile(r"^\|\s*-{2,}")
+_ISSUE_RE = re.compile(r"^#(\d+)$")
+
+
+class TrackerError(Exception):
+    """The tracker file is missing, malformed, or a lookup failed."""
+
+
+def parse_table_line(line):
+    """Split a markdown table row into stripped cell values."""
+    parts = [p.strip() for p in line.strip().split("|")]
+    if parts and parts[0] == "":
+        parts = parts[1:]
+    if parts and parts[-1] == "":
+        parts = parts[:-1]
+    return parts
+
+
+@dataclass
+class TrackerItem:
+    """One row of the testing or UI table."""
+    id: str
+    title: str
+    area: str
+    priority: str
+    status: str
+    issue: str = None
+    notes: str = ""
+    kind: str = "testing"
+    raw: str = None
+
+    @property
+    def number(self):
+        return int(self.id.rsplit("-", 1)[1])
+
+    def render(self):
+        issue = f"#{self.issue}" if self.issue else "-"
+        return f"| {self.id} | {self.title} | {self.area} | {self.priority} | {self.status} | {issue} | {self.notes} |\n"
+
+    @classmethod
+    def from_line(cls, line, kind):
+        parts = parse_table_line(line)
+        if len(parts) < 6:
+            raise TrackerError(f"Malformed tracker row: {line.strip()}")
+        item_id, title, area, priority, status, issue = parts[:6]
+        notes = " | ".join(parts[6:])
+        match = _ISSUE_RE.match(issue)
+        return cls(item_id, title, area, priority, status, match.group(1) if match else None, notes, kind, line)
+
+
+@dataclass
+class TrackerTable:
+    """Location of one table in the file and its rows, in file order."""
+    kind: str
+    prefix: str
+    start: int
+    end: int
+    items: list = field(default_factory=list)
+
+
+class Tracker:
+    """Parsed tracker file with ID / issue / table indexes."""
+
+    def __init__(self, path, text):
+        self.path = Path(path)
+        self.lines = text.splitlines(keepends=True)
+        self.tables = {}
+        self.by_id = {}
+        self.by_issue = {}
+        self.dirty = False
+        self._parse()
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        if not path.exists():
+            raise TrackerError(f"Tracker file not found: {path}")
+        return cls(path, path.read_text(encoding="utf-8"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.save()
+
+    def _parse(self):
+        kinds = {column: kind for kind, (_, column) in TABLE_KINDS.items()}
+        i = 0
+        while i < len(self.lines):
+            match = _HEADER_RE.match(self.lines[i])
+            kind = kinds.get(match.group(1)) if match else None
+            if kind is None or i + 1 >= len(self.lines) or not _SEPARATOR_RE.match(self.lines[i + 1]):
+                i += 1
+                continue
+            start = end = i + 2
+            while end < len(self.lines) and self.lines[end].startswith("|"):
+                end += 1
+            table = TrackerTable(kind, TABLE_KINDS[kind][0], start, end)
+            for line in self.lines[start:end]:
+                item = TrackerItem.from_line(line, kind)
+                table.items.append(item)
+                self._index(item)
+            self.tables.setdefault(kind, table)
+            i = end
+
+    def _index(self, item):
+        self.by_id[item.id] = item
+        if item.issue:
+            self.by_issue[item.issue] = item
+
+    def table(self, kind):
+        if kind not in self.tables:
+            raise TrackerError(f"No {kind} table in {self.path}")
+        return self.tables[kind]
+
+    def get(self, key):
+        """Look up an item by ID (TEST-001) or issue number (#12 or 12)."""
+        key = key.strip()
+        item = self.by_id.get(key) or self.by_issue.get(key.lstrip("#"))
+        if item is None:
+            raise TrackerError(f"Could not find {key} in tracker")
+        return item
+
+    def items(self, kind=None):
+        kinds = [kind] if kind else list(self.tables)
+        return [item for k in kinds for item in self.table(k).items]
+
+    def pending(self, kind=None):
+        """Items without a GitHub issue, in file order."""
+        return [item for item in self.items(kind) if not item.issue]
+
+    def next_id(self, kind):
+        table = self.table(kind)
+        numbers = [item.number for item in table.items]
+        return f"{table.prefix}-{max(numbers, default=0) + 1:03d}"
+
+    def add(self, kind, title, area, priority, notes="", status=NOT_STARTED, item_id=None):
+        """Append a new row to the table of `kind` and return it.
+
+        Without `item_id` the next free ID in this file is used; writers that
+        may run concurrently should allocate IDs through store.TrackerStore.
+        """
+        table = self.table(kind)
+        item = TrackerItem(item_id or self.next_id(kind), title, area, priority, status, None, notes, kind)
+        table.items.append(item)
+        self._index(item)
+        self.dirty = True
+        return item
+
+    def _update(self, item_id, **changes):
+        item = self.get(item_id)
+        for name, value in changes.items():
+            if getattr(item, name) != value:
+                setattr(item, name, value)
+                item.raw = None
+                self.dirty = True
+        return item
+
+    def set_issue(self, item_id, issue_number):
+        item = self._update(item_id, issue=str(issue_number))
+        self.by_issue[item.issue] = item
+        return item
+
+    def set_status(self, item_id, status):
+        return self._update(item_id, status=status)
+
+    def render(self):
+        return "".join(self._render_lines())
+
+    def _render_lines(self):
+        lines = list(self.lines)
+        for table in sorted(self.tables.values(), key=lambda t: t.start, reverse=True):
+            lines[table.start:table.end] = [item.raw or item.render() for item in table.items]
+        return lines
+
+    def save(self):
+        """Write the tracker once, atomically. No-op if nothing changed."""
+        if not self.dirty:
+            return False
+        lines = self._render_lines()
+        text = "".join(lines)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, os.stat(self.path).st_mode & 0o777)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        shift = 0
+        for table in sorted(self.tables.values(), key=lambda t: t.start):
+            old_rows = table.end - table.start
+            table.start += shift
+            table.end = table.start + len(table.items)
+            shift += len(table.items) - old_rows
+            for item in table.items:
+                item.raw = item.raw or item.render()
+        self.lines = lines
+        self.dirty = False
+        return True
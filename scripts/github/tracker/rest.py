@@ -0,0 +1,185 @@
+"""
+One-request-at-a-time GitHub access: the auth check, and issue creation
+through the REST API (urllib) or the GitHub CLI.
+
+urllib is imported where it is used: it pulls in http.client, email and ssl,
+which commands that only touch the tracker (or hit the cached auth check)
+never need.
+"""
+
+import json
+import re
+import subprocess
+
+from . import auth as auth_cache
+from .config import GITHUB_API_BASE, REPO_NAME, REPO_OWNER, get_github_token
+
+
+def check_github_access(dry_run=False):
+    """Check if we have access to GitHub (via CLI or token)."""
+    if dry_run:
+        return True  # Skip check in dry-run mode
+
+    # First, try to get token
+    token = get_github_token()
+
+    # Reuse a recent successful check made with the same credentials
+    cached = auth_cache.lookup(token, GITHUB_API_BASE)
+    if cached:
+        if cached["method"] == "cli":
+            print("✅ Using GitHub CLI for authentication (cached)")
+        else:
+            print(f"✅ Using GitHub token (authenticated as: {cached.get('login') or 'unknown'}, cached)")
+        return cached["method"]
+
+    # Try GitHub CLI if available
+    try:
+        result = subprocess.run(["gh", "--version"], capture_output=True, text=True, timeout=2)
+        if result.returncode == 0:
+            # Check if authenticated
+            auth_result = subprocess.run(["gh", "auth", "status"], capture_output=True, text=True, timeout=2)
+            if auth_result.returncode == 0:
+                print("✅ Using GitHub CLI for authentication")
+                auth_cache.store(token, "cli", api_base=GITHUB_API_BASE)
+                return "cli"
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+    # Try token-based authentication
+    if token:
+        from urllib.error import HTTPError
+        from urllib.request import Request, urlopen
+        # Test token by making an API call
+        try:
+            req = Request(f"{GITHUB_API_BASE}/user")
+            req.add_header("Authorization", f"token {token}")
+            req.add_header("Accept", "application/vnd.github.v3+json")
+
+            with urlopen(req, timeout=5) as response:
+                if response.status == 200:
+                    user_data = json.loads(response.read().decode())
+                    print(f"✅ Using GitHub token (authenticated as: {user_data.get('login', 'unknown')})")
+                    auth_cache.store(token, "token", user_data.get("login"), GITHUB_API_BASE)
+                    return "token"
+                else:
+                    print(f"⚠️  Token authentication failed: {response.status}")
+        except HTTPError as e:
+            print(f"⚠️  Token authentication failed: {e.code}")
+        except Exception as e:
+            print(f"⚠️  Error testing token: {e}")
+
+    # No access method found
+    print("❌ No GitHub access method found")
+    print("\nOptions:")
+    print("1. Install GitHub CLI: brew install gh && gh auth login")
+    print("2. Set GITHUB_TOKEN environment variable")
+    print("3. Add GITHUB_TOKEN to ~/.devbridge_tokens file")
+    return None
+
+
+def create_issue(title, body, labels, auth_method="cli", dry_run=False):
+    """Create a GitHub issue and return the issue number."""
+    if dry_run:
+        # Simulate issue creation in dry-run mode
+        import random
+        fake_issue_number = str(random.randint(1000, 9999))
+        print(f"🔍 [DRY RUN] Would create issue #{fake_issue_number}")
+        print(f"   Title: {title}")
+        print(f"   Labels: {labels}")
+        print(f"   Body preview: {body[:100]}...")
+        return fake_issue_number
+
+    # Try GitHub API with token first (more reliable)
+    token = get_github_token()
+    if token and auth_method in ("token", None):
+        return create_issue_via_api(title, body, labels, token)
+
+    # Fallback to GitHub CLI
+    if auth_method == "cli":
+        return create_issue_via_cli(title, body, labels)
+
+    print("❌ No authentication method available")
+    return None
+
+
+def create_issue_via_api(title, body, labels, token):
+    """Create issue using GitHub API."""
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+
+    url = f"{GITHUB_API_BASE}/repos/{REPO_OWNER}/{REPO_NAME}/issues"
+
+    # Parse labels (comma-separated string)
+    label_list = [l.strip() for l in labels.split(",")]
+
+    data = {
+        "title": title,
+        "body": body,
+        "labels": label_list
+    }
+
+    try:
+        req = Request(url)
+        req.add_header("Authorization", f"token {token}")
+        req.add_header("Accept", "application/vnd.github.v3+json")
+        req.add_header("Content-Type", "application/json")
+        req.data = json.dumps(data).encode('utf-8')
+        req.method = "POST"
+
+        with urlopen(req, timeout=10) as response:
+            if response.status == 201:
+                issue_data = json.loads(response.read().decode())
+                issue_number = str(issue_data["number"])
+                print(f"✅ Created issue #{issue_number}")
+                return issue_number
+            else:
+                error_body = response.read().decode()
+                print(f"❌ Failed to create issue: {response.status}")
+                print(f"   Response: {error_body[:200]}")
+                return None
+    except HTTPError as e:
+        error_body = e.read().decode() if hasattr(e, 'read') else str(e)
+        if e.code == 401:
+            auth_cache.invalidate(token, GITHUB_API_BASE)
+        print(f"❌ Failed to create issue: {e.code}")
+        print(f"   Response: {error_body[:200]}")
+        return None
+    except Exception as e:
+        print(f"❌ Error creating issue via API: {e}")
+        return None
+
+
+def create_issue_via_cli(title, body, labels):
+    """Create issue using GitHub CLI."""
+    try:
+        cmd = [
+            "gh", "issue", "create",
+            "--repo", f"{REPO_OWNER}/{REPO_NAME}",
+            "--title", title,
+            "--body", body,
+            "--label", labels
+        ]
+
+        result = subprocess.run(cmd, capture_output=True, text=True)
+
+        if result.returncode != 0:
+            if "401" in result.stderr or "auth" in result.stderr.lower():
+                auth_cache.invalidate(get_github_token(), GITHUB_API_BASE)
+            print(f"❌ Failed to create issue: {title}")
+            print(result.stderr)
+            return None
+
+        # Extract issue number from output
+        output = result.stdout.strip()
+        match = re.search(r'/issues/(\d+)', output)
+        if match:
+            issue_number = match.group(1)
+            print(f"✅ Created issue #{issue_number}")
+            return issue_number
+        else:
+            print(f"❌ Could not extract issue number from: {output}")
+            return None
+
+    except Exception as e:
+        print(f"❌ Error creating issue via CLI: {e}")
+        return None
@@ -0,0 +1,378 @@
+"""
+Local stand-in for the parts of the GitHub REST API the tracker scripts use.
+
+Serves GET /user, GET/POST /repos/{owner}/{repo}/issues,
+GET/PATCH /repos/{owner}/{repo}/issues/{number}, POST .../labels and the
+POST /graphql documents tracker/graphql.py sends (repository/label/issue
+lookups and aliased createIssue/updateIssue mutations) over keep-alive HTTP/1.1,
+with ETags (If-None-Match -> 304, which like GitHub does not count against
+the rate limit) and GitHub's rate-limit behaviour, so sync runs can be
+tested end to end:
+
+- primary limit: `rate_limit` requests per `rate_window_s`, reported in
+  X-RateLimit-Limit/Remaining/Used/Reset; over budget -> 403 "API rate
+  limit exceeded" with X-RateLimit-Remaining: 0.
+- secondary limit: more than `secondary_burst` issue creations within
+  `secondary_window_s`, or more than `max_concurrent` requests in flight,
+  -> 403 "secondary rate limit" with Retry-After. For GraphQL, more than
+  `graphql_points_per_minute` points (5 per mutation, 1 per query) in a
+  minute does the same.
+- GraphQL requests with more than `graphql_max_mutations` mutations are
+  refused as a whole (MAX_NODE_LIMIT_EXCEEDED); `mutation_ms` adds service
+  time per mutation. A blank title or unknown issue ID fails just that
+  mutation, with the error's path naming its alias.
+
+Any token in `tokens` is accepted (default: "standin").
+
+Usage:
+    python3 scripts/github/tracker/standin.py --port 8788 --secondary-burst 10
+
+and, in another shell, point the sync at it:
+
+    GITHUB_API_BASE=http://127.0.0.1:8788 GITHUB_TOKEN=standin ./scripts/github/sync-tracker-to-github.py
+
+GITHUB_API_BASE is read when tracker/config.py is imported, so an
+in-process GitHubStandIn() (also a context manager, with .base_url) needs
+the sync run as a subprocess with that environment.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_ISSUES_RE = re.compile(r"^/repos/([^/]+)/([^/]+)/issues$")
+_ISSUE_RE = re.compile(r"^/repos/([^/]+)/([^/]+)/issues/(\d+)$")
+_LABELS_RE = re.compile(r"^/repos/([^/]+)/([^/]+)/labels$")
+_GQL_MUTATION_RE = re.compile(r"(\w+): (createIssue|updateIssue)\(input: \$(\w+)\)")
+_GQL_LABEL_RE = re.compile(r"(\w+): label\(name: \$(\w+)\)")
+_GQL_ISSUE_RE = re.compile(r"(\w+): issue\(number: (\d+)\)")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self.server.standin.dispatch(
+            self.command, self.path, {k.lower(): v for k, v in self.headers.items()}, body)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PATCH = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class GitHubStandIn:
+    """Threaded in-memory GitHub issues API with primary and secondary rate limits."""
+
+    def __init__(self, host="127.0.0.1", port=0, tokens=("standin",), rate_limit=5000, rate_window_s=3600,
+                 secondary_burst=None, secondary_window_s=10, secondary_retry_after=1,
+                 max_concurrent=None, latency_ms=0, graphql_max_mutations=100, graphql_points_per_minute=None,
+                 mutation_ms=0):
+        self.tokens = set(tokens)
+        self.rate_limit = rate_limit
+        self.rate_window_s = rate_window_s
+        self.secondary_burst = secondary_burst
+        self.secondary_window_s = secondary_window_s
+        self.secondary_retry_after = secondary_retry_after
+        self.max_concurrent = max_concurrent
+        self.latency_ms = latency_ms
+        self.graphql_max_mutations = graphql_max_mutations
+        self.graphql_points_per_minute = graphql_points_per_minute
+        self.mutation_ms = mutation_ms
+        self.issues = {}
+        self.labels = {}
+        self._points = deque()
+        self._updates = {}
+        self._clock = 0
+        self.hits = Counter()
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._window_start = None
+        self._used = 0
+        self._creations = deque()
+        self._server = _Server((host, port), _Handler)
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _json(self, data, status=200, headers=None):
+        return status, {"Content-Type": "application/json; charset=utf-8", **(headers or {})}, json.dumps(data).encode()
+
+    def _conditional(self, data, request_headers, headers):
+        """200 with an ETag, or 304 (refunding the rate-limit budget) if If-None-Match matches."""
+        body = json.dumps(data).encode()
+        etag = 'W/"%s"' % hashlib.md5(body).hexdigest()
+        if request_headers.get("if-none-match") == etag:
+            self._used -= 1
+            self.hits["not_modified"] += 1
+            return 304, {**self._rate_headers(), "ETag": etag}, b""
+        return 200, {"Content-Type": "application/json; charset=utf-8", **headers, "ETag": etag}, body
+
+    def _touch(self, issue):
+        self._clock += 1
+        self._updates[issue["number"]] = self._clock
+        issue["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    def _rate_headers(self):
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(self.rate_limit - self._used, 0)),
+            "X-RateLimit-Used": str(self._used),
+            "X-RateLimit-Reset": str(int(self._window_start + self.rate_window_s)),
+            "X-RateLimit-Resource": "core",
+        }
+
+    def _label(self, name):
+        if name not in self.labels:
+            self.labels[name] = {"id": len(self.labels) + 1, "node_id": f"LA_{len(self.labels) + 1}", "name": name}
+        return self.labels[name]
+
+    def _create(self, owner, repo, title, body, label_names):
+        number = len(self.issues) + 1
+        self.issues[number] = {
+            "number": number, "node_id": f"I_{number}", "state": "open", "title": title, "body": body,
+            "labels": [{"name": self._label(name)["name"]} for name in label_names],
+            "html_url": f"https://github.com/{owner}/{repo}/issues/{number}",
+        }
+        self._touch(self.issues[number])
+        return self.issues[number]
+
+    def _graphql(self, document, variables):
+        """Execute the subset of GraphQL the batcher sends; returns the response dict."""
+        query = document.strip()
+        if not query.startswith("mutation"):
+            repository = {"id": f"R_{variables.get('owner')}/{variables.get('name')}"}
+            for alias, var in _GQL_LABEL_RE.findall(query):
+                label = self.labels.get(variables.get(var))
+                repository[alias] = {"id": label["node_id"]} if label else None
+            errors = []
+            for alias, number in _GQL_ISSUE_RE.findall(query):
+                issue = self.issues.get(int(number))
+                repository[alias] = {"id": issue["node_id"]} if issue else None
+                if issue is None:
+                    errors.append({"type": "NOT_FOUND", "path": ["repository", alias],
+                                   "message": f"Could not resolve to an Issue with the number of {number}."})
+            return {"data": {"repository": repository}, **({"errors": errors} if errors else {})}
+
+        mutations = _GQL_MUTATION_RE.findall(query)
+        if len(mutations) > self.graphql_max_mutations:
+            self.hits["graphql_refused"] += 1
+            return {"errors": [{"type": "MAX_NODE_LIMIT_EXCEEDED",
+                                "message": f"This query requests {len(mutations)} mutations, "
+                                           f"which exceeds the maximum of {self.graphql_max_mutations}."}]}
+        labels_by_id = {label["node_id"]: name for name, label in self.labels.items()}
+        data, errors = {}, []
+        for alias, mutation, var in mutations:
+            data_in = variables.get(var) or {}
+            self.hits[f"graphql {mutation}"] += 1
+            if mutation == "createIssue":
+                if not (data_in.get("title") or "").strip():
+                    issue, message = None, "Title can't be blank"
+                else:
+                    owner, _, repo = data_in.get("repositoryId", "R_/")[2:].partition("/")
+                    issue, message = self._create(owner, repo, data_in["title"], data_in.get("body", ""),
+                                                  [labels_by_id[l] for l in data_in.get("labelIds", []) if l in labels_by_id]), None
+            else:
+                number = data_in.get("id", "")[2:]
+                issue = self.issues.get(int(number)) if number.isdigit() else None
+                message = None if issue else f"Could not resolve to a node with the global id of '{data_in.get('id')}'"
+                if issue:
+                    for key in ("title", "body"):
+                        if key in data_in:
+                            issue[key] = data_in[key]
+                    if "state" in data_in:
+                        issue["state"] = data_in["state"].lower()
+                    self._touch(issue)
+            if issue is None:
+                data[alias] = None
+                errors.append({"type": "UNPROCESSABLE" if mutation == "createIssue" else "NOT_FOUND",
+                               "path": [alias], "message": message})
+            else:
+                data[alias] = {"issue": {"id": issue["node_id"], "number": issue["number"],
+                                         "state": issue["state"].upper(), "updatedAt": issue["updated_at"]}}
+        return {"data": data, **({"errors": errors} if errors else {})}
+
+    def _admit(self, method, path, body=b""):
+        """Apply the rate limits; returns a rejection response or None."""
+        now = time.time()
+        with self._lock:
+            if self._window_start is None or now >= self._window_start + self.rate_window_s:
+                self._window_start, self._used = now, 0
+            if self._used >= self.rate_limit:
+                self.hits["rejected_primary"] += 1
+                return self._json({"message": "API rate limit exceeded for user."}, 403, self._rate_headers())
+            self._used += 1
+            rate_headers = self._rate_headers()
+            secondary = self.max_concurrent is not None and self._in_flight > self.max_concurrent
+            if method == "POST" and _ISSUES_RE.match(path) and self.secondary_burst is not None:
+                while self._creations and self._creations[0] <= now - self.secondary_window_s:
+                    self._creations.popleft()
+                if len(self._creations) >= self.secondary_burst:
+                    secondary = True
+                else:
+                    self._creations.append(now)
+            if path == "/graphql" and self.graphql_points_per_minute is not None:
+                points = 1 + 5 * len(_GQL_MUTATION_RE.findall(body.decode("utf-8", "replace")))
+                while self._points and self._points[0][0] <= now - 60:
+                    self._points.popleft()
+                if sum(spent for _, spent in self._points) + points > self.graphql_points_per_minute:
+                    secondary = True
+                else:
+                    self._points.append((now, points))
+            if secondary:
+                self.hits["rejected_secondary"] += 1
+                return self._json(
+                    {"message": "You have exceeded a secondary rate limit. Please wait a few minutes before you try again."},
+                    403, {**rate_headers, "Retry-After": str(self.secondary_retry_after)})
+        return None
+
+    def dispatch(self, method, raw_path, headers, body):
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            return self._dispatch(method, raw_path, headers, body)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _dispatch(self, method, raw_path, headers, body):
+        parts = urlsplit(raw_path)
+        path, query = parts.path, {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        auth = headers.get("authorization", "")
+        if auth.split(" ", 1)[-1] not in self.tokens:
+            self.hits["unauthorized"] += 1
+            return self._json({"message": "Bad credentials"}, 401)
+        rejected = self._admit(method, path, body)
+        if rejected:
+            return rejected
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if path == "/graphql" and self.mutation_ms:
+            time.sleep(self.mutation_ms * len(_GQL_MUTATION_RE.findall(body.decode("utf-8", "replace"))) / 1000)
+        with self._lock:
+            self.hits[f"{method} {re.sub(r'/[0-9]+$', '/{number}', path)}"] += 1
+            rate_headers = self._rate_headers()
+            if path == "/user" and method == "GET":
+                return self._json({"login": "standin-bot", "id": 1}, headers=rate_headers)
+            if path == "/graphql" and method == "POST":
+                request = json.loads(body or b"{}")
+                return self._json(self._graphql(request.get("query", ""), request.get("variables") or {}),
+                                  headers={**rate_headers, "X-RateLimit-Resource": "graphql"})
+            match = _LABELS_RE.match(path)
+            if match and method == "POST":
+                name = json.loads(body or b"{}").get("name", "")
+                if name in self.labels:
+                    return self._json({"message": "Validation Failed"}, 422, rate_headers)
+                return self._json(self._label(name), 201, rate_headers)
+            match = _ISSUES_RE.match(path)
+            if match and method == "POST":
+                data = json.loads(body or b"{}")
+                issue = self._create(match.group(1), match.group(2), data.get("title", ""), data.get("body", ""),
+                                     data.get("labels", []))
+                return self._json(issue, 201, rate_headers)
+            if match and method == "GET":
+                wanted = set(filter(None, query.get("labels", "").split(",")))
+                state = query.get("state", "open")
+                per_page = min(int(query.get("per_page", 30)), 100)
+                page = int(query.get("page", 1))
+                if query.get("sort") == "updated":
+                    order = sorted(self.issues, key=self._updates.get, reverse=query.get("direction", "desc") == "desc")
+                else:
+                    order = sorted(self.issues, reverse=True)
+                matching = [self.issues[n] for n in order
+                            if (state == "all" or self.issues[n]["state"] == state)
+                            and wanted <= {label["name"] for label in self.issues[n]["labels"]}]
+                return self._conditional(matching[(page - 1) * per_page:page * per_page], headers, rate_headers)
+            match = _ISSUE_RE.match(path)
+            if match:
+                issue = self.issues.get(int(match.group(3)))
+                if issue is None:
+                    return self._json({"message": "Not Found"}, 404, rate_headers)
+                if method == "PATCH":
+                    data = json.loads(body or b"{}")
+                    for key in ("title", "body", "state"):
+                        if key in data:
+                            issue[key] = data[key]
+                    if "labels" in data:
+                        issue["labels"] = [{"name": name} for name in data["labels"]]
+                    self._touch(issue)
+                    return self._json(issue, headers=rate_headers)
+                return self._conditional(issue, headers, rate_headers)
+        return self._json({"message": "Not Found"}, 404)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the GitHub issues API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8788)
+    parser.add_argument("--token", action="append", default=None, help="accepted token (repeatable; default: standin)")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="requests per rate window")
+    parser.add_argument("--rate-window", type=float, default=3600, help="primary rate window in seconds")
+    parser.add_argument("--secondary-burst", type=int, default=None, help="issue creations allowed per secondary window")
+    parser.add_argument("--secondary-window", type=float, default=10)
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After sent on secondary limits")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="in-flight requests before a secondary limit")
+    parser.add_argument("--latency-ms", type=float, default=0, help="service time per request")
+    parser.add_argument("--graphql-max-mutations", type=int, default=100, help="mutations accepted per GraphQL request")
+    parser.add_argument("--graphql-points", type=int, default=None, help="GraphQL points allowed per minute")
+    parser.add_argument("--mutation-ms", type=float, default=0, help="extra service time per GraphQL mutation")
+    args = parser.parse_args()
+
+    server = GitHubStandIn(args.host, args.port, tokens=args.token or ("standin",), rate_limit=args.rate_limit,
+                           rate_window_s=args.rate_window, secondary_burst=args.secondary_burst,
+                           secondary_window_s=args.secondary_window, secondary_retry_after=args.retry_after,
+                           max_concurrent=args.max_concurrent, latency_ms=args.latency_ms,
+                           graphql_max_mutations=args.graphql_max_mutations,
+                           graphql_points_per_minute=args.graphql_points, mutation_ms=args.mutation_ms)
+    print(f"GitHub stand-in at {server.base_url} (token: {', '.join(server.tokens)})")
+    print(f"  GITHUB_API_BASE={server.base_url} GITHUB_TOKEN=standin ./scripts/github/sync-tracker-to-github.py")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
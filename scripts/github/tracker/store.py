@@ -0,0 +1,343 @@
+"""
+SQLite store behind the tracker markdown.
+
+docs/TRACKER_TESTING_UI.md stays the human view. Next to it,
+.TRACKER_TESTING_UI.md.db holds the same rows in an indexed table (by ID,
+issue number and status) plus a per-table ID counter, and every write goes
+through one SQLite transaction (WAL mode, BEGIN IMMEDIATE) that:
+
+1. re-imports the markdown if it changed since the store last wrote it
+   (edits by hand, git pulls), so the file never silently loses a change;
+2. applies the change, allocating new IDs from the counter (IDs are never
+   reused, even after a row is deleted from the markdown);
+3. re-renders only the changed rows into the markdown - model.Tracker keeps
+   every other line byte-for-byte - and replaces the file atomically;
+4. commits.
+
+Concurrent writers queue on the SQLite write lock instead of handing out
+the same ID or overwriting each other's rows, and lookups such as
+`store.get("#123")` or a duplicate-title check (title_hash) are indexed
+queries rather than a scan of the file. add_many() imports a whole batch
+in one transaction and one markdown write.
+
+    store = TrackerStore.open(TRACKER_FILE)
+    item = store.add("testing", "Login flow", "Integration", "P1", "...")
+    store.set_issue(item.id, "123")
+    store.set_status("#123", DONE)
+"""
+
+import hashlib
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+from .model import NOT_STARTED, TABLE_KINDS, Tracker, TrackerError, TrackerItem
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    area TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    status TEXT NOT NULL,
+    issue TEXT,
+    notes TEXT NOT NULL DEFAULT '',
+    title_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS items_issue ON items (issue) WHERE issue IS NOT NULL;
+CREATE INDEX IF NOT EXISTS items_status ON items (kind, status);
+CREATE TABLE IF NOT EXISTS counters (kind TEXT PRIMARY KEY, next INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_FIELDS = ("title", "area", "priority", "status", "issue", "notes")
+
+
+def title_hash(title):
+    """Hash of a title ignoring case, punctuation and spacing: "Login flow!" == "login  FLOW"."""
+    words = re.findall(r"\w+", title.casefold())
+    return hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest()[:16]
+
+
+def _item(row):
+    return TrackerItem(row["id"], row["title"], row["area"], row["priority"], row["status"], row["issue"],
+                       row["notes"], row["kind"])
+
+
+class TrackerStore:
+    """Indexed, transactional copy of the tracker that keeps the markdown rendered."""
+
+    def __init__(self, markdown_path, timeout=30):
+        self.path = Path(markdown_path)
+        self.db_path = self.path.parent / f".{self.path.name}.db"
+        self._db = sqlite3.connect(self.db_path, timeout=timeout, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._migrate()
+        self._depth = 0
+        self._changed = set()
+        self._rendered = None  # (file stamp, Tracker) from our last render, reused while the file is unchanged
+
+    @classmethod
+    def open(cls, markdown_path):
+        if not Path(markdown_path).exists():
+            raise TrackerError(f"Tracker file not found: {markdown_path}")
+        return cls(markdown_path)
+
+    def close(self):
+        self._db.close()
+
+    def _columns(self):
+        return {row["name"] for row in self._db.execute("PRAGMA table_info(items)")}
+
+    def _migrate(self):
+        if "title_hash" not in self._columns():  # a database from before bulk import
+            self._db.execute("BEGIN IMMEDIATE")
+            if "title_hash" not in self._columns():
+                self._db.execute("ALTER TABLE items ADD COLUMN title_hash TEXT")
+                for row in self._db.execute("SELECT id, title FROM items").fetchall():
+                    self._db.execute("UPDATE items SET title_hash = ? WHERE id = ?",
+                                     (title_hash(row["title"]), row["id"]))
+            self._db.execute("COMMIT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS items_title ON items (kind, title_hash)")
+
+    # -- markdown <-> database ------------------------------------------------
+
+    def _meta(self, key):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key, value):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _file_stamp(self):
+        stat = self.path.stat()
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _stale(self):
+        return self._meta("markdown_stamp") != self._file_stamp()
+
+    def _refresh(self):
+        """Re-import the markdown if it changed since we last wrote it (in a write transaction)."""
+        if not self._stale():
+            return
+        text = self.path.read_text(encoding="utf-8")
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if digest != self._meta("markdown_sha256"):
+            tracker = Tracker(self.path, text)
+            self._db.execute("DELETE FROM items")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO items (id, kind, number, title, area, priority, status, issue, notes, "
+                "title_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(item.id, item.kind, item.number, item.title, item.area, item.priority, item.status, item.issue,
+                  item.notes, title_hash(item.title)) for item in tracker.items()])
+            for kind in tracker.tables:
+                self._db.execute(
+                    "INSERT INTO counters (kind, next) VALUES (?, 1) ON CONFLICT (kind) DO NOTHING", (kind,))
+                self._db.execute(
+                    "UPDATE counters SET next = max(next, (SELECT coalesce(max(number), 0) + 1 FROM items "
+                    "WHERE kind = ?)) WHERE kind = ?", (kind, kind))
+            self._set_meta("markdown_sha256", digest)
+        self._set_meta("markdown_stamp", self._file_stamp())
+
+    def _render(self):
+        """Write the rows changed in this transaction into the markdown, leaving other lines as they are."""
+        stamp = self._file_stamp()
+        if self._rendered and self._rendered[0] == stamp:
+            tracker = self._rendered[1]
+        else:
+            tracker = Tracker.load(self.path)
+        self._rendered = None
+        marks = ",".join("?" * len(self._changed))
+        for row in self._db.execute(f"SELECT * FROM items WHERE id IN ({marks}) ORDER BY kind, number",
+                                    sorted(self._changed)):
+            if row["id"] in tracker.by_id:
+                tracker._update(row["id"], **{name: row[name] for name in _FIELDS if name != "issue"})
+            else:
+                tracker.add(row["kind"], row["title"], row["area"], row["priority"], row["notes"], row["status"],
+                            item_id=row["id"])
+            if row["issue"]:
+                tracker.set_issue(row["id"], row["issue"])
+            else:
+                tracker._update(row["id"], issue=None)
+        if tracker.save():
+            self._set_meta("markdown_sha256", hashlib.sha256(tracker.render().encode("utf-8")).hexdigest())
+            stamp = self._file_stamp()
+            self._set_meta("markdown_stamp", stamp)
+        self._rendered = (stamp, tracker)
+
+    @contextmanager
+    def transaction(self):
+        """One atomic write: refresh, change, render the markdown, commit. Nests."""
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+        self._db.execute("BEGIN IMMEDIATE")
+        self._depth = 1
+        try:
+            self._refresh()
+            yield self
+            if self._changed:
+                self._render()
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            self._rendered = None
+            raise
+        finally:
+            self._depth = 0
+            self._changed = set()
+
+    def _fresh(self):
+        """Bring the database up to date with the markdown before a read."""
+        if self._stale():
+            with self.transaction():
+                pass
+
+    # -- reads ----------------------------------------------------------------
+
+    def _row(self, key):
+        key = key.strip()
+        row = self._db.execute("SELECT * FROM items WHERE id = ?", (key,)).fetchone()
+        if row is None:
+            row = self._db.execute("SELECT * FROM items WHERE issue = ? ORDER BY kind, number",
+                                   (key.lstrip("#"),)).fetchone()
+        if row is None:
+            raise TrackerError(f"Could not find {key} in tracker")
+        return row
+
+    def get(self, key):
+        """Look up an item by ID (TEST-001) or issue number (#12 or 12)."""
+        if not self._depth:
+            self._fresh()
+        return _item(self._row(key))
+
+    def items(self, kind=None, status=None):
+        if not self._depth:
+            self._fresh()
+        query, args = "SELECT * FROM items WHERE 1", []
+        if kind:
+            query, args = query + " AND kind = ?", args + [kind]
+        if status:
+            query, args = query + " AND status = ?", args + [status]
+        return [_item(row) for row in self._db.execute(query + " ORDER BY kind, number", args)]
+
+    def duplicate_of(self, kind, title):
+        """ID of the first `kind` row whose title normalizes to the same as `title`, or None."""
+        if not self._depth:
+            self._fresh()
+        row = self._db.execute("SELECT id FROM items WHERE kind = ? AND title_hash = ? ORDER BY number",
+                               (kind, title_hash(title))).fetchone()
+        return row["id"] if row else None
+
+    def pending(self, kind=None):
+        """Items without a GitHub issue."""
+        return [item for item in self.items(kind) if not item.issue]
+
+    # -- writes ---------------------------------------------------------------
+
+    def _allocate(self, kind):
+        """Next ID for `kind`; callers hold the write transaction."""
+        if kind not in TABLE_KINDS:
+            raise TrackerError(f"Unknown tracker table: {kind}")
+        row = self._db.execute("SELECT next FROM counters WHERE kind = ?", (kind,)).fetchone()
+        if row is None:
+            raise TrackerError(f"No {kind} table in {self.path}")
+        self._db.execute("UPDATE counters SET next = next + 1 WHERE kind = ?", (kind,))
+        return f"{TABLE_KINDS[kind][0]}-{row['next']:03d}", row["next"]
+
+    def _insert(self, kind, title, area, priority, notes, status):
+        item_id, number = self._allocate(kind)
+        self._db.execute(
+            "INSERT INTO items (id, kind, number, title, area, priority, status, issue, notes, title_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?, ?)",
+            (item_id, kind, number, title, area, priority, status, notes, title_hash(title)))
+        self._changed.add(item_id)
+        return item_id
+
+    def add(self, kind, title, area, priority, notes="", status=NOT_STARTED):
+        """Append a row with a freshly allocated ID and return it."""
+        with self.transaction():
+            return self.get(self._insert(kind, title, area, priority, notes, status))
+
+    def add_many(self, rows):
+        """Add rows (dicts of kind, title, area, priority and optionally notes, status) in one transaction.
+
+        `rows` may be any iterable and is consumed as it goes. A row whose
+        title matches an existing row of the same kind, or an earlier row of
+        this batch, after normalization (title_hash) is skipped. IDs are
+        allocated and the markdown written once for the whole batch.
+        Returns (added items, [(row, ID of the row it duplicates)]).
+        """
+        added, duplicates = [], []
+        with self.transaction():
+            for row in rows:
+                existing = self.duplicate_of(row["kind"], row["title"])
+                if existing:
+                    duplicates.append((row, existing))
+                    continue
+                added.append(self._insert(row["kind"], row["title"], row["area"], row["priority"],
+                                          row.get("notes", ""), row.get("status") or NOT_STARTED))
+            return [self.get(item_id) for item_id in added], duplicates
+
+    def update(self, key, **changes):
+        unknown = set(changes) - set(_FIELDS)
+        if unknown:
+            raise TrackerError(f"Unknown tracker field(s): {', '.join(sorted(unknown))}")
+        with self.transaction():
+            row = self._row(key)
+            changes = {name: value for name, value in changes.items() if row[name] != value}
+            if changes:
+                if "title" in changes:
+                    changes["title_hash"] = title_hash(changes["title"])
+                assignments = ", ".join(f"{name} = ?" for name in changes)
+                self._db.execute(f"UPDATE items SET {assignments} WHERE id = ?", (*changes.values(), row["id"]))
+                self._changed.add(row["id"])
+            return self.get(row["id"])
+
+    def set_issue(self, key, issue_number):
+        return self.update(key, issue=str(issue_number))
+
+    def set_status(self, key, status):
+        return self.update(key, status=status)
+
+    def save_tracker(self, tracker):
+        """Write the rows changed in an in-memory Tracker (e.g. by a sync) through the store.
+
+        Each changed row is written whole, so for the same row the last
+        writer wins; rows changed by other writers meanwhile are kept.
+        Returns True if anything was written.
+        """
+        if not tracker.dirty:
+            return False
+        with self.transaction():
+            for item in tracker.items():
+                if item.raw is not None:
+                    continue  # unchanged since it was read
+                fields = {"title": item.title, "area": item.area, "priority": item.priority,
+                          "status": item.status, "issue": item.issue, "notes": item.notes,
+                          "title_hash": title_hash(item.title)}
+                exists = self._db.execute("SELECT 1 FROM items WHERE id = ?", (item.id,)).fetchone()
+                if exists:
+                    assignments = ", ".join(f"{name} = ?" for name in fields)
+                    self._db.execute(f"UPDATE items SET {assignments} WHERE id = ?", (*fields.values(), item.id))
+                else:
+                    self._db.execute(
+                        "INSERT INTO items (id, kind, number, title, area, priority, status, issue, notes, title_hash) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (item.id, item.kind, item.number, *fields.values()))
+                    self._db.execute("UPDATE counters SET next = max(next, ?) WHERE kind = ?",
+                                     (item.number + 1, item.kind))
+                self._changed.add(item.id)
+        for item in tracker.items():
+            item.raw = item.raw or item.render()
+        tracker.dirty = False
+        return True
@@ -0,0 +1,317 @@
+"""
+Concurrent creation of GitHub issues for pending tracker rows, and the
+incremental two-way sync of rows that already have one.
+
+A sync can be interrupted at any point and re-run safely:
+
+- every created issue is appended to a journal next to the tracker
+  (.TRACKER_TESTING_UI.md.sync-journal) and fsynced before anything else
+  happens, so numbers survive a crash before the tracker is saved; the next
+  run replays the journal into the tracker first.
+- issues created just before a crash but not yet journaled are found by
+  reconcile(): it lists the repo's issues carrying the tracker labels and
+  matches the "Created from tracker: <ID>" marker in their bodies.
+
+The journal is removed once the tracker has been saved.
+
+Incremental sync (SyncState, pull_changes, apply_remote, push_changes)
+keeps .TRACKER_TESTING_UI.md.sync-state.json next to the tracker with, per
+row, a hash of the issue content last known to match GitHub (title, body,
+open/closed) and the issue's updated_at. Rows whose current hash differs
+are PATCHed; nothing else is sent. GitHub-side changes are read from the
+repo's issue list sorted by most recently updated, fetched with
+If-None-Match on the ETag of its first page: a 304 proves no issue changed,
+so a no-op sync is one round trip, and otherwise only the pages down to
+the last sync's updated_at watermark are read. The tracker is the source
+of truth for content; GitHub's open/closed state flows back (closed ->
+Done, reopened -> Not Started) unless the row was also edited locally, in
+which case the local edit wins. Per field (title, body, state) the state
+file remembers what GitHub had, and only the fields edited locally since
+then are sent. A row with no record yet (the first sync, or a row added
+since the last one) takes over a close made on GitHub rather than
+reopening the issue; a row that is Done locally closes it.
+
+graphql.py has batched equivalents of create_issues() and push_changes().
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from .api import GitHubError
+from .model import DONE, NOT_STARTED
+
+_MARKER_RE = re.compile(r"\*Created from tracker: ((?:TEST|UI)-\d+)\*")
+
+
+class SyncJournal:
+    """Append-only record of issues created but maybe not yet saved to the tracker."""
+
+    def __init__(self, tracker_path):
+        tracker_path = Path(tracker_path)
+        self.path = tracker_path.parent / f".{tracker_path.name}.sync-journal"
+        self._file = None
+
+    def replay(self):
+        """(item_id, issue_number) pairs left behind by an interrupted run."""
+        if not self.path.exists():
+            return []
+        entries = []
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn final line from a crash mid-write
+            entries.append((entry["id"], str(entry["issue"])))
+        return entries
+
+    def record(self, item_id, issue_number):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps({"id": item_id, "issue": issue_number}) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+
+async def reconcile(github, owner, repo, label_sets):
+    """Map tracker ID -> existing issue number, from the marker in issue bodies."""
+    found = {}
+    for labels in label_sets:
+        for issue in await github.list_issues(owner, repo, labels):
+            match = _MARKER_RE.search(issue.get("body") or "")
+            if match:
+                number = str(issue["number"])
+                current = found.get(match.group(1))
+                if current is None or int(number) < int(current):
+                    found[match.group(1)] = number
+    return found
+
+
+async def create_issues(github, owner, repo, items, build_issue, journal, on_result=None):
+    """Create an issue for every item concurrently (bounded by the client).
+
+    Returns {item_id: issue_number or GitHubError}; each success is journaled
+    as soon as it is known. on_result(item, number_or_error) reports progress.
+    """
+    results = {}
+
+    async def create(item):
+        title, body, labels = build_issue(item)
+        try:
+            number = await github.create_issue(owner, repo, title, body, [l.strip() for l in labels.split(",")])
+        except GitHubError as e:
+            results[item.id] = e
+        else:
+            journal.record(item.id, number)
+            results[item.id] = number
+        if on_result:
+            on_result(item, results[item.id])
+
+    await asyncio.gather(*(create(item) for item in items))
+    return results
+
+
+class SyncState:
+    """Per-row sync bookkeeping kept next to the tracker."""
+    VERSION = 1
+
+    def __init__(self, tracker_path):
+        tracker_path = Path(tracker_path)
+        self.path = tracker_path.parent / f".{tracker_path.name}.sync-state.json"
+        self.list_etag = None
+        self.watermark = None
+        self.items = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") == self.VERSION:
+            self.list_etag = data.get("list_etag")
+            self.watermark = data.get("watermark")
+            self.items = data.get("items", {})
+
+    def save(self):
+        data = {"version": self.VERSION, "list_etag": self.list_etag, "watermark": self.watermark, "items": self.items}
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{self.path.name}.", dir=self.path.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def baseline(self, item):
+        """The row's record if it is for the row's current issue, else None (nothing known about GitHub's copy)."""
+        entry = self.items.get(item.id)
+        return entry if entry and entry.get("issue") == item.issue else None
+
+    def record(self, item_id, issue_number, content_hash, state, updated_at=None, node_id=None, fields=None):
+        previous = self.items.get(item_id) or {}
+        if node_id is None and previous.get("issue") == str(issue_number):
+            node_id = previous.get("node_id")
+        self.items[item_id] = {"issue": str(issue_number), "hash": content_hash, "state": state, "updated_at": updated_at}
+        if fields:
+            self.items[item_id]["fields"] = {name: _digest(fields[name]) for name in ("title", "body")}
+        if node_id:
+            self.items[item_id]["node_id"] = node_id  # GraphQL ID, for batched updates (graphql.py)
+
+
+def issue_fields(item, build_issue):
+    """The GitHub issue content a tracker row should have (labels are only set on create)."""
+    title, body, _ = build_issue(item)
+    return {"title": title, "body": body, "state": "closed" if item.status == DONE else "open"}
+
+
+def remote_fields(issue):
+    return {"title": issue["title"], "body": issue.get("body") or "", "state": issue["state"]}
+
+
+def content_hash(fields):
+    return _digest(json.dumps(fields, sort_keys=True))
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+async def pull_changes(github, owner, repo, state, per_page=100):
+    """Issues updated since the last sync, newest first; [] after one 304 if none changed."""
+    base = f"/repos/{owner}/{repo}/issues?state=all&sort=updated&direction=desc&per_page={per_page}"
+    changed = []
+    page = 1
+    first_etag = None
+    while True:
+        headers = {"If-None-Match": state.list_etag} if page == 1 and state.list_etag else None
+        status, response_headers, batch = await github.request("GET", f"{base}&page={page}", headers=headers)
+        if status == 304:
+            return []
+        if page == 1:
+            first_etag = response_headers.get("etag")
+        fresh = [issue for issue in batch if not state.watermark or issue["updated_at"] >= state.watermark]
+        changed.extend(issue for issue in fresh if "pull_request" not in issue)
+        if len(fresh) < len(batch) or len(batch) < per_page:
+            break
+        page += 1
+    state.list_etag = first_etag
+    if changed:
+        state.watermark = max(state.watermark or "", max(issue["updated_at"] for issue in changed))
+    return changed
+
+
+def adopt_remote_state(tracker, item, remote_state):
+    """Reconcile open/closed for a row with no sync record; returns a message, or None if they agree.
+
+    A close made on GitHub is taken over (the row becomes Done). A row that
+    is Done locally keeps Done and closes the issue on the next push.
+    """
+    if remote_state == "closed" and item.status != DONE:
+        tracker.set_status(item.id, DONE)
+        return f"#{item.issue} closed on GitHub -> {DONE} (first sync of this row)"
+    if remote_state == "open" and item.status == DONE:
+        return f"#{item.issue} open on GitHub, {DONE} locally (first sync of this row) - closing it"
+    return None
+
+
+def apply_remote(tracker, state, issues, build_issue):
+    """Fold GitHub-side changes into the tracker; returns [(item_id, message)] for what changed."""
+    applied = []
+    for issue in issues:
+        item = tracker.by_issue.get(str(issue["number"]))
+        if item is None:
+            continue
+        entry = state.baseline(item)
+        remote = remote_fields(issue)
+        # updated_at has one-second resolution, so also compare content
+        if entry and entry.get("updated_at") == issue["updated_at"] and entry.get("hash") == content_hash(remote):
+            continue  # already seen; usually our own push
+        if entry is None:
+            message = adopt_remote_state(tracker, item, remote["state"])
+            if message:
+                applied.append((item.id, message))
+        elif remote["state"] != entry.get("state"):
+            local_edited = content_hash(issue_fields(item, build_issue)) != entry.get("hash")
+            if local_edited:
+                applied.append((item.id, f"#{item.issue} {remote['state']} on GitHub, but edited locally - keeping local"))
+            elif remote["state"] == "closed" and item.status != DONE:
+                tracker.set_status(item.id, DONE)
+                applied.append((item.id, f"#{item.issue} closed on GitHub -> {DONE}"))
+            elif remote["state"] == "open" and item.status == DONE:
+                tracker.set_status(item.id, NOT_STARTED)
+                applied.append((item.id, f"#{item.issue} reopened on GitHub -> {NOT_STARTED}"))
+        state.record(item.id, item.issue, content_hash(remote), remote["state"], issue["updated_at"], issue.get("node_id"),
+                     remote)
+    return applied
+
+
+def changed_rows(tracker, state, build_issue):
+    """(item, changes, fields) for every row GitHub is behind on: the fields to send and all of the row's fields.
+
+    Only fields edited locally since the last sync are sent. A row with no
+    sync record sends its title and body, and its state only to close the
+    issue (see adopt_remote_state()).
+    """
+    for item in tracker.items():
+        if not item.issue:
+            continue
+        fields = issue_fields(item, build_issue)
+        entry = state.baseline(item)
+        if entry is None:
+            changes = {"title": fields["title"], "body": fields["body"]}
+            if fields["state"] == "closed":
+                changes["state"] = "closed"
+        else:
+            if "fields" in entry:
+                changes = {name: fields[name] for name in ("title", "body")
+                           if _digest(fields[name]) != entry["fields"].get(name)}
+            elif content_hash({**fields, "state": entry.get("state")}) != entry.get("hash"):
+                changes = {"title": fields["title"], "body": fields["body"]}  # recorded before per-field digests
+            else:
+                changes = {}
+            if fields["state"] != entry.get("state"):
+                changes["state"] = fields["state"]
+        if changes:
+            yield item, changes, fields
+
+
+def record_push(tracker, state, item, fields, issue):
+    """Record what GitHub has after pushing a row's changes; returns those fields.
+
+    When the push left the state alone and GitHub's differs (a row with no
+    sync record whose issue was closed), the row takes it over.
+    """
+    if issue["state"] != fields["state"]:
+        adopt_remote_state(tracker, item, issue["state"])
+        fields = {**fields, "state": issue["state"]}
+    state.record(item.id, item.issue, content_hash(fields), issue["state"], issue.get("updated_at"), issue.get("node_id"),
+                 fields)
+    return fields
+
+
+async def push_changes(github, owner, repo, tracker, state, build_issue, on_result=None):
+    """PATCH the locally edited fields of every row GitHub is behind on; returns the IDs pushed."""
+    pushed = []
+
+    async def push(item, changes, fields):
+        try:
+            issue = await github.update_issue(owner, repo, item.issue, changes)
+        except GitHubError as e:
+            result = e
+        else:
+            result = record_push(tracker, state, item, fields, issue)
+            pushed.append(item.id)
+        if on_result:
+            on_result(item, result)
+
+    await asyncio.gather(*(push(*row) for row in changed_rows(tracker, state, build_issue)))
+    return pushed
@@ -1,122 +1,240 @@
 #!/usr/bin/env python3
 """
 Verify new repository and setup branches
+
+Reuses the checkout in CLONE_DIR if there is one (git fetch), otherwise
+makes a blobless clone without a working tree (--clone shallow for a
+depth-1 clone, --clone full for everything), so the build artifacts in
+the monorepo's history are never downloaded. Branch and commit facts come
+from one `git for-each-ref`, missing branches are created (and local
+branches that fell behind origin fast-forwarded) in one ref transaction,
+and the branches origin lacks or is behind on are pushed in one `git push`. Nothing is
+checked out or switched in an existing checkout.
+
+    python3 verify_repo_setup.py
+    python3 verify_repo_setup.py --repo-url /tmp/remote.git --dir /tmp/checkout   # against a local bare repo
+    python3 verify_repo_setup.py --no-push
 """
 
-import subprocess
+import argparse
 import os
+import subprocess
 import sys
+from pathlib import Path
 
-REPO_URL = "https://github.com/iplixera/nivostack-monorepo.git"
-CLONE_DIR = "/Users/karim-f/Code/nivostack-monorepo-checkout"
+REPO_URL = os.environ.get("NIVOSTACK_REPO_URL", "https://github.com/iplixera/nivostack-monorepo.git")
+CLONE_DIR = os.environ.get("NIVOSTACK_CHECKOUT", "/Users/karim-f/Code/nivostack-monorepo-checkout")
+BASE_BRANCH = "main"
+DEVELOP_BRANCH = "develop"
+RELEASE_BRANCHES = ["release/v1.0.0", "release/v1.1.0"]
+# One line per ref: HEAD marker, ref, commit, author, subject (fields split on NUL)
+REF_FORMAT = "%(HEAD)%00%(refname)%00%(objectname:short)%00%(authorname) <%(authoremail:trim)>%00%(subject)"
 
-def run_cmd(cmd, description, check=True):
-    print(f"\n{'='*60}")
-    print(f"{description}")
-    print(f"{'='*60}")
-    print(f"Command: {cmd}")
-    print("-" * 60)
+def run_cmd(cmd, description, check=True, cwd=None, input=None):
+    """Run a git command (argument list, no shell); returns (ok, stdout, stderr)."""
+    print(f"\n▶ {description}: {' '.join(cmd)}")
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, check=check)
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
-        return result.returncode == 0, result.stdout, result.stderr
-    except Exception as e:
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd, input=input)
+    except OSError as e:
         print(f"Error: {e}")
         return False, "", str(e)
+    if result.returncode != 0 and result.stderr.strip():
+        print("STDERR:", result.stderr.strip())
+    if check and result.returncode != 0:
+        print(f"❌ {description} failed")
+        sys.exit(1)
+    return result.returncode == 0, result.stdout, result.stderr
+
+def git(*args):
+    return ["git", *args]
+
+def _clone_url(url):
+    """Local paths as file:// URLs, so --filter/--depth apply to test clones of a local bare repo too."""
+    if "://" in url or (":" in url and not os.path.exists(url)):
+        return url
+    return Path(url).resolve().as_uri()
+
+def prepare_checkout(repo_url, clone_dir, clone_mode, reclone):
+    """Fetch into the existing checkout, or clone; returns how it was obtained."""
+    clone_dir = Path(clone_dir)
+    if clone_dir.exists() and reclone:
+        import shutil
+        print(f"Removing existing checkout: {clone_dir}")
+        shutil.rmtree(clone_dir)
+
+    if (clone_dir / ".git").exists() or (clone_dir / "HEAD").exists():
+        ok, url, _ = run_cmd(git("config", "--get", "remote.origin.url"), "Checking origin", check=False,
+                             cwd=clone_dir)
+        if url.strip() not in (repo_url, _clone_url(repo_url)):
+            print(f"❌ {clone_dir} is a checkout of {url.strip() or 'another repository'}, not {repo_url}")
+            print("   Use --dir for another location, or --reclone to replace it")
+            sys.exit(1)
+        run_cmd(git("fetch", "--prune", "origin"), "Fetching into existing checkout", cwd=clone_dir)
+        return "fetched"
+
+    if clone_dir.exists() and any(clone_dir.iterdir()):
+        print(f"❌ {clone_dir} exists and is not a git checkout (use --reclone to replace it)")
+        sys.exit(1)
+    options = {"blobless": ["--filter=blob:none", "--no-checkout"],
+               "shallow": ["--depth=1", "--no-single-branch", "--no-checkout"],
+               "full": []}[clone_mode]
+    run_cmd(git("clone", *options, _clone_url(repo_url), str(clone_dir)), f"Cloning repository ({clone_mode})")
+    if clone_mode != "full":
+        # Keep the URL as given, so a later run recognises the checkout
+        run_cmd(git("remote", "set-url", "origin", repo_url), "Recording origin URL", cwd=clone_dir)
+    return f"cloned ({clone_mode})"
+
+def read_refs(clone_dir):
+    """{ref name: (commit, author, subject)} and the current branch, from one git for-each-ref."""
+    _, output, _ = run_cmd(git("for-each-ref", f"--format={REF_FORMAT}", "refs/heads", "refs/remotes/origin"),
+                           "Reading branches and commits", cwd=clone_dir)
+    refs, current = {}, None
+    for line in output.splitlines():
+        head, ref, commit, author, subject = line.split("\0", 4)
+        refs[ref] = (commit, author, subject)
+        if head == "*":
+            current = ref[len("refs/heads/"):]
+    return refs, current
+
+def compare_tips(clone_dir, local, remote):
+    """'ahead', 'behind' or 'diverged': where the local commit stands against origin's."""
+    _, output, _ = run_cmd(git("rev-list", "--left-right", "--count", f"{local}...{remote}"), "Comparing with origin",
+                           cwd=clone_dir)
+    ahead, behind = (int(n) for n in output.split())
+    if ahead and behind:
+        return "diverged"
+    return "ahead" if ahead else "behind"
+
+def plan_branches(refs, clone_dir, current):
+    """The ref updates to make locally and the commit each branch should have on origin.
+
+    Returns (created, forwarded, tips): branches to create as (branch, commit),
+    branches to fast-forward to origin as (branch, new, old), and {branch:
+    commit to push}. A local branch only replaces origin's when it is strictly
+    ahead of it; a stale one is fast-forwarded instead (except the branch
+    checked out in a working tree), and a diverged one is left alone.
+    """
+    def tip(branch):
+        for ref in (f"refs/heads/{branch}", f"refs/remotes/origin/{branch}"):
+            if ref in refs:
+                return refs[ref][0]
+        return None
+
+    created, forwarded, tips = [], [], {}
+    base = tip(BASE_BRANCH)
+    if base is None:
+        print(f"❌ No {BASE_BRANCH} branch locally or on origin")
+        sys.exit(1)
+    tips[BASE_BRANCH] = base
+    worktree = (Path(clone_dir) / ".git").exists()
+    for branch, start in [(BASE_BRANCH, BASE_BRANCH), (DEVELOP_BRANCH, BASE_BRANCH),
+                          *[(release, DEVELOP_BRANCH) for release in RELEASE_BRANCHES]]:
+        local = refs.get(f"refs/heads/{branch}", (None,))[0]
+        remote = refs.get(f"refs/remotes/origin/{branch}", (None,))[0]
+        if local is None:
+            # A branch only on origin is created locally at the same commit
+            tips[branch] = remote or tips[start]
+            created.append((branch, tips[branch]))
+            continue
+        print(f"✅ {branch} exists" if branch == BASE_BRANCH else f"⚠️  {branch} already exists")
+        tips[branch] = local
+        if remote is None or remote == local:
+            continue
+        relation = compare_tips(clone_dir, local, remote)
+        if relation == "ahead":
+            continue
+        tips[branch] = remote  # never push a stale or diverged branch over origin's
+        if relation == "diverged":
+            print(f"⚠️  {branch} has diverged from origin/{branch}; not pushing it")
+        elif worktree and branch == current:
+            print(f"⚠️  {branch} is behind origin/{branch} and checked out; not pushing it (pull to update it)")
+        else:
+            forwarded.append((branch, remote, local))
+    return created, forwarded, tips
 
 def main():
+    parser = argparse.ArgumentParser(description="Verify the monorepo and set up its branches")
+    parser.add_argument("--repo-url", default=REPO_URL, help=f"repository to verify (default: {REPO_URL})")
+    parser.add_argument("--dir", default=CLONE_DIR, help=f"checkout to reuse or create (default: {CLONE_DIR})")
+    parser.add_argument("--clone", choices=["blobless", "shallow", "full"], default="blobless",
+                        help="how to clone when there is no checkout yet (default: blobless)")
+    parser.add_argument("--reclone", action="store_true", help="delete the checkout and clone again")
+    parser.add_argument("--no-push", action="store_true", help="create the branches locally only")
+    args = parser.parse_args()
+
     print("="*60)
     print("Verifying New Repository and Setting Up Branches")
     print("="*60)
-    
-    # Step 1: Clone repository
-    print("\n📥 Step 1: Cloning repository...")
-    if os.path.exists(CLONE_DIR):
-        print(f"Removing existing checkout: {CLONE_DIR}")
-        run_cmd(f"rm -rf {CLONE_DIR}", "Removing existing directory", check=False)
-    
-    success, output, error = run_cmd(
-        f"git clone {REPO_URL} {CLONE_DIR}",
-        "Cloning repository"
-    )
-    
-    if not success:
-        print("❌ Failed to clone repository")
-        sys.exit(1)
-    
-    os.chdir(CLONE_DIR)
-    print(f"✅ Repository cloned to: {CLONE_DIR}")
-    
+
+    # Step 1: Reuse or clone the repository
+    print("\n📥 Step 1: Getting the repository...")
+    obtained = prepare_checkout(args.repo_url, args.dir, args.clone, args.reclone)
+    print(f"✅ Repository {obtained}: {args.dir}")
+
     # Step 2: Verify repository
     print("\n🔍 Step 2: Verifying repository...")
-    success, output, _ = run_cmd("git branch --show-current", "Current branch")
-    current_branch = output.strip() if output else "unknown"
-    
-    success, output, _ = run_cmd("git rev-list --count HEAD", "Commit count")
-    commit_count = output.strip() if output else "0"
-    
-    success, output, _ = run_cmd(
-        'git log -1 --pretty=format:"%h - %an <%ae> - %s"',
-        "Last commit"
-    )
-    
-    success, output, _ = run_cmd("ls -la | head -15", "Repository structure")
-    
-    # Step 3: Check remote
-    print("\n🌐 Step 3: Remote configuration...")
-    run_cmd("git remote -v", "Remote remotes")
-    
-    # Step 4: Check sync status
-    print("\n🔄 Step 4: Checking sync status...")
-    run_cmd("git fetch origin", "Fetching from remote", check=False)
-    
-    success, output, _ = run_cmd("git branch -a", "All branches")
-    
-    # Step 5: Setup branches
-    print("\n🌿 Step 5: Setting up branch strategy...")
-    
-    # Ensure on main
-    run_cmd("git checkout main", "Switching to main", check=False)
-    
-    # Create develop branch
-    success, output, _ = run_cmd("git show-ref --verify --quiet refs/heads/develop", "Check develop", check=False)
-    if not success:
-        run_cmd("git checkout -b develop", "Creating develop branch")
-        print("✅ Created develop branch")
+    refs, current_branch = read_refs(args.dir)
+    _, count, _ = run_cmd(git("rev-list", "--count", f"refs/remotes/origin/{BASE_BRANCH}"), "Counting commits",
+                          check=False, cwd=args.dir)
+    _, shallow, _ = run_cmd(git("rev-parse", "--is-shallow-repository"), "Checking depth", check=False,
+                            cwd=args.dir)
+    commit_count = count.strip() or "0"
+    if shallow.strip() == "true":
+        commit_count += " (shallow clone)"
+    last = refs.get(f"refs/remotes/origin/{BASE_BRANCH}")
+    if last:
+        print(f"Last commit on {BASE_BRANCH}: {last[0]} - {last[1]} - {last[2]}")
+
+    # Step 3: Remote branches
+    print("\n🌐 Step 3: Branches on origin...")
+    for ref, (commit, _, subject) in sorted(refs.items()):
+        if ref.startswith("refs/remotes/origin/") and ref != "refs/remotes/origin/HEAD":
+            print(f"  {ref[len('refs/remotes/origin/'):]:<24} {commit} {subject}")
+
+    # Step 4: Setup branches
+    print("\n🌿 Step 4: Setting up branch strategy...")
+    created, forwarded, tips = plan_branches(refs, args.dir, current_branch)
+    if created or forwarded:
+        # All ref changes in one transaction; "create" fails rather than move an existing ref, and
+        # "update" only moves a ref that still has the commit it was read at
+        transaction = "".join(f"create refs/heads/{branch} {commit}\n" for branch, commit in created)
+        transaction += "".join(f"update refs/heads/{branch} {new} {old}\n" for branch, new, old in forwarded)
+        run_cmd(git("update-ref", "--stdin"), "Updating branches", cwd=args.dir,
+                input="start\n" + transaction + "prepare\ncommit\n")
+        for branch, commit in created:
+            print(f"✅ Created {branch} branch at {commit}")
+        for branch, new, old in forwarded:
+            print(f"✅ Fast-forwarded {branch} from {old} to origin's {new}")
+
+    # Step 5: Push branches
+    branches = [BASE_BRANCH, DEVELOP_BRANCH, *RELEASE_BRANCHES]
+    pending = [branch for branch in branches
+               if refs.get(f"refs/remotes/origin/{branch}", (None,))[0] != tips[branch]]
+    if args.no_push:
+        print("\n📤 Step 5: Skipping push (--no-push)")
+    elif not pending:
+        print("\n📤 Step 5: All branches already up to date on origin")
     else:
-        run_cmd("git checkout develop", "Switching to develop", check=False)
-        print("✅ develop branch already exists")
-    
-    # Create release branches
-    release_branches = ["release/v1.0.0", "release/v1.1.0"]
-    for branch in release_branches:
-        success, _, _ = run_cmd(f"git show-ref --verify --quiet refs/heads/{branch}", f"Check {branch}", check=False)
-        if not success:
-            run_cmd(f"git checkout -b {branch} develop", f"Creating {branch}", check=False)
-            print(f"✅ Created {branch} branch")
-        else:
-            print(f"⚠️  {branch} already exists")
-    
-    # Switch back to main
-    run_cmd("git checkout main", "Switching back to main", check=False)
-    
-    # Step 6: Push branches
-    print("\n📤 Step 6: Pushing branches to remote...")
-    run_cmd("git push origin main", "Pushing main", check=False)
-    run_cmd("git push origin develop", "Pushing develop", check=False)
-    for branch in release_branches:
-        run_cmd(f"git push origin {branch}", f"Pushing {branch}", check=False)
-    
-    # Step 7: Final summary
+        print(f"\n📤 Step 5: Pushing {len(pending)} branch(es) in one push...")
+        ok, output, _ = run_cmd(git("push", "--porcelain", "origin",
+                                    *[f"refs/heads/{branch}:refs/heads/{branch}" for branch in pending]),
+                                "Pushing branches", check=False, cwd=args.dir)
+        for line in output.splitlines():
+            fields = line.split("\t")
+            if len(fields) >= 3 and ":" in fields[1]:
+                flag, ref, summary = fields[0], fields[1].split(":")[1], fields[2]
+                mark = "❌" if flag == "!" else "✅"
+                print(f"{mark} {ref[len('refs/heads/'):]}: {summary}")
+        if not ok:
+            print("⚠️  Some branches were not pushed")
+
+    # Step 6: Final summary
     print("\n" + "="*60)
     print("Summary")
     print("="*60)
-    print(f"Repository: {REPO_URL}")
-    print(f"Local checkout: {CLONE_DIR}")
-    print(f"Current branch: {current_branch}")
+    print(f"Repository: {args.repo_url}")
+    print(f"Local checkout: {args.dir}")
+    print(f"Current branch: {current_branch or 'none checked out'}")
     print(f"Total commits: {commit_count}")
     print("\nBranch Strategy:")
     print("  - main: Production-ready code")
@@ -128,4 +246,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
@@ -1,73 +1,55 @@
 #!/usr/bin/env python3
 """
 Concurrent API Performance Testing - Simulates SDK init with parallel requests
+
+Each simulated user runs one SDK-init strategy from harness/strategies.py on
+its own fresh connection pool. Time-to-usable (feature flags + SDK settings
+ready) is reported next to time-to-complete, so deferring non-critical
+configs can be measured rather than guessed.
+
+Target, credentials, users and iterations come from the scenario file
+(scenarios/sdk-init.json by default; load.concurrency is the number of
+users, load.iterations the number of rounds).
+
+Usage:
+    python3 api-concurrent-test.py                                # sequential (shipped SDKs)
+    python3 api-concurrent-test.py --strategy parallel,critical-first
+    python3 api-concurrent-test.py --strategy all
+    python3 api-concurrent-test.py --target local
 """
 
-import urllib.request
-import urllib.error
-import time
-import json
+import argparse
+import sys
 import statistics
 import ssl
 import concurrent.futures
+from pathlib import Path
 
-# Configuration
-BASE_URL = "https://devbridge-eta.vercel.app"
-API_KEY = "cmjc3tpnl000413oaw117o3fy"
+sys.path.insert(0, str(Path(__file__).parent))
+from harness.scenario import add_scenario_arguments, probe_config
+from harness.strategies import STRATEGIES
+from harness.transport import H1Transport
+
+# Configuration (set from the scenario file in main())
+BASE_URL = None
+HEADERS = {}
 CONCURRENT_USERS = 5
 ITERATIONS = 3
 
 ssl_context = ssl.create_default_context()
 
-def make_request(endpoint, headers=None):
-    """Make a single request and return timing info"""
-    url = f"{BASE_URL}{endpoint}"
-    req = urllib.request.Request(url, headers=headers or {})
-
-    start_time = time.time()
-    try:
-        with urllib.request.urlopen(req, timeout=30, context=ssl_context) as response:
-            body = response.read().decode('utf-8')
-            status_code = response.status
-    except urllib.error.HTTPError as e:
-        body = e.read().decode('utf-8') if e.fp else ""
-        status_code = e.code
-    except Exception as e:
-        return None, 0, str(e)
-
-    elapsed_ms = (time.time() - start_time) * 1000
-    return status_code, elapsed_ms, body
-
-def sdk_init_sequence(user_id):
+def sdk_init_sequence(user_id, strategy="sequential"):
     """Simulate a single SDK initialization (like app startup)"""
-    headers = {"X-API-Key": API_KEY}
-    results = {}
-
-    # SDK init typically calls these endpoints in sequence or parallel
-    endpoints = [
-        ("feature_flags", "/api/feature-flags"),
-        ("sdk_settings", "/api/sdk-settings"),
-        ("business_config", "/api/business-config"),
-    ]
+    with H1Transport(BASE_URL, ssl_context=ssl_context) as transport:
+        result = STRATEGIES[strategy].run(transport, HEADERS)
 
-    total_start = time.time()
+    return user_id, result
 
-    for name, endpoint in endpoints:
-        status, elapsed, body = make_request(endpoint, headers)
-        results[name] = {"status": status, "time": elapsed}
-
-    total_time = (time.time() - total_start) * 1000
-    results["total"] = total_time
-
-    return user_id, results
-
-def main():
-    print("=" * 70)
-    print("Concurrent SDK Init Performance Test")
-    print(f"Base URL: {BASE_URL}")
-    print(f"Concurrent Users: {CONCURRENT_USERS}")
-    print(f"Iterations: {ITERATIONS}")
-    print("=" * 70)
+def run_strategy(strategy):
+    """Run ITERATIONS rounds of CONCURRENT_USERS inits and return the results."""
+    print(f"\n{'#' * 70}")
+    print(f"Strategy: {strategy} - {STRATEGIES[strategy].description}")
+    print("#" * 70)
 
     all_results = []
 
@@ -76,75 +58,125 @@ def main():
 
         # Simulate concurrent SDK inits
         with concurrent.futures.ThreadPoolExecutor(max_workers=CONCURRENT_USERS) as executor:
-            futures = [executor.submit(sdk_init_sequence, i) for i in range(CONCURRENT_USERS)]
+            futures = [executor.submit(sdk_init_sequence, i, strategy) for i in range(CONCURRENT_USERS)]
             iteration_results = []
 
             for future in concurrent.futures.as_completed(futures):
-                user_id, results = future.result()
-                iteration_results.append(results)
-                print(f"  User {user_id}: Total {results['total']:.0f}ms "
-                      f"(flags: {results['feature_flags']['time']:.0f}ms, "
-                      f"settings: {results['sdk_settings']['time']:.0f}ms, "
-                      f"config: {results['business_config']['time']:.0f}ms)")
+                user_id, result = future.result()
+                if not result.ok:
+                    failed = next(r for _, r in result.requests if not r.ok)
+                    print(f"  User {user_id}: FAILED - {failed.path}: {failed.error or f'HTTP {failed.status}'}")
+                    continue
+                iteration_results.append(result)
+                breakdown = ", ".join(f"{name}: {response.elapsed_ms:.0f}ms" for name, response in result.requests)
+                print(f"  User {user_id}: Total {result.time_to_complete_ms:.0f}ms, "
+                      f"usable {result.time_to_usable_ms:.0f}ms ({breakdown})")
 
             all_results.extend(iteration_results)
 
-    # Aggregate statistics
+    return all_results
+
+def report(strategy, all_results):
+    """Print aggregate statistics and the assessment for one strategy."""
     print("\n" + "=" * 70)
-    print("AGGREGATE RESULTS")
+    print(f"AGGREGATE RESULTS ({strategy})")
     print("=" * 70)
 
-    # Calculate stats for each endpoint
-    endpoints = ["feature_flags", "sdk_settings", "business_config", "total"]
+    if not all_results:
+        print("No successful SDK inits")
+        return None
+
+    # Calculate stats for each request, then the critical path
+    labels = [name for name, _ in all_results[0].requests]
+    metrics = {label: [r.timing(label) for r in all_results] for label in labels}
+    metrics["usable"] = [r.time_to_usable_ms for r in all_results]
+    metrics["total"] = [r.time_to_complete_ms for r in all_results]
 
     print(f"\n{'Metric':<20} {'Min':>12} {'Mean':>12} {'Max':>12} {'p95':>12}")
     print("-" * 70)
 
-    for endpoint in endpoints:
-        if endpoint == "total":
-            times = [r["total"] for r in all_results]
-        else:
-            times = [r[endpoint]["time"] for r in all_results]
-
+    for metric, times in metrics.items():
         p95_idx = int(len(times) * 0.95)
-        print(f"{endpoint:<20} {min(times):>11.0f}ms {statistics.mean(times):>11.0f}ms "
+        print(f"{metric:<20} {min(times):>11.0f}ms {statistics.mean(times):>11.0f}ms "
               f"{max(times):>11.0f}ms {sorted(times)[p95_idx]:>11.0f}ms")
 
     # Total SDK init time analysis
-    total_times = [r["total"] for r in all_results]
+    total_times = metrics["total"]
+    usable_times = metrics["usable"]
     print(f"\n{'='*70}")
     print("SDK INITIALIZATION TIME ANALYSIS")
     print("=" * 70)
     print(f"Total Samples: {len(total_times)}")
+    print(f"Mean Time-to-Usable: {statistics.mean(usable_times):.0f}ms (feature flags + SDK settings ready)")
     print(f"Mean SDK Init Time: {statistics.mean(total_times):.0f}ms")
     print(f"Median SDK Init Time: {statistics.median(total_times):.0f}ms")
     print(f"95th Percentile: {sorted(total_times)[int(len(total_times)*0.95)]:.0f}ms")
     print(f"Max SDK Init Time: {max(total_times):.0f}ms")
 
     # Performance assessment
-    mean_init = statistics.mean(total_times)
+    mean_init = statistics.mean(usable_times)
     print(f"\n{'='*70}")
-    print("ASSESSMENT")
+    print("ASSESSMENT (time-to-usable)")
     print("=" * 70)
 
     if mean_init > 3000:
-        print(f"🔴 CRITICAL: Mean SDK init time {mean_init:.0f}ms is > 3 seconds")
+        print(f"🔴 CRITICAL: Mean time-to-usable {mean_init:.0f}ms is > 3 seconds")
         print("   This will significantly impact app startup time")
     elif mean_init > 2000:
-        print(f"🟠 WARNING: Mean SDK init time {mean_init:.0f}ms is > 2 seconds")
+        print(f"🟠 WARNING: Mean time-to-usable {mean_init:.0f}ms is > 2 seconds")
         print("   Users may notice slow app startup")
     elif mean_init > 1000:
-        print(f"🟡 ACCEPTABLE: Mean SDK init time {mean_init:.0f}ms is > 1 second")
+        print(f"🟡 ACCEPTABLE: Mean time-to-usable {mean_init:.0f}ms is > 1 second")
         print("   Consider optimizations for better UX")
     else:
-        print(f"🟢 GOOD: Mean SDK init time {mean_init:.0f}ms is under 1 second")
+        print(f"🟢 GOOD: Mean time-to-usable {mean_init:.0f}ms is under 1 second")
+
+    return statistics.mean(usable_times), statistics.mean(total_times)
+
+def main():
+    global BASE_URL, HEADERS, CONCURRENT_USERS, ITERATIONS
+
+    parser = argparse.ArgumentParser(description="Concurrent SDK init performance test")
+    parser.add_argument("--strategy", default="sequential",
+                        help=f"comma-separated init strategies, or 'all' ({', '.join(STRATEGIES)})")
+    add_scenario_arguments(parser)
+    args = parser.parse_args()
+
+    scenario, BASE_URL, HEADERS = probe_config(args, parser)
+    CONCURRENT_USERS = scenario.load.concurrency
+    ITERATIONS = scenario.load.iterations
+
+    strategies = list(STRATEGIES) if args.strategy == "all" else [s.strip() for s in args.strategy.split(",")]
+    unknown = [s for s in strategies if s not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategy {', '.join(unknown)} (choose from: {', '.join(STRATEGIES)})")
+
+    print("=" * 70)
+    print("Concurrent SDK Init Performance Test")
+    print(f"Base URL: {BASE_URL}")
+    print(f"Concurrent Users: {CONCURRENT_USERS}")
+    print(f"Iterations: {ITERATIONS}")
+    print(f"Strategies: {', '.join(strategies)}")
+    print("=" * 70)
+
+    summaries = {strategy: report(strategy, run_strategy(strategy)) for strategy in strategies}
+
+    if len(summaries) > 1:
+        print(f"\n{'='*70}")
+        print("STRATEGY COMPARISON")
+        print("=" * 70)
+        print(f"{'Strategy':<20} {'Usable':>12} {'Complete':>12}")
+        print("-" * 46)
+        for strategy, summary in summaries.items():
+            if summary:
+                print(f"{strategy:<20} {summary[0]:>10.0f}ms {summary[1]:>10.0f}ms")
 
     print("\nPotential Optimizations:")
     print("  1. Combine endpoints into single /api/sdk-init endpoint")
     print("  2. Add Redis/Vercel Edge caching for config data")
     print("  3. Use Vercel Edge Functions for lower latency")
     print("  4. Implement client-side caching with ETag/If-None-Match")
-    print("  5. Lazy load non-critical configs after app startup")
+    print("  5. Lazy load non-critical configs after app startup (compare: --strategy critical-first)")
 
 if __name__ == "__main__":
     main()
@@ -1,28 +1,41 @@
 #!/usr/bin/env python3
 """
 API Performance Testing Script for DevBridge SDK Endpoints
-Tests: Feature Flags, SDK Settings, Business Config
+Tests every endpoint in the scenario file (default: scenarios/sdk-init.json -
+SDK Init, Feature Flags, SDK Settings, Business Config)
+
+Usage:
+    python3 api-perf-test.py
+    python3 api-perf-test.py --scenario launch-mix.json --target local
+    python3 api-perf-test.py --verbose         # also print every request
 """
 
+import argparse
+import random
+import sys
 import urllib.request
 import urllib.error
 import time
 import json
 import statistics
 import ssl
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from harness.scenario import RenderContext, ScenarioError, add_scenario_arguments, probe_config
 
-# Configuration
-BASE_URL = "https://devbridge-eta.vercel.app"
-API_KEY = "cmjc3tpnl000413oaw117o3fy"
+# Configuration (set from the scenario file in main())
+BASE_URL = None
 NUM_REQUESTS = 10
+VERBOSE = False
 
 # Disable SSL verification for testing (if needed)
 ssl_context = ssl.create_default_context()
 
-def make_request(endpoint, headers=None):
+def make_request(endpoint, headers=None, method="GET", data=None):
     """Make a single request and return timing info"""
     url = f"{BASE_URL}{endpoint}"
-    req = urllib.request.Request(url, headers=headers or {})
+    req = urllib.request.Request(url, headers=headers or {}, method=method, data=data)
 
     start_time = time.time()
     try:
@@ -38,22 +51,25 @@ def make_request(endpoint, headers=None):
     elapsed_ms = (time.time() - start_time) * 1000
     return status_code, elapsed_ms, body
 
-def run_performance_test(name, endpoint, headers):
+def run_performance_test(endpoint, base_headers, seed):
     """Run multiple requests and collect statistics"""
     print(f"\n{'='*60}")
-    print(f"Testing: {name}")
-    print(f"Endpoint: {endpoint}")
+    print(f"Testing: {endpoint.name}")
+    print(f"Endpoint: {endpoint.method} {endpoint.path.text}")
     print(f"{'='*60}")
 
     timings = []
     statuses = []
+    rng = random.Random(seed)
 
     for i in range(NUM_REQUESTS):
-        status, elapsed, body = make_request(endpoint, headers)
+        planned = endpoint.build(RenderContext(i, rng), base_headers)
+        status, elapsed, body = make_request(planned.path, planned.headers, planned.method, planned.body)
         if status:
             timings.append(elapsed)
             statuses.append(status)
-            print(f"  Request {i+1:2d}: {elapsed:7.2f}ms (HTTP {status})")
+            if VERBOSE:
+                print(f"  Request {i+1:2d}: {elapsed:7.2f}ms (HTTP {status})")
         else:
             print(f"  Request {i+1:2d}: FAILED - {body}")
 
@@ -77,36 +93,32 @@ def run_performance_test(name, endpoint, headers):
     return timings
 
 def main():
+    global BASE_URL, NUM_REQUESTS, VERBOSE
+
+    parser = argparse.ArgumentParser(description="Per-endpoint API latency test")
+    parser.add_argument("--verbose", action="store_true", help="print every request, not only failures")
+    add_scenario_arguments(parser)
+    args = parser.parse_args()
+
+    scenario, _, _ = probe_config(args, parser)
+    try:
+        plan = scenario.compile(args.target)
+    except ScenarioError as e:
+        parser.error(str(e))
+    BASE_URL = plan.base_url
+    VERBOSE = args.verbose
+    NUM_REQUESTS = plan.load.requests or NUM_REQUESTS
+
     print("="*60)
     print("DevBridge API Performance Test")
     print(f"Base URL: {BASE_URL}")
     print(f"Requests per endpoint: {NUM_REQUESTS}")
     print("="*60)
 
-    sdk_headers = {"X-API-Key": API_KEY}
-
     all_results = {}
 
-    # Test 1: Feature Flags
-    all_results['feature_flags'] = run_performance_test(
-        "Feature Flags (SDK Init)",
-        "/api/feature-flags",
-        sdk_headers
-    )
-
-    # Test 2: SDK Settings
-    all_results['sdk_settings'] = run_performance_test(
-        "SDK Settings",
-        "/api/sdk-settings",
-        sdk_headers
-    )
-
-    # Test 3: Business Config
-    all_results['business_config'] = run_performance_test(
-        "Business Config",
-        "/api/business-config",
-        sdk_headers
-    )
+    for endpoint in plan.endpoints:
+        all_results[endpoint.name] = run_performance_test(endpoint, plan.headers, plan.seed)
 
     # Summary
     print("\n" + "="*60)
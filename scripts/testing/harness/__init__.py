@@ -0,0 +1,12 @@
+"""
+Shared helpers for the Python API probes in scripts/testing.
+
+The probe scripts are kebab-case and run directly, so they put this
+directory on sys.path and import from here:
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    from harness.netem import PRESETS, shaped_network
+
+scripts/data/import-localization.py inserts scripts/testing the same way
+for the dashboard client (admin.py) and percentile() (stats.py).
+"""
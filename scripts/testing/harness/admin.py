@@ -0,0 +1,123 @@
+"""
+Dashboard-API client the benchmarks use to seed and clean up their data.
+
+Seeding goes through the same routes the dashboard uses, authenticated
+with a dashboard JWT (Authorization: Bearer ...) for a project the token's
+user owns. The SDK routes are then driven with the project's API key from
+the scenario target.
+
+    admin = AdminClient(base_url, token, project_id)
+    status, data = admin.request("POST", "/api/business-config", {"projectId": admin.project_id, ...})
+    admin.created("/api/business-config", data["config"]["id"])   # deleted again by cleanup()
+
+Credentials come from --admin-token / --project-id, defaulting to
+NIVOSTACK_ADMIN_TOKEN / NIVOSTACK_PROJECT_ID.
+"""
+
+import json
+import os
+import uuid
+from urllib.parse import urlencode
+
+from .transport import make_transport
+
+
+class AdminError(RuntimeError):
+    """A seeding request failed; the message says which and why."""
+
+
+class AdminClient:
+    def __init__(self, base_url, token, project_id, protocol="h1"):
+        self.base_url = base_url
+        self.token = token
+        self.project_id = project_id
+        self.transport = make_transport(protocol, base_url)
+        self._created = []
+
+    def request(self, method, path, body=None, query=None, expect=(200, 201)):
+        """Send one dashboard request; returns (status, parsed JSON). Raises AdminError
+        for a status outside `expect` (pass expect=None to accept any)."""
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        content_type = "application/json" if body is not None else None
+        return self._send(method, path, query, content_type, payload, expect)
+
+    def upload(self, path, fields, files, expect=(200, 201)):
+        """POST multipart/form-data, like the dashboard's file imports; `files` maps a
+        field name to (filename, bytes)."""
+        content_type, payload = multipart_body(fields, files)
+        return self._send("POST", path, None, content_type, payload, expect)
+
+    def _send(self, method, path, query, content_type, payload, expect):
+        if query:
+            path = f"{path}?{urlencode(query)}"
+        headers = {"Authorization": f"Bearer {self.token}"}
+        if content_type:
+            headers["Content-Type"] = content_type
+        response = self.transport.request(path, headers, method, payload)
+        try:
+            data = json.loads(response.body or b"null")
+        except ValueError:
+            data = None
+        if expect is not None and response.status not in expect:
+            detail = (data or {}).get("error") if isinstance(data, dict) else None
+            raise AdminError(f"{method} {path} -> {response.status or response.error}"
+                             + (f": {detail}" if detail else ""))
+        return response.status, data
+
+    def created(self, path, record_id=None):
+        """Remember a record for cleanup(): DELETE path?id=record_id, or DELETE path
+        for routes that take the id in the path (/api/experiments/<id>)."""
+        self._created.append((path, record_id))
+
+    def cleanup(self):
+        """Delete what created() recorded, newest first; returns how many failed."""
+        failed = 0
+        while self._created:
+            path, record_id = self._created.pop()
+            query = {"id": record_id} if record_id is not None else None
+            status, _ = self.request("DELETE", path, query=query, expect=None)
+            if status not in (200, 204, 404):
+                failed += 1
+        return failed
+
+    def close(self):
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def multipart_body(fields, files):
+    """(content type, body) of a multipart/form-data request."""
+    boundary = f"----nivostack{uuid.uuid4().hex}"
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+                     + str(value).encode("utf-8") + b"\r\n")
+    for name, (filename, data) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f"Content-Type: application/octet-stream\r\n\r\n".encode() + data + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return f"multipart/form-data; boundary={boundary}", b"".join(parts)
+
+
+def add_admin_arguments(parser):
+    """Add the --admin-token/--project-id/--keep options of the seeding benchmarks."""
+    parser.add_argument("--admin-token", default=os.environ.get("NIVOSTACK_ADMIN_TOKEN"),
+                        help="dashboard JWT used to seed data (default: $NIVOSTACK_ADMIN_TOKEN)")
+    parser.add_argument("--project-id", default=os.environ.get("NIVOSTACK_PROJECT_ID"),
+                        help="project to seed; must belong to the token's user (default: $NIVOSTACK_PROJECT_ID)")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded data in place afterwards")
+
+
+def admin_client(args, parser, base_url, standin=False):
+    """An AdminClient from parsed arguments; the stand-in accepts any credentials."""
+    if standin:
+        return AdminClient(base_url, args.admin_token or "standin", args.project_id or "standin-project")
+    if not args.admin_token or not args.project_id:
+        parser.error("seeding needs --admin-token and --project-id (or NIVOSTACK_ADMIN_TOKEN / "
+                     "NIVOSTACK_PROJECT_ID); use --standin to run without a server")
+    return AdminClient(base_url, args.admin_token, args.project_id)
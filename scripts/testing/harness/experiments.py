@@ -0,0 +1,48 @@
+"""
+Python reference for assignToVariant() in src/lib/business-config/experiments.ts.
+
+Assignment hashes "<experiment id>:<userId or deviceId>" with the same
+32-bit string hash as targeting.ts, so a probe can predict every variant a
+server should hand out and check a variant split without asking the server.
+
+    variants = make_variants([50, 30, 20])
+    assign_to_variant("exp-1", variants, {"userId": "user-7"})   # -> 0, 1 or 2
+"""
+
+from .targeting import simple_hash
+
+
+def make_variants(weights, names=None):
+    """Experiment variants with the given weights; variant i is named names[i]
+    (default "control", "variant-1", ...) and has the value "value-<i>"."""
+    names = names or ["control"] + [f"variant-{i}" for i in range(1, len(weights))]
+    return [{"name": name, "weight": weight, "value": f"value-{i}"}
+            for i, (name, weight) in enumerate(zip(names, weights))]
+
+
+def assignment_identifier(context):
+    return context.get("userId") or context.get("deviceId") or "default"
+
+
+def assignment_percentage(experiment_id, identifier):
+    """The 0-99.99 position assignToVariant() compares with the cumulative weights."""
+    return simple_hash(f"{experiment_id}:{identifier}") % 10000 / 100
+
+
+def variant_for_percentage(variants, percentage):
+    """The variant index a 0-99.99 position falls into; weights are normalized
+    the way assignToVariant() does it, so they need not sum to 100."""
+    total = sum(v["weight"] for v in variants)
+    cumulative = 0
+    for i, variant in enumerate(variants):
+        cumulative += variant["weight"] / total * 100
+        if percentage < cumulative:
+            return i
+    return len(variants) - 1
+
+
+def assign_to_variant(experiment_id, variants, context):
+    """assignToVariant(): the variant index for `context`, or None without variants."""
+    if not variants:
+        return None
+    return variant_for_percentage(variants, assignment_percentage(experiment_id, assignment_identifier(context)))
@@ -0,0 +1,232 @@
+"""
+Live terminal view and sampled request log for load runs.
+
+The hot path only does O(1) work per request: LiveStats appends the latency
+to the current one-second bucket of its endpoint and bumps counters, and
+SampledLog makes one random draw and, for sampled requests, a non-blocking
+queue put. Percentiles are computed by the LiveView thread a few times per
+second over the last `window_s` seconds of buckets, and log lines are
+formatted and written by the SampledLog thread.
+
+Usage:
+    live = LiveStats()
+    with LiveView(live), SampledLog("requests.jsonl", rate=0.01) as log:
+        run_plan(plan, live=live, on_result=log.write)
+"""
+
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+
+from .stats import percentile
+
+
+class _Buckets:
+    """Per-second latency buckets for one endpoint."""
+
+    def __init__(self, window_s):
+        self.window_s = window_s
+        self.buckets = deque()
+        self.count = 0
+        self.errors = 0
+
+    def add(self, second, elapsed_ms, ok):
+        if not self.buckets or self.buckets[-1][0] != second:
+            self.buckets.append((second, []))
+            while self.buckets[0][0] <= second - self.window_s:
+                self.buckets.popleft()
+        self.buckets[-1][1].append(elapsed_ms)
+        self.count += 1
+        if not ok:
+            self.errors += 1
+
+    def recent(self, now_second):
+        return [v for second, values in list(self.buckets) if second > now_second - self.window_s for v in values]
+
+
+class LiveStats:
+    """In-memory aggregates fed by the runner; read by LiveView."""
+
+    def __init__(self, window_s=10):
+        self.window_s = window_s
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._endpoints = defaultdict(lambda: _Buckets(window_s))
+        self._completions = deque()
+        self.in_flight = 0
+        self.total = 0
+        self.errors = 0
+        self._transports = []
+
+    def watch_transport(self, transport):
+        """Count a transport's open connections in the view."""
+        with self._lock:
+            self._transports.append(transport)
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self, endpoint, response):
+        now = time.monotonic()
+        second = int(now)
+        with self._lock:
+            self.in_flight -= 1
+            self.total += 1
+            if not response.ok:
+                self.errors += 1
+            self._endpoints[endpoint].add(second, response.elapsed_ms, response.ok)
+            self._completions.append(now)
+
+    def snapshot(self):
+        """Aggregates for display: overall rates plus per-endpoint rolling percentiles."""
+        now = time.monotonic()
+        with self._lock:
+            while self._completions and self._completions[0] < now - self.window_s:
+                self._completions.popleft()
+            recent_count = len(self._completions)
+            endpoints = {name: (b.count, b.errors, b.recent(int(now))) for name, b in self._endpoints.items()}
+            total, errors, in_flight = self.total, self.errors, self.in_flight
+            connections = sum(t.counters.connections - t.counters.closed for t in self._transports)
+        elapsed = now - self.started
+        rows = []
+        for name, (count, endpoint_errors, recent) in endpoints.items():
+            rows.append({
+                "endpoint": name,
+                "count": count,
+                "errors": endpoint_errors,
+                "p50_ms": percentile(recent, 0.50),
+                "p95_ms": percentile(recent, 0.95),
+                "p99_ms": percentile(recent, 0.99),
+            })
+        return {
+            "elapsed_s": elapsed,
+            "total": total,
+            "errors": errors,
+            "error_rate": errors / total if total else 0.0,
+            "rps": recent_count / min(self.window_s, max(elapsed, 1.0)),
+            "in_flight": in_flight,
+            "connections": connections,
+            "endpoints": rows,
+        }
+
+
+class LiveView:
+    """Redraws a LiveStats snapshot in place `hz` times per second.
+
+    On a non-TTY stream it prints one summary line every `plain_interval_s`
+    instead, so piped output stays readable.
+    """
+
+    def __init__(self, stats, hz=4, stream=None, plain_interval_s=5):
+        self.stats = stats
+        self.interval_s = 1 / hz
+        self.stream = stream or sys.stdout
+        self.tty = self.stream.isatty()
+        self.plain_interval_s = plain_interval_s
+        self._stop = threading.Event()
+        self._thread = None
+        self._lines_drawn = 0
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.render()
+
+    def _loop(self):
+        interval = self.interval_s if self.tty else self.plain_interval_s
+        while not self._stop.wait(interval):
+            self.render()
+
+    def render(self):
+        snap = self.stats.snapshot()
+        header = (f"{snap['elapsed_s']:6.1f}s  {snap['rps']:7.1f} req/s  {snap['total']:>8,} done  "
+                  f"{snap['error_rate'] * 100:5.2f}% errors  {snap['in_flight']:>3} in flight  "
+                  f"{snap['connections']:>3} conns")
+        if not self.tty:
+            self.stream.write(header + "\n")
+            self.stream.flush()
+            return
+        lines = [header, f"  {'Endpoint':<22} {'Count':>8} {'Errors':>7} {'p50':>8} {'p95':>8} {'p99':>8}"]
+        for row in snap["endpoints"]:
+            lines.append(f"  {row['endpoint']:<22} {row['count']:>8,} {row['errors']:>7,} "
+                         f"{row['p50_ms']:>6.0f}ms {row['p95_ms']:>6.0f}ms {row['p99_ms']:>6.0f}ms")
+        lines.append(f"  (rolling {self.stats.window_s}s window)")
+        out = []
+        if self._lines_drawn:
+            out.append(f"\x1b[{self._lines_drawn}F\x1b[J")
+        out.append("\n".join(lines) + "\n")
+        self.stream.write("".join(out))
+        self.stream.flush()
+        self._lines_drawn = len(lines)
+
+
+class SampledLog:
+    """Optional per-request JSON-lines log, sampled and written off the hot path.
+
+    write(planned, response) keeps roughly `rate` of requests (errors are
+    always kept); a full queue drops records rather than slowing the run.
+    """
+
+    def __init__(self, path, rate=1.0, seed=None, max_queue=10_000):
+        self.path = path
+        self.rate = rate
+        self.dropped = 0
+        self.written = 0
+        self._rng = random.Random(seed)
+        self._queue = queue.Queue(max_queue)
+        self._thread = None
+        self._file = None
+
+    def __enter__(self):
+        if self.path:
+            self._file = sys.stdout if self.path == "-" else open(self.path, "a", encoding="utf-8")
+            self._thread = threading.Thread(target=self._drain, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            if self._file is not sys.stdout:
+                self._file.close()
+
+    def write(self, planned, response):
+        if self._thread is None:
+            return
+        if response.ok and self._rng.random() >= self.rate:
+            return
+        try:
+            self._queue.put_nowait((time.time(), planned, response))
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            ts, planned, response = item
+            record = {
+                "ts": round(ts, 3),
+                "endpoint": planned.endpoint,
+                "method": planned.method,
+                "path": planned.path,
+                "status": response.status,
+                "ms": round(response.elapsed_ms, 2),
+            }
+            if response.error:
+                record["error"] = response.error
+            self._file.write(json.dumps(record) + "\n")
+            self.written += 1
+        self._file.flush()
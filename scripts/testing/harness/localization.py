@@ -0,0 +1,44 @@
+"""
+Synthetic localization data for the localization benchmarks.
+
+Keys, languages and translation values are pure functions of their index
+(and a revision number, bumped when a benchmark edits a translation), so a
+probe can say what any key held at any published version without keeping
+millions of strings around.
+
+    code = language_code(3)                      # "fr-x-bench"
+    translation_value(code, 1234, revision=2)    # deterministic, ~40 characters
+"""
+
+BASE_LANGUAGES = (
+    "en", "es", "fr", "de", "it", "pt", "nl", "sv", "da", "nb", "fi", "pl", "cs", "sk", "hu", "ro", "bg",
+    "el", "tr", "ru", "uk", "ar", "he", "fa", "hi", "bn", "ur", "ta", "te", "mr", "th", "vi", "id", "ms",
+    "tl", "zh", "ja", "ko", "sw", "am", "hr", "sr", "sl", "lt", "lv", "et", "is", "ga", "ca", "eu",
+)
+RTL_LANGUAGES = {"ar", "he", "fa", "ur"}
+MAX_LANGUAGES = len(BASE_LANGUAGES)
+_SAMPLE_TEXT = {
+    "ar": "مرحبا بك في التطبيق", "he": "ברוכים הבאים לאפליקציה", "ru": "Добро пожаловать в приложение",
+    "ja": "アプリへようこそ", "zh": "欢迎使用应用程序", "ko": "앱에 오신 것을 환영합니다", "hi": "ऐप में आपका स्वागत है",
+    "th": "ยินดีต้อนรับสู่แอป", "el": "Καλώς ήρθατε στην εφαρμογή",
+}
+
+
+def language_code(index):
+    """A private-use tag (BCP 47 "-x-") so benchmark languages never collide with a project's own."""
+    return f"{BASE_LANGUAGES[index]}-x-bench"
+
+
+def language_name(index):
+    return f"{BASE_LANGUAGES[index].upper()} (benchmark)"
+
+
+def key_name(index, prefix="bench"):
+    return f"{prefix}.screen{index // 100:04d}.k{index:06d}"
+
+
+def translation_value(code, key_index, revision=0, chars=40):
+    """The value of key `key_index` in language `code` at `revision`, padded to about `chars` characters."""
+    base = code.split("-", 1)[0]
+    text = f"{_SAMPLE_TEXT.get(base, 'Welcome to the app')} #{key_index} r{revision}"
+    return text + " ·" * max((chars - len(text)) // 2, 0)
@@ -0,0 +1,240 @@
+"""
+Python reference for the mock matching in src/lib/mock.ts, plus generators
+for synthetic mock tables and the proxy requests that exercise them.
+
+select_endpoints() does what getMockResponse()'s findMany does (enabled
+endpoints for the method with their enabled responses and conditions, in
+priority order); match_mock() is the matching loop that runs over the
+result on every proxied call. Splitting them lets a probe time the
+in-process matching on its own, next to what the proxy costs end to end.
+
+    table = make_mock_table(endpoints=100, conditions=4)
+    candidates = select_endpoints(table, "GET")
+    match_mock({"mode": "selective"}, candidates, **proxy_request("match", 7, 4, n=0))
+"""
+
+import json
+import re
+
+from .targeting import js_parse_float
+
+
+def _js_string(value):
+    """String(value) for values parsed from JSON."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, dict):
+        return "[object Object]"
+    if isinstance(value, list):
+        return ",".join("" if v is None else _js_string(v) for v in value)
+    return str(value)
+
+
+def matches_pattern(path, pattern):
+    """matchesPattern(): `*` matches anything, `:name` one path segment."""
+    regex = re.sub(r":[^/]+", "[^/]+", pattern.replace("*", ".*"))
+    return re.search(f"^{regex}$", path) is not None
+
+
+def should_mock_endpoint(path, environment, endpoint_exists):
+    mode = environment.get("mode", "selective")
+    if mode == "selective":
+        return endpoint_exists
+    if mode == "global":
+        return True
+    if mode == "whitelist":
+        return any(matches_pattern(path, p) for p in environment.get("whitelist") or [])
+    if mode == "blacklist":
+        return not any(matches_pattern(path, p) for p in environment.get("blacklist") or [])
+    return False
+
+
+def match_endpoint_path(pattern, request_path):
+    """matchEndpointPath(): (matched, path params)."""
+    pattern_parts = pattern.split("/")
+    request_parts = request_path.split("/")
+    if len(pattern_parts) != len(request_parts):
+        if pattern.endswith("/*") and request_path.startswith(pattern[:-2]):
+            return True, {}
+        return False, {}
+    params = {}
+    for pattern_part, request_part in zip(pattern_parts, request_parts):
+        if pattern_part.startswith(":"):
+            params[pattern_part[1:]] = request_part
+        elif pattern_part != "*" and pattern_part != request_part:
+            return False, params
+    return True, params
+
+
+def _value_to_check(condition, params, query, headers, body):
+    kind, key = condition["type"], condition["key"]
+    if kind == "path_param":
+        return params.get(key) or None
+    if kind == "query_param":
+        return query.get(key) or None
+    if kind == "header":
+        if condition.get("isCaseSensitive"):
+            header = key if key in headers else None
+        else:
+            header = next((k for k in headers if k.lower() == key.lower()), None)
+        return (headers.get(header) or None) if header is not None else None
+    if kind == "body_json_path":
+        current = body
+        for part in re.sub(r"^\$\.", "", key).split("."):
+            if isinstance(current, dict) and part in current:
+                current = current[part]
+            elif isinstance(current, list) and part.isdigit() and int(part) < len(current):
+                current = current[int(part)]
+            else:
+                return None
+        return _js_string(current) if current is not None else None
+    return None
+
+
+def evaluate_condition(condition, params, query, headers, body):
+    """evaluateCondition() for one MockCondition row."""
+    value = _value_to_check(condition, params, query, headers, body)
+    operator = condition["operator"]
+    if operator == "exists":
+        return value is not None
+    if operator == "not_exists":
+        return value is None
+    if value is None:
+        return False
+    case_sensitive = condition.get("isCaseSensitive", False)
+    check = value if case_sensitive else value.lower()
+    wanted = condition.get("value") or None
+    if wanted is not None and not case_sensitive:
+        wanted = wanted.lower()
+    if operator == "equals":
+        return check == wanted
+    if operator == "contains":
+        return wanted is not None and wanted in check
+    if operator == "matches":
+        try:
+            return re.search(wanted or "", check) is not None
+        except re.error:
+            return False
+    if operator in ("greater_than", "less_than"):
+        left = js_parse_float(check)
+        right = js_parse_float(wanted) if wanted is not None else float("nan")
+        if left != left or right != right:
+            return False
+        return left > right if operator == "greater_than" else left < right
+    return False
+
+
+def select_endpoints(endpoints, method):
+    """The rows getMockResponse() fetches: enabled endpoints for `method` with their
+    enabled responses, conditions in evaluation order, all in priority order."""
+    selected = []
+    for endpoint in endpoints:
+        if not endpoint.get("isEnabled", True) or endpoint["method"] != method.upper():
+            continue
+        responses = sorted((r for r in endpoint["responses"] if r.get("isEnabled", True)),
+                           key=lambda r: (r.get("order", 0), not r.get("isDefault", False)))
+        selected.append({**endpoint,
+                         "conditions": sorted(endpoint.get("conditions") or [], key=lambda c: c.get("order", 0)),
+                         "responses": [{**r, "conditions": sorted(r.get("conditions") or [],
+                                                                  key=lambda c: c.get("order", 0))}
+                                       for r in responses]})
+    return sorted(selected, key=lambda e: e.get("order", 0))
+
+
+def _result(endpoint, response):
+    return {"mockFound": True, "statusCode": response["statusCode"], "headers": response.get("responseHeaders") or {},
+            "body": response.get("responseBody"), "delay": response.get("delay", 0),
+            "endpointId": endpoint["id"], "responseId": response["id"]}
+
+
+def match_mock(environment, endpoints, path, method, query=None, headers=None, body=None):
+    """The matching loop of getMockResponse() over select_endpoints() output."""
+    query, headers = query or {}, headers or {}
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            body = None
+    for endpoint in endpoints:
+        matched, params = match_endpoint_path(endpoint["path"], path)
+        if not matched:
+            continue
+        if not all(evaluate_condition(c, params, query, headers, body) for c in endpoint["conditions"]):
+            continue
+        if not should_mock_endpoint(path, environment, True):
+            return {"mockFound": False}
+        for response in endpoint["responses"]:
+            if all(evaluate_condition(c, params, query, headers, body) for c in response["conditions"]):
+                return _result(endpoint, response)
+        default = next((r for r in endpoint["responses"] if r.get("isDefault")), None)
+        if default:
+            return _result(endpoint, default)
+    return {"mockFound": False}
+
+
+# -- synthetic mock tables ----------------------------------------------------
+
+# Conditions on each endpoint's conditional response, rotating through the
+# condition types; a "match" request satisfies all of them and a "default"
+# request fails only the last one, so both pay for every condition.
+_CONDITIONS = (
+    lambda j: ({"type": "query_param", "key": f"q{j}", "operator": "equals", "value": f"v{j}"},
+               ("query", f"q{j}", f"v{j}", f"w{j}")),
+    lambda j: ({"type": "header", "key": f"X-Bench-{j}", "operator": "contains", "value": "ok"},
+               ("headers", f"X-Bench-{j}", f"is-ok-{j}", f"no-{j}")),
+    lambda j: ({"type": "body_json_path", "key": f"$.filters.f{j}", "operator": "equals", "value": f"v{j}"},
+               ("body", f"f{j}", f"v{j}", f"w{j}")),
+    lambda j: ({"type": "query_param", "key": f"n{j}", "operator": "greater_than", "value": "10"},
+               ("query", f"n{j}", "42", "3")),
+    lambda j: ({"type": "header", "key": f"X-Trace-{j}", "operator": "matches", "value": "^[a-f0-9]+$"},
+               ("headers", f"X-Trace-{j}", "c0ffee", "zz-top")),
+)
+
+
+def mock_path(index):
+    return f"/bench/r{index}/items/:id"
+
+
+def response_conditions(conditions):
+    """The MockCondition rows for a conditional response with `conditions` conditions."""
+    return [dict(_CONDITIONS[j % len(_CONDITIONS)](j)[0], order=j) for j in range(conditions)]
+
+
+def make_mock_table(endpoints, conditions, body_bytes=256):
+    """`endpoints` GET endpoints, each with a conditional 200 response (`conditions`
+    conditions) and a default 202 response, as select_endpoints() input."""
+    table = []
+    filler = "x" * max(body_bytes - 40, 0)
+    for i in range(endpoints):
+        table.append({
+            "id": f"endpoint-{i}", "path": mock_path(i), "method": "GET", "order": i, "conditions": [],
+            "responses": [
+                {"id": f"response-{i}-match", "statusCode": 200, "order": 0, "isDefault": False,
+                 "responseBody": {"endpoint": i, "case": "match", "data": filler},
+                 "conditions": response_conditions(conditions)},
+                {"id": f"response-{i}-default", "statusCode": 202, "order": 1, "isDefault": True,
+                 "responseBody": {"endpoint": i, "case": "default", "data": filler}, "conditions": []},
+            ],
+        })
+    return table
+
+
+def proxy_request(kind, endpoint, conditions, n=0):
+    """Arguments of match_mock() for one proxied call.
+
+    kind is "match" (the conditional response), "default" (every condition but
+    the last holds, so the default response) or "miss" (no endpoint matches).
+    """
+    if kind == "miss":
+        return {"path": f"/bench/unmapped/items/{n}", "method": "GET", "query": {}, "headers": {}, "body": None}
+    parts = {"query": {}, "headers": {}, "body": {}}
+    for j in range(conditions):
+        _, (where, key, good, bad) = _CONDITIONS[j % len(_CONDITIONS)](j)
+        parts[where][key] = bad if kind == "default" and j == conditions - 1 else good
+    return {"path": mock_path(endpoint).replace(":id", str(n)), "method": "GET", "query": parts["query"],
+            "headers": parts["headers"], "body": {"filters": parts["body"]} if parts["body"] else None}
+
+
+REQUEST_KINDS = ("match", "default", "miss")
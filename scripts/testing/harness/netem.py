@@ -0,0 +1,255 @@
+"""
+In-process mobile network emulation for the API probes.
+
+Wraps every TCP connection opened through socket.create_connection (which
+urllib and http.client use) in a shaped link: the application gets one end
+of a loopback socket pair, and a pair of delay lines pump bytes between the
+other end and the real upstream socket. Each delay line adds one-way
+latency, jitter, a bandwidth cap and retransmission-like stalls, so TLS and
+HTTP behave exactly as they would on a slow path - no root or tc/netem.
+
+Shaping is added on top of whatever the real path already costs, so
+results are most meaningful against a local or nearby instance.
+
+Usage:
+    from harness.netem import PRESETS, shaped_network
+
+    with shaped_network(PRESETS["3g"], seed=42) as stats:
+        urllib.request.urlopen(...)
+    print(stats.connections, stats.bytes_down)
+"""
+
+import contextlib
+import math
+import queue
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+
+MSS_BYTES = 1460
+MIN_RTO_MS = 200
+CHUNK_BYTES = 16 * 1024
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    """Link characteristics for one emulated network.
+
+    Bandwidth values are in kilobits per second; 0 means unlimited.
+    `loss` is the per-segment probability of a loss, modelled as a stall of
+    one retransmission timeout on the chunk carrying that segment.
+    """
+    name: str
+    rtt_ms: float = 0.0
+    jitter_ms: float = 0.0
+    down_kbps: float = 0.0
+    up_kbps: float = 0.0
+    loss: float = 0.0
+
+    @property
+    def rto_ms(self):
+        return max(MIN_RTO_MS, 2 * self.rtt_ms)
+
+    @property
+    def is_passthrough(self):
+        return not (self.rtt_ms or self.jitter_ms or self.down_kbps or self.up_kbps or self.loss)
+
+    def describe(self):
+        def rate(kbps):
+            return "unlimited" if not kbps else f"{kbps / 1000:.1f}Mbps" if kbps >= 1000 else f"{kbps:.0f}kbps"
+        return (f"{self.name}: RTT {self.rtt_ms:.0f}ms ±{self.jitter_ms:.0f}ms, "
+                f"down {rate(self.down_kbps)}, up {rate(self.up_kbps)}, loss {self.loss * 100:.1f}%")
+
+
+# Rough field numbers for SDK-init conditions (median RTT, sustained throughput).
+PRESETS = {
+    "none": NetworkProfile("none"),
+    "edge": NetworkProfile("edge", rtt_ms=650, jitter_ms=100, down_kbps=240, up_kbps=200, loss=0.02),
+    "3g": NetworkProfile("3g", rtt_ms=300, jitter_ms=40, down_kbps=1600, up_kbps=768, loss=0.01),
+    "lte": NetworkProfile("lte", rtt_ms=70, jitter_ms=15, down_kbps=12000, up_kbps=5000, loss=0.002),
+    "wifi-poor": NetworkProfile("wifi-poor", rtt_ms=150, jitter_ms=80, down_kbps=2000, up_kbps=1000, loss=0.03),
+}
+
+
+def get_profile(name):
+    """Look up a preset by name, raising ValueError with the valid names."""
+    try:
+        return PRESETS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown network profile '{name}' (choose from: {', '.join(PRESETS)})") from None
+
+
+class LinkStats:
+    """Counters for all connections opened inside one shaped_network() block."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.bytes_up = 0
+        self.bytes_down = 0
+        self.stalls = 0
+
+    def add(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                setattr(self, key, getattr(self, key) + value)
+
+
+class _DelayLine:
+    """One direction of a shaped link, pumping src -> dst."""
+
+    def __init__(self, src, dst, one_way_s, jitter_s, kbps, loss, rto_s, rng, stats, counter, on_done):
+        self.src = src
+        self.dst = dst
+        self.one_way_s = one_way_s
+        self.jitter_s = jitter_s
+        self.bytes_per_s = kbps * 1000 / 8 if kbps else 0
+        self.loss = loss
+        self.rto_s = rto_s
+        self.rng = rng
+        self.stats = stats
+        self.counter = counter
+        self.on_done = on_done
+        self._queue = queue.Queue()
+        self._link_free_at = 0.0
+        self._last_delivery = 0.0
+
+    def start(self):
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        threading.Thread(target=self._write_loop, daemon=True).start()
+
+    def _schedule(self, size):
+        now = time.monotonic()
+        if self.bytes_per_s:
+            self._link_free_at = max(now, self._link_free_at) + size / self.bytes_per_s
+        else:
+            self._link_free_at = now
+        deliver_at = self._link_free_at + self.one_way_s
+        if self.jitter_s:
+            deliver_at += self.rng.uniform(0, self.jitter_s)
+        if self.loss:
+            segments = math.ceil(size / MSS_BYTES)
+            if self.rng.random() < 1 - (1 - self.loss) ** segments:
+                deliver_at += self.rto_s
+                self.stats.add(stalls=1)
+        # TCP delivers in order, so a stalled chunk holds back everything behind it.
+        self._last_delivery = max(deliver_at, self._last_delivery)
+        return self._last_delivery
+
+    def _read_loop(self):
+        try:
+            while True:
+                chunk = self.src.recv(CHUNK_BYTES)
+                if not chunk:
+                    break
+                self._queue.put((self._schedule(len(chunk)), chunk))
+        except OSError:
+            pass
+        self._queue.put((self._schedule(0), None))
+
+    def _write_loop(self):
+        try:
+            while True:
+                deliver_at, chunk = self._queue.get()
+                delay = deliver_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                if chunk is None:
+                    self.dst.shutdown(socket.SHUT_WR)
+                    break
+                self.dst.sendall(chunk)
+                self.stats.add(**{self.counter: len(chunk)})
+        except OSError:
+            pass
+        self.on_done()
+
+
+def _loopback_pair():
+    """Return a connected pair of loopback TCP sockets.
+
+    socket.socketpair() gives AF_UNIX sockets, which reject the TCP options
+    http.client sets (TCP_NODELAY), so build a real TCP pair instead.
+    """
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        app_side = _real_create_connection(listener.getsockname())
+        link_side, _ = listener.accept()
+    return app_side, link_side
+
+
+class _ShapedConnection:
+    """Owns the loopback pair and upstream socket behind one shaped connection."""
+
+    def __init__(self, upstream, profile, rng, stats, timeout):
+        self.upstream = upstream
+        self.app_side, self.link_side = _loopback_pair()
+        if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+            self.app_side.settimeout(timeout)
+        upstream.settimeout(None)
+        self._lock = threading.Lock()
+        self._open_lines = 2
+
+        one_way_s = profile.rtt_ms / 2000
+        jitter_s = profile.jitter_ms / 2000
+        rto_s = profile.rto_ms / 1000
+        _DelayLine(self.link_side, upstream, one_way_s, jitter_s, profile.up_kbps,
+                   profile.loss, rto_s, rng, stats, "bytes_up", self._line_done).start()
+        _DelayLine(upstream, self.link_side, one_way_s, jitter_s, profile.down_kbps,
+                   profile.loss, rto_s, rng, stats, "bytes_down", self._line_done).start()
+
+    def _line_done(self):
+        with self._lock:
+            self._open_lines -= 1
+            if self._open_lines:
+                return
+        for sock in (self.link_side, self.upstream):
+            with contextlib.suppress(OSError):
+                sock.close()
+
+
+_patch_lock = threading.Lock()
+_real_create_connection = socket.create_connection
+
+
+@contextlib.contextmanager
+def shaped_network(profile, seed=None):
+    """Shape every connection opened via socket.create_connection in this block.
+
+    Yields a LinkStats with connection and byte counters. The patch is
+    process-wide, so only one shaped_network() block may be active at once.
+    """
+    stats = LinkStats()
+    if profile is None or profile.is_passthrough:
+        yield stats
+        return
+
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    class _LockedRandom:
+        def random(self):
+            with rng_lock:
+                return rng.random()
+
+        def uniform(self, a, b):
+            with rng_lock:
+                return rng.uniform(a, b)
+
+    locked_rng = _LockedRandom()
+
+    def create_connection(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None, **kwargs):
+        upstream = _real_create_connection(address, timeout, source_address, **kwargs)
+        # The TCP three-way handshake costs one full round trip before any data moves.
+        time.sleep((profile.rtt_ms + locked_rng.uniform(0, profile.jitter_ms)) / 1000)
+        stats.add(connections=1)
+        return _ShapedConnection(upstream, profile, locked_rng, stats, timeout).app_side
+
+    if not _patch_lock.acquire(blocking=False):
+        raise RuntimeError("shaped_network() blocks cannot be nested")
+    socket.create_connection = create_connection
+    try:
+        yield stats
+    finally:
+        socket.create_connection = _real_create_connection
+        _patch_lock.release()
@@ -0,0 +1,142 @@
+"""
+Executes a compiled scenario (harness.scenario.ExecutionPlan).
+
+Workers share one request counter; each takes the next index, builds that
+request from the plan and sends it over its own keep-alive transport. With
+load.rps set the run is open-loop: request i is sent at its scheduled
+offset whether or not earlier responses are back. Otherwise each worker
+sends as fast as its responses return (closed loop), with workers started
+evenly across load.ramp_up_s.
+"""
+
+import itertools
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from .stats import percentile
+from .transport import make_transport
+
+
+@dataclass
+class RunResult:
+    """Per-endpoint latencies (ms) and outcomes of one plan execution."""
+    latencies: dict = field(default_factory=lambda: defaultdict(list))
+    errors: dict = field(default_factory=lambda: defaultdict(int))
+    statuses: dict = field(default_factory=lambda: defaultdict(int))
+    started: float = 0.0
+    finished: float = 0.0
+
+    def record(self, planned, response):
+        self.latencies[planned.endpoint].append(response.elapsed_ms)
+        self.statuses[response.status or "error"] += 1
+        if not response.ok:
+            self.errors[planned.endpoint] += 1
+
+    @property
+    def duration_s(self):
+        return max(self.finished - self.started, 1e-9)
+
+    @property
+    def total(self):
+        return sum(len(v) for v in self.latencies.values())
+
+    def summary(self, endpoint=None):
+        """Metrics for one endpoint, or all endpoints combined."""
+        if endpoint is None:
+            values = [v for vs in self.latencies.values() for v in vs]
+            errors = sum(self.errors.values())
+        else:
+            values = self.latencies.get(endpoint, [])
+            errors = self.errors.get(endpoint, 0)
+        count = len(values)
+        return {
+            "count": count,
+            "errors": errors,
+            "error_rate": errors / count if count else 0.0,
+            "rps": count / self.duration_s,
+            "mean_ms": sum(values) / count if count else 0.0,
+            "p50_ms": percentile(values, 0.50),
+            "p95_ms": percentile(values, 0.95),
+            "p99_ms": percentile(values, 0.99),
+        }
+
+
+def run_plan(plan, protocol="h1", on_result=None, stop=None, live=None):
+    """Execute `plan` and return a RunResult.
+
+    on_result(planned, response) is called from worker threads after every
+    request; `stop` is an optional threading.Event to end the run early;
+    `live` is an optional harness.live.LiveStats fed as requests complete.
+    """
+    load = plan.load
+    result = RunResult()
+    counter = itertools.count()
+    record_lock = threading.Lock()
+    stop = stop or threading.Event()
+    result.started = time.perf_counter()
+    deadline = result.started + load.duration_s if load.duration_s else None
+
+    def worker(worker_index):
+        if not load.rps and load.ramp_up_s:
+            time.sleep(worker_index * load.ramp_up_s / load.concurrency)
+        with make_transport(protocol, plan.base_url) as transport:
+            if live:
+                live.watch_transport(transport)
+            while not stop.is_set():
+                index = next(counter)
+                if load.requests is not None and index >= load.requests:
+                    return
+                offset = load.offset_s(index)
+                if offset is not None:
+                    send_at = result.started + offset
+                    if deadline and send_at >= deadline:
+                        return
+                    delay = send_at - time.perf_counter()
+                    if delay > 0 and stop.wait(delay):
+                        return
+                elif deadline and time.perf_counter() >= deadline:
+                    return
+                planned = plan.request_at(index)
+                if live:
+                    live.begin()
+                response = transport.request(planned.path, planned.headers, planned.method, planned.body)
+                if live:
+                    live.finish(planned.endpoint, response)
+                with record_lock:
+                    result.record(planned, response)
+                if on_result:
+                    on_result(planned, response)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(load.concurrency)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.2)
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    result.finished = time.perf_counter()
+    return result
+
+
+def evaluate_slo(plan, result):
+    """Check the plan's SLO thresholds; returns (scope, metric, limit, actual, ok) rows."""
+    rows = []
+    scopes = [("overall", None, plan.slo)]
+    scopes += [(name, name, thresholds) for name, thresholds in plan.slo_by_endpoint.items()]
+    for scope, endpoint, thresholds in scopes:
+        summary = result.summary(endpoint)
+        for metric, limit in thresholds.items():
+            if metric == "min_rps":
+                actual = summary["rps"]
+                ok = actual >= limit
+            else:
+                actual = summary[metric]
+                ok = actual <= limit
+            rows.append((scope, metric, limit, actual, ok))
+    return rows
@@ -0,0 +1,360 @@
+"""
+Declarative load scenarios, compiled once into an execution plan.
+
+A scenario is a JSON file (see scripts/testing/scenarios/) describing:
+- targets:   named base URLs + default headers; values may use ${VAR} or
+             ${VAR:-default} so credentials come from the environment
+- endpoints: a weighted mix, each with method, path, headers, query and an
+             optional JSON body; strings may contain {{...}} placeholders,
+             and paths and headers may use ${VAR} like targets
+- load:      concurrency, a request count or duration, and optional rps,
+             ramp-up and iteration count
+- seed:      makes endpoint choice and placeholder values reproducible
+- slo:       thresholds (p50_ms, p95_ms, p99_ms, error_rate, min_rps), with
+             optional per-endpoint overrides
+
+Placeholders:
+    {{seq}}              request index
+    {{uuid}}             random UUID4
+    {{int:LO:HI}}        random integer in [LO, HI]
+    {{choice:a|b|c}}     one of the options
+    {{user:N}}           one of N synthetic user IDs ("user-<k>")
+    {{now}}              current UTC time, ISO 8601
+
+Scenario.compile() resolves the target, expands the environment, parses every
+template and builds a cumulative-weight table, so per-request work in the
+runner is one bisect plus filling in pre-split template parts. Request i is
+always drawn from Random(seed, i), so the same seed yields the same
+request sequence regardless of how workers interleave.
+"""
+
+import bisect
+import json
+import os
+import random
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode
+
+SCENARIO_DIR = Path(__file__).resolve().parent.parent / "scenarios"
+DEFAULT_SCENARIO = SCENARIO_DIR / "sdk-init.json"
+
+_ENV_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}")
+_PLACEHOLDER = re.compile(r"\{\{\s*([a-z]+)(?::([^}]*))?\s*\}\}")
+SLO_METRICS = ("p50_ms", "p95_ms", "p99_ms", "error_rate", "min_rps")
+
+
+class ScenarioError(ValueError):
+    """Raised for an invalid scenario file or an unresolvable target."""
+
+
+def expand_env(value, where):
+    """Replace ${VAR} / ${VAR:-default} in a string from os.environ."""
+    def substitute(match):
+        name, default = match.group(1), match.group(2)
+        if name in os.environ:
+            return os.environ[name]
+        if default is not None:
+            return default
+        raise ScenarioError(f"{where}: environment variable {name} is not set")
+    return _ENV_PATTERN.sub(substitute, value)
+
+
+class Template:
+    """A string split once into literal parts and placeholder generators."""
+
+    def __init__(self, text, where):
+        self.parts = []
+        self.dynamic = False
+        pos = 0
+        for match in _PLACEHOLDER.finditer(text):
+            if match.start() > pos:
+                self.parts.append(text[pos:match.start()])
+            self.parts.append(self._generator(match.group(1), match.group(2), where))
+            self.dynamic = True
+            pos = match.end()
+        if pos < len(text):
+            self.parts.append(text[pos:])
+        self.text = text
+
+    @staticmethod
+    def _generator(kind, arg, where):
+        if kind == "seq":
+            return lambda ctx: str(ctx.index)
+        if kind == "uuid":
+            return lambda ctx: str(uuid.UUID(int=ctx.rng.getrandbits(128), version=4))
+        if kind == "now":
+            return lambda ctx: datetime.now(timezone.utc).isoformat()
+        if kind == "int":
+            try:
+                lo, hi = (int(v) for v in (arg or "").split(":"))
+            except ValueError:
+                raise ScenarioError(f"{where}: {{{{int:LO:HI}}}} needs two integers, got '{arg}'") from None
+            return lambda ctx: str(ctx.rng.randint(lo, hi))
+        if kind == "choice":
+            options = (arg or "").split("|")
+            return lambda ctx: ctx.rng.choice(options)
+        if kind == "user":
+            try:
+                population = int(arg)
+            except (TypeError, ValueError):
+                raise ScenarioError(f"{where}: {{{{user:N}}}} needs a population size, got '{arg}'") from None
+            return lambda ctx: f"user-{ctx.rng.randrange(population)}"
+        raise ScenarioError(f"{where}: unknown placeholder '{{{{{kind}}}}}'")
+
+    def render(self, ctx):
+        if not self.dynamic:
+            return self.text
+        return "".join(part if isinstance(part, str) else part(ctx) for part in self.parts)
+
+
+def _compile_value(value, where):
+    """Turn a JSON value into a render(ctx) callable, or a constant if static."""
+    if isinstance(value, str):
+        template = Template(value, where)
+        return template.render if template.dynamic else value
+    if isinstance(value, dict):
+        items = [(k, _compile_value(v, f"{where}.{k}")) for k, v in value.items()]
+        if not any(callable(v) for _, v in items):
+            return value
+        return lambda ctx: {k: v(ctx) if callable(v) else v for k, v in items}
+    if isinstance(value, list):
+        items = [_compile_value(v, f"{where}[{i}]") for i, v in enumerate(value)]
+        if not any(callable(v) for v in items):
+            return value
+        return lambda ctx: [v(ctx) if callable(v) else v for v in items]
+    return value
+
+
+@dataclass
+class RenderContext:
+    index: int
+    rng: random.Random
+
+
+@dataclass
+class PlannedRequest:
+    index: int
+    endpoint: str
+    method: str
+    path: str
+    headers: dict
+    body: bytes | None
+
+
+@dataclass
+class CompiledEndpoint:
+    name: str
+    method: str
+    weight: float
+    path: Template
+    query: object
+    headers: object
+    body: object
+    static_body: bytes | None = None
+
+    def build(self, ctx, base_headers):
+        path = self.path.render(ctx)
+        query = self.query(ctx) if callable(self.query) else self.query
+        if query:
+            path = f"{path}{'&' if '?' in path else '?'}{urlencode(query)}"
+        headers = self.headers(ctx) if callable(self.headers) else self.headers
+        if self.static_body is not None:
+            body = self.static_body
+        elif self.body is not None:
+            body = json.dumps(self.body(ctx)).encode("utf-8")
+        else:
+            body = None
+        return PlannedRequest(ctx.index, self.name, self.method, path, {**base_headers, **headers}, body)
+
+
+@dataclass
+class LoadProfile:
+    """How hard to drive the plan. `iterations` is the round count used by
+    api-concurrent-test.py; the runner stops on `requests` or `duration_s`."""
+    concurrency: int = 1
+    requests: int | None = None
+    duration_s: float | None = None
+    rps: float | None = None
+    ramp_up_s: float = 0.0
+    iterations: int = 1
+
+    def offset_s(self, index):
+        """Open-loop send time of request `index`, with a linear rate ramp."""
+        if not self.rps:
+            return None
+        ramp_requests = self.rps * self.ramp_up_s / 2
+        if index < ramp_requests:
+            return (2 * index * self.ramp_up_s / self.rps) ** 0.5
+        return self.ramp_up_s + (index - ramp_requests) / self.rps
+
+
+@dataclass
+class ExecutionPlan:
+    name: str
+    target: str
+    base_url: str
+    headers: dict
+    endpoints: list
+    seed: int
+    load: LoadProfile
+    slo: dict = field(default_factory=dict)
+    slo_by_endpoint: dict = field(default_factory=dict)
+    _cumulative: list = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        total = 0.0
+        for endpoint in self.endpoints:
+            total += endpoint.weight
+            self._cumulative.append(total)
+
+    def request_at(self, index):
+        """Build request `index`; the same seed and index always give the same request."""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        endpoint = self.endpoints[bisect.bisect_right(self._cumulative, rng.random() * self._cumulative[-1])]
+        return endpoint.build(RenderContext(index, rng), self.headers)
+
+
+@dataclass
+class Scenario:
+    """A parsed scenario file; compile() turns it into an ExecutionPlan."""
+    path: Path
+    data: dict
+
+    @property
+    def name(self):
+        return self.data.get("name", self.path.stem)
+
+    @property
+    def targets(self):
+        return list(self.data.get("targets", {}))
+
+    def target(self, name=None):
+        """Return (name, base_url, headers) for a target with the environment expanded."""
+        targets = self.data.get("targets") or {}
+        name = name or self.data.get("default_target") or next(iter(targets), None)
+        if name not in targets:
+            raise ScenarioError(f"{self.path.name}: unknown target '{name}' (choose from: {', '.join(targets)})")
+        target = targets[name]
+        where = f"{self.path.name}: targets.{name}"
+        if "base_url" not in target:
+            raise ScenarioError(f"{where}: base_url is required")
+        base_url = expand_env(target["base_url"], where).rstrip("/")
+        headers = {k: expand_env(str(v), f"{where}.headers.{k}") for k, v in (target.get("headers") or {}).items()}
+        return name, base_url, headers
+
+    @property
+    def load(self):
+        raw = dict(self.data.get("load") or {})
+        unknown = set(raw) - set(LoadProfile.__dataclass_fields__)
+        if unknown:
+            raise ScenarioError(f"{self.path.name}: unknown load settings: {', '.join(sorted(unknown))}")
+        load = LoadProfile(**raw)
+        if load.concurrency < 1:
+            raise ScenarioError(f"{self.path.name}: load.concurrency must be at least 1")
+        return load
+
+    def compile(self, target=None, seed=None, **load_overrides):
+        name, base_url, headers = self.target(target)
+        load = self.load
+        for key, value in load_overrides.items():
+            if value is not None:
+                setattr(load, key, value)
+        if load.requests is None and load.duration_s is None:
+            raise ScenarioError(f"{self.path.name}: load needs 'requests' or 'duration_s'")
+
+        endpoints = []
+        for i, raw in enumerate(self.data.get("endpoints") or []):
+            where = f"{self.path.name}: endpoints[{i}]"
+            if "path" not in raw:
+                raise ScenarioError(f"{where}: path is required")
+            weight = float(raw.get("weight", 1))
+            if weight <= 0:
+                continue
+            endpoint_headers = {k: expand_env(str(v), f"{where}.headers.{k}")
+                                for k, v in (raw.get("headers") or {}).items()}
+            if "body" in raw and not any(k.lower() == "content-type" for k in endpoint_headers):
+                endpoint_headers["Content-Type"] = "application/json"
+            endpoint = CompiledEndpoint(
+                name=raw.get("name") or raw["path"],
+                method=raw.get("method", "GET").upper(),
+                weight=weight,
+                path=Template(expand_env(raw["path"], f"{where}.path"), f"{where}.path"),
+                query=_compile_value(raw.get("query") or {}, f"{where}.query"),
+                headers=_compile_value(endpoint_headers, f"{where}.headers"),
+                body=None,
+            )
+            if "body" in raw:
+                body = _compile_value(raw["body"], f"{where}.body")
+                if callable(body):
+                    endpoint.body = body
+                else:
+                    endpoint.static_body = json.dumps(body).encode("utf-8")
+            endpoints.append(endpoint)
+        if not endpoints:
+            raise ScenarioError(f"{self.path.name}: at least one endpoint with a positive weight is required")
+
+        slo = dict(self.data.get("slo") or {})
+        slo_by_endpoint = slo.pop("endpoints", {}) or {}
+        for scope, thresholds in [("slo", slo), *((f"slo.endpoints.{k}", v) for k, v in slo_by_endpoint.items())]:
+            unknown = set(thresholds) - set(SLO_METRICS)
+            if unknown:
+                raise ScenarioError(f"{self.path.name}: {scope}: unknown metrics {', '.join(sorted(unknown))}")
+
+        return ExecutionPlan(
+            name=self.name,
+            target=name,
+            base_url=base_url,
+            headers=headers,
+            endpoints=endpoints,
+            seed=self.data.get("seed", 0) if seed is None else seed,
+            load=load,
+            slo=slo,
+            slo_by_endpoint=slo_by_endpoint,
+        )
+
+
+def load_scenario(path=None):
+    """Read a scenario file (default: scenarios/sdk-init.json)."""
+    path = Path(path) if path else DEFAULT_SCENARIO
+    if not path.exists() and not path.is_absolute() and (SCENARIO_DIR / path).exists():
+        path = SCENARIO_DIR / path
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise ScenarioError(f"Scenario file not found: {path}") from None
+    except json.JSONDecodeError as e:
+        raise ScenarioError(f"{path.name}: invalid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise ScenarioError(f"{path.name}: top level must be an object")
+    return Scenario(path, data)
+
+
+def add_scenario_arguments(parser, default=None):
+    """Add the --scenario/--target options every probe script accepts.
+
+    `default` is the script's own scenario (a file in scenarios/), used when
+    --scenario is not given; without one, load_scenario() falls back to
+    scenarios/sdk-init.json.
+    """
+    shown = SCENARIO_DIR.name + "/" + default if default else DEFAULT_SCENARIO.relative_to(SCENARIO_DIR.parent)
+    parser.add_argument("--scenario", default=default, help=f"scenario file (default: {shown})")
+    parser.add_argument("--target", default=None, help="target name from the scenario (default: its default_target)")
+
+
+def probe_config(args, parser):
+    """Resolve (scenario, base_url, headers) for a probe from parsed --scenario/--target.
+
+    Scenario problems are reported through parser.error(), like bad options.
+    """
+    try:
+        scenario = load_scenario(args.scenario)
+        _, base_url, headers = scenario.target(args.target)
+        scenario.load
+    except ScenarioError as e:
+        parser.error(str(e))
+    return scenario, base_url, headers
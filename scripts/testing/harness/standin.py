@@ -0,0 +1,350 @@
+"""
+Local stand-in for the SDK endpoints, speaking HTTP/1.1 and HTTP/2.
+
+Serves /api/sdk-init and the three legacy endpoints it replaced
+(/api/feature-flags, /api/sdk-settings, /api/business-config) with payloads
+shaped like the real routes and a configurable per-route service delay that
+stands in for the Prisma queries. One port accepts both keep-alive
+HTTP/1.1 and prior-knowledge HTTP/2 (h2c), chosen from the connection
+preface, so protocol comparisons need no TLS setup. The routes table can be
+replaced to stand in for other APIs; a key ending in "/" also serves every
+path below it (for ids in the path, like /api/mocks/environments/<id>).
+
+HTTP/2 needs the `h2` package (pip install h2); without it the stand-in
+serves HTTP/1.1 only.
+
+Usage:
+    python3 scripts/testing/harness/standin.py --port 8787 --delay-scale 0.5
+
+    from harness.standin import StandInServer
+    with StandInServer() as server:
+        run_probe(server.base_url)
+"""
+
+import argparse
+import hashlib
+import json
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+FEATURE_FLAGS = {
+    "sdkEnabled": True, "apiTracking": True, "screenTracking": True, "crashReporting": True,
+    "logging": True, "deviceTracking": True, "sessionTracking": True, "businessConfig": True,
+    "localization": True, "offlineSupport": False, "batchEvents": True,
+}
+
+SDK_SETTINGS = {
+    "trackingMode": "all", "captureRequestBodies": True, "captureResponseBodies": True,
+    "capturePrintStatements": False, "sanitizeSensitiveData": True,
+    "sensitiveFieldPatterns": ["password", "token", "secret", "apiKey", "api_key", "authorization", "cookie"],
+    "maxLogQueueSize": 100, "maxTraceQueueSize": 50, "flushIntervalSeconds": 30,
+    "enableBatching": True, "minLogLevel": "debug", "verboseErrors": False,
+}
+
+API_CONFIGS = [
+    {"endpoint": f"/v1/resource-{i}", "method": "GET", "enableLogs": True,
+     "captureRequestBody": i % 2 == 0, "captureResponseBody": True, "costPerRequest": 0.0001 * i}
+    for i in range(12)
+]
+
+BUSINESS_CONFIGS = {f"config_key_{i}": f"value-{i}" for i in range(40)}
+BUSINESS_META = {key: {"type": "string", "category": "general", "version": 1} for key in BUSINESS_CONFIGS}
+
+# Service time per route: the legacy routes each re-validate the API key and
+# subscription before their own query; sdk-init does that once and runs its
+# queries in parallel.
+DEFAULT_DELAYS_MS = {
+    "/api/feature-flags": 40,
+    "/api/sdk-settings": 45,
+    "/api/business-config": 50,
+    "/api/sdk-init": 60,
+}
+
+
+class Request:
+    """What a route handler sees of an incoming request."""
+
+    def __init__(self, method, path, headers, body=b""):
+        parts = urlsplit(path)
+        self.method = method
+        self.path = parts.path
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self.headers = {k.lower(): v for k, v in headers.items()}
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body or b"null")
+
+    def form(self):
+        """(fields, files) of a multipart/form-data body; files map a name to (filename, bytes)."""
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.headers.get('content-type', '')}\r\n\r\n".encode() + self.body)
+        fields, files = {}, {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename() is not None:
+                files[name] = (part.get_filename(), part.get_payload(decode=True))
+            else:
+                fields[name] = part.get_payload(decode=True).decode("utf-8")
+        return fields, files
+
+
+def json_response(data, status=200, headers=None):
+    body = json.dumps(data).encode("utf-8")
+    return status, {"content-type": "application/json", **(headers or {})}, body
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _require_key(request):
+    if not request.headers.get("x-api-key"):
+        return json_response({"error": "API key required. Use X-API-Key header."}, 401)
+    return None
+
+
+def feature_flags(request):
+    return _require_key(request) or json_response({"flags": FEATURE_FLAGS, "projectId": "standin-project"})
+
+
+def sdk_settings(request):
+    return _require_key(request) or json_response({"settings": SDK_SETTINGS, "apiConfigs": API_CONFIGS})
+
+
+def business_config(request):
+    return _require_key(request) or json_response(
+        {"configs": BUSINESS_CONFIGS, "meta": BUSINESS_META, "fetchedAt": _timestamp()})
+
+
+def sdk_init(request):
+    denied = _require_key(request)
+    if denied:
+        return denied
+    config = {
+        "featureFlags": FEATURE_FLAGS,
+        "sdkSettings": {"settings": SDK_SETTINGS, "apiConfigs": API_CONFIGS},
+        "businessConfig": {"configs": BUSINESS_CONFIGS, "meta": BUSINESS_META},
+        "deviceConfig": {"deviceCode": None, "debugModeEnabled": False,
+                         "debugModeExpiresAt": None, "trackingEnabled": True},
+    }
+    etag = '"%s"' % hashlib.md5(json.dumps(config).encode()).hexdigest()
+    cache_headers = {"etag": etag, "cache-control": "public, s-maxage=60, stale-while-revalidate=300"}
+    if request.headers.get("if-none-match") == etag:
+        return 304, cache_headers, b""
+    return json_response({**config, "timestamp": _timestamp()}, headers=cache_headers)
+
+
+SDK_ROUTES = {
+    "/api/feature-flags": feature_flags,
+    "/api/sdk-settings": sdk_settings,
+    "/api/business-config": business_config,
+    "/api/sdk-init": sdk_init,
+}
+
+
+class _H1Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self.server.standin.dispatch(
+            Request(self.command, self.path, dict(self.headers), body))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        peeked = b""
+        while len(peeked) < len(H2_PREFACE) and H2_PREFACE.startswith(peeked):
+            more = sock.recv(len(H2_PREFACE), socket.MSG_PEEK)
+            if len(more) == len(peeked):
+                break
+            peeked = more
+        if peeked == H2_PREFACE:
+            self.server.standin.serve_h2(sock)
+        else:
+            _H1Handler(sock, self.client_address, self.server)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StandInServer:
+    """Threaded HTTP/1.1 + h2c server dispatching to a routes table."""
+
+    def __init__(self, host="127.0.0.1", port=0, routes=None, delays_ms=None, delay_scale=1.0):
+        self.routes = dict(SDK_ROUTES if routes is None else routes)
+        self.delays_ms = dict(DEFAULT_DELAYS_MS if delays_ms is None else delays_ms)
+        self.delay_scale = delay_scale
+        self.hits = Counter()
+        self._hits_lock = threading.Lock()
+        self._server = _Server((host, port), _ConnectionHandler)
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def route_for(self, path):
+        """The routes key serving `path`: an exact match, else the longest "/"-terminated prefix."""
+        if path in self.routes:
+            return path
+        prefixes = [key for key in self.routes if key.endswith("/") and path.startswith(key)]
+        return max(prefixes, key=len) if prefixes else None
+
+    def dispatch(self, request):
+        with self._hits_lock:
+            self.hits[request.path] += 1
+        route = self.route_for(request.path)
+        if route is None:
+            return json_response({"error": "Not found"}, 404)
+        handler = self.routes[route]
+        delay_ms = self.delays_ms.get(route, 0) * self.delay_scale
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        try:
+            return handler(request)
+        except Exception as e:
+            return json_response({"error": f"Stand-in handler failed: {e}"}, 500)
+
+    def serve_h2(self, sock):
+        try:
+            import h2.config
+            import h2.connection
+            import h2.events
+            import h2.exceptions
+        except ImportError:
+            sock.close()
+            return
+
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        lock = threading.Condition()
+        pending = {}
+        closed = threading.Event()
+
+        def flush():
+            data = conn.data_to_send()
+            if data:
+                sock.sendall(data)
+
+        def respond(stream_id, headers, body):
+            status, response_headers, payload = self.dispatch(
+                Request(headers.get(":method", "GET"), headers.get(":path", "/"),
+                        {k: v for k, v in headers.items() if not k.startswith(":")}, bytes(body)))
+            try:
+                with lock:
+                    conn.send_headers(stream_id, [(":status", str(status)),
+                                                  ("content-length", str(len(payload))),
+                                                  *response_headers.items()],
+                                      end_stream=not payload)
+                    flush()
+                    view = memoryview(payload)
+                    while view:
+                        while conn.local_flow_control_window(stream_id) < 1:
+                            if closed.is_set():
+                                return
+                            lock.wait()
+                        size = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size, len(view))
+                        conn.send_data(stream_id, view[:size].tobytes(), end_stream=size == len(view))
+                        view = view[size:]
+                        flush()
+            except (h2.exceptions.StreamClosedError, h2.exceptions.ProtocolError, OSError):
+                pass
+
+        with lock:
+            conn.initiate_connection()
+            flush()
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                with lock:
+                    for event in conn.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            pending[event.stream_id] = (dict(event.headers), bytearray())
+                        elif isinstance(event, h2.events.DataReceived):
+                            pending[event.stream_id][1].extend(event.data)
+                            conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                        elif isinstance(event, h2.events.StreamEnded):
+                            headers, body = pending.pop(event.stream_id)
+                            threading.Thread(target=respond, args=(event.stream_id, headers, body),
+                                             daemon=True).start()
+                        elif isinstance(event, (h2.events.WindowUpdated, h2.events.RemoteSettingsChanged)):
+                            lock.notify_all()
+                        elif isinstance(event, h2.events.ConnectionTerminated):
+                            flush()
+                            return
+                    flush()
+        except (h2.exceptions.ProtocolError, OSError):
+            pass
+        finally:
+            closed.set()
+            with lock:
+                lock.notify_all()
+            sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/1.1 + h2c stand-in for the SDK endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--delay-scale", type=float, default=1.0,
+                        help="multiply the per-route service delays (0 disables them)")
+    args = parser.parse_args()
+
+    server = StandInServer(args.host, args.port, delay_scale=args.delay_scale)
+    print(f"Stand-in serving {', '.join(server.routes)} at {server.base_url} (HTTP/1.1 + h2c)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
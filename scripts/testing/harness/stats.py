@@ -0,0 +1,40 @@
+"""
+Small statistics helpers shared by the probes.
+"""
+
+import math
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile (`fraction` in 0..1) of unsorted values; 0.0 if empty.
+
+    Matches the probes' original sorted(values)[int(len(values) * 0.95)].
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def chi_square(observed, expected=None):
+    """Pearson's chi-square test of `observed` counts against `expected` (default: uniform).
+
+    Returns (statistic, degrees of freedom, p-value). The p-value is exact
+    for 1 and 2 degrees of freedom (two- and three-way splits) and uses the
+    Wilson-Hilferty normal approximation above that, which is accurate to
+    about 0.01 for the bucket counts the probes use.
+    """
+    total = sum(observed)
+    if expected is None:
+        expected = [total / len(observed)] * len(observed)
+    else:
+        scale = total / sum(expected)
+        expected = [e * scale for e in expected]
+    statistic = sum((o - e) ** 2 / e for o, e in zip(observed, expected) if e > 0)
+    dof = max(sum(1 for e in expected if e > 0) - 1, 1)
+    if dof == 1:
+        return statistic, dof, math.erfc(math.sqrt(statistic / 2))
+    if dof == 2:
+        return statistic, dof, math.exp(-statistic / 2)
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return statistic, dof, 0.5 * math.erfc(z / math.sqrt(2))
@@ -0,0 +1,193 @@
+"""
+Pluggable SDK-initialization strategies with critical-path timing.
+
+An SDK is *usable* once its critical configs (feature flags and SDK settings
+decide whether and what to track) have arrived, and *complete* once every
+config, including deferred ones like business config, has arrived. Each
+strategy records both times plus every request it made, so a run can be
+rendered as a waterfall.
+
+Built-in strategies:
+- sequential:     each config endpoint in turn (what shipped SDKs do)
+- parallel:       every config endpoint at once
+- combined:       one /api/sdk-init request carrying everything
+- critical-first: critical endpoints at once, the rest deferred until usable
+
+Add a strategy by subclassing Strategy and decorating it with
+@register_strategy; it then shows up in STRATEGIES and the probe CLIs.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+COMBINED_ENDPOINT = "/api/sdk-init"
+
+
+@dataclass(frozen=True)
+class ConfigSource:
+    name: str
+    path: str
+    critical: bool
+
+
+SDK_CONFIGS = (
+    ConfigSource("feature_flags", "/api/feature-flags", critical=True),
+    ConfigSource("sdk_settings", "/api/sdk-settings", critical=True),
+    ConfigSource("business_config", "/api/business-config", critical=False),
+)
+
+
+@dataclass
+class InitResult:
+    """One SDK initialization: labelled responses plus critical-path times."""
+    strategy: str
+    started: float
+    requests: list = field(default_factory=list)
+    usable_at: float | None = None
+    complete_at: float | None = None
+
+    def record(self, label, response):
+        self.requests.append((label, response))
+
+    @property
+    def ok(self):
+        return bool(self.requests) and all(response.ok for _, response in self.requests)
+
+    @property
+    def time_to_usable_ms(self):
+        return (self.usable_at - self.started) * 1000 if self.usable_at else None
+
+    @property
+    def time_to_complete_ms(self):
+        return (self.complete_at - self.started) * 1000 if self.complete_at else None
+
+    def timing(self, label):
+        """Elapsed ms of the request with this label, or None."""
+        for name, response in self.requests:
+            if name == label:
+                return response.elapsed_ms
+        return None
+
+
+class Strategy:
+    name = None
+    description = None
+
+    def run(self, transport, headers, configs=SDK_CONFIGS):
+        """Initialize once over `transport` and return an InitResult."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _fetch_all(transport, headers, configs, result):
+        """Fetch `configs` concurrently, recording each; returns when all are done."""
+        if len(configs) == 1:
+            result.record(configs[0].name, transport.request(configs[0].path, headers))
+            return
+        with ThreadPoolExecutor(max_workers=len(configs)) as pool:
+            futures = [(c.name, pool.submit(transport.request, c.path, headers)) for c in configs]
+            for name, future in futures:
+                result.record(name, future.result())
+
+    @staticmethod
+    def _finish(result):
+        result.complete_at = max((r.finished for _, r in result.requests), default=time.perf_counter())
+        return result
+
+
+STRATEGIES = {}
+
+
+def register_strategy(cls):
+    STRATEGIES[cls.name] = cls()
+    return cls
+
+
+def get_strategy(name):
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy '{name}' (choose from: {', '.join(STRATEGIES)})") from None
+
+
+def _critical_done_at(result, configs):
+    critical = {c.name for c in configs if c.critical}
+    times = [r.finished for name, r in result.requests if name in critical]
+    return max(times) if times else result.started
+
+
+@register_strategy
+class SequentialStrategy(Strategy):
+    name = "sequential"
+    description = "each config endpoint in turn"
+
+    def run(self, transport, headers, configs=SDK_CONFIGS):
+        result = InitResult(self.name, time.perf_counter())
+        for config in configs:
+            result.record(config.name, transport.request(config.path, headers))
+        result.usable_at = _critical_done_at(result, configs)
+        return self._finish(result)
+
+
+@register_strategy
+class ParallelStrategy(Strategy):
+    name = "parallel"
+    description = "every config endpoint at once"
+
+    def run(self, transport, headers, configs=SDK_CONFIGS):
+        result = InitResult(self.name, time.perf_counter())
+        self._fetch_all(transport, headers, configs, result)
+        result.usable_at = _critical_done_at(result, configs)
+        return self._finish(result)
+
+
+@register_strategy
+class CombinedStrategy(Strategy):
+    name = "combined"
+    description = f"one {COMBINED_ENDPOINT} request"
+
+    def run(self, transport, headers, configs=SDK_CONFIGS):
+        result = InitResult(self.name, time.perf_counter())
+        response = transport.request(COMBINED_ENDPOINT, headers)
+        result.record("sdk_init", response)
+        result.usable_at = result.complete_at = response.finished
+        return result
+
+
+@register_strategy
+class CriticalFirstStrategy(Strategy):
+    name = "critical-first"
+    description = "critical configs at once, the rest deferred until usable"
+
+    def run(self, transport, headers, configs=SDK_CONFIGS):
+        result = InitResult(self.name, time.perf_counter())
+        critical = [c for c in configs if c.critical]
+        deferred = [c for c in configs if not c.critical]
+        self._fetch_all(transport, headers, critical, result)
+        result.usable_at = _critical_done_at(result, configs)
+        if deferred:
+            self._fetch_all(transport, headers, deferred, result)
+        return self._finish(result)
+
+
+def format_waterfall(result, width=40):
+    """Render one InitResult as text rows: label, offset, duration and a bar.
+
+    `|` in the bar marks the moment the SDK became usable.
+    """
+    total_ms = result.time_to_complete_ms or 1
+    scale = width / total_ms
+    usable_col = round((result.time_to_usable_ms or 0) * scale)
+    lines = []
+    for label, response in sorted(result.requests, key=lambda item: item[1].started):
+        offset_ms = (response.started - result.started) * 1000
+        start_col = round(offset_ms * scale)
+        end_col = max(start_col + 1, round((offset_ms + response.elapsed_ms) * scale))
+        bar = [" "] * start_col + ["█"] * (end_col - start_col) + [" "] * max(0, width - end_col)
+        if usable_col < len(bar) and bar[usable_col] == " ":
+            bar[usable_col] = "|"
+        status = response.status if response.status is not None else "ERR"
+        lines.append(f"{label:<16} +{offset_ms:>6,.0f}ms {response.elapsed_ms:>6,.0f}ms {status!s:>3} {''.join(bar)}")
+    lines.append(f"{'usable':<16} {result.time_to_usable_ms or 0:>7,.0f}ms   "
+                 f"complete {result.time_to_complete_ms or 0:,.0f}ms")
+    return lines
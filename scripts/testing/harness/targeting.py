@@ -0,0 +1,253 @@
+"""
+Python reference for src/lib/business-config/targeting.ts, plus generators
+for synthetic targeting rules and contexts.
+
+evaluate_targeting() and should_receive_rollout() follow the TypeScript
+line by line, including its JavaScript semantics (strict equality, where
+1 != "1" and true != 1; parseFloat prefixes; 32-bit string hashing over
+UTF-16 code units), so responses from a server can be checked against
+them and the stand-in can serve the same answers.
+
+    rules = make_rules(rules=50, conditions=5)
+    context = make_context(random.Random(7), attributes=50, segments=100)
+    evaluate_targeting(rules, context, "default")
+"""
+
+import math
+import random
+import re
+from operator import mul
+
+OPERATORS = ("equals", "contains", "startsWith", "endsWith", "greaterThan", "lessThan",
+             "in", "notIn", "exists", "notExists")
+_FLOAT_PREFIX = re.compile(r"^[\t\n\v\f\r  ﻿]*([+-]?(?:Infinity|\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?))")
+
+
+def _js_type(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "object"
+
+
+def strict_equals(a, b):
+    """JavaScript ===; objects and arrays parsed from JSON are never equal to each other."""
+    kind = _js_type(a)
+    if kind != _js_type(b) or kind == "object":
+        return False
+    return a == b
+
+
+def _includes(array, value):
+    """Array.prototype.includes (SameValueZero)."""
+    if isinstance(value, float) and math.isnan(value):
+        return any(isinstance(item, float) and math.isnan(item) for item in array)
+    return any(strict_equals(item, value) for item in array)
+
+
+def js_parse_float(value):
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    elif value is None:
+        value = "null"
+    elif isinstance(value, (list, dict)):
+        value = ",".join(str(v) for v in value) if isinstance(value, list) else "[object Object]"
+    match = _FLOAT_PREFIX.match(str(value))
+    if not match:
+        return math.nan
+    return float(match.group(1).replace("Infinity", "inf"))
+
+
+def _compare_numbers(a, b):
+    num_a = a if _js_type(a) == "number" else js_parse_float(a)
+    num_b = b if _js_type(b) == "number" else js_parse_float(b)
+    if math.isnan(num_a) or math.isnan(num_b):
+        return 0
+    return num_a - num_b
+
+
+def _normalize(value, case_sensitive):
+    return value.lower() if isinstance(value, str) and not case_sensitive else value
+
+
+def get_property_value(prop, context):
+    value = context
+    for part in prop.split("."):
+        if value is None:
+            return None
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit():
+            value = value[int(part)] if int(part) < len(value) else None
+        elif isinstance(value, (str, list)) and part == "length":
+            value = len(value)
+        else:
+            value = None
+    return value
+
+
+def evaluate_condition(condition, context):
+    operator = condition.get("operator")
+    value = condition.get("value")
+    case_sensitive = condition.get("caseSensitive", False)
+    prop_value = get_property_value(condition.get("property", ""), context)
+
+    if operator == "exists":
+        return prop_value is not None
+    if operator == "notExists":
+        return prop_value is None
+    if prop_value is None:
+        return False
+
+    left = _normalize(prop_value, case_sensitive)
+    right = _normalize(value, case_sensitive)
+    if operator == "equals":
+        return strict_equals(left, right)
+    if operator in ("contains", "startsWith", "endsWith"):
+        if not (isinstance(left, str) and isinstance(right, str)):
+            return False
+        return {"contains": right in left, "startsWith": left.startswith(right),
+                "endsWith": left.endswith(right)}[operator]
+    if operator == "greaterThan":
+        return _compare_numbers(left, right) > 0
+    if operator == "lessThan":
+        return _compare_numbers(left, right) < 0
+    if operator == "in":
+        return isinstance(right, list) and _includes(right, left)
+    if operator == "notIn":
+        return isinstance(right, list) and not _includes(right, left)
+    return False
+
+
+def evaluate_rule(rule, context):
+    conditions = rule.get("conditions") or []
+    if not conditions:
+        return True
+    results = [evaluate_condition(condition, context) for condition in conditions]
+    return all(results) if rule.get("logic") == "AND" else any(results)
+
+
+def evaluate_targeting(targeting_rules, context, default_value):
+    """evaluateTargeting(): the value of the first matching rule, else the default."""
+    if not targeting_rules or not targeting_rules.get("rules"):
+        return default_value
+    for rule in targeting_rules["rules"]:
+        if evaluate_rule(rule, context):
+            return rule.get("value")
+    return targeting_rules["defaultValue"] if "defaultValue" in targeting_rules else default_value
+
+
+_POWERS = {}
+
+
+def _powers(length):
+    """31^(length-1) ... 31^0 mod 2^32, so an ASCII hash is one sum of products."""
+    powers = _POWERS.get(length)
+    if powers is None:
+        powers = _POWERS[length] = [pow(31, length - 1 - i, 1 << 32) for i in range(length)]
+    return powers
+
+
+def simple_hash(text):
+    """simpleHash(): the 32-bit `hash * 31 + charCode` over UTF-16 code units, made non-negative."""
+    if text.isascii():
+        data = text.encode()
+        value = sum(map(mul, data, _powers(len(data)))) & 0xFFFFFFFF
+    else:
+        value = 0
+        data = text.encode("utf-16-le")
+        for i in range(0, len(data), 2):
+            value = (value * 31 + data[i] + (data[i + 1] << 8)) & 0xFFFFFFFF
+    return abs(value - (1 << 32) if value & 0x80000000 else value)
+
+
+def rollout_bucket(identifier):
+    """The 1-100 bucket shouldReceiveRollout() compares with the rollout percentage."""
+    return simple_hash(identifier) % 100 + 1
+
+
+def rollout_identifier(context):
+    return (context.get("user") or {}).get("id") or (context.get("device") or {}).get("deviceId") or "default"
+
+
+def should_receive_rollout(rollout_percentage, context):
+    if rollout_percentage >= 100:
+        return True
+    if rollout_percentage <= 0:
+        return False
+    return rollout_bucket(rollout_identifier(context)) <= rollout_percentage
+
+
+# -- synthetic rules and contexts ---------------------------------------------
+
+# Conditions after the first one in each rule; every generated context satisfies
+# them, so each rule costs all of its conditions (targeting.ts evaluates every
+# condition before combining them). j is the attribute the condition reads.
+MIN_ATTRIBUTES = 5
+_FILLER_CONDITIONS = (
+    lambda j: {"property": f"device.attr_{j}", "operator": "startsWith", "value": "VAL"},
+    lambda j: {"property": f"user.attr_{j}", "operator": "contains", "value": "-"},
+    lambda j: {"property": "app.buildNumber", "operator": "greaterThan", "value": 10},
+    lambda j: {"property": "device.platform", "operator": "in", "value": ["ios", "android"]},
+    lambda j: {"property": f"device.attr_{j}", "operator": "exists", "value": None},
+    lambda j: {"property": "user.country", "operator": "notIn", "value": ["xx", "yy", "zz"]},
+    lambda j: {"property": "device.osVersion", "operator": "lessThan", "value": "99"},
+    lambda j: {"property": f"user.attr_{j}", "operator": "endsWith", "value": str(j % 10)},
+)
+
+
+def make_rules(rules, conditions, default_value="default"):
+    """A TargetingRules object with `rules` AND rules of `conditions` conditions each.
+
+    Rule i matches contexts whose user.segment is "seg-<i>" and returns
+    "variant-<i>".
+    """
+    generated = []
+    for i in range(rules):
+        rule_conditions = [{"property": "user.segment", "operator": "equals", "value": f"seg-{i}"}]
+        for j in range(1, conditions):
+            rule_conditions.append(_FILLER_CONDITIONS[(i + j) % len(_FILLER_CONDITIONS)](j % MIN_ATTRIBUTES))
+        generated.append({"conditions": rule_conditions, "logic": "AND", "value": f"variant-{i}"})
+    return {"rules": generated, "defaultValue": default_value}
+
+
+def make_context(rng, attributes, segments, identifier=None):
+    """A TargetingContext with `attributes` custom attributes (at least MIN_ATTRIBUTES)
+    on both the user and the device.
+
+    user.segment is drawn from `segments` values; with segments = 2 x rules,
+    half of the contexts match a rule (at a uniform position) and the other
+    half are checked against every rule.
+    """
+    identifier = identifier or f"device-{rng.getrandbits(48):012x}"
+    user = {"id": identifier, "segment": f"seg-{rng.randrange(max(segments, 1))}", "country": "us"}
+    device = {"deviceId": identifier, "platform": rng.choice(("ios", "android")), "osVersion": "17.2",
+              "appVersion": "2.4.1", "deviceModel": "Pixel 8"}
+    for k in range(max(attributes, MIN_ATTRIBUTES)):
+        user[f"attr_{k}"] = device[f"attr_{k}"] = f"value-{k}-{k % 10}"
+    return {"user": user, "device": device, "app": {"version": "2.4.1", "buildNumber": "241"}}
+
+
+def synthetic_ids(kind, count, seed=0, start=0):
+    """`count` device/user identifiers in one of the formats SDKs send."""
+    rng = random.Random(seed)
+    if kind == "uuid":
+        for _ in range(count):
+            value = f"{rng.getrandbits(128):032x}"
+            yield f"{value[:8]}-{value[8:12]}-4{value[13:16]}-{value[16:20]}-{value[20:]}"
+    elif kind == "android":
+        for _ in range(count):
+            yield f"{rng.getrandbits(64):016x}"
+    elif kind == "sequential":
+        for n in range(start, start + count):
+            yield f"user-{n}"
+    else:
+        raise ValueError(f"unknown id format '{kind}'")
+
+
+ID_FORMATS = ("uuid", "android", "sequential")
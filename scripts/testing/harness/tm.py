@@ -0,0 +1,402 @@
+"""
+Translation-memory suggestions: the route's ranking and an n-gram index.
+
+GET /api/localization/tm/suggestions loads every memory entry of a language
+pair and scores each against the source text with a full Levenshtein
+matrix. suggest() is a port of that route (the oracle); NgramIndex answers
+the same query from an index that only verifies entries which can still
+reach min_similarity:
+
+- length filter: similarity = (L - d) / L with L the longer length, so an
+  entry qualifies only if d <= (1 - min_similarity) * L and its length is
+  within d of the query's. Entries are numbered in length order, so the
+  lengths within reach are one range of entry numbers (the window);
+- count filter: a string of length l has l + n - 1 padded n-grams and one
+  edit changes at most n of them, so a qualifying entry shares at least
+  max(l_q, l_e) + n - 1 - n*d n-grams (as multisets) with the query.
+  Postings are keyed by (n-gram, occurrence), so a count of posting hits
+  is that multiset overlap. Counts are kept bit-sliced (one integer per
+  bit of the count, one bit per entry of the window) and each posting is
+  added with a few integer operations; postings holding at least 1/32 of
+  the entries are stored as bitsets, which is no larger than the array;
+- candidates are verified together: distances() packs them into lanes of
+  one integer and runs the bit-parallel Levenshtein over all of them at
+  once, so the Python loop runs once per query unit, not per entry.
+
+The bound loses n*d per edit, so at the route's 0.7 default bigrams (n=2)
+prune far more than trigrams; n is a parameter for comparing the two. At
+0.7 no n-gram count is selective on low-entropy text: long strings built
+from a few syllables share most of their bigrams with thousands of entries,
+and those queries pay for verifying them all.
+
+Distances use a bit-parallel Levenshtein (Myers/Hyyrö) over UTF-16 code
+units, like the route's charAt() loop, and ranking uses the route's
+comparator, so results match suggest() except where the route's 0.01
+similarity window makes its own ordering depend on the input order.
+
+    index = NgramIndex(entries)                  # entries: TmEntry(source_text, target_text, usage_count)
+    index.query("Tap to continue", min_similarity=0.7, limit=10)
+"""
+
+import bisect
+import random
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import cmp_to_key
+from itertools import accumulate
+
+PAD = "\0\0"
+TIE_WINDOW = 0.01
+DENSE = 32  # postings with at least 1/DENSE of the entries are bitsets
+_MATCH = [b"0" * i + b"1" + b"0" * (255 - i) for i in range(256)]  # bytes.translate table: byte i -> "1"
+
+
+@dataclass(frozen=True)
+class TmEntry:
+    source_text: str
+    target_text: str
+    usage_count: int = 0
+    last_used_at: str = None
+
+    @classmethod
+    def from_export(cls, row):
+        """An entry from an exported TranslationMemory row (Prisma field names)."""
+        return cls(row["sourceText"], row["targetText"], int(row.get("usageCount") or 0), row.get("lastUsedAt"))
+
+
+def js_units(text):
+    """`text` as UTF-16 code units (one str character each), the unit charAt() and .length count."""
+    if all(ord(c) < 0x10000 for c in text):
+        return text
+    data = text.encode("utf-16-le", "surrogatepass")
+    return "".join(chr(int.from_bytes(data[i:i + 2], "little")) for i in range(0, len(data), 2))
+
+
+def pattern_bits(pattern):
+    """Per-character match masks of `pattern`, for distance() against many texts."""
+    peq = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    return peq
+
+
+def distance(peq, m, text):
+    """Levenshtein distance between the length-`m` pattern of `peq` and `text`."""
+    if m == 0:
+        return len(text)
+    full, top = (1 << m) - 1, 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & top:
+            score += 1
+        elif mh & top:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh = mh << 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    return score
+
+
+def distances(text, patterns):
+    """Levenshtein distance between `text` and each of `patterns`, in one bit-parallel pass.
+
+    Each pattern takes a lane of len(pattern) bits plus a zero guard bit in
+    one integer; the guard stops the carry of the addition and the shifts
+    from reaching the next lane. At the end a lane's vertical deltas sum to
+    its distance.
+    """
+    if not text:
+        return [len(p) for p in patterns]
+    if not patterns:
+        return []
+    layout = "".join(p + "\0" for p in patterns)[::-1]  # int(..., 2) reads the last character as bit 0
+    total = len(layout)
+    guards = _bitset(accumulate(len(p) + 1 for p in patterns), 1, total + 1)
+    full = ((1 << total) - 1) ^ guards
+    lows = ((guards << 1) | 1) & full
+    data = layout.encode("utf-16-le", "surrogatepass")
+    low_bytes, high_bytes = data[0::2], data[1::2]
+    narrow = high_bytes.count(0) == len(high_bytes)
+    peq = {}
+    for char in set(text):
+        code = ord(char)
+        if narrow:
+            peq[char] = int(low_bytes.translate(_MATCH[code]), 2) & full if code < 256 else 0
+        else:
+            peq[char] = (int(low_bytes.translate(_MATCH[code & 255]), 2)
+                         & int(high_bytes.translate(_MATCH[code >> 8]), 2) & full)
+    pv, mv = full, 0
+    for char in text:
+        eq = peq[char]
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = (pv & xh) << 1
+        ph = (ph << 1) | lows
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    plus, minus = format(pv, "b").zfill(total)[::-1], format(mv, "b").zfill(total)[::-1]
+    found, start = [], 0
+    for pattern in patterns:
+        end = start + len(pattern)
+        found.append(len(text) + plus.count("1", start, end) - minus.count("1", start, end))
+        start = end + 1
+    return found
+
+
+def levenshtein(a, b):
+    """Edit distance of two strings, bit-parallel over the shorter one."""
+    if len(a) < len(b):
+        a, b = b, a
+    return distance(pattern_bits(b), len(b), a)
+
+
+def similarity(a, b):
+    """calculateSimilarity(): (L - distance) / L over code units, 1.0 for two empty strings."""
+    a, b = js_units(a), js_units(b)
+    longer = max(len(a), len(b))
+    return 1.0 if longer == 0 else (longer - levenshtein(a, b)) / longer
+
+
+def _compare(a, b):
+    if abs(a["similarity"] - b["similarity"]) > TIE_WINDOW:
+        return -1 if b["similarity"] < a["similarity"] else 1
+    return b["usageCount"] - a["usageCount"]
+
+
+def rank(suggestions, limit=10):
+    """The route's sort (similarity, then usageCount within 0.01) and top-`limit` cut."""
+    return sorted(suggestions, key=cmp_to_key(_compare))[:limit]
+
+
+def _suggestion(entry, score):
+    return {"targetText": entry.target_text, "similarity": score, "usageCount": entry.usage_count,
+            "lastUsedAt": entry.last_used_at}
+
+
+def suggest(entries, text, min_similarity=0.7, limit=10):
+    """The route: score every entry, keep those >= min_similarity, rank."""
+    scored = (_suggestion(entry, similarity(text, entry.source_text)) for entry in entries)
+    return rank([s for s in scored if s["similarity"] >= min_similarity], limit)
+
+
+def max_distance(length, min_similarity):
+    """The largest d with (length - d) / length >= min_similarity, as the route's float math decides."""
+    if length == 0:
+        return 0
+    d = min(max(int((1 - min_similarity) * length), 0), length)
+    while d < length and (length - d - 1) / length >= min_similarity:
+        d += 1
+    while d >= 0 and (length - d) / length < min_similarity:
+        d -= 1
+    return d
+
+
+def _bitset(numbers, low, high):
+    """Entry numbers in [low, high) as an int with bit (number - low) set."""
+    bits = bytearray((high - low + 7) // 8)
+    for number in numbers:
+        number -= low
+        bits[number >> 3] |= 1 << (number & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _at_least(planes, need, window):
+    """Bitset of the window's entries whose bit-sliced count in `planes` is at least `need`."""
+    if need <= 0:
+        return window
+    if need >> len(planes):
+        return 0
+    above, equal = 0, window
+    for bit in range(len(planes) - 1, -1, -1):
+        if need >> bit & 1:
+            equal &= planes[bit]
+        else:
+            above |= equal & planes[bit]
+            equal &= ~planes[bit]
+    return above | equal
+
+
+def ngrams(units, n):
+    """Padded n-grams of `units`, each tagged with its occurrence number ("ab", 0), ("ab", 1), ..."""
+    padded = PAD[:n - 1] + units + PAD[:n - 1]
+    seen = defaultdict(int)
+    tagged = []
+    for i in range(len(padded) - n + 1):
+        gram = padded[i:i + n]
+        tagged.append((gram, seen[gram]))
+        seen[gram] += 1
+    return tagged
+
+
+class NgramIndex:
+    """Inverted (n-gram, occurrence) index over memory entries' source texts.
+
+    Entries are numbered by (source length, stored order), so postings,
+    array('I') of entry numbers (4 bytes each), are sorted by length too;
+    `order` maps an entry number back to the stored order. Postings with
+    at least 1/DENSE of the entries are int bitsets (bit i: entry i).
+    """
+
+    def __init__(self, entries, n=2):
+        self.n = n
+        entries = list(entries)
+        units = [js_units(e.source_text) for e in entries]
+        self.order = array("I", sorted(range(len(entries)), key=lambda i: (len(units[i]), i)))
+        self.entries = [entries[i] for i in self.order]
+        self.units = [units[i] for i in self.order]
+        self.lengths = array("I", (len(u) for u in self.units))
+        postings = defaultdict(lambda: array("I"))
+        for number, source in enumerate(self.units):
+            for gram in ngrams(source, n):
+                postings[gram].append(number)
+        self.postings = dict(postings)
+        for gram, numbers in self.postings.items():
+            if len(numbers) * DENSE >= len(entries):
+                self.postings[gram] = _bitset(numbers, 0, len(entries))
+
+    def size_bytes(self):
+        """Approximate footprint of the index structures (postings, keys, length and order arrays)."""
+        postings = sum((p.bit_length() + 7) // 8 + 32 if isinstance(p, int) else p.itemsize * len(p) + 64
+                       for p in self.postings.values())
+        keys = sum(56 + 50 + 2 * len(gram) for gram, _ in self.postings)
+        return postings + keys + (self.lengths.itemsize + self.order.itemsize) * len(self.lengths)
+
+    def query(self, text, min_similarity=0.7, limit=10, stats=None):
+        """Top-`limit` suggestions for `text`, as the route returns them.
+
+        `stats`, if given, is a dict that receives the number of entries
+        in the length window and of candidates verified.
+        """
+        query = js_units(text)
+        length, n, lengths = len(query), self.n, self.lengths
+        # per entry length within reach: the n-gram overlap it needs
+        shortest = length - max_distance(length, min_similarity)
+        needs = {}
+        for entry_length in range(shortest, max(lengths[-1] if lengths else 0, length) + 1):
+            longer = max(length, entry_length)
+            d = max_distance(longer, min_similarity)
+            if entry_length - length > d:
+                break
+            needs[entry_length] = longer + n - 1 - n * d
+        low, high = bisect.bisect_left(lengths, shortest), bisect.bisect_right(lengths, max(needs))
+        window = (1 << (high - low)) - 1
+
+        # bit-sliced overlap counts: planes[b] holds bit b of every window entry's count
+        planes = []
+        for gram in ngrams(query, n):
+            postings = self.postings.get(gram)
+            if postings is None:
+                continue
+            if isinstance(postings, int):
+                carry = (postings >> low) & window
+            else:
+                carry = _bitset(postings[bisect.bisect_left(postings, low):bisect.bisect_left(postings, high)],
+                                low, high)
+            for bit, plane in enumerate(planes):
+                planes[bit], carry = plane ^ carry, plane & carry
+                if not carry:
+                    break
+            else:
+                planes.append(carry)
+
+        chosen, above = 0, {}
+        for entry_length, need in needs.items():
+            first = bisect.bisect_left(lengths, entry_length, low, high)
+            last = bisect.bisect_right(lengths, entry_length, first, high)
+            if first < last:
+                if need not in above:
+                    above[need] = _at_least(planes, need, window)
+                chosen |= above[need] & (((1 << (last - first)) - 1) << (first - low))
+        bits = format(chosen, "b")[::-1]
+        numbers, at = [], bits.find("1")
+        while at >= 0:
+            numbers.append(low + at)
+            at = bits.find("1", at + 1)
+
+        hits = []
+        for number, found in zip(numbers, distances(query, [self.units[number] for number in numbers])):
+            longer = max(length, lengths[number])
+            score = 1.0 if longer == 0 else (longer - found) / longer
+            if score >= min_similarity:
+                hits.append((self.order[number], number, score))
+        if stats is not None:
+            stats.update(window=high - low, candidates=len(numbers))
+        hits.sort()  # the route ranks entries in their stored order
+        return rank([_suggestion(self.entries[number], score) for _, number, score in hits], limit)
+
+
+# -- synthetic memory ---------------------------------------------------------
+
+_SYLLABLES = ("ta", "pe", "ri", "so", "mu", "ka", "le", "ni", "vo", "da", "shi", "ren", "gal", "tor", "min",
+              "bel", "cor", "ux", "pla", "sen")
+_UI_WORDS = ("tap", "to", "continue", "save", "your", "changes", "settings", "account", "delete", "item", "the",
+             "open", "close", "share", "profile", "photo", "upload", "failed", "retry", "now", "later", "new",
+             "message", "from", "you", "have", "unread", "notifications", "sign", "in", "out", "with", "email",
+             "password", "forgot", "order", "cart", "checkout", "payment", "confirmed", "shipping", "address")
+
+
+def synthetic_memory(count, seed=42):
+    """`count` memory entries shaped like app UI strings, with families of near-duplicates.
+
+    About a third of the entries are edits of an earlier one (a word
+    swapped, added or dropped), so fuzzy queries have real neighbours.
+    """
+    rng = random.Random(seed)
+    words = list(_UI_WORDS) + ["".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+                               for _ in range(600)]
+    sources, seen, entries = [], set(), []
+    while len(entries) < count:
+        if sources and rng.random() < 0.35:
+            parts = rng.choice(sources).split()
+            position = rng.randrange(len(parts))
+            action = rng.random()
+            if action < 0.5:
+                parts[position] = rng.choice(words)
+            elif action < 0.8 or len(parts) < 3:
+                parts.insert(position, rng.choice(words))
+            else:
+                del parts[position]
+        else:
+            parts = [rng.choice(words) for _ in range(rng.randint(2, 9))]
+            if rng.random() < 0.2:
+                parts.append(f"{{{rng.choice(('count', 'name', 'date'))}}}")
+        text = " ".join(parts).capitalize()
+        if text in seen:
+            continue
+        seen.add(text)
+        sources.append(text)
+        entries.append(TmEntry(text, f"« {text[::-1]} »", rng.randint(0, 40)))
+    return entries
+
+
+def fuzzy_queries(entries, count, seed=42, exact=0.15, unrelated=0.15):
+    """Query texts: exact sources, sources with a few character edits, and unrelated text."""
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyz "
+    queries = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < unrelated:
+            queries.append(" ".join(rng.choice(_UI_WORDS) for _ in range(rng.randint(2, 8))).capitalize())
+            continue
+        text = list(rng.choice(entries).source_text)
+        if roll >= unrelated + exact:
+            for _ in range(rng.randint(1, max(1, len(text) // 8))):
+                position = rng.randrange(len(text) + 1)
+                action = rng.random()
+                if action < 0.4 and position < len(text):
+                    text[position] = rng.choice(alphabet)
+                elif action < 0.7 or not text:
+                    text.insert(position, rng.choice(alphabet))
+                elif position < len(text):
+                    del text[position]
+        queries.append("".join(text))
+    return queries
@@ -0,0 +1,408 @@
+"""
+HTTP transports for the API probes, with per-run connection and byte counts.
+
+Both transports are thread-safe and expose the same request() call, so a
+fetch strategy can issue requests from several threads without caring how
+they reach the server:
+
+- H1Transport keeps a pool of keep-alive HTTP/1.1 connections and opens a
+  new one whenever every pooled connection is busy (like OkHttp/URLSession).
+- H2Transport multiplexes every request as a stream on a single HTTP/2
+  connection (ALPN "h2" over TLS, or prior-knowledge h2c over plain HTTP).
+
+Byte counts are application-layer wire bytes: HTTP/1.1 request/response
+text, or HTTP/2 frames including HPACK-compressed headers. TLS record
+overhead is excluded.
+
+HTTP/2 needs the `h2` package:
+    pip install h2
+"""
+
+import http.client
+import io
+import socket
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+PROTOCOLS = ("h1", "h2")
+
+
+@dataclass
+class Response:
+    """Result of one request, with monotonic start/end times in seconds."""
+    path: str
+    status: int | None
+    started: float
+    finished: float
+    body: bytes = b""
+    headers: dict = field(default_factory=dict)
+    connection_id: int | None = None
+    error: str | None = None
+
+    @property
+    def elapsed_ms(self):
+        return (self.finished - self.started) * 1000
+
+    @property
+    def ok(self):
+        return self.status is not None and 200 <= self.status < 400
+
+
+class _Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.closed = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+    def add(self, connections=0, bytes_out=0, bytes_in=0, closed=0):
+        with self._lock:
+            self.connections += connections
+            self.closed += closed
+            self.bytes_out += bytes_out
+            self.bytes_in += bytes_in
+
+
+class Transport:
+    """Base class: subclasses implement request() and close()."""
+    protocol = None
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.authority = parts.netloc
+        self.timeout = timeout
+        self.counters = _Counters()
+
+    @property
+    def stats(self):
+        """Snapshot of (connections, bytes_out, bytes_in) so far."""
+        return self.counters.connections, self.counters.bytes_out, self.counters.bytes_in
+
+    def request(self, path, headers=None, method="GET", body=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _CountingReader(io.RawIOBase):
+    def __init__(self, sock, counters):
+        self._sock = sock
+        self._counters = counters
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self._sock.recv_into(buffer)
+        self._counters.add(bytes_in=n)
+        return n
+
+
+class _CountingSocket:
+    """Socket proxy that counts bytes http.client sends and reads."""
+
+    def __init__(self, sock, counters):
+        self._sock = sock
+        self._counters = counters
+
+    def sendall(self, data):
+        self._sock.sendall(data)
+        self._counters.add(bytes_out=len(data))
+
+    def makefile(self, mode="rb", *args, **kwargs):
+        return io.BufferedReader(_CountingReader(self._sock, self._counters))
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+class H1Transport(Transport):
+    """Keep-alive HTTP/1.1 connection pool."""
+    protocol = "h1"
+
+    def __init__(self, base_url, timeout=30, ssl_context=None):
+        super().__init__(base_url, timeout)
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._idle = []
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self.scheme == "https":
+            conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.ssl_context)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        conn.connect()
+        conn.sock = _CountingSocket(conn.sock, self.counters)
+        conn.retired = False
+        self.counters.add(connections=1)
+        with self._lock:
+            conn.conn_id = len(self._all)
+            self._all.append(conn)
+        return conn
+
+    def _retire(self, conn):
+        """Close `conn` and count it once. After a will_close response http.client has
+        already dropped conn.sock, so the count cannot go by the socket."""
+        if not conn.retired:
+            conn.retired = True
+            self.counters.add(closed=1)
+        conn.close()
+
+    def _checkout(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def request(self, path, headers=None, method="GET", body=None):
+        started = time.perf_counter()
+        conn = None
+        try:
+            conn = self._checkout()
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            if conn is not None:
+                self._retire(conn)
+            return Response(path, None, started, time.perf_counter(), error=str(e))
+        finished = time.perf_counter()
+        if response.will_close:
+            self._retire(conn)
+        else:
+            with self._lock:
+                self._idle.append(conn)
+        return Response(path, response.status, started, finished, payload,
+                        {k.lower(): v for k, v in response.getheaders()}, conn.conn_id)
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                self._retire(conn)
+            self._idle.clear()
+
+
+class _Stream:
+    def __init__(self, path):
+        self.path = path
+        self.status = None
+        self.headers = {}
+        self.body = bytearray()
+        self.error = None
+        self.done = threading.Event()
+
+
+class _H2Connection:
+    """One HTTP/2 connection of an H2Transport and the streams open on it."""
+
+    def __init__(self, sock, h2_connection, conn_id):
+        self.sock = sock
+        self.h2 = h2_connection
+        self.conn_id = conn_id
+        self.streams = {}
+        self.lock = threading.Lock()
+        self.dead = False
+
+
+class H2Transport(Transport):
+    """One HTTP/2 connection; concurrent request() calls become parallel streams.
+
+    A connection that fails (a send or read error, EOF, a protocol error or
+    GOAWAY) is marked dead, its open streams fail, and the next request
+    opens a new one.
+    """
+    protocol = "h2"
+
+    def __init__(self, base_url, timeout=30, ssl_context=None):
+        super().__init__(base_url, timeout)
+        try:
+            import h2.config
+            import h2.connection
+            import h2.events
+            import h2.exceptions
+        except ImportError:
+            raise RuntimeError("HTTP/2 mode requires the h2 package. Install with: pip install h2") from None
+        self._events = h2.events
+        self._protocol_error = h2.exceptions.ProtocolError
+        self.ssl_context = ssl_context
+        self._config = h2.config.H2Configuration(client_side=True, header_encoding="utf-8")
+        self._conn = None
+        self._connect_lock = threading.Lock()
+        self._closed = False
+        self._h2_connection_cls = h2.connection.H2Connection
+
+    def _ensure_connected(self):
+        """The live connection, opening a new one if there is none or it died."""
+        with self._connect_lock:
+            if self._conn is not None and not self._conn.dead:
+                return self._conn
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                if self.scheme == "https":
+                    sock = self._tls_context().wrap_socket(sock, server_hostname=self.host)
+                    if sock.selected_alpn_protocol() != "h2":
+                        raise ConnectionError(f"{self.authority} did not negotiate HTTP/2 via ALPN")
+                sock.settimeout(None)
+                h2_connection = self._h2_connection_cls(config=self._config)
+                h2_connection.initiate_connection()
+                conn = _H2Connection(sock, h2_connection, self.counters.connections)
+                self._send_pending(conn)
+            except OSError:
+                sock.close()
+                raise
+            self._conn = conn
+            self.counters.add(connections=1)
+            threading.Thread(target=self._read_loop, args=(conn,), daemon=True).start()
+            return conn
+
+    def _tls_context(self):
+        """A private context offering h2 over ALPN; the caller's context (shared with H1) is not touched.
+
+        Its verification settings and CA certificates are copied. Certificates
+        in a capath directory that the caller's context has not loaded yet,
+        and client certificates, are not.
+        """
+        context = ssl.create_default_context()
+        if self.ssl_context is not None:
+            context.check_hostname = self.ssl_context.check_hostname
+            context.verify_mode = self.ssl_context.verify_mode
+            ca_certs = self.ssl_context.get_ca_certs(binary_form=True)
+            if ca_certs:
+                context.load_verify_locations(cadata=b"".join(ca_certs))
+        context.set_alpn_protocols(["h2"])
+        return context
+
+    def _send_pending(self, conn):
+        data = conn.h2.data_to_send()
+        if data:
+            conn.sock.sendall(data)
+            self.counters.add(bytes_out=len(data))
+
+    def _read_loop(self, conn):
+        events = self._events
+        while True:
+            try:
+                data = conn.sock.recv(65536)
+            except OSError:
+                data = b""
+            if not data:
+                with conn.lock:
+                    self._drop_locked(conn, "connection closed")
+                return
+            self.counters.add(bytes_in=len(data))
+            with conn.lock:
+                try:
+                    for event in conn.h2.receive_data(data):
+                        stream = conn.streams.get(getattr(event, "stream_id", None))
+                        if isinstance(event, events.ResponseReceived) and stream:
+                            stream.headers = dict(event.headers)
+                            stream.status = int(stream.headers.get(":status", 0))
+                        elif isinstance(event, events.DataReceived):
+                            if stream:
+                                stream.body.extend(event.data)
+                            conn.h2.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                        elif isinstance(event, events.StreamEnded) and stream:
+                            stream.done.set()
+                        elif isinstance(event, events.StreamReset) and stream:
+                            stream.error = f"stream reset (error code {event.error_code})"
+                            stream.done.set()
+                        elif isinstance(event, events.ConnectionTerminated):
+                            self._send_pending(conn)
+                            self._drop_locked(conn, f"GOAWAY (error code {event.error_code})")
+                            return
+                    self._send_pending(conn)
+                except (OSError, self._protocol_error) as e:
+                    self._drop_locked(conn, f"connection lost: {e}")
+                    return
+
+    def _drop_locked(self, conn, reason):
+        """Mark `conn` dead, count its close (once) and fail its open streams."""
+        if not conn.dead:
+            conn.dead = True
+            self.counters.add(closed=1)
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.sock.close()
+        for stream in conn.streams.values():
+            if not stream.done.is_set():
+                stream.error = reason
+                stream.done.set()
+
+    def request(self, path, headers=None, method="GET", body=None):
+        started = time.perf_counter()
+        try:
+            conn = self._ensure_connected()
+        except OSError as e:
+            return Response(path, None, started, time.perf_counter(), error=str(e))
+
+        stream = _Stream(path)
+        request_headers = [(":method", method), (":path", path),
+                           (":scheme", self.scheme), (":authority", self.authority)]
+        request_headers += [(k.lower(), v) for k, v in (headers or {}).items()]
+        stream_id = None
+        with conn.lock:
+            try:
+                stream_id = conn.h2.get_next_available_stream_id()
+                conn.streams[stream_id] = stream
+                conn.h2.send_headers(stream_id, request_headers, end_stream=body is None)
+                if body is not None:
+                    conn.h2.send_data(stream_id, body, end_stream=True)
+                self._send_pending(conn)
+            except (OSError, self._protocol_error) as e:
+                # like an H1 send error: this request fails and the next one reconnects
+                self._drop_locked(conn, f"connection lost: {e}")
+                stream.error = stream.error or f"connection lost: {e}"
+                stream.done.set()
+
+        if not stream.done.wait(self.timeout):
+            stream.error = "timed out"
+        finished = time.perf_counter()
+        with conn.lock:
+            conn.streams.pop(stream_id, None)
+        if stream.error:
+            return Response(path, None, started, finished, error=stream.error, connection_id=conn.conn_id)
+        return Response(path, stream.status, started, finished, bytes(stream.body),
+                        {k: v for k, v in stream.headers.items() if not k.startswith(":")}, conn.conn_id)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        conn = self._conn
+        if conn is None:
+            return
+        with conn.lock:
+            if not conn.dead:
+                conn.h2.close_connection()
+                try:
+                    self._send_pending(conn)
+                except OSError:
+                    pass
+            self._drop_locked(conn, "transport closed")
+
+
+def make_transport(protocol, base_url, timeout=30, ssl_context=None):
+    """Create a transport for "h1" or "h2"."""
+    if protocol == "h1":
+        return H1Transport(base_url, timeout, ssl_context)
+    if protocol == "h2":
+        return H2Transport(base_url, timeout, ssl_context)
+    raise ValueError(f"Unknown protocol '{protocol}' (choose from: {', '.join(PROTOCOLS)})")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Run any declarative load scenario (see scenarios/*.json and harness/scenario.py).
+
+The scenario is compiled once into an execution plan, executed with the
+configured load profile and checked against its SLO thresholds. The exit
+code is 1 when any SLO is breached, so the runner can gate CI.
+
+Usage:
+    python3 run-scenario.py                                   # scenarios/sdk-init.json
+    python3 run-scenario.py launch-mix.json --target local
+    python3 run-scenario.py sdk-init.json --seed 7 --requests 200 --concurrency 20
+    python3 run-scenario.py launch-mix.json --network 3g --protocol h2
+    python3 run-scenario.py sdk-init.json --standin          # local stand-in, no server needed
+    python3 run-scenario.py launch-mix.json --log requests.jsonl --log-sample 0.01
+
+While the run is in progress a live view (refreshed 4x per second) shows
+throughput, error rate, in-flight requests, open connections and rolling
+p50/p95/p99 per endpoint; it is on by default when stdout is a terminal.
+Per-request lines are not printed; --log writes a sampled JSON-lines log
+(errors are always kept) from a background thread.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from harness.live import LiveStats, LiveView, SampledLog
+from harness.netem import PRESETS, get_profile, shaped_network
+from harness.runner import evaluate_slo, run_plan
+from harness.scenario import ScenarioError, load_scenario
+from harness.standin import StandInServer
+from harness.transport import PROTOCOLS
+
+def print_results(plan, result):
+    print("\n" + "=" * 78)
+    print("RESULTS")
+    print("=" * 78)
+    print(f"{'Endpoint':<20} {'Count':>7} {'Errors':>7} {'Mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    print("-" * 78)
+    names = [e.name for e in plan.endpoints if e.name in result.latencies]
+    for name in names + [None]:
+        s = result.summary(name)
+        label = name or "ALL"
+        if name is None:
+            print("-" * 78)
+        print(f"{label:<20} {s['count']:>7} {s['errors']:>7} {s['mean_ms']:>7.0f}ms "
+              f"{s['p50_ms']:>7.0f}ms {s['p95_ms']:>7.0f}ms {s['p99_ms']:>7.0f}ms")
+
+    overall = result.summary()
+    print(f"\nDuration: {result.duration_s:.1f}s   Throughput: {overall['rps']:.1f} req/s   "
+          f"Error rate: {overall['error_rate'] * 100:.2f}%")
+    statuses = ", ".join(f"{status}: {count}" for status, count in sorted(result.statuses.items(), key=str))
+    print(f"Statuses: {statuses}")
+
+def print_slo(rows):
+    print("\n" + "=" * 78)
+    print("SLO")
+    print("=" * 78)
+    if not rows:
+        print("No SLO thresholds defined")
+        return True
+    for scope, metric, limit, actual, ok in rows:
+        if metric == "error_rate":
+            limit_text, actual_text = f"{limit * 100:.2f}%", f"{actual * 100:.2f}%"
+        elif metric == "min_rps":
+            limit_text, actual_text = f">= {limit:g} req/s", f"{actual:.1f} req/s"
+        else:
+            limit_text, actual_text = f"<= {limit:g}ms", f"{actual:.0f}ms"
+        print(f"{'✅' if ok else '❌'} {scope:<20} {metric:<11} {actual_text:>14}  (limit {limit_text})")
+    return all(ok for *_, ok in rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a declarative load scenario")
+    parser.add_argument("scenario", nargs="?", default=None, help="scenario file or name in scenarios/")
+    parser.add_argument("--target", default=None, help="target name from the scenario")
+    parser.add_argument("--seed", type=int, default=None, help="override the scenario seed")
+    parser.add_argument("--requests", type=int, default=None, help="override load.requests")
+    parser.add_argument("--duration", type=float, default=None, dest="duration_s", help="override load.duration_s")
+    parser.add_argument("--concurrency", type=int, default=None, help="override load.concurrency")
+    parser.add_argument("--rps", type=float, default=None, help="override load.rps (open-loop arrival rate)")
+    parser.add_argument("--protocol", default="h1", choices=PROTOCOLS)
+    parser.add_argument("--network", default="none", help=f"emulated network ({', '.join(PRESETS)})")
+    parser.add_argument("--standin", action="store_true", help="run against a local stand-in server")
+    parser.add_argument("--live", action=argparse.BooleanOptionalAction, default=None,
+                        help="live view during the run (default: on when stdout is a terminal)")
+    parser.add_argument("--log", default=None, metavar="FILE", help="append per-request JSON lines to FILE ('-' for stdout)")
+    parser.add_argument("--log-sample", type=float, default=1.0, metavar="RATE",
+                        help="fraction of successful requests to log (default: 1.0)")
+    args = parser.parse_args()
+    if not 0 <= args.log_sample <= 1:
+        parser.error("--log-sample must be between 0 and 1")
+    show_live = sys.stdout.isatty() if args.live is None else args.live
+
+    try:
+        profile = get_profile(args.network)
+        scenario = load_scenario(args.scenario)
+        target = args.target
+        if args.standin and target is None and "standin" in scenario.targets:
+            target = "standin"
+        plan = scenario.compile(
+            target, seed=args.seed, requests=args.requests, duration_s=args.duration_s,
+            concurrency=args.concurrency, rps=args.rps)
+    except (ScenarioError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    standin = StandInServer().start() if args.standin else None
+    if standin:
+        plan.base_url = standin.base_url
+
+    load = plan.load
+    print("=" * 78)
+    print(f"Scenario: {plan.name} (target: {plan.target})")
+    print(f"Base URL: {plan.base_url}")
+    print(f"Mix: {', '.join(f'{e.name}={e.weight:g}' for e in plan.endpoints)}")
+    stop_rule = f"{load.requests} requests" if load.requests is not None else f"{load.duration_s:g}s"
+    pacing = f", {load.rps:g} req/s open-loop" if load.rps else ""
+    print(f"Load: {load.concurrency} workers, {stop_rule}{pacing}, ramp-up {load.ramp_up_s:g}s, seed {plan.seed}")
+    print(f"Protocol: {args.protocol}   Network: {profile.describe()}")
+    print("=" * 78)
+
+    live = LiveStats() if show_live else None
+    log = SampledLog(args.log, rate=args.log_sample, seed=plan.seed)
+    try:
+        with shaped_network(profile, seed=plan.seed), log:
+            if live:
+                with LiveView(live):
+                    result = run_plan(plan, protocol=args.protocol, on_result=log.write, live=live)
+            else:
+                result = run_plan(plan, protocol=args.protocol, on_result=log.write)
+    finally:
+        if standin:
+            standin.stop()
+    if args.log and args.log != "-":
+        print(f"\nRequest log: {log.written:,} lines appended to {args.log}"
+              f"{f' ({log.dropped:,} dropped)' if log.dropped else ''}")
+
+    print_results(plan, result)
+    if not print_slo(evaluate_slo(plan, result)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Experiment-assignment load test with consistency checks.
+
+POST /api/experiments/[id]/assign runs on app launch for every user in an
+experiment, so it has to stay fast and sticky under load. This probe seeds
+a running experiment and drives assignment for a synthetic user population
+in two phases:
+- first contact: each user's first --burst calls are sent at the same time
+  (adjacent requests, so they land on different workers); this is the path
+  that creates the assignment, and where concurrent calls race each other
+- repeat:        --repeat more calls per user after everyone is assigned,
+                 the sticky read path every later app launch takes
+
+It reports latency percentiles and errors (by status) per phase, lists users
+who were handed different variants across calls, checks every answer
+against harness/experiments.py (a reference port of assignToVariant()), and
+runs a chi-square test of the observed variant split against the weights.
+
+Before any of that, the split check runs offline on --population synthetic
+IDs per format (UUID, Android ID, sequential "user-N"), which catches a
+biased hash or weight handling in experiments.ts without a server.
+
+Usage:
+    python3 test-experiment-assign.py --standin                     # no server needed
+    python3 test-experiment-assign.py --target local --users 20000 --concurrency 64
+    python3 test-experiment-assign.py --weights 10,20,30,40 --identity device
+    python3 test-experiment-assign.py --experiment <id> --skip-offline
+    python3 test-experiment-assign.py --json results.json
+
+Seeding needs a dashboard token and project (--admin-token/--project-id or
+NIVOSTACK_ADMIN_TOKEN/NIVOSTACK_PROJECT_ID); the project's API key comes
+from the scenario target (scenarios/experiment-assign.json). The seeded
+business config and experiment are deleted afterwards unless --keep is
+given; assignments go with the experiment.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from harness.admin import AdminError, add_admin_arguments, admin_client
+from harness.experiments import assign_to_variant, assignment_percentage, make_variants, variant_for_percentage
+from harness.runner import run_plan
+from harness.scenario import CompiledEndpoint, ScenarioError, Template, add_scenario_arguments, probe_config
+from harness.standin import StandInServer, json_response
+from harness.stats import chi_square
+from harness.targeting import ID_FORMATS, synthetic_ids
+
+DEFAULT_SCENARIO = "experiment-assign.json"
+KEY_PREFIX = "bench_experiment"
+IDS_PER_TASK = 250_000
+P_VALUE_FLOOR = 0.001
+
+def parse_weights(text, parser):
+    try:
+        weights = [float(v) for v in text.split(",") if v.strip()]
+    except ValueError:
+        parser.error(f"--weights takes comma-separated numbers, got '{text}'")
+    if len(weights) < 2 or min(weights) <= 0:
+        parser.error("--weights needs at least two positive weights")
+    if abs(sum(weights) - 100) > 0.01:
+        parser.error("--weights must sum to 100 (the experiments API rejects anything else)")
+    return weights
+
+def assign_body(identity, identifier):
+    """The SDK's assign request for one synthetic user."""
+    body = {"context": {"platform": "android" if identifier[-1] in "02468ace" else "ios", "appVersion": "2.4.1"}}
+    if identity in ("user", "both"):
+        body["userId"] = identifier
+    if identity in ("device", "both"):
+        body["deviceId"] = f"device-{identifier}"
+    return body
+
+# -- stand-in -------------------------------------------------------------------
+
+STANDIN_EXPERIMENT = "standin-experiment"
+
+def standin_routes():
+    """Business-config and experiment routes for one experiment at a time.
+
+    Assignment is sticky: the first call for a (deviceId, userId) pair
+    stores the variant from harness/experiments.py and later calls return it.
+    """
+    state = {"experiment": None, "assignments": {}}
+    lock = threading.Lock()
+    base = f"/api/experiments/{STANDIN_EXPERIMENT}"
+
+    def business_config(request):
+        if request.method == "POST":
+            return json_response({"config": {"id": "standin-config", **request.json()}})
+        return json_response({"success": True})
+
+    def experiments(request):
+        body = request.json()
+        state["experiment"] = {"id": STANDIN_EXPERIMENT, "variants": body["variants"], "status": "draft"}
+        state["assignments"] = {}
+        return json_response({"experiment": state["experiment"]})
+
+    def experiment(request):
+        if state["experiment"] is None:
+            return json_response({"error": "Experiment not found"}, 404)
+        if request.method == "PATCH":
+            state["experiment"].update(request.json())
+        elif request.method == "DELETE":
+            state["experiment"] = None
+            return json_response({"success": True})
+        return json_response({"experiment": state["experiment"]})
+
+    def assign(request):
+        if not request.headers.get("x-api-key"):
+            return json_response({"error": "Invalid API key"}, 401)
+        current = state["experiment"]
+        if current is None:
+            return json_response({"error": "Experiment not found"}, 404)
+        if current["status"] != "running":
+            return json_response({"error": "Experiment is not running", "status": current["status"]}, 400)
+        body = request.json()
+        key = (body.get("deviceId"), body.get("userId"))
+        with lock:
+            index = state["assignments"].get(key)
+            if index is None:
+                context = {"deviceId": key[0], "userId": key[1], **(body.get("context") or {})}
+                index = state["assignments"][key] = assign_to_variant(current["id"], current["variants"], context)
+        variant = current["variants"][index]
+        return json_response({"variantIndex": index, "variantName": variant["name"], "value": variant["value"]})
+
+    return {"/api/business-config": business_config, "/api/experiments": experiments,
+            base: experiment, f"{base}/assign": assign}
+
+STANDIN_DELAYS_MS = {f"/api/experiments/{STANDIN_EXPERIMENT}/assign": 3}
+
+# -- seeding ----------------------------------------------------------------------
+
+def seed_experiment(admin, weights, seed):
+    """Create a business config and a running experiment over it; returns (id, variants)."""
+    key = f"{KEY_PREFIX}_{seed}_{int(time.time())}"
+    _, data = admin.request("POST", "/api/business-config",
+                            {"projectId": admin.project_id, "key": key, "valueType": "string", "value": "value-0",
+                             "category": "benchmark"})
+    config_id = data["config"]["id"]
+    admin.created("/api/business-config", config_id)
+    _, data = admin.request("POST", "/api/experiments",
+                            {"projectId": admin.project_id, "configId": config_id, "name": key,
+                             "description": "Seeded by test-experiment-assign.py", "variants": make_variants(weights),
+                             "assignmentType": "consistent"})
+    experiment = data["experiment"]
+    admin.created(f"/api/experiments/{experiment['id']}")
+    admin.request("PATCH", f"/api/experiments/{experiment['id']}", {"status": "running"})
+    return experiment["id"], experiment["variants"]
+
+def existing_experiment(admin, experiment_id):
+    _, data = admin.request("GET", f"/api/experiments/{experiment_id}")
+    experiment = data["experiment"]
+    if experiment.get("status") != "running":
+        raise AdminError(f"experiment {experiment_id} is {experiment.get('status')}, not running")
+    return experiment["id"], experiment["variants"]
+
+# -- offline split --------------------------------------------------------------------
+
+def split_counts(experiment_id, variants, kind, seed, start, count):
+    """Predicted users per variant for one slice of synthetic IDs; runs in a worker."""
+    counts = [0] * len(variants)
+    for identifier in synthetic_ids(kind, count, seed=seed, start=start):
+        counts[variant_for_percentage(variants, assignment_percentage(experiment_id, identifier))] += 1
+    return counts
+
+def check_offline_split(experiment_id, variants, population, seed, jobs):
+    print("\n" + "=" * 78)
+    print(f"OFFLINE SPLIT: {population:,} synthetic IDs per format through assignToVariant()")
+    print("=" * 78)
+    weights = [v["weight"] for v in variants]
+    results = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {kind: [pool.submit(split_counts, experiment_id, variants, kind, seed * 1000 + task, start,
+                                      min(IDS_PER_TASK, population - start))
+                          for task, start in enumerate(range(0, population, IDS_PER_TASK))]
+                   for kind in ID_FORMATS}
+        for kind in ID_FORMATS:
+            counts = [sum(column) for column in zip(*(future.result() for future in futures[kind]))]
+            statistic, dof, p_value = chi_square(counts, weights)
+            results[kind] = {"counts": counts, "chi_square": statistic, "dof": dof, "p_value": p_value}
+    elapsed = time.perf_counter() - started
+    print(f"{'Format':<12} {'chi-square':>11} {'p-value':>9}  split (% of users, weights {weights})")
+    for kind, r in results.items():
+        mark = "✅" if r["p_value"] >= P_VALUE_FLOOR else "❌"
+        split = "  ".join(f"{c / population * 100:6.2f}" for c in r["counts"])
+        print(f"{mark} {kind:<10} {r['chi_square']:>11.2f} {r['p_value']:>9.3g}  {split}")
+    print(f"({len(ID_FORMATS) * population:,} IDs assigned in {elapsed:.1f}s; a p-value below {P_VALUE_FLOOR} means "
+          f"that ID format does not split by the weights)")
+    return results
+
+# -- load phases ----------------------------------------------------------------------
+
+class AssignmentLog:
+    """Every variant each user was handed, plus error statuses; called from worker threads."""
+
+    def __init__(self, users):
+        self.users = users
+        self.lock = threading.Lock()
+        self.variants = defaultdict(list)
+        self.statuses = Counter()
+
+    def recorder(self, user_of):
+        def record(planned, response):
+            user = user_of(planned.index)
+            if not response.ok:
+                with self.lock:
+                    self.statuses[response.status or response.error or "error"] += 1
+                return
+            try:
+                index = json.loads(response.body).get("variantIndex")
+            except (TypeError, ValueError, AttributeError):
+                index = None
+            with self.lock:
+                self.variants[user].append(index)
+        return record
+
+def run_phase(plan, name, experiment_id, identity, user_ids, requests, user_of, log):
+    endpoint = CompiledEndpoint(name=name, method="POST", weight=1,
+                                path=Template(f"/api/experiments/{experiment_id}/assign", name), query={},
+                                headers={"Content-Type": "application/json"},
+                                body=lambda ctx: assign_body(identity, user_ids[user_of(ctx.index)]))
+    phase_plan = replace(plan, endpoints=[endpoint], _cumulative=[],
+                         load=replace(plan.load, requests=requests, duration_s=None))
+    statuses_before = Counter(log.statuses)
+    result = run_plan(phase_plan, on_result=log.recorder(user_of))
+    summary = result.summary()
+    summary["statuses"] = {str(k): v for k, v in (log.statuses - statuses_before).items()}
+    flag = "✅" if not summary["errors"] else "❌"
+    print(f"{flag} {name:<14} {summary['count']:>7} calls  p50 {summary['p50_ms']:7.1f}ms  "
+          f"p95 {summary['p95_ms']:7.1f}ms  p99 {summary['p99_ms']:7.1f}ms  {summary['rps']:7.1f} req/s"
+          + (f"  errors: {', '.join(f'{n}x {s}' for s, n in summary['statuses'].items())}" if summary["errors"] else ""))
+    return summary
+
+def check_consistency(log, experiment_id, variants, identity, user_ids):
+    print("\n" + "=" * 78)
+    print("CONSISTENCY")
+    print("=" * 78)
+    flapping, unreadable, disagree = [], 0, []
+    observed = [0] * len(variants)
+    for user, answers in log.variants.items():
+        if None in answers:
+            unreadable += 1
+            continue
+        if len(set(answers)) > 1:
+            flapping.append(user)
+        observed[answers[0]] += 1
+        body = assign_body(identity, user_ids[user])
+        expected = assign_to_variant(experiment_id, variants, {"deviceId": body.get("deviceId"),
+                                                               "userId": body.get("userId"), **body["context"]})
+        if answers[0] != expected:
+            disagree.append(user)
+    answered = sum(observed)
+    print(f"{answered} of {len(user_ids)} users got an answer"
+          + (f" ({unreadable} responses without a variantIndex)" if unreadable else ""))
+    print(f"{'✅' if not flapping else '❌'} {len(flapping)} users were handed more than one variant")
+    for user in flapping[:5]:
+        print(f"     {user_ids[user]}: {log.variants[user]}")
+    print(f"{'✅' if not disagree else '❌'} {len(disagree)} users got a different variant than assignToVariant() predicts")
+    for user in disagree[:5]:
+        print(f"     {user_ids[user]}: got {log.variants[user][0]}")
+
+    weights = [v["weight"] for v in variants]
+    split = {"observed": observed}
+    if answered:
+        statistic, dof, p_value = chi_square(observed, weights)
+        split.update(chi_square=statistic, dof=dof, p_value=p_value)
+        mark = "✅" if p_value >= P_VALUE_FLOOR else "❌"
+        shares = "  ".join(f"{v['name']} {c / answered * 100:.1f}% (want {v['weight']:g}%)"
+                           for v, c in zip(variants, observed))
+        print(f"{mark} split: {shares}")
+        print(f"   chi-square {statistic:.2f} on {dof} dof, p = {p_value:.3g}")
+    return {"users": len(user_ids), "answered": answered, "flapping": len(flapping), "disagree": len(disagree),
+            "unreadable": unreadable, "split": split}
+
+def main():
+    parser = argparse.ArgumentParser(description="Experiment-assignment load test with consistency checks")
+    parser.add_argument("--users", type=int, default=5000, help="synthetic users to assign (default: 5000)")
+    parser.add_argument("--burst", type=int, default=3, help="simultaneous first calls per user (default: 3)")
+    parser.add_argument("--repeat", type=int, default=2, help="later calls per user (default: 2)")
+    parser.add_argument("--identity", choices=["user", "device", "both"], default="both",
+                        help="send userId, deviceId or both (default: both)")
+    parser.add_argument("--weights", default="50,50", help="variant weights, summing to 100 (default: 50,50)")
+    parser.add_argument("--experiment", default=None, help="use this running experiment instead of seeding one")
+    parser.add_argument("--concurrency", type=int, default=None, help="override load.concurrency")
+    parser.add_argument("--rps", type=float, default=None, help="open-loop request rate (default: closed loop)")
+    parser.add_argument("--population", type=int, default=1_000_000,
+                        help="synthetic IDs per format for the offline split check (default: 1M)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="processes for the offline check")
+    parser.add_argument("--skip-offline", action="store_true", help="skip the offline split check")
+    parser.add_argument("--standin", action="store_true", help="run against a local stand-in server")
+    parser.add_argument("--seed", type=int, default=None, help="override the scenario seed")
+    parser.add_argument("--json", default=None, metavar="FILE", help="also write the results as JSON")
+    add_scenario_arguments(parser, DEFAULT_SCENARIO)
+    add_admin_arguments(parser)
+    args = parser.parse_args()
+    weights = parse_weights(args.weights, parser)
+    if args.users < 1 or args.burst < 1 or args.repeat < 0:
+        parser.error("--users and --burst must be at least 1 and --repeat at least 0")
+
+    if args.standin and args.target is None:
+        args.target = "standin"
+    scenario, _, _ = probe_config(args, parser)
+    try:
+        plan = scenario.compile(args.target, seed=args.seed, concurrency=args.concurrency, rps=args.rps)
+    except ScenarioError as e:
+        parser.error(str(e))
+    standin = StandInServer(routes=standin_routes(), delays_ms=STANDIN_DELAYS_MS).start() if args.standin else None
+    if standin:
+        plan.base_url = standin.base_url
+
+    print("=" * 78)
+    print("Experiment assignment load test")
+    print(f"Target: {plan.target} ({plan.base_url})   Seed: {plan.seed}   Workers: {plan.load.concurrency}"
+          + (f"   Rate: {plan.load.rps:g} req/s" if plan.load.rps else ""))
+    print(f"Users: {args.users} ({args.identity} IDs), {args.burst} simultaneous first calls + "
+          f"{args.repeat} repeat calls each")
+    print("=" * 78)
+
+    results = {"target": plan.target, "seed": plan.seed, "users": args.users, "burst": args.burst,
+               "repeat": args.repeat, "identity": args.identity}
+    admin = admin_client(args, parser, plan.base_url, standin=bool(standin))
+    try:
+        if args.experiment:
+            experiment_id, variants = existing_experiment(admin, args.experiment)
+        else:
+            experiment_id, variants = seed_experiment(admin, weights, plan.seed)
+        results["experiment"] = {"id": experiment_id, "variants": variants}
+        print(f"Experiment {experiment_id}: " + ", ".join(f"{v['name']} {v['weight']:g}%" for v in variants))
+
+        if not args.skip_offline:
+            results["offline"] = check_offline_split(experiment_id, variants, args.population, plan.seed, args.jobs)
+
+        print("\n" + "=" * 78)
+        print("LATENCY")
+        print("=" * 78)
+        user_ids = list(synthetic_ids("uuid", args.users, seed=plan.seed))
+        log = AssignmentLog(args.users)
+        results["first_contact"] = run_phase(plan, "first-contact", experiment_id, args.identity, user_ids,
+                                             args.users * args.burst, lambda i: i // args.burst, log)
+        if args.repeat:
+            results["repeat"] = run_phase(plan, "repeat", experiment_id, args.identity, user_ids,
+                                          args.users * args.repeat, lambda i: i % args.users, log)
+        if results["first_contact"]["errors"] and plan.load.concurrency > 1 and args.burst > 1:
+            print("   (errors only on first contact usually mean simultaneous first calls raced to create "
+                  "the same assignment)")
+        results["consistency"] = check_consistency(log, experiment_id, variants, args.identity, user_ids)
+    except AdminError as e:
+        print(f"\n❌ Seeding failed: {e}")
+        sys.exit(2)
+    finally:
+        if args.keep:
+            print("\nSeeded experiment kept (--keep)")
+        elif admin.cleanup():
+            print("\n⚠️  Some seeded records could not be deleted")
+        admin.close()
+        if standin:
+            standin.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    consistency = results["consistency"]
+    failed = consistency["flapping"] or consistency["disagree"] or not consistency["answered"]
+    failed = failed or consistency["split"].get("p_value", 1) < P_VALUE_FLOOR
+    failed = failed or any(results.get(phase, {}).get("errors") for phase in ("first_contact", "repeat"))
+    failed = failed or any(r["p_value"] < P_VALUE_FLOOR for r in results.get("offline", {}).values())
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
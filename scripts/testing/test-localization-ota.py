@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+Localization OTA check/update benchmark with delta-size accounting.
+
+GET /api/localization/ota/check compares a device's last-known build version
+with the project's latest production build and ships the language's
+translations; the SDK then reports the update with POST
+/api/localization/ota/update. This probe sizes what that costs:
+
+1. For each point of --languages x --keys it seeds the project (languages
+   and keys through the dashboard import, growing between points), then
+   publishes a series of production localization builds, editing --churn %
+   of the translations and adding --added % new keys between builds.
+2. A fleet of --devices devices, each with a random language and a last-known
+   version drawn from --fleet (versions behind the latest, or a fresh
+   install), calls check, and the devices that got an update call update.
+
+It reports check and update latency, payload bytes (raw, and gzip for one
+response per fleet group), and for every payload how much of it the device
+already had unchanged. All sizes are measured on the body re-encoded as
+NextResponse.json() sends it, so they compare like with like whatever the
+server's spacing; the bytes actually received are kept as wire_bytes in
+the JSON results. It also compares the delta the server sent with the
+delta it should have sent (computed from the local record of every
+published version), so the numbers show what delta-only updates would save.
+
+Usage:
+    python3 test-localization-ota.py --standin                        # no server needed
+    python3 test-localization-ota.py --target local --allow-publish --languages 10,50 --keys 1000,100000
+    python3 test-localization-ota.py --fleet 0:50,1:30,fresh:20 --devices 2000 --churn 2
+    python3 test-localization-ota.py --json results.json
+
+Seeding needs a dashboard token and project (--admin-token/--project-id or
+NIVOSTACK_ADMIN_TOKEN/NIVOSTACK_PROJECT_ID); the project's API key comes
+from the scenario target (scenarios/localization-ota.json) and must belong
+to the same project. Publishing makes the benchmark's builds the project's
+production localization build, so run it against a dedicated project and
+confirm with --allow-publish. Seeded languages (*-x-bench), keys and builds
+are deleted afterwards unless --keep is given; the last build stays active,
+since the API does not delete an active build.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from harness.admin import AdminClient, AdminError, add_admin_arguments, admin_client
+from harness.localization import (MAX_LANGUAGES, RTL_LANGUAGES, BASE_LANGUAGES, key_name, language_code,
+                                  language_name, translation_value)
+from harness.runner import run_plan
+from harness.scenario import CompiledEndpoint, ScenarioError, Template, add_scenario_arguments, probe_config
+from harness.standin import StandInServer, json_response
+
+DEFAULT_SCENARIO = "localization-ota.json"
+CATEGORY = "benchmark-ota"
+KEY_PREFIX = "bench.ota"
+IMPORT_CHUNK = 500
+VALUE_SAMPLE = 5
+
+def compact(data):
+    """JSON as NextResponse.json() sends it (no spaces, UTF-8)."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def compact_response(data, status=200):
+    """A stand-in reply encoded like NextResponse.json(), so payload sizes match a real server's."""
+    return status, {"content-type": "application/json"}, compact(data)
+
+def parse_sizes(text, name, parser, maximum=None):
+    try:
+        sizes = sorted({int(v) for v in text.split(",") if v.strip()})
+    except ValueError:
+        parser.error(f"--{name} takes comma-separated integers, got '{text}'")
+    if not sizes or sizes[0] < 1 or (maximum and sizes[-1] > maximum):
+        parser.error(f"--{name} values must be between 1 and {maximum or 'any'}")
+    return sizes
+
+def parse_fleet(text, parser):
+    """{versions behind (None = fresh install): weight} from "0:20,1:30,fresh:15"."""
+    fleet = {}
+    for item in text.split(","):
+        try:
+            behind, weight = item.split(":")
+            fleet[None if behind.strip() == "fresh" else int(behind)] = float(weight)
+        except ValueError:
+            parser.error(f"--fleet takes behind:weight pairs (behind a number or 'fresh'), got '{item}'")
+    if not fleet or min(fleet.values()) < 0 or any(b is not None and b < 0 for b in fleet):
+        parser.error("--fleet needs non-negative versions behind and weights")
+    return fleet
+
+def fleet_label(behind):
+    return "fresh" if behind is None else "current" if behind == 0 else f"{behind} behind"
+
+# -- stand-in -------------------------------------------------------------------
+
+def standin_routes():
+    """Localization, build and OTA routes, following the real ones.
+
+    ota/check mirrors the route as written, including where it looks up the
+    device's version in the build snapshot and sending the full payload
+    next to the delta, so stand-in runs show the same payload shape.
+    """
+    languages, keys, translations, builds = {}, {}, defaultdict(dict), {}
+    lock = threading.Lock()
+    counter = iter(range(1, 1 << 62))
+
+    def new_id(kind):
+        return f"standin-{kind}-{next(counter)}"
+
+    def language_routes(request):
+        if request.method == "GET":
+            return json_response({"languages": list(languages.values())})
+        if request.method == "DELETE":
+            with lock:
+                removed = languages.pop(request.query.get("id"), None)
+                if removed:
+                    translations.pop(removed["code"], None)
+            return json_response({"success": True} if removed else {"error": "Language not found"},
+                                 200 if removed else 404)
+        body = request.json()
+        with lock:
+            if any(lang["code"] == body["code"] for lang in languages.values()):
+                return json_response({"error": "Language code already exists"}, 409)
+            language = {"id": new_id("language"), "code": body["code"], "name": body["name"], "isEnabled": True}
+            languages[language["id"]] = language
+        return json_response({"language": language}, 201)
+
+    def import_file(request):
+        fields, files = request.form()
+        code = fields["languageCode"]
+        options = json.loads(fields.get("options") or "{}")
+        parsed = json.loads(files["file"][1])
+        stats = {"keysCreated": 0, "translationsCreated": 0, "translationsUpdated": 0, "errors": []}
+        with lock:
+            if not any(lang["code"] == code for lang in languages.values()):
+                return json_response({"error": f"Language {code} not found or disabled"}, 400)
+            for key, value in parsed.items():
+                if key not in keys:
+                    keys[key] = options.get("category")
+                    stats["keysCreated"] += 1
+                stats["translationsUpdated" if key in translations[code] else "translationsCreated"] += 1
+                translations[code][key] = value
+        return json_response({"success": True, "stats": stats})
+
+    def bulk(request):
+        body = request.json()
+        with lock:
+            doomed = [key for key, category in keys.items() if category == body["filters"].get("category")]
+            for key in doomed:
+                del keys[key]
+                for values in translations.values():
+                    values.pop(key, None)
+        return json_response({"success": True, "affected": {"keys": len(doomed), "translations": 0}})
+
+    def create_build(request):
+        with lock:
+            version = max((b["version"] for b in builds.values()), default=0) + 1
+            snapshot = {"translations": {lang["code"]: dict(translations[lang["code"]]) for lang in languages.values()},
+                        "languages": [lang["code"] for lang in languages.values()]}
+            build = {"id": new_id("build"), "version": version, "mode": None, "isActive": False,
+                     "localizationSnapshot": snapshot}
+            builds[build["id"]] = build
+        return json_response({"build": {k: v for k, v in build.items() if k != "localizationSnapshot"}})
+
+    def build_routes(request):
+        build_id = request.path.split("/")[3]
+        build = builds.get(build_id)
+        if build is None:
+            return json_response({"error": "Build not found"}, 404)
+        if request.method == "DELETE":
+            if build["isActive"]:
+                return json_response({"error": "Cannot delete active build. Deactivate it first."}, 500)
+            del builds[build_id]
+            return json_response({"success": True})
+        mode = request.json()["mode"]
+        with lock:
+            for other in builds.values():
+                if other["mode"] == mode:
+                    other["isActive"] = False
+            build.update(mode=mode, isActive=True)
+        return json_response({"build": {k: v for k, v in build.items() if k != "localizationSnapshot"}})
+
+    def ota_check(request):
+        if not request.headers.get("x-api-key"):
+            return json_response({"error": "Invalid API key"}, 401)
+        code, current = request.query.get("languageCode"), int(request.query.get("currentVersion") or 0)
+        production = [b for b in builds.values() if b["mode"] == "production"]
+        latest = max(production, key=lambda b: b["version"], default=None)
+        if latest is None:
+            return compact_response({"updateAvailable": False, "latestVersion": current})
+        if latest["version"] <= current:
+            return compact_response({"updateAvailable": False, "latestVersion": latest["version"]})
+        previous = next((b for b in production if b["version"] == current), None)
+        # getTranslationsForVersion() reads snapshot[languageCode]
+        old = (previous["localizationSnapshot"].get(code) or {}) if previous else {}
+        new = dict(translations.get(code) or {})
+        delta = {"added": {k: v for k, v in new.items() if k not in old},
+                 "updated": {k: v for k, v in new.items() if k in old and old[k] != v},
+                 "deleted": [k for k in old if k not in new]}
+        response = {"updateAvailable": True, "latestVersion": latest["version"], "fullPayload": new}
+        if delta["added"] or delta["updated"] or delta["deleted"]:
+            response["delta"] = delta
+        return compact_response(response)
+
+    def ota_update(request):
+        body = request.json()
+        missing = [f for f in ("projectId", "deviceId", "fromVersion", "toVersion", "languageCode") if not body.get(f)]
+        if missing:
+            return json_response({"error": "projectId, deviceId, fromVersion, toVersion, and languageCode are "
+                                           "required"}, 400)
+        return json_response({"success": True, "message": "OTA update logged"})
+
+    return {"/api/localization/languages": language_routes, "/api/localization/import": import_file,
+            "/api/localization/bulk": bulk, "/api/builds": create_build, "/api/builds/": build_routes,
+            "/api/localization/ota/check": ota_check, "/api/localization/ota/update": ota_update}
+
+STANDIN_DELAYS_MS = {"/api/localization/ota/check": 5, "/api/localization/ota/update": 2}
+
+# -- seeding ----------------------------------------------------------------------
+
+class OtaProject:
+    """The benchmark's languages, keys and builds in the project, mirrored locally.
+
+    Each key has a revision; translation_value(code, key, revision) is its
+    text, and every published build keeps a copy of the revisions, so the
+    content of any version is known without storing it.
+    """
+
+    def __init__(self, admin, workers, value_chars):
+        self.admin = admin
+        self.workers = workers
+        self.value_chars = value_chars
+        self.languages = {}
+        self.revisions = array("I")
+        self.builds = []
+        self.clients = threading.local()
+        self.all_clients = []
+
+    def remove_leftovers(self):
+        """Delete benchmark languages and keys left by an interrupted run."""
+        _, data = self.admin.request("GET", "/api/localization/languages", query={"projectId": self.admin.project_id})
+        for language in (data or {}).get("languages", []):
+            if language["code"].endswith("-x-bench"):
+                self.admin.request("DELETE", "/api/localization/languages", query={"id": language["id"]}, expect=None)
+        self.delete_keys()
+
+    def delete_keys(self):
+        self.admin.request("PATCH", "/api/localization/bulk",
+                           {"projectId": self.admin.project_id, "operation": "delete_keys",
+                            "filters": {"category": CATEGORY}, "updates": {}}, expect=None)
+
+    def _client(self):
+        if not hasattr(self.clients, "client"):
+            self.clients.client = AdminClient(self.admin.base_url, self.admin.token, self.admin.project_id)
+            self.all_clients.append(self.clients.client)
+        return self.clients.client
+
+    def close(self):
+        for client in self.all_clients:
+            client.close()
+
+    def _import(self, job):
+        code, indices = job
+        payload = {key_name(k, KEY_PREFIX): translation_value(code, k, self.revisions[k], self.value_chars)
+                   for k in indices}
+        _, data = self._client().upload(
+            "/api/localization/import",
+            {"projectId": self.admin.project_id, "format": "json", "languageCode": code,
+             "options": json.dumps({"category": CATEGORY, "createMissingKeys": True, "updateExisting": True})},
+            {"file": ("translations.json", compact(payload))})
+        errors = (data or {}).get("stats", {}).get("errors") or []
+        if errors:
+            raise AdminError(f"import into {code}: {len(errors)} errors, e.g. {errors[0].get('message')}")
+        return len(indices)
+
+    def import_keys(self, codes, indices):
+        """Import the current values of keys `indices` into languages `codes`, in chunks and in parallel."""
+        jobs = [(code, indices[i:i + IMPORT_CHUNK]) for code in codes for i in range(0, len(indices), IMPORT_CHUNK)]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return sum(pool.map(self._import, jobs))
+
+    def ensure(self, languages, keys):
+        """Grow (or, for languages, shrink) the benchmark data to `languages` x `keys`."""
+        wanted = [language_code(i) for i in range(languages)]
+        for code in [c for c in self.languages if c not in wanted]:
+            self.admin.request("DELETE", "/api/localization/languages", query={"id": self.languages.pop(code)})
+        imported = 0
+        if keys > len(self.revisions):
+            new_keys = list(range(len(self.revisions), keys))
+            self.revisions.extend([0] * len(new_keys))
+            imported += self.import_keys(list(self.languages), new_keys)
+        added = [c for c in wanted if c not in self.languages]
+        for code in added:
+            base = code.split("-", 1)[0]
+            _, data = self.admin.request("POST", "/api/localization/languages",
+                                         {"projectId": self.admin.project_id, "code": code,
+                                          "name": language_name(BASE_LANGUAGES.index(base)),
+                                          "isRTL": base in RTL_LANGUAGES})
+            self.languages[code] = data["language"]["id"]
+            self.admin.created("/api/localization/languages", data["language"]["id"])
+        if added:
+            imported += self.import_keys(added, list(range(len(self.revisions))))
+        return imported
+
+    def edit(self, rng, churn, added):
+        """Change `churn` % of the translations (in every language) and add `added` % new keys."""
+        count = len(self.revisions)
+        changed = rng.sample(range(count), min(count, round(count * churn / 100)))
+        for k in changed:
+            self.revisions[k] += 1
+        new_keys = list(range(count, count + round(count * added / 100)))
+        self.revisions.extend([0] * len(new_keys))
+        return self.import_keys(list(self.languages), sorted(changed) + new_keys)
+
+    def publish(self, name):
+        _, data = self.admin.request("POST", "/api/builds",
+                                     {"projectId": self.admin.project_id, "featureType": "localization",
+                                      "name": name, "description": "Seeded by test-localization-ota.py"})
+        build = data["build"]
+        self.admin.created(f"/api/builds/{build['id']}")
+        self.admin.request("PATCH", f"/api/builds/{build['id']}/mode", {"mode": "production"})
+        self.builds.append((build["version"], array("I", self.revisions)))
+        return build["version"]
+
+    def revisions_at(self, version):
+        return next(revisions for v, revisions in self.builds if v == version)
+
+# -- measurement ------------------------------------------------------------------
+
+def changed_keys(project, version, latest):
+    """Keys whose value at `latest` differs from (or is missing at) `version`; None means all of them."""
+    if not version:
+        return None
+    old, new = project.revisions_at(version), project.revisions_at(latest)
+    return [k for k in range(len(new)) if k >= len(old) or old[k] != new[k]]
+
+class PayloadLedger:
+    """Per-device check results and payload accounting; called from worker threads."""
+
+    def __init__(self, project, devices, latest, changed, value_chars):
+        self.project, self.devices, self.latest = project, devices, latest
+        self.changed = changed
+        self.value_chars = value_chars
+        self.latest_revisions = project.revisions_at(latest)
+        self.lock = threading.Lock()
+        self.results = {}
+        self.gzip_bytes = {}
+
+    def __call__(self, planned, response):
+        device = self.devices[planned.index]
+        if not response.ok:
+            return
+        data = json.loads(response.body)
+        # Every size is measured on compact(), whatever spacing or escaping the server used
+        body = compact(data)
+        record = {"behind": device["behind"], "bytes": len(body), "wire_bytes": len(response.body),
+                  "update": bool(data.get("updateAvailable")), "wrong": None}
+        expected_update = device["version"] != self.latest
+        if record["update"] != expected_update:
+            record["wrong"] = f"updateAvailable {record['update']}, expected {expected_update}"
+        if record["update"]:
+            record.update(self._account(device, data))
+        with self.lock:
+            self.results[planned.index] = record
+            if record["update"] and device["behind"] not in self.gzip_bytes:
+                self.gzip_bytes[device["behind"]] = len(gzip.compress(body, 6))
+
+    def _account(self, device, data):
+        code = device["language"]
+        full = data.get("fullPayload") or {}
+        full_bytes = len(compact(full))
+        delta = data.get("delta") or {}
+        delta_keys = len(delta.get("added") or {}) + len(delta.get("updated") or {}) + len(delta.get("deleted") or [])
+        changed = self.changed[device["behind"]]
+        result = {"full_bytes": full_bytes, "full_keys": len(full), "delta_keys": delta_keys,
+                  "delta_bytes": len(compact(delta)) if delta else 0}
+        if changed is None:
+            result.update(expected_delta_keys=len(full), unchanged_bytes=0,
+                          ideal_bytes=len(compact({"added": full, "updated": {}, "deleted": []})))
+        else:
+            old_count = len(self.project.revisions_at(device["version"]))
+            added = {key_name(k, KEY_PREFIX): full.get(key_name(k, KEY_PREFIX)) for k in changed if k >= old_count}
+            updated = {key_name(k, KEY_PREFIX): full.get(key_name(k, KEY_PREFIX)) for k in changed if k < old_count}
+            changed_bytes = sum(len(compact(k)) + len(compact(v)) + 2 for k, v in (*added.items(), *updated.items()))
+            result.update(expected_delta_keys=len(changed), unchanged_bytes=max(full_bytes - changed_bytes, 0),
+                          ideal_bytes=len(compact({"added": added, "updated": updated, "deleted": []})))
+        expected_keys = len(self.latest_revisions)
+        if len(full) != expected_keys:
+            result["wrong"] = f"fullPayload has {len(full)} keys, expected {expected_keys}"
+        else:
+            for k in random.Random(device["id"]).sample(range(expected_keys), min(VALUE_SAMPLE, expected_keys)):
+                want = translation_value(code, k, self.latest_revisions[k], self.value_chars)
+                if full.get(key_name(k, KEY_PREFIX)) != want:
+                    result["wrong"] = f"{key_name(k, KEY_PREFIX)} is stale or wrong in {code}"
+                    break
+        return result
+
+def make_fleet(rng, count, codes, fleet, versions):
+    """`count` devices with a language and a last-known version (0 for a fresh install)."""
+    levels, weights = list(fleet), list(fleet.values())
+    devices = []
+    for i in range(count):
+        behind = rng.choices(levels, weights)[0]
+        version = 0 if behind is None else versions[-1 - behind]
+        devices.append({"id": f"ota-device-{i:06d}", "language": rng.choice(codes), "behind": behind,
+                        "version": version})
+    return devices
+
+def run_checks(plan, project_id, devices, ledger):
+    endpoint = CompiledEndpoint(
+        name="check", method="GET", weight=1, path=Template("/api/localization/ota/check", "check"), body=None,
+        query=lambda ctx: {"projectId": project_id, "currentVersion": str(devices[ctx.index]["version"]),
+                           "languageCode": devices[ctx.index]["language"]},
+        headers={})
+    check_plan = replace(plan, endpoints=[endpoint], _cumulative=[],
+                         load=replace(plan.load, requests=len(devices), duration_s=None))
+    return run_plan(check_plan, on_result=ledger).summary()
+
+def run_updates(plan, project_id, devices, latest):
+    statuses = defaultdict(int)
+    lock = threading.Lock()
+
+    def record(planned, response):
+        with lock:
+            statuses[response.status or response.error or "error"] += 1
+
+    endpoint = CompiledEndpoint(
+        name="update", method="POST", weight=1, path=Template("/api/localization/ota/update", "update"), query={},
+        headers={"Content-Type": "application/json"},
+        body=lambda ctx: {"projectId": project_id, "deviceId": devices[ctx.index]["id"],
+                          "fromVersion": devices[ctx.index]["version"], "toVersion": latest,
+                          "languageCode": devices[ctx.index]["language"]})
+    update_plan = replace(plan, endpoints=[endpoint], _cumulative=[],
+                          load=replace(plan.load, requests=len(devices), duration_s=None))
+    summary = run_plan(update_plan, on_result=record).summary()
+    summary["statuses"] = {str(k): v for k, v in statuses.items()}
+    return summary
+
+def summarize(ledger, devices):
+    """Payload accounting per fleet group, and for the whole fleet."""
+    groups = defaultdict(list)
+    for index, record in ledger.results.items():
+        groups[devices[index]["behind"]].append(record)
+    rows = {}
+    for behind, records in sorted(groups.items(), key=lambda item: (item[0] is None, item[0] or 0)):
+        updated = [r for r in records if r["update"]]
+        row = {"devices": len(records), "updates": len(updated), "wrong": sum(1 for r in records if r.get("wrong"))}
+        if updated:
+            mean = lambda field: statistics.mean(r[field] for r in updated)
+            row.update(bytes=mean("bytes"), wire_bytes=mean("wire_bytes"), full_bytes=mean("full_bytes"),
+                       ideal_bytes=mean("ideal_bytes"),
+                       unchanged_share=statistics.mean(r["unchanged_bytes"] / r["bytes"] for r in updated),
+                       delta_keys=mean("delta_keys"), expected_delta_keys=mean("expected_delta_keys"),
+                       gzip_bytes=ledger.gzip_bytes.get(behind))
+        rows[fleet_label(behind)] = row
+    return rows
+
+def human(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def print_point(point):
+    check, update = point["check"], point.get("update")
+    flag = "✅" if not point["wrong"] and not check["errors"] else "❌"
+    print(f"\n{flag} {point['languages']} languages x {point['keys']} keys (build v{point['latest']}, "
+          f"{point['versions']} versions published)")
+    print(f"   check   {check['count']:>6} calls  p50 {check['p50_ms']:7.1f}ms  p95 {check['p95_ms']:7.1f}ms  "
+          f"p99 {check['p99_ms']:7.1f}ms  {check['rps']:6.1f} req/s" + (f"  {check['errors']} errors" if check["errors"] else ""))
+    if update:
+        errors = ", ".join(f"{n}x {s}" for s, n in update["statuses"].items() if s != "200")
+        print(f"   update  {update['count']:>6} calls  p50 {update['p50_ms']:7.1f}ms  p95 {update['p95_ms']:7.1f}ms  "
+              f"p99 {update['p99_ms']:7.1f}ms  {update['rps']:6.1f} req/s" + (f"  errors: {errors}" if errors else ""))
+    print(f"   {'device':<11} {'count':>6} {'payload':>10} {'gzip':>10} {'unchanged':>10} {'ideal delta':>12} "
+          f"{'delta keys sent':>16}")
+    for label, row in point["fleet"].items():
+        if not row["updates"]:
+            print(f"   {label:<11} {row['devices']:>6} {'no update':>10}")
+            continue
+        gzip_size = human(row["gzip_bytes"]) if row.get("gzip_bytes") else "-"
+        print(f"   {label:<11} {row['devices']:>6} {human(row['bytes']):>10} {gzip_size:>10} "
+              f"{row['unchanged_share'] * 100:>9.1f}% {human(row['ideal_bytes']):>12} "
+              f"{row['delta_keys']:>7.0f} / {row['expected_delta_keys']:<7.0f}")
+    if point["wrong"]:
+        print(f"   ❌ {point['wrong']} answers were wrong, e.g. {point['wrong_example']}")
+
+def print_summary(points):
+    print("\n" + "=" * 78)
+    print("OTA COST")
+    print("=" * 78)
+    print(f"  {'languages':>9} {'keys':>8} {'check p50':>10} {'check p95':>10} {'MB/1k checks':>13} "
+          f"{'unchanged':>10} {'delta-only':>11}")
+    for p in points:
+        updated = [row for row in p["fleet"].values() if row["updates"]]
+        total = sum(row["bytes"] * row["updates"] for row in updated)
+        ideal = sum(row["ideal_bytes"] * row["updates"] for row in updated)
+        unchanged = sum(row["unchanged_share"] * row["bytes"] * row["updates"] for row in updated)
+        devices = sum(row["devices"] for row in p["fleet"].values())
+        print(f"  {p['languages']:>9} {p['keys']:>8} {p['check']['p50_ms']:>8.1f}ms {p['check']['p95_ms']:>8.1f}ms "
+              f"{total / max(devices, 1) * 1000 / 1e6:>13.1f} "
+              f"{unchanged / total * 100 if total else 0:>9.1f}% {ideal / total * 100 if total else 0:>10.1f}%")
+    print("  (MB/1k checks: bytes sent per 1000 device checks with this fleet; unchanged: share of those bytes the\n"
+          "   devices already had; delta-only: what sending only the changed keys would cost, as a share)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Localization OTA check/update benchmark")
+    parser.add_argument("--languages", default="10,50", help=f"languages to sweep, up to {MAX_LANGUAGES} (default: 10,50)")
+    parser.add_argument("--keys", default="1000,10000", help="keys to sweep (default: 1000,10000)")
+    parser.add_argument("--devices", type=int, default=500, help="devices per point (default: 500)")
+    parser.add_argument("--fleet", default="0:20,1:30,2:20,3:15,fresh:15",
+                        help="versions behind (or 'fresh') : weight (default: 0:20,1:30,2:20,3:15,fresh:15)")
+    parser.add_argument("--churn", type=float, default=5, help="%% of translations edited per version (default: 5)")
+    parser.add_argument("--added", type=float, default=1, help="%% of keys added per version (default: 1)")
+    parser.add_argument("--value-chars", type=int, default=40, help="characters per translation (default: 40)")
+    parser.add_argument("--concurrency", type=int, default=None, help="override load.concurrency")
+    parser.add_argument("--rps", type=float, default=None, help="open-loop request rate (default: closed loop)")
+    parser.add_argument("--seed-workers", type=int, default=4, help="parallel import requests (default: 4)")
+    parser.add_argument("--allow-publish", action="store_true",
+                        help="confirm that --project-id is a dedicated project whose production build may change")
+    parser.add_argument("--standin", action="store_true", help="run against a local stand-in server")
+    parser.add_argument("--seed", type=int, default=None, help="override the scenario seed")
+    parser.add_argument("--json", default=None, metavar="FILE", help="also write the results as JSON")
+    add_scenario_arguments(parser, DEFAULT_SCENARIO)
+    add_admin_arguments(parser)
+    args = parser.parse_args()
+    args.languages = parse_sizes(args.languages, "languages", parser, MAX_LANGUAGES)
+    args.keys = parse_sizes(args.keys, "keys", parser)
+    fleet = parse_fleet(args.fleet, parser)
+    if not args.standin and not args.allow_publish:
+        parser.error("this benchmark publishes production localization builds in --project-id; "
+                     "pass --allow-publish for a dedicated benchmark project (or use --standin)")
+
+    if args.standin and args.target is None:
+        args.target = "standin"
+    scenario, _, _ = probe_config(args, parser)
+    try:
+        plan = scenario.compile(args.target, seed=args.seed, concurrency=args.concurrency, rps=args.rps)
+    except ScenarioError as e:
+        parser.error(str(e))
+    standin = StandInServer(routes=standin_routes(), delays_ms=STANDIN_DELAYS_MS).start() if args.standin else None
+    if standin:
+        plan.base_url = standin.base_url
+    versions_per_point = max((b for b in fleet if b is not None), default=0) + 1
+
+    print("=" * 78)
+    print("Localization OTA benchmark")
+    print(f"Target: {plan.target} ({plan.base_url})   Seed: {plan.seed}   Workers: {plan.load.concurrency}")
+    print(f"Sweep: languages {args.languages} x keys {args.keys}; {args.devices} devices per point, "
+          f"fleet " + ", ".join(f"{fleet_label(b)} {w:g}" for b, w in fleet.items()))
+    print(f"Each point publishes {versions_per_point} builds, editing {args.churn:g}% and adding {args.added:g}% "
+          f"of keys between them")
+    print("=" * 78)
+
+    results = {"target": plan.target, "seed": plan.seed, "fleet": {fleet_label(b): w for b, w in fleet.items()},
+               "churn": args.churn, "added": args.added, "points": []}
+    admin = admin_client(args, parser, plan.base_url, standin=bool(standin))
+    project = OtaProject(admin, args.seed_workers, args.value_chars)
+    rng = random.Random(plan.seed)
+    try:
+        project.remove_leftovers()
+        for keys in args.keys:
+            for languages in args.languages:
+                started = time.perf_counter()
+                imported = project.ensure(languages, keys)
+                versions = []
+                for v in range(versions_per_point):
+                    if v:
+                        imported += project.edit(rng, args.churn, args.added)
+                    versions.append(project.publish(f"OTA benchmark {languages}x{keys} #{v + 1}"))
+                print(f"\n   (seeded {imported} translations and published {len(versions)} builds in "
+                      f"{time.perf_counter() - started:.0f}s)")
+                latest = versions[-1]
+                devices = make_fleet(rng, args.devices, list(project.languages), fleet, versions)
+                changed = {b: changed_keys(project, 0 if b is None else versions[-1 - b], latest) for b in fleet}
+                ledger = PayloadLedger(project, devices, latest, changed, args.value_chars)
+                point = {"languages": languages, "keys": len(project.revisions), "latest": latest,
+                         "versions": len(versions), "check": run_checks(plan, admin.project_id, devices, ledger)}
+                to_update = [devices[i] for i, r in sorted(ledger.results.items()) if r["update"]]
+                if to_update:
+                    point["update"] = run_updates(plan, admin.project_id, to_update, latest)
+                point["fleet"] = summarize(ledger, devices)
+                wrong = [r["wrong"] for r in ledger.results.values() if r.get("wrong")]
+                point["wrong"], point["wrong_example"] = len(wrong), wrong[0] if wrong else None
+                results["points"].append(point)
+                print_point(point)
+        print_summary(results["points"])
+    except AdminError as e:
+        print(f"\n❌ Seeding failed: {e}")
+        sys.exit(2)
+    finally:
+        project.close()
+        if args.keep:
+            print("\nSeeded languages, keys and builds kept (--keep)")
+        else:
+            project.delete_keys()
+            if admin.cleanup() > (1 if project.builds else 0):
+                print("\n⚠️  Some seeded records could not be deleted")
+            elif project.builds:
+                print(f"\nSeeded data deleted; build v{project.builds[-1][0]} stays the active production build")
+        admin.close()
+        if standin:
+            standin.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    failed = any(p["wrong"] or p["check"]["errors"] for p in results["points"])
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
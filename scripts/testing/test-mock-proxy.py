@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Mock proxy throughput and condition-matching scaling benchmark.
+
+POST /api/mocks/proxy loads every enabled endpoint of the environment (with
+responses and conditions) and matches them one by one on every proxied SDK
+call, so its cost grows with the mock table. This probe seeds a mock
+environment per --conditions value, grows it through the --endpoints sizes,
+and at each size drives the proxy with a mix of:
+- match:   a mocked path whose conditional response's conditions all hold
+- default: a mocked path where only the last condition fails (default response)
+- miss:    an unmocked path, which is checked against every endpoint
+
+Each seeded endpoint is GET /bench/r<i>/items/:id with a conditional 200
+response (--conditions conditions rotating through query, header, JSON body,
+greater_than and regex conditions) and a default 202 response. Paths are
+drawn uniformly, so a hit scans half the table on average.
+
+It reports p50/p95/p99 per request kind and the throughput at every size,
+the latency added per 100 endpoints, and checks every answer (the right
+endpoint and response). For each size it also times harness/mocks.py, a
+reference port of the matching loop in src/lib/mock.ts, on the same table.
+That shows how much of the growth is the matching itself and how much is
+loading the table.
+
+Usage:
+    python3 test-mock-proxy.py --standin                          # no server needed
+    python3 test-mock-proxy.py --target local --endpoints 10,100,500 --conditions 0,4,16
+    python3 test-mock-proxy.py --rps 500 --requests 5000 --mix 80,10,10
+    python3 test-mock-proxy.py --json results.json
+
+Seeding needs a dashboard token and project (--admin-token/--project-id or
+NIVOSTACK_ADMIN_TOKEN/NIVOSTACK_PROJECT_ID) and a plan whose mock-endpoint
+limit covers the largest --endpoints value. The project's API key comes from
+the scenario target (scenarios/mock-proxy.json). Each seeded environment is
+deleted afterwards (with its endpoints) unless --keep is given.
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from harness.admin import AdminClient, AdminError, add_admin_arguments, admin_client
+from harness.mocks import REQUEST_KINDS, make_mock_table, match_mock, proxy_request, select_endpoints
+from harness.runner import run_plan
+from harness.scenario import CompiledEndpoint, ScenarioError, Template, add_scenario_arguments, probe_config
+from harness.standin import StandInServer, json_response
+
+DEFAULT_SCENARIO = "mock-proxy.json"
+EXPECTED_STATUS = {"match": 200, "default": 202}
+OFFLINE_REQUESTS = 300
+_ENDPOINT_INDEX = re.compile(r"^/bench/r(\d+)/")
+
+def parse_sizes(text, name, parser, minimum=1):
+    try:
+        sizes = sorted({int(v) for v in text.split(",") if v.strip()})
+    except ValueError:
+        parser.error(f"--{name} takes comma-separated integers, got '{text}'")
+    if not sizes or sizes[0] < minimum:
+        parser.error(f"--{name} values must be at least {minimum}")
+    return sizes
+
+# -- stand-in -------------------------------------------------------------------
+
+def standin_routes():
+    """Mock-management routes and the proxy, matching with harness/mocks.py.
+
+    Like the real route, the proxy re-reads the environment's endpoints on
+    every call (select_endpoints() stands in for the findMany).
+    """
+    environments, endpoints, responses = {}, {}, {}
+    lock = threading.Lock()
+    counter = iter(range(1, 1 << 62))
+
+    def new_id(kind):
+        with lock:
+            return f"standin-{kind}-{next(counter)}"
+
+    def create_environment(request):
+        body = request.json()
+        environment = {"id": new_id("environment"), "name": body["name"], "mode": body.get("mode", "selective"),
+                       "whitelist": body.get("whitelist") or [], "blacklist": body.get("blacklist") or [],
+                       "endpoints": []}
+        environments[environment["id"]] = environment
+        return json_response({"environment": {k: v for k, v in environment.items() if k != "endpoints"}})
+
+    def environment(request):
+        if request.method != "DELETE":
+            return json_response({"error": "Method not allowed"}, 405)
+        removed = environments.pop(request.path.rsplit("/", 1)[-1], None)
+        if removed is None:
+            return json_response({"error": "Environment not found"}, 404)
+        return json_response({"success": True})
+
+    def create_endpoint(request):
+        body = request.json()
+        record = {"id": new_id("endpoint"), "path": body["path"], "method": body["method"].upper(),
+                  "order": body.get("order") or 0, "conditions": [], "responses": []}
+        with lock:
+            endpoints[record["id"]] = record
+            environments[body["environmentId"]]["endpoints"].append(record)
+        return json_response({"endpoint": record})
+
+    def create_response(request):
+        body = request.json()
+        record = {"id": new_id("response"), "statusCode": body["statusCode"], "order": body.get("order") or 0,
+                  "isDefault": body.get("isDefault", False), "responseBody": body.get("responseBody"),
+                  "responseHeaders": body.get("responseHeaders"), "delay": body.get("delay") or 0, "conditions": []}
+        with lock:
+            responses[record["id"]] = record
+            endpoints[body["endpointId"]]["responses"].append(record)
+        return json_response({"response": record})
+
+    def create_condition(request):
+        body = request.json()
+        owner = responses.get(body.get("responseId")) or endpoints[body["endpointId"]]
+        with lock:
+            owner["conditions"].append({k: body.get(k) for k in ("type", "key", "operator", "value", "order")})
+        return json_response({"condition": {"id": new_id("condition"), **body}})
+
+    def proxy(request):
+        if not request.headers.get("x-api-key"):
+            return json_response({"error": "API key required"}, 401)
+        body = request.json()
+        current = environments.get(body.get("environmentId"))
+        if current is None:
+            return json_response({"mockFound": False})
+        result = match_mock(current, select_endpoints(current["endpoints"], body["method"]), body["path"],
+                            body["method"], body.get("query") or {}, body.get("headers") or {}, body.get("body"))
+        if not result["mockFound"]:
+            return json_response({"mockFound": False,
+                                  "message": f"No mock endpoint found for {body['method']} {body['path']}"})
+        return json_response({**result, "matched": True})
+
+    return {"/api/mocks/environments": create_environment, "/api/mocks/environments/": environment,
+            "/api/mocks/endpoints": create_endpoint, "/api/mocks/responses": create_response,
+            "/api/mocks/conditions": create_condition, "/api/mocks/proxy": proxy}
+
+STANDIN_DELAYS_MS = {"/api/mocks/proxy": 2}
+
+# -- seeding ----------------------------------------------------------------------
+
+def create_environment(admin, conditions):
+    name = f"bench-mock-c{conditions}-{int(time.time())}"
+    _, data = admin.request("POST", "/api/mocks/environments",
+                            {"projectId": admin.project_id, "name": name, "mode": "selective",
+                             "description": "Seeded by test-mock-proxy.py"})
+    environment_id = data["environment"]["id"]
+    admin.created(f"/api/mocks/environments/{environment_id}")
+    return environment_id
+
+def seed_endpoint(admin, environment_id, index, template):
+    """Create one endpoint of make_mock_table() output with its responses and conditions; returns its id."""
+    _, data = admin.request("POST", "/api/mocks/endpoints",
+                            {"environmentId": environment_id, "path": template["path"], "method": "GET",
+                             "order": index})
+    endpoint_id = data["endpoint"]["id"]
+    for response in template["responses"]:
+        _, data = admin.request("POST", "/api/mocks/responses",
+                                {"endpointId": endpoint_id, "statusCode": response["statusCode"],
+                                 "name": response["id"], "responseBody": response["responseBody"],
+                                 "isDefault": response["isDefault"], "order": response["order"]})
+        for condition in response["conditions"]:
+            admin.request("POST", "/api/mocks/conditions", {"responseId": data["response"]["id"], **condition})
+    return endpoint_id
+
+def grow_table(admin, environment_id, endpoint_ids, size, conditions, body_bytes, workers):
+    """Seed endpoints len(endpoint_ids) .. size-1 in parallel, one dashboard client per thread."""
+    start = len(endpoint_ids)
+    templates = make_mock_table(size, conditions, body_bytes)[start:]
+    local = threading.local()
+    clients = []
+
+    def seed(offset):
+        if not hasattr(local, "client"):
+            local.client = AdminClient(admin.base_url, admin.token, admin.project_id)
+            clients.append(local.client)
+        return seed_endpoint(local.client, environment_id, start + offset, templates[offset])
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            endpoint_ids.extend(pool.map(seed, range(len(templates))))
+    finally:
+        for client in clients:
+            client.close()
+
+# -- measurement ------------------------------------------------------------------
+
+class Checker:
+    """Checks each proxy answer against the endpoint and response it should hit."""
+
+    def __init__(self, endpoint_ids, conditions):
+        self.endpoint_ids = endpoint_ids
+        # Without conditions the conditional response always matches, so "default" requests get it too
+        self.expected_status = dict(EXPECTED_STATUS, default=202 if conditions else 200)
+        self.lock = threading.Lock()
+        self.checked = self.wrong = 0
+        self.example = None
+
+    def __call__(self, planned, response):
+        if not response.ok:
+            return
+        sent = json.loads(planned.body)
+        match = _ENDPOINT_INDEX.match(sent["path"])
+        try:
+            answer = json.loads(response.body)
+        except ValueError:
+            answer = {}
+        if planned.endpoint == "miss":
+            right = answer.get("mockFound") is False
+        else:
+            right = (answer.get("mockFound") is True
+                     and answer.get("statusCode") == self.expected_status[planned.endpoint]
+                     and answer.get("endpointId") == self.endpoint_ids[int(match.group(1))])
+        with self.lock:
+            self.checked += 1
+            if not right:
+                self.wrong += 1
+                if self.example is None:
+                    self.example = (planned.endpoint, sent["path"], answer)
+
+def proxy_endpoints(environment_id, size, conditions, mix):
+    def body_for(kind):
+        def body(ctx):
+            return {"environmentId": environment_id, **proxy_request(kind, ctx.rng.randrange(size), conditions,
+                                                                     n=ctx.index)}
+        return body
+
+    return [CompiledEndpoint(name=kind, method="POST", weight=weight, path=Template("/api/mocks/proxy", kind),
+                             query={}, headers={"Content-Type": "application/json"}, body=body_for(kind))
+            for kind, weight in zip(REQUEST_KINDS, mix) if weight > 0]
+
+def time_reference(size, conditions, body_bytes, mix, seed):
+    """Mean microseconds per proxied call for the reference matching loop alone."""
+    candidates = select_endpoints(make_mock_table(size, conditions, body_bytes), "GET")
+    rng = random.Random(seed)
+    kinds = rng.choices([k for k, w in zip(REQUEST_KINDS, mix) if w > 0], [w for w in mix if w > 0],
+                        k=OFFLINE_REQUESTS)
+    requests = [proxy_request(kind, rng.randrange(size), conditions, n=i) for i, kind in enumerate(kinds)]
+    environment = {"mode": "selective"}
+    started = time.perf_counter()
+    for request in requests:
+        match_mock(environment, candidates, **request)
+    return (time.perf_counter() - started) / len(requests) * 1e6
+
+def run_point(plan, environment_id, endpoint_ids, size, conditions, args):
+    point_plan = replace(plan, endpoints=proxy_endpoints(environment_id, size, conditions, args.mix), _cumulative=[])
+    checker = Checker(endpoint_ids, conditions)
+    result = run_plan(point_plan, on_result=checker)
+    point = {"endpoints": size, "conditions": conditions, "rps": result.summary()["rps"],
+             "errors": result.summary()["errors"], "checked": checker.checked, "wrong": checker.wrong,
+             "reference_us": time_reference(size, conditions, args.body_bytes, args.mix, plan.seed),
+             "kinds": {kind: result.summary(kind) for kind in REQUEST_KINDS if result.summary(kind)["count"]}}
+    flag = "✅" if not point["wrong"] and not point["errors"] else "❌"
+    latencies = "  ".join(f"{kind} {s['p50_ms']:.1f}/{s['p95_ms']:.1f}/{s['p99_ms']:.1f}"
+                          for kind, s in point["kinds"].items())
+    print(f"{flag} {size:>6} endpoints x {conditions:>2} conditions  {point['rps']:7.1f} req/s  "
+          f"p50/p95/p99 ms: {latencies}  reference {point['reference_us']:.0f}us"
+          + (f"  {point['errors']} errors" if point["errors"] else "")
+          + (f"  {point['wrong']}/{point['checked']} wrong answers" if point["wrong"] else ""))
+    if checker.example:
+        kind, path, answer = checker.example
+        print(f"     e.g. {kind} {path}: {json.dumps(answer)[:160]}")
+    return point
+
+def print_curves(points, args):
+    print("\n" + "=" * 78)
+    print("SCALING (p50 ms by table size)")
+    print("=" * 78)
+    kinds = [kind for kind, weight in zip(REQUEST_KINDS, args.mix) if weight > 0]
+    print(f"  {'conditions':>10} {'endpoints':>10} " + " ".join(f"{kind:>9}" for kind in kinds)
+          + f" {'req/s':>9} {'reference':>10}")
+    for conditions in args.conditions:
+        rows = [p for p in points if p["conditions"] == conditions]
+        for p in rows:
+            print(f"  {conditions:>10} {p['endpoints']:>10} "
+                  + " ".join(f"{p['kinds'].get(kind, {}).get('p50_ms', 0):>7.1f}ms" for kind in kinds)
+                  + f" {p['rps']:>9.1f} {p['reference_us'] / 1000:>8.2f}ms")
+        if len(rows) > 1:
+            low, high = rows[0], rows[-1]
+            per_100 = lambda metric: (metric(high) - metric(low)) / (high["endpoints"] - low["endpoints"]) * 100
+            median_p50 = lambda p: statistics.median(s["p50_ms"] for s in p["kinds"].values())
+            print(f"  {'':>10} {'':>10} +{per_100(median_p50):.2f}ms p50 per 100 endpoints "
+                  f"(reference matching: +{per_100(lambda p: p['reference_us'] / 1000):.3f}ms)")
+    wrong = sum(p["wrong"] for p in points)
+    if wrong:
+        print(f"\n❌ {wrong} of {sum(p['checked'] for p in points)} proxy answers hit the wrong endpoint or response")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock proxy throughput and condition-matching scaling benchmark")
+    parser.add_argument("--endpoints", default="10,100,500", help="mock endpoints to sweep (default: 10,100,500)")
+    parser.add_argument("--conditions", default="0,4,16",
+                        help="conditions per conditional response to sweep (default: 0,4,16)")
+    parser.add_argument("--mix", default="60,20,20", help="match,default,miss request weights (default: 60,20,20)")
+    parser.add_argument("--body-bytes", type=int, default=256, help="mock response body size (default: 256)")
+    parser.add_argument("--requests", type=int, default=None, help="requests per point (default: the scenario's)")
+    parser.add_argument("--concurrency", type=int, default=None, help="override load.concurrency")
+    parser.add_argument("--rps", type=float, default=None, help="open-loop request rate (default: closed loop)")
+    parser.add_argument("--seed-workers", type=int, default=8, help="parallel seeding requests (default: 8)")
+    parser.add_argument("--standin", action="store_true", help="run against a local stand-in server")
+    parser.add_argument("--seed", type=int, default=None, help="override the scenario seed")
+    parser.add_argument("--json", default=None, metavar="FILE", help="also write the results as JSON")
+    add_scenario_arguments(parser, DEFAULT_SCENARIO)
+    add_admin_arguments(parser)
+    args = parser.parse_args()
+    args.endpoints = parse_sizes(args.endpoints, "endpoints", parser)
+    args.conditions = parse_sizes(args.conditions, "conditions", parser, minimum=0)
+    try:
+        args.mix = [float(v) for v in args.mix.split(",")]
+    except ValueError:
+        parser.error(f"--mix takes three comma-separated weights, got '{args.mix}'")
+    if len(args.mix) != len(REQUEST_KINDS) or min(args.mix) < 0 or not sum(args.mix):
+        parser.error("--mix takes three non-negative weights (match,default,miss)")
+
+    if args.standin and args.target is None:
+        args.target = "standin"
+    scenario, _, _ = probe_config(args, parser)
+    try:
+        plan = scenario.compile(args.target, seed=args.seed, requests=args.requests, concurrency=args.concurrency,
+                                rps=args.rps)
+    except ScenarioError as e:
+        parser.error(str(e))
+    standin = StandInServer(routes=standin_routes(), delays_ms=STANDIN_DELAYS_MS).start() if args.standin else None
+    if standin:
+        plan.base_url = standin.base_url
+
+    print("=" * 78)
+    print("Mock proxy benchmark")
+    print(f"Target: {plan.target} ({plan.base_url})   Seed: {plan.seed}   Workers: {plan.load.concurrency}"
+          + (f"   Rate: {plan.load.rps:g} req/s" if plan.load.rps else ""))
+    print(f"Sweep: endpoints {args.endpoints} x conditions {args.conditions}, mix match/default/miss "
+          f"{'/'.join(f'{w:g}' for w in args.mix)}, "
+          + (f"{plan.load.requests} requests per point" if plan.load.requests else f"{plan.load.duration_s:g}s per point"))
+    print("=" * 78 + "\n")
+
+    results = {"target": plan.target, "seed": plan.seed, "mix": args.mix, "body_bytes": args.body_bytes, "points": []}
+    admin = admin_client(args, parser, plan.base_url, standin=bool(standin))
+    try:
+        for conditions in args.conditions:
+            environment_id = create_environment(admin, conditions)
+            endpoint_ids = []
+            for size in args.endpoints:
+                started = time.perf_counter()
+                grow_table(admin, environment_id, endpoint_ids, size, conditions, args.body_bytes, args.seed_workers)
+                seeded = time.perf_counter() - started
+                if seeded > 5:
+                    print(f"   (seeded up to {size} endpoints in {seeded:.0f}s)")
+                results["points"].append(run_point(plan, environment_id, endpoint_ids, size, conditions, args))
+        print_curves(results["points"], args)
+    except AdminError as e:
+        print(f"\n❌ Seeding failed: {e}")
+        sys.exit(2)
+    finally:
+        if args.keep:
+            print("\nSeeded environments kept (--keep)")
+        elif admin.cleanup():
+            print("\n⚠️  Some seeded environments could not be deleted")
+        admin.close()
+        if standin:
+            standin.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    sys.exit(1 if any(p["wrong"] or p["errors"] for p in results["points"]) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,145 +1,246 @@
 #!/usr/bin/env python3
 """
 Compare performance: New /api/sdk-init vs Old 3-endpoint approach
+
+Every SDK-init strategy (harness/strategies.py) is run against every
+selected protocol and network:
+- combined:       one /api/sdk-init request
+- sequential:     the 3 legacy endpoints one after another (original SDKs)
+- parallel:       the 3 legacy endpoints at once - 3 connections on HTTP/1.1,
+                  3 multiplexed streams on one connection on HTTP/2
+- critical-first: feature flags + SDK settings at once, business config
+                  deferred until the SDK is usable
+
+Each run starts from a fresh transport (no warm connections), like an app
+launch, and reports time-to-usable (critical configs ready), time-to-complete,
+connection count and wire bytes, plus a request waterfall of the median run.
+
+Usage:
+    python3 test-sdk-init.py                     # HTTP/1.1, unshaped network
+    python3 test-sdk-init.py --network 3g,lte    # emulated mobile networks
+    python3 test-sdk-init.py --network all --seed 7
+    python3 test-sdk-init.py --protocols h1,h2 --standin --network 3g
+    python3 test-sdk-init.py --strategies sequential,critical-first
+
+Target URL, credentials and run count come from the scenario file
+(scenarios/sdk-init.json by default; see --scenario/--target). HTTP/2 needs
+the h2 package (pip install h2). --standin runs against a local HTTP/1.1 +
+h2c stand-in instead of the scenario target.
 """
 
-import urllib.request
-import urllib.error
-import time
+import argparse
+import sys
 import json
 import statistics
 import ssl
-
-BASE_URL = "https://devbridge-eta.vercel.app"
-API_KEY = "cmjc3tpnl000413oaw117o3fy"
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from harness.netem import PRESETS, get_profile, shaped_network
+from harness.scenario import add_scenario_arguments, probe_config
+from harness.standin import StandInServer
+from harness.strategies import STRATEGIES, format_waterfall
+from harness.transport import PROTOCOLS, make_transport
+
+# Configuration (set from the scenario file in main())
+BASE_URL = None
+HEADERS = {}
 NUM_REQUESTS = 10
 
 ssl_context = ssl.create_default_context()
 
-def make_request(endpoint, headers=None):
-    """Make a single request and return timing info"""
-    url = f"{BASE_URL}{endpoint}"
-    req = urllib.request.Request(url, headers=headers or {})
-
-    start_time = time.time()
+def describe_sdk_init(body):
+    """Show the combined response structure (first run only)."""
     try:
-        with urllib.request.urlopen(req, timeout=30, context=ssl_context) as response:
-            body = response.read().decode('utf-8')
-            status_code = response.status
-            cache_status = response.headers.get('x-vercel-cache', 'N/A')
-    except urllib.error.HTTPError as e:
-        body = e.read().decode('utf-8') if e.fp else ""
-        status_code = e.code
-        cache_status = 'ERROR'
-    except Exception as e:
-        return None, 0, str(e), 'ERROR'
-
-    elapsed_ms = (time.time() - start_time) * 1000
-    return status_code, elapsed_ms, body, cache_status
-
-def test_old_approach():
-    """Test the old 3-endpoint sequential approach"""
-    print("\n" + "=" * 60)
-    print("OLD APPROACH: 3 Sequential Requests")
-    print("=" * 60)
-
-    headers = {"X-API-Key": API_KEY}
-    endpoints = [
-        "/api/feature-flags",
-        "/api/sdk-settings",
-        "/api/business-config"
-    ]
-
-    all_total_times = []
-
-    for i in range(NUM_REQUESTS):
-        total_time = 0
-        for endpoint in endpoints:
-            status, elapsed, _, _ = make_request(endpoint, headers)
-            if status:
-                total_time += elapsed
-        all_total_times.append(total_time)
-        print(f"  Run {i+1:2d}: {total_time:,.0f}ms total (3 requests)")
-
-    print(f"\n  Results ({len(all_total_times)} runs):")
-    print(f"  ├─ Min:    {min(all_total_times):,.0f}ms")
-    print(f"  ├─ Max:    {max(all_total_times):,.0f}ms")
-    print(f"  ├─ Mean:   {statistics.mean(all_total_times):,.0f}ms")
-    print(f"  └─ Median: {statistics.median(all_total_times):,.0f}ms")
-
-    return statistics.mean(all_total_times)
-
-def test_new_approach():
-    """Test the new combined endpoint approach"""
+        data = json.loads(body)
+    except ValueError:
+        return
+    print(f"\n  Response structure:")
+    print(f"  ├─ featureFlags: {len(data.get('featureFlags', {}))} flags")
+    print(f"  ├─ sdkSettings.settings: {len(data.get('sdkSettings', {}).get('settings', {}))} settings")
+    print(f"  ├─ sdkSettings.apiConfigs: {len(data.get('sdkSettings', {}).get('apiConfigs', []))} configs")
+    print(f"  ├─ businessConfig.configs: {len(data.get('businessConfig', {}).get('configs', {}))} configs")
+    print(f"  └─ Response size: {len(body):,} bytes\n")
+
+def run_strategy(base_url, protocol, strategy):
+    """Run one strategy NUM_REQUESTS times and return a summary dict."""
+    init = STRATEGIES[strategy]
     print("\n" + "=" * 60)
-    print("NEW APPROACH: Single /api/sdk-init Request")
+    print(f"{strategy.upper()} over {protocol}: {init.description}")
     print("=" * 60)
 
-    headers = {"X-API-Key": API_KEY}
+    headers = HEADERS
+    runs = []
     timings = []
+    usable = []
+    connections = []
+    bytes_out = []
+    bytes_in = []
     cache_hits = 0
 
     for i in range(NUM_REQUESTS):
-        status, elapsed, body, cache_status = make_request("/api/sdk-init", headers)
-        if status:
-            timings.append(elapsed)
-            if cache_status == 'HIT':
-                cache_hits += 1
-            print(f"  Run {i+1:2d}: {elapsed:,.0f}ms (HTTP {status}, Cache: {cache_status})")
-
-            # Show response structure on first request
-            if i == 0:
-                try:
-                    data = json.loads(body)
-                    print(f"\n  Response structure:")
-                    print(f"  ├─ featureFlags: {len(data.get('featureFlags', {}))} flags")
-                    print(f"  ├─ sdkSettings.settings: {len(data.get('sdkSettings', {}).get('settings', {}))} settings")
-                    print(f"  ├─ sdkSettings.apiConfigs: {len(data.get('sdkSettings', {}).get('apiConfigs', []))} configs")
-                    print(f"  ├─ businessConfig.configs: {len(data.get('businessConfig', {}).get('configs', {}))} configs")
-                    print(f"  └─ Response size: {len(body):,} bytes\n")
-                except:
-                    pass
-
-    if timings:
-        print(f"\n  Results ({len(timings)} requests):")
-        print(f"  ├─ Min:        {min(timings):,.0f}ms")
-        print(f"  ├─ Max:        {max(timings):,.0f}ms")
-        print(f"  ├─ Mean:       {statistics.mean(timings):,.0f}ms")
-        print(f"  ├─ Median:     {statistics.median(timings):,.0f}ms")
-        print(f"  └─ Cache Hits: {cache_hits}/{len(timings)} ({cache_hits/len(timings)*100:.0f}%)")
-
-    return statistics.mean(timings) if timings else 0
+        try:
+            transport = make_transport(protocol, base_url, ssl_context=ssl_context)
+        except RuntimeError as e:
+            print(f"  ❌ {e}")
+            return None
+        with transport:
+            result = init.run(transport, headers)
+            conns, sent, received = transport.stats
+
+        responses = [response for _, response in result.requests]
+        failed = [r for r in responses if not r.ok]
+        if failed:
+            print(f"  Run {i+1:2d}: FAILED - {failed[0].path}: {failed[0].error or f'HTTP {failed[0].status}'}")
+            continue
+
+        runs.append(result)
+        timings.append(result.time_to_complete_ms)
+        usable.append(result.time_to_usable_ms)
+        connections.append(conns)
+        bytes_out.append(sent)
+        bytes_in.append(received)
+        cache_status = responses[0].headers.get('x-vercel-cache', 'N/A')
+        if cache_status == 'HIT':
+            cache_hits += 1
+        print(f"  Run {i+1:2d}: usable {result.time_to_usable_ms:,.0f}ms, complete {result.time_to_complete_ms:,.0f}ms "
+              f"({len(responses)} requests, {conns} connection(s), {received:,} bytes in, Cache: {cache_status})")
+        if i == 0 and strategy == "combined":
+            describe_sdk_init(responses[0].body)
+
+    if not timings:
+        return None
+
+    summary = {
+        "usable": statistics.mean(usable),
+        "mean": statistics.mean(timings),
+        "median": statistics.median(timings),
+        "p95": sorted(timings)[int(len(timings) * 0.95)],
+        "connections": statistics.mean(connections),
+        "bytes_out": statistics.mean(bytes_out),
+        "bytes_in": statistics.mean(bytes_in),
+    }
+    print(f"\n  Results ({len(timings)} runs):")
+    print(f"  ├─ Usable:      {summary['usable']:,.0f}ms mean (critical configs ready)")
+    print(f"  ├─ Min:         {min(timings):,.0f}ms")
+    print(f"  ├─ Max:         {max(timings):,.0f}ms")
+    print(f"  ├─ Mean:        {summary['mean']:,.0f}ms")
+    print(f"  ├─ Median:      {summary['median']:,.0f}ms")
+    print(f"  ├─ Connections: {summary['connections']:.1f} per run")
+    print(f"  ├─ Bytes:       {summary['bytes_out']:,.0f} out / {summary['bytes_in']:,.0f} in per run")
+    print(f"  └─ Cache Hits:  {cache_hits}/{len(timings)} ({cache_hits/len(timings)*100:.0f}%)")
+
+    median_run = sorted(runs, key=lambda r: r.time_to_complete_ms)[len(runs) // 2]
+    print(f"\n  Waterfall (median run):")
+    for line in format_waterfall(median_run):
+        print(f"    {line}")
+    return summary
+
+def compare(base_url, profile_name, protocols, strategies, seed):
+    """Run every protocol/strategy pair under one network profile."""
+    profile = get_profile(profile_name)
+    print("\n" + "#" * 60)
+    print(f"Network: {profile.describe()}")
+    print("#" * 60)
+
+    results = {}
+    with shaped_network(profile, seed=seed) as stats:
+        for protocol in protocols:
+            for strategy in strategies:
+                results[(protocol, strategy)] = run_strategy(base_url, protocol, strategy)
+
+    if not profile.is_passthrough:
+        print(f"\n  Link: {stats.connections} connections, "
+              f"{stats.bytes_up:,} bytes up, {stats.bytes_down:,} bytes down, "
+              f"{stats.stalls} loss stalls")
+    return results
+
+def print_verdict(old_mean, new_mean):
+    if old_mean > 0 and new_mean > 0:
+        improvement = ((old_mean - new_mean) / old_mean) * 100
+        speedup = old_mean / new_mean
+        print(f"\n  Improvement: {improvement:.1f}% faster")
+        print(f"  Speedup:     {speedup:.1f}x faster")
+
+        if improvement > 50:
+            print(f"\n  ✅ EXCELLENT: Significant performance improvement!")
+        elif improvement > 25:
+            print(f"\n  ✅ GOOD: Notable performance improvement.")
+        else:
+            print(f"\n  ⚠️  Improvement less than expected. Check caching.")
+
+def parse_list(value, choices, parser, option):
+    names = list(choices) if value == "all" else [n.strip().lower() for n in value.split(",") if n.strip()]
+    unknown = [n for n in names if n not in choices]
+    if unknown:
+        parser.error(f"{option}: unknown value(s) {', '.join(unknown)} (choose from: {', '.join(choices)})")
+    return names
 
 def main():
+    global BASE_URL, HEADERS, NUM_REQUESTS
+
+    parser = argparse.ArgumentParser(description="Compare /api/sdk-init against the 3 legacy endpoints")
+    parser.add_argument("--network", default="none",
+                        help=f"comma-separated network presets, or 'all' ({', '.join(PRESETS)})")
+    parser.add_argument("--protocols", default="h1", help=f"comma-separated protocols, or 'all' ({', '.join(PROTOCOLS)})")
+    parser.add_argument("--strategies", default="all", help=f"comma-separated strategies ({', '.join(STRATEGIES)})")
+    parser.add_argument("--seed", type=int, default=None, help="seed for jitter/loss so runs are repeatable")
+    parser.add_argument("--requests", type=int, default=None, help="runs per strategy (default: scenario load.requests)")
+    parser.add_argument("--standin", action="store_true", help="run against a local HTTP/1.1 + h2c stand-in")
+    add_scenario_arguments(parser)
+    args = parser.parse_args()
+
+    networks = parse_list(args.network, PRESETS, parser, "--network")
+    protocols = parse_list(args.protocols, PROTOCOLS, parser, "--protocols")
+    strategies = parse_list(args.strategies, STRATEGIES, parser, "--strategies")
+    if args.standin and args.target is None:
+        args.target = "standin"
+    scenario, BASE_URL, HEADERS = probe_config(args, parser)
+    NUM_REQUESTS = args.requests or scenario.load.requests or NUM_REQUESTS
+
+    standin = StandInServer().start() if args.standin else None
+    base_url = standin.base_url if standin else BASE_URL
+
     print("=" * 60)
     print("SDK Init Performance Comparison Test")
-    print(f"Target: {BASE_URL}")
+    print(f"Target: {base_url}{' (local stand-in)' if standin else ''}")
     print(f"Requests per test: {NUM_REQUESTS}")
+    print(f"Networks: {', '.join(networks)}")
+    print(f"Protocols: {', '.join(protocols)}")
     print("=" * 60)
 
     # Run tests
-    old_mean = test_old_approach()
-    new_mean = test_new_approach()
+    try:
+        results = {name: compare(base_url, name, protocols, strategies, args.seed) for name in networks}
+    finally:
+        if standin:
+            standin.stop()
 
     # Summary
     print("\n" + "=" * 60)
     print("COMPARISON SUMMARY")
     print("=" * 60)
-    print(f"\n  Old Approach (3 requests):  {old_mean:,.0f}ms mean")
-    print(f"  New Approach (1 request):   {new_mean:,.0f}ms mean")
-
-    if old_mean > 0 and new_mean > 0:
-        improvement = ((old_mean - new_mean) / old_mean) * 100
-        speedup = old_mean / new_mean
-        print(f"\n  Improvement: {improvement:.1f}% faster")
-        print(f"  Speedup:     {speedup:.1f}x faster")
-
-        if improvement > 50:
-            print(f"\n  ✅ EXCELLENT: Significant performance improvement!")
-        elif improvement > 25:
-            print(f"\n  ✅ GOOD: Notable performance improvement.")
-        else:
-            print(f"\n  ⚠️  Improvement less than expected. Check caching.")
+    print(f"\n  {'Network':<10} {'Proto':<6} {'Strategy':<15} {'Usable':>8} {'Complete':>9} {'p95':>8} {'Conns':>6} {'Bytes in':>10}")
+    print("  " + "-" * 78)
+    for network, by_pair in results.items():
+        for (protocol, strategy), summary in by_pair.items():
+            if summary is None:
+                print(f"  {network:<10} {protocol:<6} {strategy:<15} {'failed':>8}")
+                continue
+            print(f"  {network:<10} {protocol:<6} {strategy:<15} {summary['usable']:>6,.0f}ms {summary['mean']:>7,.0f}ms "
+                  f"{summary['p95']:>6,.0f}ms {summary['connections']:>6.1f} {summary['bytes_in']:>10,.0f}")
+
+    for network, by_pair in results.items():
+        old = by_pair.get(("h1", "sequential"))
+        new = by_pair.get(("h1", "combined"))
+        if old and new:
+            print(f"\n  [{network}] Old Approach (3 requests):  {old['mean']:,.0f}ms mean")
+            print(f"  [{network}] New Approach (1 request):   {new['mean']:,.0f}ms mean")
+            print_verdict(old["mean"], new["mean"])
+        multiplexed = by_pair.get(("h2", "parallel"))
+        if old and multiplexed:
+            print(f"\n  [{network}] Legacy SDKs on HTTP/2 (3 multiplexed streams): "
+                  f"{multiplexed['mean']:,.0f}ms mean vs {old['mean']:,.0f}ms sequential HTTP/1.1")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Targeting-rule evaluation benchmark for the business-config endpoints.
+
+Seeds one business config per (rules, conditions) combination, then sweeps
+rules x conditions x context size against the target and reports latency
+and throughput curves for each dimension:
+- rules:      targeting rules per config (each an AND of its conditions)
+- conditions: conditions per rule, cycling through every operator
+- context:    custom attributes on the user and device in each context
+
+Half of the generated contexts match a rule (at a uniform position in the
+list) and half match none, so the second half is checked against every
+rule. Every response is also checked against harness/targeting.py, a
+reference port of src/lib/business-config/targeting.ts, so a sweep shows
+when the endpoint does not evaluate the rules it was given.
+
+--endpoint picks what is driven:
+- sdk:       GET /api/business-config?key=... with the X-DevBridge-Context header (default)
+- evaluate:  POST /api/business-config/evaluate {configKey, context}
+
+The dashboard stores targeting rules, default value and rollout percentage
+in the config's metadata. The SDK route evaluates from there; the evaluate
+route reads targetingRules/rolloutPercentage as config columns, which do
+not exist, so it answers the plain value for everyone and every
+--endpoint evaluate point reports mismatches. The stand-in does the same.
+
+The rollout check hashes --ids synthetic device/user IDs per format (UUIDs,
+Android IDs, sequential "user-N") with the same hash as
+shouldReceiveRollout() to check that buckets are uniform (chi-square) and
+rollout percentages are accurate, then asks the target about --sample IDs
+several times each to check that its answers are deterministic and agree
+with the local hash.
+
+Usage:
+    python3 test-targeting-scale.py --standin                       # no server needed
+    python3 test-targeting-scale.py --target local
+    python3 test-targeting-scale.py --target local --endpoint evaluate
+    python3 test-targeting-scale.py --rules 1,10,100,500 --conditions 1,10 --context 10
+    python3 test-targeting-scale.py --skip-sweep --ids 5000000      # rollout hashing only
+    python3 test-targeting-scale.py --json results.json
+
+Seeding needs a dashboard token and project (--admin-token/--project-id or
+NIVOSTACK_ADMIN_TOKEN/NIVOSTACK_PROJECT_ID); the project's API key comes
+from the scenario target (scenarios/business-targeting.json). The seeded
+configs (bench_targeting_*) are deleted afterwards unless --keep is given.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from harness.admin import AdminError, add_admin_arguments, admin_client
+from harness.runner import run_plan
+from harness.scenario import CompiledEndpoint, ScenarioError, Template, add_scenario_arguments, probe_config
+from harness.standin import StandInServer, json_response
+from harness.stats import chi_square
+from harness.targeting import (ID_FORMATS, evaluate_targeting, make_context, make_rules, rollout_bucket,
+                               should_receive_rollout, synthetic_ids)
+
+DEFAULT_SCENARIO = "business-targeting.json"
+KEY_PREFIX = "bench_targeting"
+CATEGORY = "benchmark"
+DEFAULT_VALUE = "default"
+ROLLOUT_CHECKS = (1, 5, 10, 25, 50)
+IDS_PER_TASK = 250_000
+
+def parse_sizes(text, name, parser):
+    try:
+        sizes = [int(v) for v in text.split(",") if v.strip()]
+    except ValueError:
+        parser.error(f"--{name} takes comma-separated integers, got '{text}'")
+    if not sizes or min(sizes) < 1:
+        parser.error(f"--{name} values must be at least 1")
+    return sizes
+
+# -- stand-in -------------------------------------------------------------------
+
+def standin_routes():
+    """Business-config routes backed by a dict, evaluating with harness/targeting.py.
+
+    Targeting rules, default value and rollout percentage live in the
+    config's metadata, as the dashboard POST stores them. Like the real
+    routes, the SDK GET evaluates from metadata and evaluate reads them as
+    (missing) columns of the config.
+    """
+    configs = {}
+    lock = threading.Lock()
+
+    def value_of(config, context):
+        meta = config["metadata"]
+        if not should_receive_rollout(meta.get("rolloutPercentage") or 100, context):
+            return False, None
+        default = meta.get("defaultValue", config["value"])
+        return True, evaluate_targeting(meta.get("targetingRules"), context, default)
+
+    def business_config(request):
+        if request.method == "POST":
+            if not request.headers.get("authorization"):
+                return json_response({"error": "Unauthorized"}, 401)
+            body = request.json()
+            with lock:
+                if body["key"] in configs:
+                    return json_response({"error": "A config with this key already exists in this project"}, 409)
+                meta = {k: body[k] for k in ("targetingRules", "defaultValue", "rolloutPercentage") if k in body}
+                config = {"id": f"standin-{len(configs)}-{body['key']}", "key": body["key"], "value": body.get("value"),
+                          "category": body.get("category"), "metadata": meta}
+                configs[body["key"]] = config
+            return json_response({"config": config})
+        if request.method == "DELETE":
+            with lock:
+                for key, config in list(configs.items()):
+                    if config["id"] == request.query.get("id"):
+                        del configs[key]
+                        return json_response({"success": True})
+            return json_response({"error": "Config not found"}, 404)
+        if request.headers.get("x-api-key"):
+            context = json.loads(request.headers.get("x-devbridge-context") or "{}")
+            result = {}
+            for key, config in configs.items():
+                if request.query.get("key") in (None, key):
+                    receives, value = value_of(config, context)
+                    if receives:
+                        result[key] = value
+            return json_response({"configs": result})
+        if request.headers.get("authorization"):
+            category = request.query.get("category")
+            return json_response({"configs": [c for c in configs.values() if category in (None, c["category"])]})
+        return json_response({"error": "Unauthorized"}, 401)
+
+    def evaluate(request):
+        if not request.headers.get("x-api-key"):
+            return json_response({"error": "Invalid API key"}, 401)
+        body = request.json()
+        if not body.get("configKey"):
+            return json_response({"error": "configKey is required"}, 400)
+        config = configs.get(body["configKey"])
+        if config is None:
+            return json_response({"error": "Config not found"}, 404)
+        context = body.get("context") or {}
+        if not should_receive_rollout(config.get("rolloutPercentage") or 100, context):
+            return json_response({"receivesRollout": False, "value": None,
+                                  "reason": "User not included in rollout percentage"})
+        value = config["value"]
+        if config.get("targetingRules"):
+            default = config["defaultValue"] if config.get("defaultValue") is not None else value
+            value = evaluate_targeting(config["targetingRules"], context, default)
+        return json_response({"receivesRollout": True, "value": value,
+                              "matchedTargeting": bool(config.get("targetingRules"))})
+
+    return {"/api/business-config": business_config, "/api/business-config/evaluate": evaluate}
+
+STANDIN_DELAYS_MS = {"/api/business-config": 5, "/api/business-config/evaluate": 5}
+
+# -- seeding ----------------------------------------------------------------------
+
+def remove_leftovers(admin):
+    """Delete bench_targeting_* configs left by an interrupted run (or --keep)."""
+    _, data = admin.request("GET", "/api/business-config", query={"projectId": admin.project_id, "category": CATEGORY})
+    for config in (data or {}).get("configs", []):
+        if config.get("key", "").startswith(KEY_PREFIX):
+            admin.request("DELETE", "/api/business-config", query={"id": config["id"]}, expect=None)
+
+def seed_config(admin, key, targeting_rules=None, rollout=None):
+    body = {"projectId": admin.project_id, "key": key, "valueType": "string", "value": DEFAULT_VALUE,
+            "category": CATEGORY, "defaultValue": DEFAULT_VALUE, "isEnabled": True}
+    if targeting_rules:
+        body["targetingRules"] = targeting_rules
+    if rollout is not None:
+        body["rolloutPercentage"] = rollout
+    _, data = admin.request("POST", "/api/business-config", body)
+    admin.created("/api/business-config", data["config"]["id"])
+
+# -- requests -----------------------------------------------------------------------
+
+def endpoint_for(mode, name, key, context_for):
+    """A CompiledEndpoint sending context_for(request index) to the evaluate or SDK route."""
+    if mode == "evaluate":
+        return CompiledEndpoint(name=name, method="POST", weight=1,
+                                path=Template("/api/business-config/evaluate", name), query={},
+                                headers={"Content-Type": "application/json"},
+                                body=lambda ctx: {"configKey": key, "context": context_for(ctx.index)})
+    return CompiledEndpoint(name=name, method="GET", weight=1, path=Template("/api/business-config", name),
+                            query={"key": key}, body=None,
+                            headers=lambda ctx: {"X-DevBridge-Context": json.dumps(context_for(ctx.index))})
+
+def answer(mode, key, response):
+    """(receives rollout, value) from a response, or None if it cannot be read."""
+    try:
+        data = json.loads(response.body)
+    except (TypeError, ValueError):
+        return None
+    if mode == "evaluate":
+        return bool(data.get("receivesRollout")), data.get("value")
+    configs = data.get("configs") or {}
+    return key in configs, configs.get(key)
+
+class Checker:
+    """Compares responses with the reference evaluation; called from worker threads."""
+
+    def __init__(self, mode, key, expected_for):
+        self.mode, self.key, self.expected_for = mode, key, expected_for
+        self.lock = threading.Lock()
+        self.checked = self.mismatched = 0
+        self.example = None
+        self.request_bytes = []
+
+    def __call__(self, planned, response):
+        if not response.ok:
+            return
+        actual = answer(self.mode, self.key, response)
+        expected = self.expected_for(planned.index)
+        with self.lock:
+            self.checked += 1
+            self.request_bytes.append(len(planned.body or b"") + sum(len(v) for v in planned.headers.values()))
+            if actual != expected:
+                self.mismatched += 1
+                if self.example is None:
+                    self.example = (planned.index, expected, actual)
+
+# -- sweep --------------------------------------------------------------------------
+
+def run_sweep(plan, admin, args):
+    points = []
+    for rules in args.rules:
+        for conditions in args.conditions:
+            key = f"{KEY_PREFIX}_r{rules}_c{conditions}"
+            targeting = make_rules(rules, conditions, DEFAULT_VALUE)
+            seed_config(admin, key, targeting)
+            for attributes in args.context:
+                name = f"r{rules}/c{conditions}/k{attributes}"
+
+                def context_for(index, attributes=attributes, segments=2 * rules):
+                    return make_context(random.Random(plan.seed * 1_000_003 + index), attributes, segments)
+
+                def expected_for(index, targeting=targeting, context_for=context_for):
+                    return True, evaluate_targeting(targeting, context_for(index), DEFAULT_VALUE)
+
+                point_plan = replace(plan, endpoints=[endpoint_for(args.endpoint, name, key, context_for)],
+                                     _cumulative=[])
+                checker = Checker(args.endpoint, key, expected_for)
+                result = run_plan(point_plan, on_result=checker)
+                summary = result.summary()
+                point = {"rules": rules, "conditions": conditions, "context": attributes, **summary,
+                         "checked": checker.checked, "mismatched": checker.mismatched,
+                         "request_bytes": statistics.mean(checker.request_bytes) if checker.request_bytes else 0}
+                points.append(point)
+                flag = "✅" if not checker.mismatched and not summary["errors"] else "❌"
+                print(f"{flag} {name:<16} p50 {summary['p50_ms']:7.1f}ms  p95 {summary['p95_ms']:7.1f}ms  "
+                      f"p99 {summary['p99_ms']:7.1f}ms  {summary['rps']:7.1f} req/s  "
+                      f"{point['request_bytes'] / 1024:6.1f} KB/request"
+                      + (f"  {summary['errors']} errors" if summary["errors"] else "")
+                      + (f"  {checker.mismatched}/{checker.checked} differ from targeting.ts" if checker.mismatched else ""))
+                if checker.example:
+                    index, expected, actual = checker.example
+                    print(f"     e.g. request {index}: expected {expected}, got {actual}")
+    return points
+
+def print_curves(points, args):
+    print("\n" + "=" * 78)
+    print("LATENCY CURVES (median over the other dimensions)")
+    print("=" * 78)
+    for dimension, values in (("rules", args.rules), ("conditions", args.conditions), ("context", args.context)):
+        print(f"\n{dimension}:")
+        print(f"  {'value':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'req/s':>9}")
+        for value in values:
+            subset = [p for p in points if p[dimension] == value]
+            if not subset:
+                continue
+            median = lambda metric: statistics.median(p[metric] for p in subset)
+            print(f"  {value:>8} {median('p50_ms'):>7.1f}ms {median('p95_ms'):>7.1f}ms "
+                  f"{median('p99_ms'):>7.1f}ms {median('rps'):>9.1f}")
+        if len(values) > 1 and points:
+            low, high = values[0], values[-1]
+            p50 = lambda value: statistics.median(p["p50_ms"] for p in points if p[dimension] == value)
+            print(f"  {low} -> {high}: p50 {p50(low):.1f}ms -> {p50(high):.1f}ms "
+                  f"({(p50(high) - p50(low)) / (high - low):+.3f}ms per {dimension[:-1] if dimension != 'context' else 'attribute'})")
+    mismatched = sum(p["mismatched"] for p in points)
+    if mismatched:
+        print(f"\n❌ {mismatched} of {sum(p['checked'] for p in points)} responses differ from the targeting.ts "
+              f"reference: the endpoint is not evaluating the seeded rules (see the examples above)")
+
+# -- rollout ------------------------------------------------------------------------
+
+def bucket_counts(kind, seed, start, count):
+    """Rollout bucket counts (index 0 = bucket 1) for one slice of synthetic IDs; runs in a worker."""
+    counts = [0] * 100
+    for identifier in synthetic_ids(kind, count, seed=seed, start=start):
+        counts[rollout_bucket(identifier) - 1] += 1
+    return counts
+
+def check_uniformity(ids, seed, jobs):
+    print("\n" + "=" * 78)
+    print(f"ROLLOUT BUCKETING: {ids:,} synthetic IDs per format")
+    print("=" * 78)
+    results = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for kind in ID_FORMATS:
+            for task, start in enumerate(range(0, ids, IDS_PER_TASK)):
+                count = min(IDS_PER_TASK, ids - start)
+                futures.setdefault(kind, []).append(pool.submit(bucket_counts, kind, seed * 1000 + task, start, count))
+        for kind in ID_FORMATS:
+            counts = [sum(column) for column in zip(*(future.result() for future in futures[kind]))]
+            statistic, dof, p_value = chi_square(counts)
+            accuracy = {pct: sum(counts[:pct]) / ids * 100 for pct in ROLLOUT_CHECKS}
+            results[kind] = {"counts": counts, "chi_square": statistic, "dof": dof, "p_value": p_value,
+                             "accuracy": accuracy}
+    elapsed = time.perf_counter() - started
+    print(f"{'Format':<12} {'chi-square':>11} {'p-value':>9} {'min/max bucket':>16}  "
+          + "  ".join(f"{pct:>3}%->" for pct in ROLLOUT_CHECKS))
+    for kind, r in results.items():
+        expected = ids / 100
+        spread = f"{min(r['counts']) / expected:.2f}/{max(r['counts']) / expected:.2f}x"
+        mark = "✅" if r["p_value"] >= 0.001 else "❌"
+        print(f"{mark} {kind:<10} {r['chi_square']:>11.1f} {r['p_value']:>9.3g} {spread:>16}  "
+              + "  ".join(f"{r['accuracy'][pct]:>6.2f}" for pct in ROLLOUT_CHECKS))
+    print(f"({3 * ids:,} IDs hashed in {elapsed:.1f}s; a p-value below 0.001 means the buckets are not uniform "
+          f"for that ID format, so rollout percentages are off for it)")
+    return results
+
+def check_determinism(plan, admin, args):
+    """Ask the target about the same IDs `repeat` times; answers must agree with each other and the hash."""
+    key = f"{KEY_PREFIX}_rollout"
+    seed_config(admin, key, rollout=args.rollout)
+    identifiers = list(synthetic_ids("uuid", args.sample, seed=plan.seed))
+    context_for = lambda index: {"user": {"id": identifiers[index % len(identifiers)]}}
+    seen = defaultdict(set)
+    lock = threading.Lock()
+
+    def record(planned, response):
+        if response.ok:
+            with lock:
+                seen[planned.index % len(identifiers)].add(answer(args.endpoint, key, response)[0])
+
+    sample_plan = replace(plan, endpoints=[endpoint_for(args.endpoint, "rollout", key, context_for)], _cumulative=[],
+                          load=replace(plan.load, requests=len(identifiers) * args.repeat, duration_s=None))
+    result = run_plan(sample_plan, on_result=record)
+    flapping = [i for i, answers in seen.items() if len(answers) > 1]
+    wrong = [i for i, answers in seen.items()
+             if len(answers) == 1 and next(iter(answers)) != should_receive_rollout(args.rollout, context_for(i))]
+    included = sum(1 for answers in seen.values() if True in answers)
+
+    print("\n" + "=" * 78)
+    print(f"ROLLOUT DETERMINISM: {len(identifiers)} IDs x {args.repeat} calls at {args.rollout}% rollout")
+    print("=" * 78)
+    summary = result.summary()
+    print(f"{summary['count']} requests, {summary['errors']} errors, p50 {summary['p50_ms']:.1f}ms")
+    print(f"{'✅' if not flapping else '❌'} {len(flapping)} IDs got different answers across calls")
+    print(f"{'✅' if not wrong else '❌'} {len(wrong)} IDs answered differently from shouldReceiveRollout()")
+    print(f"   {included / max(len(seen), 1) * 100:.1f}% of the sampled IDs are in the rollout (configured {args.rollout}%)")
+    return {"ids": len(identifiers), "repeat": args.repeat, "flapping": len(flapping), "disagree": len(wrong),
+            "included_pct": included / max(len(seen), 1) * 100}
+
+def main():
+    parser = argparse.ArgumentParser(description="Targeting-rule evaluation benchmark")
+    parser.add_argument("--endpoint", choices=["sdk", "evaluate"], default="sdk",
+                        help="sdk: GET /api/business-config (default); evaluate: POST /api/business-config/evaluate")
+    parser.add_argument("--rules", default="1,10,100", help="rules per config to sweep (default: 1,10,100)")
+    parser.add_argument("--conditions", default="1,5,20", help="conditions per rule to sweep (default: 1,5,20)")
+    parser.add_argument("--context", default="5,50,500", help="context attributes to sweep (default: 5,50,500)")
+    parser.add_argument("--requests", type=int, default=None, help="requests per sweep point (default: the scenario's)")
+    parser.add_argument("--concurrency", type=int, default=None, help="override load.concurrency")
+    parser.add_argument("--ids", type=int, default=1_000_000, help="synthetic IDs per format to hash (default: 1M)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="processes for hashing (default: cores)")
+    parser.add_argument("--sample", type=int, default=200, help="IDs to ask the target about (default: 200)")
+    parser.add_argument("--repeat", type=int, default=3, help="calls per sampled ID (default: 3)")
+    parser.add_argument("--rollout", type=int, default=30, help="rollout percentage for the determinism check")
+    parser.add_argument("--skip-sweep", action="store_true", help="skip the latency sweep")
+    parser.add_argument("--skip-rollout", action="store_true", help="skip the rollout checks")
+    parser.add_argument("--standin", action="store_true", help="run against a local stand-in server")
+    parser.add_argument("--seed", type=int, default=None, help="override the scenario seed")
+    parser.add_argument("--json", default=None, metavar="FILE", help="also write the results as JSON")
+    add_scenario_arguments(parser, DEFAULT_SCENARIO)
+    add_admin_arguments(parser)
+    args = parser.parse_args()
+    for name in ("rules", "conditions", "context"):
+        setattr(args, name, parse_sizes(getattr(args, name), name, parser))
+    if not 1 <= args.rollout <= 99:
+        parser.error("--rollout must be between 1 and 99")
+
+    if args.standin and args.target is None:
+        args.target = "standin"
+    scenario, _, _ = probe_config(args, parser)
+    try:
+        plan = scenario.compile(args.target, seed=args.seed, requests=args.requests, concurrency=args.concurrency)
+    except ScenarioError as e:
+        parser.error(str(e))
+    standin = StandInServer(routes=standin_routes(), delays_ms=STANDIN_DELAYS_MS).start() if args.standin else None
+    if standin:
+        plan.base_url = standin.base_url
+
+    print("=" * 78)
+    print("Business-config targeting benchmark")
+    print(f"Target: {plan.target} ({plan.base_url})   Endpoint: {args.endpoint}   Seed: {plan.seed}")
+    if not args.skip_sweep:
+        print(f"Sweep: rules {args.rules} x conditions {args.conditions} x context {args.context}, "
+              f"{plan.load.requests} requests per point, {plan.load.concurrency} workers")
+    print("=" * 78)
+
+    results = {"target": plan.target, "endpoint": args.endpoint, "seed": plan.seed}
+    admin = None
+    try:
+        if not args.skip_sweep or not args.skip_rollout:
+            admin = admin_client(args, parser, plan.base_url, standin=bool(standin))
+            remove_leftovers(admin)
+        if not args.skip_sweep:
+            print()
+            results["sweep"] = run_sweep(plan, admin, args)
+            print_curves(results["sweep"], args)
+        if not args.skip_rollout:
+            results["uniformity"] = check_uniformity(args.ids, plan.seed, args.jobs)
+            results["determinism"] = check_determinism(plan, admin, args)
+    except AdminError as e:
+        print(f"\n❌ Seeding failed: {e}")
+        sys.exit(2)
+    finally:
+        if admin:
+            if args.keep:
+                print("\nSeeded configs kept (--keep)")
+            elif admin.cleanup():
+                print("\n⚠️  Some seeded configs could not be deleted")
+            admin.close()
+        if standin:
+            standin.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    failed = any(p["mismatched"] or p["errors"] for p in results.get("sweep", []))
+    failed |= bool(results.get("determinism", {}).get("flapping") or results.get("determinism", {}).get("disagree"))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
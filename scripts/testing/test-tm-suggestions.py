@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Translation-memory suggestion benchmark: n-gram index vs the route's full scan.
+
+GET /api/localization/tm/suggestions loads every memory entry of the
+language pair and runs a full Levenshtein matrix against each one, so its
+cost grows with the size of the memory. harness/tm.py has a port of that
+route (the oracle) and NgramIndex, a reference design that returns the same
+top-k from an (n-gram, occurrence) index with length and count filters.
+
+For each memory size in --sizes this probe:
+
+1. builds the index (time, approximate footprint);
+2. runs --queries fuzzy queries through it (edited copies of memory
+   entries, exact copies and unrelated text) and reports latency, how
+   many entries each query's length window held and how many of those
+   passed the count filter and were verified, and whether p95 stays within
+   --target-ms (reported as met or missed; it does not fail the run);
+3. runs the first --oracle-queries of them through the route's algorithm
+   and checks that the index returns the same suggestions (a difference
+   only in the order of near-ties, which the route's 0.01 window leaves to
+   input order, is reported separately and is not a failure);
+4. sends --endpoint-queries of them to the endpoint (the stand-in serves
+   the route's algorithm over the same memory) and compares its answers
+   with the index's.
+
+Step 3 scans the whole memory once per query, which takes tens of
+seconds per query at 500,000 entries, so it only runs for sizes up to
+--scan-max. The stand-in scans too, and its requests share one process
+and the client's 30 s timeout, so it only answers for sizes up to
+--standin-max. A real endpoint is always compared.
+
+Usage:
+    python3 test-tm-suggestions.py --standin                         # synthetic memory, no server
+    python3 test-tm-suggestions.py --skip-endpoint --sizes 10000,100000,300000
+    python3 test-tm-suggestions.py --skip-endpoint --sizes 500000 --scan-max 500000   # slow: full scans at 500k
+    python3 test-tm-suggestions.py --standin --n 3 --min-similarity 0.8
+    python3 test-tm-suggestions.py --target local --tm tm-export.json --project-id ... \\
+        --source-language-id ... --target-language-id ...
+    python3 test-tm-suggestions.py --json results.json
+
+Against a real server the memory is not seeded: export the project's
+TranslationMemory rows for one language pair (a JSON array or JSON lines
+with sourceText, targetText, usageCount) and pass it with --tm, so the
+index and the endpoint answer from the same data. The route takes a
+dashboard token (NIVOSTACK_ADMIN_TOKEN, sent by the scenario targets).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from harness.runner import run_plan
+from harness.scenario import CompiledEndpoint, ScenarioError, Template, add_scenario_arguments, probe_config
+from harness.standin import StandInServer, json_response
+from harness.stats import percentile
+from harness.tm import NgramIndex, TmEntry, fuzzy_queries, suggest, synthetic_memory
+
+DEFAULT_SCENARIO = "tm-suggestions.json"
+STANDIN_LANGUAGES = ("standin-source", "standin-target")
+SIMILARITY_TOLERANCE = 1e-9
+
+def parse_sizes(text, parser):
+    try:
+        sizes = sorted({int(v) for v in text.split(",") if v.strip()})
+    except ValueError:
+        parser.error(f"--sizes takes comma-separated integers, got '{text}'")
+    if not sizes or sizes[0] < 1:
+        parser.error("--sizes values must be positive")
+    return sizes
+
+def load_export(path, source_language_id=None, target_language_id=None):
+    """TmEntry list from an exported JSON array or JSON lines, optionally filtered to one language pair."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    rows = json.loads(text) if text.lstrip().startswith("[") else [json.loads(line) for line in text.splitlines()
+                                                                   if line.strip()]
+    return [TmEntry.from_export(row) for row in rows
+            if (not source_language_id or row.get("sourceLanguageId", source_language_id) == source_language_id)
+            and (not target_language_id or row.get("targetLanguageId", target_language_id) == target_language_id)]
+
+def compare(expected, got):
+    """"exact", "ties" (same suggestions and scores, near-ties in another order) or "differ"."""
+    def key(s):
+        return s["targetText"], round(s["similarity"] / SIMILARITY_TOLERANCE)
+    if [key(s) for s in expected] == [key(s) for s in got]:
+        return "exact"
+    if sorted(key(s)[1] for s in expected) == sorted(key(s)[1] for s in got):
+        return "ties"
+    return "differ"
+
+def tally(outcomes):
+    return {name: outcomes.count(name) for name in ("exact", "ties", "differ")}
+
+# -- stand-in -------------------------------------------------------------------
+
+def standin_routes(memory):
+    """The suggestions route over memory["entries"], with the route's parameter checks."""
+
+    def suggestions(request):
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            return json_response({"error": "Unauthorized"}, 401)
+        query = request.query
+        if not all(query.get(name) for name in ("projectId", "sourceLanguageId", "targetLanguageId", "sourceText")):
+            return json_response({"error": "projectId, sourceLanguageId, targetLanguageId, and sourceText are "
+                                           "required"}, 400)
+        if (query["sourceLanguageId"], query["targetLanguageId"]) != STANDIN_LANGUAGES:
+            return json_response({"suggestions": []})
+        min_similarity = float(query.get("minSimilarity") or 0.7)
+        return json_response({"suggestions": suggest(memory["entries"], query["sourceText"], min_similarity)})
+
+    return {"/api/localization/tm/suggestions": suggestions}
+
+# -- measurement ------------------------------------------------------------------
+
+def time_index(index, queries, args):
+    latencies, windows, candidates, answers = [], [], [], []
+    for text in queries:
+        stats = {}
+        started = time.perf_counter()
+        answers.append(index.query(text, args.min_similarity, args.limit, stats))
+        latencies.append((time.perf_counter() - started) * 1000)
+        windows.append(stats["window"])
+        candidates.append(stats["candidates"])
+    p95 = percentile(latencies, 0.95)
+    return answers, {"p50_ms": percentile(latencies, 0.5), "p95_ms": p95, "p99_ms": percentile(latencies, 0.99),
+                     "mean_ms": statistics.mean(latencies), "window": statistics.mean(windows),
+                     "candidates": statistics.mean(candidates),
+                     "candidates_p95": percentile(candidates, 0.95), "target_met": p95 <= args.target_ms}
+
+def check_oracle(entries, queries, answers, args):
+    latencies, outcomes, examples = [], [], []
+    for text, answer in zip(queries, answers):
+        started = time.perf_counter()
+        expected = suggest(entries, text, args.min_similarity, args.limit)
+        latencies.append((time.perf_counter() - started) * 1000)
+        outcome = compare(expected, answer)
+        outcomes.append(outcome)
+        if outcome == "differ" and len(examples) < 3:
+            examples.append(text)
+    return {"queries": len(queries), "p50_ms": percentile(latencies, 0.5), "p95_ms": percentile(latencies, 0.95),
+            **tally(outcomes), "examples": examples}
+
+def check_endpoint(plan, queries, answers, args):
+    """Send `queries` to the endpoint; compare its suggestions with the index's `answers`."""
+    outcomes, lock = {}, threading.Lock()
+    project_id, source_id, target_id = args.project_id, args.source_language_id, args.target_language_id
+
+    def record(planned, response):
+        if not response.ok:
+            return
+        got = json.loads(response.body).get("suggestions", [])
+        with lock:
+            outcomes[planned.index] = compare(answers[planned.index], got)
+
+    endpoint = CompiledEndpoint(
+        name="suggestions", method="GET", weight=1,
+        path=Template("/api/localization/tm/suggestions", "suggestions"), body=None, headers={},
+        query=lambda ctx: {"projectId": project_id, "sourceLanguageId": source_id, "targetLanguageId": target_id,
+                           "sourceText": queries[ctx.index], "minSimilarity": str(args.min_similarity)})
+    endpoint_plan = replace(plan, endpoints=[endpoint], _cumulative=[],
+                            load=replace(plan.load, requests=len(queries), duration_s=None))
+    summary = run_plan(endpoint_plan, on_result=record).summary()
+    return {**summary, **tally(list(outcomes.values()))}
+
+def human(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def agreement(result):
+    line = f"{result['exact']}/{result['exact'] + result['ties'] + result['differ']} exact"
+    if result["ties"]:
+        line += f", {result['ties']} near-ties reordered"
+    if result["differ"]:
+        line += f", ❌ {result['differ']} differ"
+    return line
+
+def print_point(point, args):
+    index, oracle, endpoint = point["index"], point.get("oracle"), point.get("endpoint")
+    failed = (oracle and oracle["differ"]) or (endpoint and (endpoint["differ"] or endpoint["errors"]))
+    print(f"\n{'❌' if failed else '✅'} {point['entries']:,} entries   index built in {point['build_s']:.1f}s, "
+          f"{human(point['index_bytes'])} ({point['index_bytes'] / point['entries']:.0f} B/entry)")
+    print(f"   index      p50 {index['p50_ms']:8.2f}ms  p95 {index['p95_ms']:8.2f}ms  p99 {index['p99_ms']:8.2f}ms"
+          f"   {index['window']:.0f} in the length window, {index['candidates']:.0f} verified per query "
+          f"(p95 {index['candidates_p95']:.0f})")
+    print(f"   target     p95 <= {args.target_ms:g}ms: " + ("✅ met" if index["target_met"] else "❌ missed"))
+    if oracle:
+        print(f"   route scan p50 {oracle['p50_ms']:8.2f}ms  p95 {oracle['p95_ms']:8.2f}ms"
+              f"                 {agreement(oracle)} ({oracle['queries']} queries)")
+        for text in oracle["examples"]:
+            print(f"      differs: {text!r}")
+    if endpoint:
+        print(f"   endpoint   p50 {endpoint['p50_ms']:8.2f}ms  p95 {endpoint['p95_ms']:8.2f}ms  p99 "
+              f"{endpoint['p99_ms']:8.2f}ms   {agreement(endpoint)} ({endpoint['count']} queries"
+              + (f", {endpoint['errors']} errors)" if endpoint["errors"] else ")"))
+
+def print_summary(points, args):
+    print("\n" + "=" * 78)
+    print("SCALING")
+    print("=" * 78)
+    print(f"  {'entries':>9} {'index MB':>9} {'index p50':>10} {'index p95':>10} {'scan p50':>10} {'speedup':>8} "
+          f"{'endpoint p50':>13}")
+    for p in points:
+        scan = p.get("oracle", {}).get("p50_ms")
+        endpoint = p.get("endpoint", {}).get("p50_ms")
+        speedup = f"{scan / max(p['index']['p50_ms'], 1e-6):7.0f}x" if scan else f"{'-':>8}"
+        print(f"  {p['entries']:>9,} {p['index_bytes'] / 1e6:>9.1f} {p['index']['p50_ms']:>8.2f}ms "
+              f"{p['index']['p95_ms']:>8.2f}ms " + (f"{scan:>8.1f}ms " if scan else f"{'-':>10} ") + speedup
+              + (f" {endpoint:>11.1f}ms" if endpoint else f" {'-':>13}"))
+    print("  (scan: the route's algorithm, ported, on the same machine; speedup compares the two p50s)")
+    if any(p["entries"] > args.scan_max for p in points):
+        print(f"  (sizes above --scan-max {args.scan_max:,} are not checked against the scan)")
+    if args.standin and not args.skip_endpoint and any(p["entries"] > args.standin_max for p in points):
+        print(f"  (sizes above --standin-max {args.standin_max:,} are not sent to the stand-in)")
+    missed = [p["entries"] for p in points if not p["index"]["target_met"]]
+    if missed:
+        print(f"\n❌ Target missed: index p95 above {args.target_ms:g}ms at "
+              + ", ".join(f"{size:,}" for size in missed) + " entries")
+    else:
+        print(f"\n✅ Target met: index p95 within {args.target_ms:g}ms at every size")
+
+def main():
+    parser = argparse.ArgumentParser(description="Translation-memory suggestion benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000,500000",
+                        help="memory sizes to sweep (default: 1000,10000,100000,500000)")
+    parser.add_argument("--tm", default=None, metavar="FILE",
+                        help="exported TranslationMemory rows (JSON array or lines) instead of a synthetic memory")
+    parser.add_argument("--n", type=int, default=2, help="n-gram length of the index (default: 2)")
+    parser.add_argument("--min-similarity", type=float, default=0.7, help="minSimilarity (default: 0.7, the route's)")
+    parser.add_argument("--limit", type=int, default=10, help="suggestions per query (default: 10, the route's)")
+    parser.add_argument("--queries", type=int, default=300, help="index queries per size (default: 300)")
+    parser.add_argument("--oracle-queries", type=int, default=30,
+                        help="queries also answered by the route's full scan (default: 30)")
+    parser.add_argument("--endpoint-queries", type=int, default=30, help="queries sent to the endpoint (default: 30)")
+    parser.add_argument("--target-ms", type=float, default=10.0,
+                        help="index p95 latency to meet at every size, in ms (default: 10)")
+    parser.add_argument("--scan-max", type=int, default=100000,
+                        help="largest size checked against the route's scan (default: 100000)")
+    parser.add_argument("--standin-max", type=int, default=10000,
+                        help="largest size sent to the stand-in, which scans each query (default: 10000)")
+    parser.add_argument("--skip-endpoint", action="store_true", help="compare with the ported route only")
+    parser.add_argument("--project-id", default=os.environ.get("NIVOSTACK_PROJECT_ID"),
+                        help="project of the exported memory (default: $NIVOSTACK_PROJECT_ID)")
+    parser.add_argument("--source-language-id", default=os.environ.get("NIVOSTACK_TM_SOURCE_LANGUAGE_ID"),
+                        help="source language id of the pair (default: $NIVOSTACK_TM_SOURCE_LANGUAGE_ID)")
+    parser.add_argument("--target-language-id", default=os.environ.get("NIVOSTACK_TM_TARGET_LANGUAGE_ID"),
+                        help="target language id of the pair (default: $NIVOSTACK_TM_TARGET_LANGUAGE_ID)")
+    parser.add_argument("--concurrency", type=int, default=None, help="override load.concurrency")
+    parser.add_argument("--standin", action="store_true", help="run against a local stand-in server")
+    parser.add_argument("--seed", type=int, default=None, help="override the scenario seed")
+    parser.add_argument("--json", default=None, metavar="FILE", help="also write the results as JSON")
+    add_scenario_arguments(parser, DEFAULT_SCENARIO)
+    args = parser.parse_args()
+    args.sizes = parse_sizes(args.sizes, parser)
+    if args.n < 1 or not 0 <= args.min_similarity <= 1:
+        parser.error("--n must be at least 1 and --min-similarity between 0 and 1")
+    if not args.skip_endpoint and not args.standin and not (args.tm and args.project_id and args.source_language_id
+                                                            and args.target_language_id):
+        parser.error("the endpoint answers from the project's own memory: pass --tm with --project-id, "
+                     "--source-language-id and --target-language-id, or use --standin / --skip-endpoint")
+
+    if args.standin and args.target is None:
+        args.target = "standin"
+    plan, standin, memory = None, None, {"entries": []}
+    seed = args.seed
+    if not args.skip_endpoint:
+        scenario, _, _ = probe_config(args, parser)
+        try:
+            plan = scenario.compile(args.target, seed=args.seed, concurrency=args.concurrency)
+        except ScenarioError as e:
+            parser.error(str(e))
+        seed = plan.seed
+        if args.standin:
+            standin = StandInServer(routes=standin_routes(memory)).start()
+            plan.base_url = standin.base_url
+            args.project_id = args.project_id or "standin-project"
+            args.source_language_id, args.target_language_id = STANDIN_LANGUAGES
+    seed = 42 if seed is None else seed
+
+    if args.tm:
+        entries = load_export(args.tm, args.source_language_id, args.target_language_id)
+        if not entries:
+            parser.error(f"{args.tm} has no entries for this language pair")
+        sizes = [len(entries)]
+    else:
+        entries = synthetic_memory(args.sizes[-1], seed)
+        sizes = args.sizes
+    queries = fuzzy_queries(entries, args.queries, seed + 1)
+
+    print("=" * 78)
+    print("Translation-memory suggestion benchmark")
+    print(f"Memory: {args.tm or 'synthetic'}, sizes {sizes}   Index: {args.n}-grams   "
+          f"minSimilarity {args.min_similarity:g}, top {args.limit}")
+    print(f"Queries: {args.queries} per size, {args.oracle_queries} through the route's scan"
+          + ("" if args.skip_endpoint else f", {args.endpoint_queries} to {plan.target} ({plan.base_url})"))
+    print("=" * 78)
+
+    results = {"memory": args.tm or "synthetic", "n": args.n, "min_similarity": args.min_similarity,
+               "limit": args.limit, "seed": seed, "target_ms": args.target_ms, "points": []}
+    try:
+        for size in sizes:
+            subset = entries[:size]
+            memory["entries"] = subset
+            started = time.perf_counter()
+            index = NgramIndex(subset, n=args.n)
+            point = {"entries": size, "build_s": time.perf_counter() - started, "index_bytes": index.size_bytes()}
+            answers, point["index"] = time_index(index, queries, args)
+            if args.oracle_queries and size <= args.scan_max:
+                point["oracle"] = check_oracle(subset, queries[:args.oracle_queries], answers, args)
+            if plan and args.endpoint_queries and (not standin or size <= args.standin_max):
+                point["endpoint"] = check_endpoint(plan, queries[:args.endpoint_queries], answers, args)
+            results["points"].append(point)
+            print_point(point, args)
+        print_summary(results["points"], args)
+    finally:
+        if standin:
+            standin.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    failed = any(p.get("oracle", {}).get("differ") or p.get("endpoint", {}).get("differ")
+                 or p.get("endpoint", {}).get("errors") for p in results["points"])
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()